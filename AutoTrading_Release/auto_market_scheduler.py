@@ -2,18 +2,32 @@
 """
 자동 시장 전환 스케줄러
 
-현재 시간 기준으로 활성 시장을 자동 감지하여 실행:
-- 한국 장 시간 (09:00-15:30 KST) → 한국 시장만 모니터링
-- 미국 장 시간 (09:30-16:00 ET) → 미국 시장만 모니터링
-- 둘 다 아닐 경우 → 대기
+현재 시간 기준으로 개장 중인 시장을 모두 감지하여 동시에 실행:
+- 한국 장 시간 (09:00-15:30 KST) → 한국 시장 모니터링
+- 미국 장 시간 (09:30-16:00 ET) → 미국 시장 모니터링
+- 세션이 겹치는 시장(추가 해외 시장 등)은 함께 모니터링, 모두 폐장이면 대기
+
+시장마다 전용 워커(MarketWorker)가 자기 세션 일정(개장/마감 전환, 매도/매수 주기)을 EventScheduler로
+실행하므로 한 시장의 주기가 다른 시장 주기를 밀지 않는다. 시장 런타임(MarketScheduler - 전략, API
+클라이언트, 브로커, 캐시)은 처음 워밍업(또는 개장) 때 1번만 만들고 마감 시 suspend, 다음 개장 시 resume으로 재사용한다. 전송(공용 HTTP 세션), 호출 예산(공용
+RateLimiter), 토큰(토큰 파일 단위 재발급 잠금)은 모든 시장이 공유한다.
 """
+import argparse
+import functools
 import logging
+import threading
 import time
-from datetime import datetime, time as dt_time
+from datetime import datetime
 import pytz
-from typing import Optional
-
-from dual_market_scheduler import MarketScheduler
+from typing import Optional, Dict, List
+
+from dual_market_scheduler import MarketScheduler, MARKETS, trading_hours
+from common import http
+from common.event_scheduler import EventScheduler
+from common.market_calendar import get_calendar
+from common.market_worker import MarketWorker
+from common.prefetcher import PREFETCH_LEAD_SECONDS
+from strategy_host import load_market_settings, warmup_lead_minutes
 from config import (
     USE_PAPER_TRADING,
     LOG_LEVEL,
@@ -24,110 +38,322 @@ from config import (
 
 
 class AutoMarketScheduler:
-    """시간대별 자동 시장 전환 스케줄러"""
+    """시간대별 자동 시장 전환 스케줄러 (세션이 겹치는 여러 시장 동시 운영)"""
 
-    def __init__(self):
+    def __init__(self, markets: List[str] = None):
+        """
+        Args:
+            markets: 운영할 시장 리스트 (기본: 등록된 전체 시장 MARKETS)
+        """
         self.logger = logging.getLogger(__name__)
-        self.us_tz = pytz.timezone('US/Eastern')
         self.kr_tz = pytz.timezone('Asia/Seoul')
+        self.markets = list(markets or MARKETS)
+
+        # 거래소 캘린더 (휴장일/조기 폐장/지연 개장 반영)
+        self.calendars = {}
+        for market in self.markets:
+            start_time, end_time = trading_hours(market)
+            self.calendars[market] = get_calendar(market, (start_time.strftime('%H:%M'), end_time.strftime('%H:%M')))
 
-        # 시장 시간 정의
-        self.us_start = dt_time(9, 30)   # 09:30 ET
-        self.us_end = dt_time(16, 0)     # 16:00 ET
-        self.kr_start = dt_time(9, 0)    # 09:00 KST
-        self.kr_end = dt_time(15, 30)    # 15:30 KST
+        # 시장 런타임 {market: MarketScheduler} (한 번 만들면 세션 사이에도 유지)
+        self.runtimes: Dict[str, MarketScheduler] = {}
+        # 모니터링 중인 시장 {market: MarketScheduler}
+        self.schedulers: Dict[str, MarketScheduler] = {}
+        self._market_locks = {market: threading.RLock() for market in self.markets}
+
+        # 시장별 주기 소요 시간 통계
+        self.cycle_stats = {market: {'cycles': 0, 'total_seconds': 0.0, 'last_seconds': None, 'max_seconds': 0.0}
+                            for market in self.markets}
+
+        # 시장별 워커 (호출 예산은 공용 HTTP 계층에서 시장 전체가 공유)
+        self.workers = {market: MarketWorker(market, functools.partial(self._setup_market, market))
+                        for market in self.markets}
 
-        self.current_scheduler: Optional[MarketScheduler] = None
-        self.current_market = None
         self.is_running = False
+        self.events = EventScheduler('auto')
+
+    def get_active_markets(self) -> List[str]:
+        """
+        현재 개장 중인 시장 목록
+
+        Returns:
+            ['us', 'kr', ...] (둘 다 폐장이면 빈 리스트 - 주말/휴장일 포함)
+        """
+        now = time.time()
+        return [market for market, calendar in self.calendars.items() if calendar.is_open(now)]
 
     def get_active_market(self) -> Optional[str]:
         """
-        현재 활성화된 시장 확인
+        현재 활성화된 시장 확인 (여러 시장이 열려 있으면 첫 번째)
 
         Returns:
-            'us': 미국 장 시간
-            'kr': 한국 장 시간
-            None: 둘 다 아님
+            시장 이름 또는 None
         """
-        now_us = datetime.now(self.us_tz)
-        now_kr = datetime.now(self.kr_tz)
+        active = self.get_active_markets()
+        return active[0] if active else None
 
-        # 주말 제외
-        is_us_weekday = now_us.weekday() < 5
-        is_kr_weekday = now_kr.weekday() < 5
+    def activate_market(self, market: str) -> MarketScheduler:
+        """
+        시장 모니터링 시작 (다른 시장은 그대로 유지, 런타임이 있으면 재개)
 
-        # 미국 장 시간 확인
-        if is_us_weekday:
-            us_time = now_us.time()
-            if self.us_start <= us_time <= self.us_end:
-                return 'us'
+        Args:
+            market: 'us', 'kr' 등
+        """
+        scheduler = self.schedulers.get(market)
+        if scheduler is not None:
+            return scheduler
+
+        with self._market_locks[market]:
+            scheduler = self.schedulers.get(market)
+            if scheduler is not None:
+                return scheduler
+
+            started = time.perf_counter()
+            action = "재개" if market in self.runtimes else "생성"
+            scheduler = self.get_runtime(market)
+            # 토큰 체크 (같은 토큰 파일은 한 곳에서만 재발급) 후 보유 종목 고빈도 감시 시작
+            scheduler.resume()
+            self.schedulers[market] = scheduler
+            elapsed = time.perf_counter() - started
+
+        self._log_activation(scheduler, action, elapsed)
+        return scheduler
+
+    def get_runtime(self, market: str) -> MarketScheduler:
+        """시장 런타임 (없으면 생성, 감시 스레드는 시작하지 않음)"""
+        with self._market_locks[market]:
+            scheduler = self.runtimes.get(market)
+            if scheduler is None:
+                scheduler = self.runtimes[market] = MarketScheduler(market)
+            return scheduler
+
+    def get_warmup_lead(self, market: str) -> Optional[float]:
+        """시장 설정 "warmup" 블록의 워밍업 시점 (개장 몇 분 전, 런타임을 만들지 않고 설정 파일만 읽음)"""
+        try:
+            settings = load_market_settings(MARKETS[market]['config'].STOCKS_CONFIG_FILE)
+        except Exception as e:
+            self.logger.error(f"[{market.upper()}] 시장 설정 로드 실패 (워밍업 기본값 사용): {e}")
+            settings = {}
+        return warmup_lead_minutes(settings)
 
-        # 한국 장 시간 확인
-        if is_kr_weekday:
-            kr_time = now_kr.time()
-            if self.kr_start <= kr_time <= self.kr_end:
-                return 'kr'
+    def warmup_market(self, market: str):
+        """개장 전 워밍업 (런타임을 미리 만들고 토큰/연결/캐시 준비)"""
+        self.get_runtime(market).warmup()
 
-        return None
+    def _log_activation(self, scheduler: MarketScheduler, action: str, elapsed: float):
+        """시장 모니터링 시작 로그 (전환 소요 시간 포함)"""
+        market = scheduler.market
+        now = datetime.now(self.kr_tz)
+        now_local = datetime.now(scheduler.tz)
+
+        self.logger.info("=" * 60)
+        self.logger.info(f"[SWITCH] ✅ {scheduler.market_name} 시장 모니터링 시작 (런타임 {action}, {elapsed:.2f}초)")
+        self.logger.info(f"[TIME] 현재 시간: {now.strftime('%Y-%m-%d %H:%M:%S')} KST")
+        if scheduler.tz_label != 'KST':
+            self.logger.info(f"[TIME] {scheduler.market_name} 시간: {now_local.strftime('%Y-%m-%d %H:%M:%S')} {scheduler.tz_label}")
+        hours = scheduler.calendar.session_hours(now_local.date())
+        if hours:
+            self.logger.info(f"[HOURS] {scheduler.market_name} 장: {hours[0].strftime('%H:%M')}-{hours[1].strftime('%H:%M')} "
+                             f"{scheduler.tz_label}")
+        others = [m.upper() for m in self.schedulers if m != market]
+        if others:
+            self.logger.info(f"[SWITCH] 동시 모니터링 중: {', '.join(others)}")
+        self.logger.info("=" * 60)
+
+    def deactivate_market(self, market: str):
+        """시장 모니터링 종료 (런타임은 suspend 후 유지, 다른 시장은 그대로)"""
+        with self._market_locks[market]:
+            scheduler = self.schedulers.pop(market, None)
+            if scheduler is None:
+                return
+            started = time.perf_counter()
+            scheduler.suspend()
+            elapsed = time.perf_counter() - started
+
+        self.logger.info(f"[SWITCH] {market.upper()} 시장 모니터링 종료 (런타임 유지, {elapsed:.2f}초)")
+        if not self.schedulers:
+            self.logger.info("[IDLE] 모든 시장 폐장 - 대기 모드")
+            self.log_next_events()
 
     def switch_market(self, market: str):
         """
-        시장 전환
+        시장 전환 (해당 시장 모니터링 시작, 기존 시장은 세션이 끝날 때 각자 종료)
 
         Args:
-            market: 'us' 또는 'kr'
+            market: 'us', 'kr' 등
         """
-        if self.current_market == market:
-            return  # 이미 같은 시장
+        self.activate_market(market)
 
-        # 기존 스케줄러 정리
-        if self.current_scheduler:
-            self.logger.info(f"[SWITCH] {self.current_market.upper()} 시장 모니터링 종료")
-            # 스케줄 클리어는 나중에 추가 가능
+    def run_active_market(self):
+        """현재 개장 중인 모든 시장의 전략 실행 (시장별 워커에서 동시에)"""
+        threads = [threading.Thread(target=self._run_startup_cycle, args=(market,), name=f"Startup-{market.upper()}")
+                   for market in self.get_active_markets()]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    def _run_startup_cycle(self, market: str):
+        """시작 직후 즉시 매도 → 매수 실행 후 상태 출력"""
+        scheduler = self.activate_market(market)
+        self.logger.info(f"[STARTUP] {market.upper()} 시작 직후 즉시 매도 전략 실행...")
+        self.run_cycle(market, 'sell')
+        time.sleep(2)
 
-        # 새 시장 스케줄러 생성
-        self.current_market = market
-        self.current_scheduler = MarketScheduler(market)
+        self.logger.info(f"[STARTUP] {market.upper()} 시작 직후 즉시 매수 전략 실행...")
+        self.run_cycle(market, 'buy')
+        time.sleep(2)
 
-        market_name = "미국" if market == 'us' else "한국"
-        now = datetime.now(self.kr_tz)
+        scheduler.print_status()
 
-        self.logger.info("=" * 60)
-        self.logger.info(f"[SWITCH] ✅ {market_name} 시장 모니터링 시작")
-        self.logger.info(f"[TIME] 현재 시간: {now.strftime('%Y-%m-%d %H:%M:%S')} KST")
+    def _setup_market(self, market: str, events: EventScheduler, limiter):
+        """
+        MarketWorker setup - 시장 세션 일정 등록 (워커 스레드에서 호출, 개장 중이면 즉시 1회 실행)
 
-        if market == 'us':
-            now_et = datetime.now(self.us_tz)
-            self.logger.info(f"[TIME] 미국 시간: {now_et.strftime('%Y-%m-%d %H:%M:%S')} ET")
-            self.logger.info(f"[HOURS] 미국 장: 09:30-16:00 ET")
-        else:
-            self.logger.info(f"[HOURS] 한국 장: 09:00-15:30 KST")
+        Args:
+            market: 시장 이름
+            events: 워커 전용 EventScheduler
+            limiter: 사용 안 함 (호출 예산은 공용 HTTP 계층에서 공유)
+        """
+        calendar = self.calendars[market]
+        tz = calendar.tz
+
+        # 개장 전 워밍업 (시장 설정 "warmup" 블록의 lead_minutes분 전, 런타임은 워밍업/개장 때 생성)
+        lead = self.get_warmup_lead(market)
+        if lead:
+            events.at_session('open', lambda: self.warmup_market(market), calendar, offset_minutes=-lead,
+                              name=f"{market}_warmup")
+
+        events.at_session('open', lambda: self.open_market(market), calendar, name=f"{market}_open")
+
+        # 30분마다 매도 / 60분마다 매수 / 30분마다 토큰 체크 (그날 실제 세션 안에서만)
+        events.every(30, lambda scheduled_at: self.run_cycle(market, 'sell', scheduled_at), tz,
+                     name=f"{market}_sell", pass_scheduled_at=True,
+                     prepare=lambda at: self.prepare_cycle(market, 'sell', at),
+                     prepare_lead=PREFETCH_LEAD_SECONDS, calendar=calendar)
+        events.every(60, lambda scheduled_at: self.run_cycle(market, 'buy', scheduled_at), tz,
+                     name=f"{market}_buy", pass_scheduled_at=True,
+                     prepare=lambda at: self.prepare_cycle(market, 'buy', at),
+                     prepare_lead=PREFETCH_LEAD_SECONDS, calendar=calendar)
+        events.every(30, lambda: self.run_cycle(market, 'token'), tz,
+                     name=f"{market}_token", calendar=calendar)
+
+        # 폐장 시각에 해당 시장만 대기 모드 전환
+        events.at_session('close', lambda: self.close_market(market), calendar, name=f"{market}_close")
+
+        # 워커 (재)시작 시 개장 중이면 곧바로 모니터링 이어받기
+        if calendar.is_open():
+            self.activate_market(market)
+        return None
 
-        self.logger.info("=" * 60)
+    def setup_schedule(self):
+        """감독자/상태 로그 주기 등록 (시장 세션 일정은 각 시장 워커가 등록)"""
+        # 워커 점검 (30초 주기, 죽은 워커 재시작 - 스레드 워커의 멈춘 작업은 경고만)
+        self.events.every(0.5, self.supervise, self.kr_tz, weekdays_only=False, name='supervisor')
 
-        # 초기 토큰 체크
-        self.current_scheduler.check_and_refresh_token()
+        # 10분마다 상태 로그 (개장 시장이 있을 때), 대기 중 상태 로그 (1시간마다)
+        self.events.every(10, self.log_open_status, self.kr_tz, weekdays_only=False, name='status')
+        self.events.every(60, self.log_idle_status, self.kr_tz, weekdays_only=False, name='idle_status')
 
-    def run_active_market(self):
-        """현재 활성 시장의 전략 실행"""
-        if not self.current_scheduler:
-            return
+    def supervise(self):
+        """시장 워커 점검 - 죽은 워커 재시작 (스레드 워커의 멈춘 작업은 경고만)"""
+        for market, worker in self.workers.items():
+            reason = worker.check()
+            if reason:
+                self.logger.warning(f"[SUPERVISOR] {market.upper()} 워커 재시작 ({reason})")
+
+    def open_market(self, market: str):
+        """개장 시각 - 해당 시장 모니터링 시작 (열려 있는 다른 시장은 유지)"""
+        if self.calendars[market].is_open():
+            self.activate_market(market)
+
+    def close_market(self, market: str):
+        """마감 시각 - 해당 시장 감시 종료"""
+        self.deactivate_market(market)
+
+    def run_cycle(self, market: str, kind: str, scheduled_at: Optional[float] = None):
+        """
+        시장 주기 실행 (개장 중이 아니면 건너뜀, 시장별 소요 시간 기록)
 
-        if not self.current_scheduler.is_trading_hours():
-            self.logger.debug(f"[{self.current_market.upper()}] 운영 시간 외")
+        Args:
+            market: 시장 이름
+            kind: 'sell', 'buy' 또는 'token'
+            scheduled_at: 주기 예정 시각 (epoch 초)
+        """
+        if not self.calendars[market].is_open():
             return
+        scheduler = self.activate_market(market)
 
-        # 매도 전략 실행
-        self.current_scheduler.execute_sell_strategy()
-        time.sleep(2)
+        if kind == 'token':
+            scheduler.check_and_refresh_token()
+            return
 
-        # 매수 전략 실행
-        self.current_scheduler.execute_buy_strategy()
-        time.sleep(2)
+        started = time.perf_counter()
+        if kind == 'sell':
+            scheduler.execute_sell_strategy(scheduled_at=scheduled_at)
+        else:
+            scheduler.execute_buy_strategy(scheduled_at=scheduled_at)
+        elapsed = time.perf_counter() - started
+
+        stats = self.cycle_stats[market]
+        stats['cycles'] += 1
+        stats['total_seconds'] += elapsed
+        stats['last_seconds'] = elapsed
+        stats['max_seconds'] = max(stats['max_seconds'], elapsed)
+        if len(self.schedulers) > 1:
+            self.logger.info(f"[{market.upper()}_CYCLE] {kind} {elapsed:.2f}초 "
+                             f"(동시 운영: {', '.join(m.upper() for m in self.schedulers)})")
+
+    def prepare_cycle(self, market: str, kind: str, cycle_at: float):
+        """다음 주기 시세 선조회 예약 (현재 모니터링 중인 시장만)"""
+        scheduler = self.schedulers.get(market)
+        if scheduler:
+            scheduler.prepare_cycle(kind, cycle_at)
+
+    def log_status(self):
+        """현재 모니터링 상태 로그 (시장별 주기 소요 시간/스케줄 지연 + 공용 전송 계층)"""
+        now = datetime.now(self.kr_tz)
+        active = self.get_active_markets()
 
-        # 상태 출력
-        self.current_scheduler.print_status()
+        if active:
+            names = ', '.join(MARKETS[market]['name'] for market in active)
+            self.logger.info(f"[STATUS] 현재: {names} 장 모니터링 중 ({now.strftime('%H:%M')} KST)")
+        else:
+            self.logger.info(f"[STATUS] 대기 중 - 다음 개장 대기 ({now.strftime('%H:%M')} KST)")
+
+        for market in active:
+            cycle = self.cycle_stats[market]
+            avg = cycle['total_seconds'] / cycle['cycles'] if cycle['cycles'] else 0.0
+            last = f"{cycle['last_seconds']:.2f}초" if cycle['last_seconds'] is not None else '-'
+            worker = self.workers[market].get_status()
+            events = worker['events'] or {}
+            self.logger.info(f"[STATUS] {market.upper()}: 주기 {cycle['cycles']}회, 최근 {last}, 평균 {avg:.2f}초, "
+                             f"최대 {cycle['max_seconds']:.2f}초, 스케줄 평균 지연 {events.get('avg_lag_ms', 0.0)}ms, "
+                             f"워커 {worker['state']}")
+
+        transport = http.get_stats()
+        self.logger.info(f"[STATUS] 공용 전송: 요청 {transport['requests']}회, 오류 {transport['errors']}회, "
+                         f"예산 대기 평균 {transport['avg_wait_ms']}ms / 최대 {transport['max_wait_ms']}ms")
+
+    def log_open_status(self):
+        """개장 시장이 있을 때만 상태 로그"""
+        if self.get_active_markets():
+            self.log_status()
+
+    def log_idle_status(self):
+        """대기 중일 때만 상태 로그"""
+        if not self.get_active_markets():
+            self.log_status()
+
+    def log_next_events(self):
+        """시장별 다음 매도/매수/개장 예정 시각 안내"""
+        for worker in self.workers.values():
+            events = worker.events
+            if events is None:
+                continue
+            for name, fire_at in events.next_fire_times().items():
+                if name.endswith(('_open', '_sell', '_buy')):
+                    self.logger.info(f"[INFO] 다음 {name}: {fire_at.strftime('%m-%d %H:%M %Z')}")
 
     def start(self):
         """자동 시장 전환 시스템 시작"""
@@ -145,82 +371,21 @@ class AutoMarketScheduler:
             print("=" * 60)
 
         self.is_running = True
-        last_check_minute = -1
-        last_status_print = time.time()
-
-        # 시작 직후 초기 상태 출력 및 즉시 실행
-        initial_market = self.get_active_market()
-        if initial_market:
-            self.switch_market(initial_market)
-
-            # 시작 직후 즉시 전략 실행
-            self.logger.info("[STARTUP] 시작 직후 즉시 매도 전략 실행...")
-            self.current_scheduler.execute_sell_strategy()
-            time.sleep(2)
-
-            self.logger.info("[STARTUP] 시작 직후 즉시 매수 전략 실행...")
-            self.current_scheduler.execute_buy_strategy()
-            time.sleep(2)
-
-            self.current_scheduler.print_status()
-
-            # 다음 주기 안내
-            next_sell = 30 - (datetime.now().minute % 30)
-            next_buy = 60 - (datetime.now().minute % 60)
-            self.logger.info(f"[INFO] 다음 매도 전략: {next_sell}분 후 (매 30분마다)")
-            self.logger.info(f"[INFO] 다음 매수 전략: {next_buy}분 후 (매 60분마다)")
-            self.logger.info(f"[INFO] 시스템 정상 작동 중 (10초마다 시장 체크)")
+
+        # 시작 직후 개장 중인 시장 모두 즉시 실행 (시장별 병렬)
+        if self.get_active_markets():
+            self.run_active_market()
         else:
             self.logger.info("[IDLE] 현재 모든 시장 폐장 - 대기 모드")
 
-        try:
-            while self.is_running:
-                # 1분마다 시장 체크
-                current_minute = datetime.now().minute
-
-                if current_minute != last_check_minute:
-                    last_check_minute = current_minute
-
-                    # 활성 시장 확인
-                    active_market = self.get_active_market()
-
-                    if active_market:
-                        # 시장 전환 필요 시
-                        if active_market != self.current_market:
-                            self.switch_market(active_market)
-
-                        # 매 분마다 전략 실행 (실제로는 스케줄 주기에 따라)
-                        if current_minute % 30 == 0:  # 30분마다 매도
-                            self.current_scheduler.execute_sell_strategy()
-
-                        if current_minute % 60 == 0:  # 60분마다 매수
-                            self.current_scheduler.execute_buy_strategy()
-
-                        if current_minute % 30 == 0:  # 30분마다 토큰 체크
-                            self.current_scheduler.check_and_refresh_token()
+        # 시장별 워커 시작 후 감독자 스케줄 설정
+        for worker in self.workers.values():
+            worker.start()
+        self.setup_schedule()
 
-                    else:
-                        # 장 시간 외
-                        if self.current_scheduler:
-                            self.current_scheduler = None
-                            self.current_market = None
-                            self.logger.info("[IDLE] 모든 시장 폐장 - 대기 모드")
-
-                # 10분마다 상태 로그
-                if time.time() - last_status_print >= 600:
-                    now = datetime.now(self.kr_tz)
-                    active = self.get_active_market()
-
-                    if active:
-                        market_name = "미국" if active == 'us' else "한국"
-                        self.logger.info(f"[STATUS] 현재: {market_name} 장 모니터링 중 ({now.strftime('%H:%M')} KST)")
-                    else:
-                        self.logger.info(f"[STATUS] 대기 중 - 다음 개장 대기 ({now.strftime('%H:%M')} KST)")
-
-                    last_status_print = time.time()
-
-                # CPU 사용률 절감
-                time.sleep(10)  # 10초마다 체크
+        try:
+            # 감독자 루프 - 다음 점검/상태 로그 시각까지 대기 후 실행 (시장 작업은 각 워커에서)
+            self.events.run()
 
         except KeyboardInterrupt:
             self.logger.info("[STOP] 사용자 중단 요청")
@@ -237,10 +402,26 @@ class AutoMarketScheduler:
         self.logger.info("=== 자동 시장 전환 시스템 종료 ===")
         self.logger.info("=" * 60)
         self.is_running = False
+        self.events.stop()
+
+        for worker in self.workers.values():
+            worker.stop()
+
+        for market in list(self.schedulers):
+            self.deactivate_market(market)
 
 
 def main():
     """메인 실행 함수"""
+    parser = argparse.ArgumentParser(description='자동 시장 전환 자동매매 시스템')
+    parser.add_argument('--markets', type=str, default=','.join(MARKETS),
+                        help=f"운영 시장 (쉼표 구분, 기본값: {','.join(MARKETS)})")
+    args = parser.parse_args()
+    markets = [market.strip().lower() for market in args.markets.split(',') if market.strip()]
+    unknown = [market for market in markets if market not in MARKETS]
+    if unknown:
+        parser.error(f"등록되지 않은 시장: {', '.join(unknown)} (사용 가능: {', '.join(MARKETS)})")
+
     # 로깅 설정
     from logging.handlers import RotatingFileHandler
 
@@ -265,7 +446,7 @@ def main():
     )
 
     # 자동 시장 전환 스케줄러 시작
-    scheduler = AutoMarketScheduler()
+    scheduler = AutoMarketScheduler(markets=markets)
     scheduler.start()
 
 
@@ -0,0 +1,13 @@
+"""
+Backtest module - 과거 봉 데이터로 실거래 전략을 재생하는 백테스트
+"""
+from .clock import SimulatedClock
+from .bars import BarData, load_bars_csv, load_bars_store
+from .sim_client import SimulatedAPIClient, market_profile
+from .engine import BacktestEngine
+from .vectorized import VectorizedBacktest, build_param_grid, check_consistency
+from .sweep import ParameterSweep
+
+__all__ = ['SimulatedClock', 'BarData', 'load_bars_csv', 'load_bars_store', 'SimulatedAPIClient',
+           'market_profile', 'BacktestEngine', 'VectorizedBacktest', 'build_param_grid',
+           'check_consistency', 'ParameterSweep']
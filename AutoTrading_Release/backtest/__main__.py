@@ -0,0 +1,160 @@
+"""
+백테스트 실행
+
+사용 예:
+    python -m backtest --market kr --bars data/kr_minute_2025.csv --start 2025-01-01 --end 2025-12-31
+    python -m backtest --market us --bars data/us_daily/ --cash 10000 --out backtest_results/us
+    python -m backtest --market kr --bar-store bar_store --start 2025-01-01
+    python -m backtest --market kr --bars data/kr_minute_2025.csv --grid profit_threshold=0.03,0.05,0.08 --grid top_k=1,3,5
+    python -m backtest --market kr --bars data/kr_minute_2025.csv --check-consistency
+    python -m backtest --market kr --check-consistency          (데이터 없이 고정 시드 합성 봉으로 점검)
+    python -m backtest --market kr --bars data/kr_minute_2025.csv --sweep --grid profit_threshold=0.02,0.03,0.05,0.08 --grid stop_loss_cooldown_days=10,20,50
+"""
+import argparse
+import json
+import logging
+import os
+from datetime import date
+
+from .bars import load_bars_csv, load_bars_store, synthetic_bars
+from .engine import BacktestEngine
+from .sim_client import market_profile
+from .vectorized import VectorizedBacktest, build_param_grid, check_consistency
+from .sweep import ParameterSweep, SORT_KEYS, DEFAULT_CACHE_DIR, format_table, save_results_csv
+
+# 합성 봉 시작 가격 기준 (시장별 대략적인 가격대)
+SYNTHETIC_BASE_PRICE = {'kr': 50_000, 'us': 100.0}
+
+
+def _parse_grid_axis(text: str) -> tuple:
+    """'key=v1,v2' → (key, [값...]) (숫자/None/문자열 자동 변환)"""
+    key, _, values = text.partition('=')
+
+    def convert(value: str):
+        value = value.strip()
+        if value.lower() == 'none':
+            return None
+        for cast in (int, float):
+            try:
+                return cast(value)
+            except ValueError:
+                pass
+        return value
+
+    return key.strip(), [convert(v) for v in values.split(',') if v.strip()]
+
+
+def _synthetic_bars(market: str, config_file: str, profile: dict):
+    """종목 설정 파일의 필터/감시 종목으로 고정 시드 합성 30분봉 생성"""
+    if config_file is None:
+        if market == 'kr':
+            from kr.config import KRConfig as market_config
+        else:
+            from us.config import USConfig as market_config
+        config_file = market_config.STOCKS_CONFIG_FILE
+    with open(config_file, 'r', encoding='utf-8') as f:
+        stocks_config = json.load(f)
+    symbols = list(stocks_config.get('filter_stocks', {})) + stocks_config.get('watch_list', [])
+    return synthetic_bars(symbols, profile['timezone'], profile['market_hours'], interval_minutes=30,
+                          base_price=SYNTHETIC_BASE_PRICE[market])
+
+
+def main():
+    """메인 실행 함수"""
+    parser = argparse.ArgumentParser(description='자동매매 전략 백테스트')
+    parser.add_argument('--market', type=str, default='kr', choices=['kr', 'us'],
+                        help='시장 선택: kr (기본값), us')
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument('--bars', type=str,
+                        help='봉 데이터 CSV 파일 또는 종목별 CSV 디렉토리')
+    source.add_argument('--bar-store', type=str,
+                        help='로컬 봉 저장소 디렉토리 (BarStore, 기본 일봉 / --interval minute이면 1분봉)')
+    parser.add_argument('--interval', type=str, default=None, choices=['minute', 'daily'],
+                        help='봉 종류 (기본값: 자동 판별)')
+    parser.add_argument('--start', type=date.fromisoformat, default=None, help='시작 날짜 (YYYY-MM-DD)')
+    parser.add_argument('--end', type=date.fromisoformat, default=None, help='종료 날짜 (YYYY-MM-DD)')
+    parser.add_argument('--cash', type=float, default=10_000_000, help='초기 예수금')
+    parser.add_argument('--config', type=str, default=None, help='종목 설정 파일 (기본값: 시장 기본 파일)')
+    parser.add_argument('--profit-threshold', type=float, default=None, help='목표 수익률 (예: 0.05)')
+    parser.add_argument('--slippage-ticks', type=int, default=0, help='시장가 슬리피지 (호가 단위 수)')
+    parser.add_argument('--out', type=str, default=None, help='결과 디렉토리 (기본값: backtest_results/<market>)')
+    parser.add_argument('--grid', action='append', default=[], metavar='KEY=V1,V2',
+                        help='벡터화 그리드 탐색 축 (여러 번 지정 가능, 예: top_k=1,3,5)')
+    parser.add_argument('--top', type=int, default=10, help='그리드 결과 상위 출력 개수')
+    parser.add_argument('--sweep', action='store_true',
+                        help='그리드를 프로세스 풀로 분산 실행 (결과 캐시 재사용)')
+    parser.add_argument('--workers', type=int, default=None, help='스윕 워커 수 (기본값: CPU 코어 수)')
+    parser.add_argument('--cache-dir', type=str, default=DEFAULT_CACHE_DIR, help='스윕 패널/결과 캐시 디렉토리')
+    parser.add_argument('--sort', type=str, default='return', choices=list(SORT_KEYS),
+                        help='스윕 순위 기준 (기본값: return)')
+    parser.add_argument('--check-consistency', action='store_true',
+                        help='벡터화 경로와 이벤트 기반 경로 결과 일치 확인 (봉 데이터 미지정 시 합성 봉 사용)')
+    parser.add_argument('--verbose', action='store_true', help='전략 INFO 로그 출력')
+    args = parser.parse_args()
+    if args.sweep and args.bar_store:
+        parser.error('--sweep은 --bars (CSV) 입력만 지원합니다')
+    if not (args.bars or args.bar_store or args.check_consistency):
+        parser.error('--bars 또는 --bar-store 중 하나가 필요합니다')
+
+    logging.basicConfig(level=logging.INFO,
+                        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+    output_dir = args.out or f"backtest_results/{args.market}"
+
+    if args.sweep:
+        grid = build_param_grid(**dict(_parse_grid_axis(axis) for axis in args.grid))
+        sweep = ParameterSweep(args.market, args.bars, stocks_config_file=args.config,
+                               cache_dir=args.cache_dir, initial_cash=args.cash,
+                               start=args.start, end=args.end, interval=args.interval,
+                               slippage_ticks=args.slippage_ticks, workers=args.workers)
+        report = sweep.run(grid, sort_by=args.sort)
+        results_path = os.path.join(output_dir, f"{args.market}_sweep_results.csv")
+        save_results_csv(report['results'], results_path)
+        print(format_table(report['results'], top=args.top))
+        print(f"\n{report['combos']}개 조합 (캐시 {report['cached']}, 계산 {report['computed']}, "
+              f"워커 {report['workers']}) {report['elapsed_seconds']:.2f}초 → {results_path}")
+        return
+
+    profile = market_profile(args.market)
+    if args.bar_store:
+        bars = load_bars_store(args.bar_store, args.market, profile['timezone'], profile['market_hours'],
+                               interval=args.interval)
+    elif args.bars:
+        bars = load_bars_csv(args.bars, profile['timezone'], profile['market_hours'], interval=args.interval)
+    else:
+        bars = _synthetic_bars(args.market, args.config, profile)
+
+    if args.check_consistency:
+        result = check_consistency(args.market, bars, stocks_config_file=args.config,
+                                   initial_cash=args.cash, start=args.start, end=args.end,
+                                   output_dir=output_dir)
+        print(json.dumps(result, ensure_ascii=False, indent=2))
+        raise SystemExit(0 if result['match'] else 1)
+
+    if args.grid:
+        grid = build_param_grid(**dict(_parse_grid_axis(axis) for axis in args.grid))
+        vectorized = VectorizedBacktest(args.market, bars, stocks_config_file=args.config,
+                                        initial_cash=args.cash, start=args.start, end=args.end,
+                                        slippage_ticks=args.slippage_ticks)
+        report = vectorized.run(grid)
+        report.pop('equity')
+        report.pop('fills')
+        report['results'] = report['results'][:args.top]
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+        return
+
+    engine = BacktestEngine(
+        args.market, bars,
+        initial_cash=args.cash,
+        output_dir=output_dir,
+        stocks_config_file=args.config,
+        profit_threshold=args.profit_threshold,
+        slippage_ticks=args.slippage_ticks,
+        quiet=not args.verbose
+    )
+    summary = engine.run(start=args.start, end=args.end)
+    print(json.dumps(summary, ensure_ascii=False, indent=2))
+
+
+if __name__ == '__main__':
+    main()
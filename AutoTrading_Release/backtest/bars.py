@@ -0,0 +1,399 @@
+"""
+백테스트 시세 데이터 (분봉/일봉)
+
+CSV 형식 (파일 하나에 여러 종목, 또는 디렉토리에 종목별 파일 <종목코드>.csv):
+
+    symbol,datetime,open,high,low,close,volume
+    005930,2025-01-02 09:00,53000,53300,52900,53200,120345
+
+- 시각 컬럼: datetime / timestamp, 또는 date(+time). 'YYYYMMDD', 'HHMM(SS)' 형식도 허용
+- 타임존 없는 시각은 시장 타임존 기준으로 해석
+- 분봉 시각은 봉 시작 시각으로 간주 (미래 참조 방지: 완성된 봉의 종가만 현재가로 사용)
+- 일봉은 장중 시세를 시가→종가 선형 보간으로 근사 (거래량도 경과 비율만큼 누적)
+
+로컬 봉 저장소(common.bar_store.BarStore)의 일봉/분봉을 바로 읽으려면 load_bars_store를 사용한다.
+데이터 없이 경로 점검(--check-consistency 등)만 하려면 synthetic_bars로 고정 시드 합성 봉을 만든다.
+"""
+import csv
+import os
+import random
+from bisect import bisect_left, bisect_right
+from collections import Counter
+from datetime import datetime, timedelta, date as dt_date
+from typing import Optional, Dict, List, Tuple, Iterable
+
+import pytz
+
+from .clock import session_time
+
+
+DAILY = 'daily'
+MINUTE = 'minute'
+
+
+class _SymbolBars:
+    """종목 1개의 봉 배열 (시각 오름차순, 장 날짜별 인덱스 범위)"""
+
+    __slots__ = ('starts', 'ends', 'opens', 'highs', 'lows', 'closes', 'cum_volumes',
+                 'dates', 'day_ranges')
+
+    def __init__(self, rows: List[Tuple[float, dt_date, float, float, float, float, float]],
+                 interval_seconds: float):
+        rows.sort(key=lambda row: row[0])
+        self.starts = [row[0] for row in rows]
+        self.ends = [row[0] + interval_seconds for row in rows]
+        self.opens = [row[2] for row in rows]
+        self.highs = [row[3] for row in rows]
+        self.lows = [row[4] for row in rows]
+        self.closes = [row[5] for row in rows]
+
+        # 장 날짜별 범위 + 당일 누적 거래량
+        self.cum_volumes = []
+        self.dates: List[dt_date] = []
+        self.day_ranges: Dict[dt_date, Tuple[int, int]] = {}
+        cum = 0.0
+        for i, row in enumerate(rows):
+            day = row[1]
+            if not self.dates or self.dates[-1] != day:
+                self.dates.append(day)
+                self.day_ranges[day] = (i, i)
+                cum = 0.0
+            else:
+                self.day_ranges[day] = (self.day_ranges[day][0], i)
+            cum += row[6] or 0.0
+            self.cum_volumes.append(cum)
+
+
+class BarData:
+    """
+    종목별 봉 데이터 + 시뮬레이션 시각 기준 시세 조회
+
+    사용 예:
+        bars = load_bars_csv("bars/kr_minute.csv", "Asia/Seoul", ("09:00", "15:30"))
+        price, volume = bars.quote_at("005930", clock.timestamp())
+    """
+
+    def __init__(self, rows: Dict[str, List[tuple]], timezone: str,
+                 market_hours: Tuple[str, str], interval: Optional[str] = None,
+                 interval_minutes: Optional[float] = None):
+        """
+        Args:
+            rows: {symbol: [(datetime, open, high, low, close, volume), ...]}
+            timezone: 시장 타임존 (타임존 없는 시각 해석 기준)
+            market_hours: (장 시작 'HH:MM', 장 종료 'HH:MM')
+            interval: 'daily' / 'minute' (없으면 자동 판별)
+            interval_minutes: 분봉 간격 (없으면 자동 판별)
+        """
+        self.timezone = timezone
+        self.tz = pytz.timezone(timezone)
+        self.market_hours = market_hours
+
+        parsed: Dict[str, List[tuple]] = {}
+        for symbol, symbol_rows in rows.items():
+            items = []
+            for when, open_, high, low, close, volume in symbol_rows:
+                if when.tzinfo is None:
+                    when = self.tz.localize(when)
+                local = when.astimezone(self.tz)
+                items.append((when.timestamp(), local.date(), float(open_), float(high),
+                              float(low), float(close), float(volume or 0)))
+            if items:
+                parsed[symbol] = items
+
+        self.interval = interval or self._detect_interval(parsed)
+        if self.interval == DAILY:
+            interval_seconds = 0.0
+        else:
+            interval_seconds = (interval_minutes * 60 if interval_minutes
+                                else self._detect_interval_seconds(parsed))
+        self.interval_seconds = interval_seconds
+
+        self._symbols: Dict[str, _SymbolBars] = {
+            symbol: _SymbolBars(items, interval_seconds) for symbol, items in parsed.items()
+        }
+        self._sessions = sorted({day for bars in self._symbols.values() for day in bars.dates})
+        self._session_bounds: Dict[dt_date, Tuple[float, float]] = {}
+
+    @staticmethod
+    def _detect_interval(parsed: Dict[str, List[tuple]]) -> str:
+        """모든 종목이 장 날짜별로 봉 1개면 일봉"""
+        for items in parsed.values():
+            if len({item[1] for item in items}) < len(items):
+                return MINUTE
+        return DAILY
+
+    @staticmethod
+    def _detect_interval_seconds(parsed: Dict[str, List[tuple]]) -> float:
+        """같은 날 연속 봉 간격의 최빈값 (기본 60초)"""
+        gaps = Counter()
+        for items in parsed.values():
+            ordered = sorted(items, key=lambda item: item[0])
+            for prev, cur in zip(ordered, ordered[1:]):
+                if prev[1] == cur[1] and cur[0] > prev[0]:
+                    gaps[round(cur[0] - prev[0])] += 1
+            if sum(gaps.values()) >= 1000:
+                break
+        return float(gaps.most_common(1)[0][0]) if gaps else 60.0
+
+    def symbols(self) -> List[str]:
+        """데이터가 있는 종목 리스트"""
+        return list(self._symbols.keys())
+
+    def sessions(self, start: Optional[dt_date] = None, end: Optional[dt_date] = None) -> List[dt_date]:
+        """데이터가 있는 장 날짜 리스트 (start~end 포함 범위)"""
+        lo = bisect_left(self._sessions, start) if start else 0
+        hi = bisect_right(self._sessions, end) if end else len(self._sessions)
+        return self._sessions[lo:hi]
+
+    def has_session(self, day: dt_date) -> bool:
+        """해당 날짜에 데이터가 있는지 (휴장일 판단)"""
+        i = bisect_left(self._sessions, day)
+        return i < len(self._sessions) and self._sessions[i] == day
+
+    def session_bounds(self, day: dt_date) -> Tuple[float, float]:
+        """장 시작/종료 시각 (epoch 초)"""
+        bounds = self._session_bounds.get(day)
+        if bounds is None:
+            start_str, end_str = self.market_hours
+            bounds = self._session_bounds[day] = (
+                session_time(day, start_str, self.timezone).timestamp(),
+                session_time(day, end_str, self.timezone).timestamp()
+            )
+        return bounds
+
+    def quote_at(self, symbol: str, ts: float) -> Tuple[Optional[float], Optional[float]]:
+        """
+        시각 ts에 관측 가능한 현재가와 당일 누적 거래량
+
+        Args:
+            symbol: 종목 코드
+            ts: 시뮬레이션 시각 (epoch 초)
+
+        Returns:
+            (현재가, 누적 거래량), 당일 데이터가 없거나 첫 봉 이전이면 (None, None)
+        """
+        bars = self._symbols.get(symbol)
+        if bars is None:
+            return None, None
+
+        day = datetime.fromtimestamp(ts, self.tz).date()
+        day_range = bars.day_ranges.get(day)
+        if day_range is None:
+            return None, None
+        first, last = day_range
+
+        if self.interval == DAILY:
+            open_ts, close_ts = self.session_bounds(day)
+            span = close_ts - open_ts
+            frac = min(1.0, max(0.0, (ts - open_ts) / span)) if span > 0 else 1.0
+            open_, close = bars.opens[first], bars.closes[first]
+            return open_ + (close - open_) * frac, bars.cum_volumes[first] * frac
+
+        # 완성된 마지막 봉의 종가 (진행 중인 첫 봉이면 시가)
+        i = bisect_right(bars.ends, ts, first, last + 1) - 1
+        if i >= first:
+            return bars.closes[i], bars.cum_volumes[i]
+        if ts >= bars.starts[first]:
+            return bars.opens[first], 0.0
+        return None, None
+
+    def price_at(self, symbol: str, ts: float) -> Optional[float]:
+        """시각 ts의 현재가 (없으면 None)"""
+        return self.quote_at(symbol, ts)[0]
+
+    def previous_close(self, symbol: str, day: dt_date) -> Optional[float]:
+        """day 이전 마지막 장 날짜의 종가"""
+        bars = self._symbols.get(symbol)
+        if bars is None:
+            return None
+        i = bisect_left(bars.dates, day)
+        if i == 0:
+            return None
+        return bars.closes[bars.day_ranges[bars.dates[i - 1]][1]]
+
+    def day_close(self, symbol: str, day: dt_date) -> Optional[float]:
+        """해당 날짜 종가 (데이터 없으면 직전 종가)"""
+        bars = self._symbols.get(symbol)
+        if bars is None:
+            return None
+        day_range = bars.day_ranges.get(day)
+        if day_range is not None:
+            return bars.closes[day_range[1]]
+        return self.previous_close(symbol, day)
+
+
+def _parse_datetime(row: Dict[str, str]) -> datetime:
+    """CSV 행의 시각 컬럼 해석"""
+    text = (row.get('datetime') or row.get('timestamp') or '').strip()
+    if not text:
+        date_text = (row.get('date') or '').strip().replace('-', '').replace('/', '')
+        time_text = (row.get('time') or '').strip().replace(':', '')
+        if len(time_text) == 4:
+            time_text += '00'
+        if time_text:
+            return datetime.strptime(date_text + time_text.zfill(6), '%Y%m%d%H%M%S')
+        return datetime.strptime(date_text, '%Y%m%d')
+
+    if text.isdigit():
+        if len(text) == 8:
+            return datetime.strptime(text, '%Y%m%d')
+        if len(text) in (12, 14):
+            return datetime.strptime(text.ljust(14, '0'), '%Y%m%d%H%M%S')
+        return datetime.fromtimestamp(float(text), pytz.utc)
+    return datetime.fromisoformat(text.replace('T', ' ').replace('Z', '+00:00'))
+
+
+def _read_csv_rows(path: str, default_symbol: Optional[str]) -> Iterable[Tuple[str, tuple]]:
+    """CSV 파일 → (symbol, (datetime, open, high, low, close, volume))"""
+    with open(path, 'r', encoding='utf-8-sig', newline='') as f:
+        for row in csv.DictReader(f):
+            row = {(key or '').strip().lower(): value for key, value in row.items()}
+            symbol = (row.get('symbol') or row.get('code') or default_symbol or '').strip()
+            if not symbol:
+                raise ValueError(f"{path}: symbol 컬럼 또는 종목별 파일명이 필요합니다")
+            close = float(row['close'])
+            yield symbol, (
+                _parse_datetime(row),
+                float(row.get('open') or close),
+                float(row.get('high') or close),
+                float(row.get('low') or close),
+                close,
+                float(row.get('volume') or 0)
+            )
+
+
+def load_bars_csv(path: str, timezone: str, market_hours: Tuple[str, str],
+                  interval: Optional[str] = None,
+                  symbols: Optional[Iterable[str]] = None) -> BarData:
+    """
+    CSV 파일 또는 디렉토리(종목별 <종목코드>.csv)에서 봉 데이터 로드
+
+    Args:
+        path: CSV 파일 또는 디렉토리 경로
+        timezone: 시장 타임존
+        market_hours: (장 시작 'HH:MM', 장 종료 'HH:MM')
+        interval: 'daily' / 'minute' (없으면 자동 판별)
+        symbols: 로드할 종목 (없으면 전체)
+
+    Returns:
+        BarData
+    """
+    wanted = set(symbols) if symbols else None
+    if os.path.isdir(path):
+        files = [(os.path.join(path, name), os.path.splitext(name)[0])
+                 for name in sorted(os.listdir(path)) if name.lower().endswith('.csv')]
+    else:
+        files = [(path, None)]
+
+    rows: Dict[str, List[tuple]] = {}
+    for file_path, default_symbol in files:
+        if wanted is not None and default_symbol is not None and default_symbol not in wanted:
+            continue
+        for symbol, bar in _read_csv_rows(file_path, default_symbol):
+            if wanted is None or symbol in wanted:
+                rows.setdefault(symbol, []).append(bar)
+
+    return BarData(rows, timezone, market_hours, interval=interval)
+
+
+def load_bars_store(root: str, market: str, timezone: str, market_hours: Tuple[str, str],
+                    symbols: Optional[Iterable[str]] = None,
+                    start: Optional[dt_date] = None, end: Optional[dt_date] = None,
+                    interval: Optional[str] = None) -> BarData:
+    """
+    로컬 봉 저장소에서 봉 데이터 로드 (네트워크 없음)
+
+    Args:
+        root: BarStore 디렉토리
+        market: 'kr' 또는 'us'
+        timezone: 시장 타임존
+        market_hours: (장 시작 'HH:MM', 장 종료 'HH:MM')
+        symbols: 로드할 종목 (없으면 저장된 전체)
+        start: 시작 날짜 (포함, 전일 종가 계산을 위해 하루 이상 앞서 지정 권장)
+        end: 종료 날짜 (포함)
+        interval: 'daily' (기본값) 또는 'minute' (장중 관측 시세로 모은 1분봉)
+
+    Returns:
+        BarData
+    """
+    from common.bar_store import BarStore, from_yyyymmdd, MINUTE as STORE_MINUTE, DAILY as STORE_DAILY
+
+    store = BarStore(root)
+    frame = STORE_MINUTE if interval == MINUTE else STORE_DAILY
+    tz = pytz.timezone(timezone)
+    if frame == STORE_MINUTE:
+        # 분봉 키는 epoch 초 → 날짜 범위를 장 타임존 하루 경계로 변환
+        lo = tz.localize(datetime.combine(start, datetime.min.time())).timestamp() if start else None
+        hi = tz.localize(datetime.combine(end, datetime.max.time())).timestamp() if end else None
+    else:
+        lo, hi = start, end
+
+    rows: Dict[str, List[tuple]] = {}
+    for symbol in (list(symbols) if symbols else store.symbols(market, frame)):
+        bars = store.get_bars(market, symbol, lo, hi, frame=frame)
+        if frame == STORE_MINUTE:
+            times = [datetime.fromtimestamp(ts, tz) for ts in bars['time'].tolist()]
+        else:
+            times = [datetime.combine(from_yyyymmdd(day), datetime.min.time()) for day in bars['date'].tolist()]
+        rows[symbol] = list(zip(times, bars['open'].tolist(), bars['high'].tolist(),
+                                bars['low'].tolist(), bars['close'].tolist(), bars['volume'].tolist()))
+
+    if frame == STORE_MINUTE:
+        return BarData(rows, timezone, market_hours, interval=MINUTE, interval_minutes=1)
+    return BarData(rows, timezone, market_hours, interval=DAILY)
+
+
+def synthetic_bars(symbols: Iterable[str], timezone: str, market_hours: Tuple[str, str],
+                   sessions: int = 60, start: dt_date = dt_date(2025, 1, 6),
+                   interval_minutes: Optional[int] = None, base_price: float = 100.0,
+                   seed: int = 0) -> BarData:
+    """
+    고정 시드 합성 봉 데이터 (실데이터 없이 백테스트 경로 점검용)
+
+    종목별 무작위 보행(일 변동성 약 3%, 장중 봉은 그 안에서 분할)으로 평일 sessions일치
+    봉을 만든다. 같은 인자면 항상 같은 데이터가 나오므로 결과 비교에 쓸 수 있다.
+
+    Args:
+        symbols: 종목 코드
+        timezone: 시장 타임존
+        market_hours: (장 시작 'HH:MM', 장 종료 'HH:MM')
+        sessions: 장 날짜 수 (주말 제외)
+        start: 첫 장 날짜 (주말이면 다음 평일)
+        interval_minutes: 분봉 간격 (없으면 일봉)
+        base_price: 시작 가격 기준 (종목별로 0.5~2배 분산)
+        seed: 난수 시드
+
+    Returns:
+        BarData
+    """
+    days = []
+    day = start
+    while len(days) < sessions:
+        if day.weekday() < 5:
+            days.append(day)
+        day += timedelta(days=1)
+
+    rng = random.Random(seed)
+    rows: Dict[str, List[tuple]] = {}
+    for symbol in symbols:
+        price = round(base_price * rng.uniform(0.5, 2.0), 2)
+        items = rows[symbol] = []
+        for day in days:
+            if interval_minutes:
+                open_ts, close_ts = (session_time(day, hhmm, timezone) for hhmm in market_hours)
+                steps = max(1, int((close_ts - open_ts).total_seconds() // (interval_minutes * 60)))
+                step_vol = 0.03 / steps ** 0.5
+                times = [open_ts + timedelta(minutes=interval_minutes * i) for i in range(steps)]
+            else:
+                step_vol = 0.03
+                times = [datetime.combine(day, datetime.min.time())]
+            for when in times:
+                open_ = price
+                close = round(max(0.01, open_ * (1 + rng.gauss(0, step_vol))), 2)
+                high = round(max(open_, close) * (1 + abs(rng.gauss(0, step_vol / 2))), 2)
+                low = round(min(open_, close) * (1 - abs(rng.gauss(0, step_vol / 2))), 2)
+                items.append((when, open_, high, low, close, rng.randint(1_000, 100_000)))
+                price = close
+
+    interval = MINUTE if interval_minutes else DAILY
+    return BarData(rows, timezone, market_hours, interval=interval, interval_minutes=interval_minutes)
@@ -0,0 +1,76 @@
+"""
+백테스트용 시뮬레이션 시계
+
+전략/로거/손절 추적기가 같은 가상 시각을 보도록 공유하는 시계.
+TransactionLogger, StopLossTracker의 clock 인자로 clock.now를 넘기면
+기록 시각과 재매수 금지 기간이 모두 시뮬레이션 시각 기준으로 계산된다.
+"""
+from datetime import datetime, timedelta
+from typing import Union
+
+import pytz
+
+
+class SimulatedClock:
+    """
+    수동으로 진행하는 가상 시계 (epoch 초 기준)
+
+    사용 예:
+        clock = SimulatedClock()
+        clock.set(pytz.timezone('Asia/Seoul').localize(datetime(2025, 1, 2, 9, 0)))
+        logger = TransactionLogger(prefix="kr", clock=clock.now)
+        clock.advance(minutes=30)
+    """
+
+    def __init__(self, start: Union[datetime, float] = 0.0):
+        """
+        Args:
+            start: 시작 시각 (타임존 포함 datetime 또는 epoch 초)
+        """
+        self._ts = 0.0
+        self.set(start)
+
+    def set(self, when: Union[datetime, float]):
+        """시각 설정 (datetime은 타임존 포함 필수)"""
+        if isinstance(when, datetime):
+            if when.tzinfo is None:
+                raise ValueError("SimulatedClock에는 타임존이 포함된 datetime이 필요합니다")
+            self._ts = when.timestamp()
+        else:
+            self._ts = float(when)
+
+    def advance(self, seconds: float = 0.0, minutes: float = 0.0):
+        """시각 진행"""
+        self._ts += seconds + minutes * 60
+
+    def timestamp(self) -> float:
+        """현재 시뮬레이션 시각 (epoch 초)"""
+        return self._ts
+
+    def now(self, tz=None) -> datetime:
+        """
+        현재 시뮬레이션 시각 (datetime.now(tz) 대체)
+
+        Args:
+            tz: pytz 타임존 또는 타임존 이름 (없으면 UTC)
+        """
+        if isinstance(tz, str):
+            tz = pytz.timezone(tz)
+        return datetime.fromtimestamp(self._ts, tz or pytz.utc)
+
+    def __repr__(self) -> str:
+        return f"SimulatedClock({self.now().isoformat()})"
+
+
+def session_time(date, time_str: str, timezone: str) -> datetime:
+    """
+    장 날짜 + 'HH:MM' → 타임존 포함 datetime
+
+    Args:
+        date: datetime.date
+        time_str: 'HH:MM' 문자열
+        timezone: 타임존 이름
+    """
+    hour, minute = (int(x) for x in time_str.split(':'))
+    naive = datetime(date.year, date.month, date.day) + timedelta(hours=hour, minutes=minute)
+    return pytz.timezone(timezone).localize(naive)
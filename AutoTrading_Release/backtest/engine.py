@@ -0,0 +1,295 @@
+"""
+이벤트 기반 백테스트 엔진
+
+KRStrategy/USStrategy를 수정 없이 SimulatedAPIClient 위에서 실행하고
+정기 매도(30분)/매수(60분) 주기를 시뮬레이션 시각으로 재생한다.
+
+- 주기 시각: AutoMarketScheduler와 같이 정시/30분 경계 (매도 → 매수 순)
+- 거래 기록: TransactionLogger (실거래와 같은 CSV 형식, 시뮬레이션 날짜별 파일)
+- 손절 블랙리스트: StopLossTracker (재매수 금지 기간을 시뮬레이션 날짜로 계산)
+- 실거래 상태 파일(블랙리스트/매도가/트레일링 최고가)은 읽거나 쓰지 않고
+  결과 디렉토리의 별도 파일을 사용
+"""
+import csv
+import json
+import logging
+import os
+import time
+from datetime import date as dt_date
+from typing import Optional, Dict, Any, List
+
+from transaction_logger import TransactionLogger
+from stop_loss_tracker import StopLossTracker
+from .bars import BarData
+from .clock import SimulatedClock
+from .sim_client import SimulatedAPIClient
+
+
+# 기본 주기 (분, config.SELL_INTERVAL_MINUTES / BUY_INTERVAL_MINUTES와 동일)
+BACKTEST_SELL_INTERVAL_MINUTES = 30
+BACKTEST_BUY_INTERVAL_MINUTES = 60
+
+# 재생 중 INFO 로그를 줄일 로거 (주기마다 수십 줄씩 출력되어 재생 속도를 좌우)
+QUIET_LOGGERS = ('KRStrategy', 'USStrategy', 'StopLossTracker', 'TrailingStopTracker',
+                 'SimulatedAPIClient')
+
+
+def cycle_times(bars: BarData, day: dt_date, sell_interval_minutes: int,
+                buy_interval_minutes: int) -> List[tuple]:
+    """
+    장 시간 안의 정기 주기 시각 (매도/매수 주기 경계, 장 시작/종료 포함)
+
+    Args:
+        bars: 봉 데이터 (장 시간 기준)
+        day: 장 날짜
+        sell_interval_minutes: 매도 주기 (분)
+        buy_interval_minutes: 매수 주기 (분)
+
+    Returns:
+        [(epoch 초, run_sell, run_buy), ...]
+    """
+    open_ts, close_ts = bars.session_bounds(day)
+    start_hour, start_minute = (int(x) for x in bars.market_hours[0].split(':'))
+    open_minute = start_hour * 60 + start_minute
+
+    cycles = []
+    for offset in range(int((close_ts - open_ts) // 60) + 1):
+        minute_of_day = open_minute + offset
+        run_sell = minute_of_day % sell_interval_minutes == 0
+        run_buy = minute_of_day % buy_interval_minutes == 0
+        if run_sell or run_buy:
+            cycles.append((open_ts + offset * 60, run_sell, run_buy))
+    return cycles
+
+
+class BacktestEngine:
+    """
+    과거 봉 데이터로 전략을 재생하는 백테스터
+
+    사용 예:
+        bars = load_bars_csv("bars/kr_2025.csv", "Asia/Seoul", ("09:00", "15:30"))
+        engine = BacktestEngine('kr', bars, initial_cash=10_000_000, output_dir="backtest_results/kr")
+        summary = engine.run(start=date(2025, 1, 1), end=date(2025, 12, 31))
+    """
+
+    def __init__(self, market: str, bars: BarData,
+                 initial_cash: float = 10_000_000,
+                 output_dir: str = "backtest_results",
+                 stocks_config_file: Optional[str] = None,
+                 profit_threshold: Optional[float] = None,
+                 sell_interval_minutes: int = BACKTEST_SELL_INTERVAL_MINUTES,
+                 buy_interval_minutes: int = BACKTEST_BUY_INTERVAL_MINUTES,
+                 commission_rate: Optional[float] = None,
+                 sell_tax_rate: Optional[float] = None,
+                 slippage_ticks: int = 0,
+                 quiet: bool = True):
+        """
+        Args:
+            market: 'kr' 또는 'us'
+            bars: 봉 데이터
+            initial_cash: 초기 예수금
+            output_dir: 거래 기록/상태/결과 저장 디렉토리
+            stocks_config_file: 종목 설정 파일 (없으면 시장 기본 파일)
+            profit_threshold: 목표 수익률 (없으면 config 값)
+            sell_interval_minutes: 매도 주기 (분)
+            buy_interval_minutes: 매수 주기 (분)
+            commission_rate: 수수료율 (없으면 시장 기본값)
+            sell_tax_rate: 매도 거래세율 (없으면 시장 기본값)
+            slippage_ticks: 시장가 슬리피지 (호가 단위 수)
+            quiet: 재생 중 전략 INFO 로그 숨김
+        """
+        self.market = market
+        self.bars = bars
+        self.output_dir = output_dir
+        self.sell_interval_minutes = sell_interval_minutes
+        self.buy_interval_minutes = buy_interval_minutes
+        self.quiet = quiet
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+        os.makedirs(output_dir, exist_ok=True)
+
+        # 전략/로거 생성 시점 시각도 시뮬레이션 시작일 기준 (첫 날짜별 파일명 등)
+        sessions = bars.sessions()
+        self.clock = SimulatedClock(bars.session_bounds(sessions[0])[0] if sessions else 0.0)
+        self.client = SimulatedAPIClient(bars, self.clock, market=market, initial_cash=initial_cash,
+                                         commission_rate=commission_rate, sell_tax_rate=sell_tax_rate,
+                                         slippage_ticks=slippage_ticks)
+        self.log_prefix = 'kr' if market == 'kr' else ''
+        self._reset_output()
+        self.strategy = self._build_strategy(stocks_config_file, profit_threshold)
+
+        self.equity_curve: List[Dict[str, Any]] = []
+        self.stats = {
+            'sessions': 0,
+            'sell_cycles': 0,
+            'buy_cycles': 0
+        }
+
+    def _state_file(self, name: str) -> str:
+        return os.path.join(self.output_dir, f"{self.market}_{name}")
+
+    def _reset_output(self):
+        """이전 실행의 거래 기록/상태 파일 삭제 (같은 날짜 파일에 이어 쓰지 않도록)"""
+        log_head = f"{self.log_prefix}_trading_log_" if self.log_prefix else "trading_log_"
+        state_files = {os.path.basename(self._state_file(name))
+                       for name in ('stop_loss_blacklist.json', 'trailing_stop.json', 'last_sell_prices.json')}
+        for name in os.listdir(self.output_dir):
+            base = name[:-4] if name.endswith('.bak') else name
+            if (name.startswith(log_head) and name.endswith('.csv')) or base in state_files:
+                os.remove(os.path.join(self.output_dir, name))
+
+    def _build_strategy(self, stocks_config_file: Optional[str], profit_threshold: Optional[float]):
+        """
+        전략 생성 후 로거/손절 추적기/상태 저장소를 시뮬레이션용으로 교체
+
+        생성 시점부터 state_dir로 결과 디렉토리를 지정해 실거래 상태 파일
+        (transaction_logs/, 손절 블랙리스트, 매도가, 트레일링 최고가)을 읽거나 쓰지 않음
+        """
+        if self.market == 'kr':
+            from kr.strategy import KRStrategy as strategy_class
+            from kr.config import KRConfig as market_config
+        else:
+            from us.strategy import USStrategy as strategy_class
+            from us.config import USConfig as market_config
+
+        strategy = strategy_class(api_client=self.client, profit_threshold=profit_threshold,
+                                  stocks_config_file=stocks_config_file, state_dir=self.output_dir)
+
+        # 거래 기록: 결과 디렉토리 + 시뮬레이션 시각
+        transaction_logger = TransactionLogger(csv_dir=self.output_dir, prefix=self.log_prefix,
+                                               clock=self.clock.now)
+        strategy.transaction_logger = transaction_logger
+
+        # 손절 블랙리스트 (KR 전용, 실거래 블랙리스트와 분리)
+        if strategy.stop_loss_tracker is not None:
+            strategy.stop_loss_tracker = StopLossTracker(
+                blacklist_file=self._state_file('stop_loss_blacklist.json'),
+                cooldown_days=market_config.STOP_LOSS_COOLDOWN_DAYS,
+                timezone=market_config.TIMEZONE,
+                transaction_logger=transaction_logger,
+                clock=self.clock.now
+            )
+
+        # 재매수 방지 매도가: 영구 저장소 대신 메모리 기록
+        strategy.sell_price_store = None
+
+        # 트레일링 스탑: 실거래 최고가 대신 빈 상태에서 시작
+        if strategy.trailing_stop is not None:
+            with open(strategy.stocks_config_file, 'r', encoding='utf-8') as f:
+                stocks_config = json.load(f)
+            strategy._setup_trailing_stop(stocks_config, self._state_file('trailing_stop.json'),
+                                          market_config.TIMEZONE)
+
+        return strategy
+
+    def run(self, start: Optional[dt_date] = None, end: Optional[dt_date] = None) -> Dict[str, Any]:
+        """
+        백테스트 실행
+
+        Args:
+            start: 시작 날짜 (없으면 데이터 처음)
+            end: 종료 날짜 (없으면 데이터 끝)
+
+        Returns:
+            결과 요약 딕셔너리 (output_dir/<market>_backtest_summary.json에도 저장)
+        """
+        sessions = self.bars.sessions(start, end)
+        if not sessions:
+            raise ValueError("백테스트 기간에 봉 데이터가 없습니다")
+
+        saved_levels = {}
+        if self.quiet:
+            for name in QUIET_LOGGERS:
+                saved_levels[name] = logging.getLogger(name).level
+                logging.getLogger(name).setLevel(logging.WARNING)
+
+        started = time.perf_counter()
+        try:
+            for day in sessions:
+                self._run_session(day)
+        finally:
+            for name, level in saved_levels.items():
+                logging.getLogger(name).setLevel(level)
+        elapsed = time.perf_counter() - started
+
+        summary = self._summarize(sessions, elapsed)
+        self._save_results(summary)
+        self.logger.info(f"[BACKTEST] {self.market.upper()} {sessions[0]}~{sessions[-1]} "
+                         f"{len(sessions)}일 재생 완료 ({elapsed:.1f}초): "
+                         f"수익률 {summary['total_return']*100:+.2f}%, 체결 {summary['fills']}건")
+        return summary
+
+    def _run_session(self, day: dt_date):
+        """장 하루 재생"""
+        open_ts, close_ts = self.bars.session_bounds(day)
+        self.clock.set(open_ts)
+
+        # 장중 지표는 날짜 단위 (실거래에서는 날짜 변경 시 자동 초기화)
+        self.strategy.indicators.reset()
+
+        for ts, run_sell, run_buy in cycle_times(self.bars, day, self.sell_interval_minutes,
+                                                 self.buy_interval_minutes):
+            self.clock.set(ts)
+            if run_sell:
+                self.strategy.execute_sell_strategy()
+                self.stats['sell_cycles'] += 1
+            if run_buy:
+                self.strategy.execute_buy_strategy()
+                self.stats['buy_cycles'] += 1
+
+        self.clock.set(close_ts)
+        self.stats['sessions'] += 1
+        self.equity_curve.append({
+            'date': day.isoformat(),
+            'cash': round(self.client.cash, 2),
+            'equity': round(self.client.get_equity(), 2),
+            'positions': len(self.client.positions)
+        })
+
+    def _summarize(self, sessions: List[dt_date], elapsed: float) -> Dict[str, Any]:
+        """결과 요약 (수익률, 최대 낙폭, 승률, 비용)"""
+        initial = self.client.initial_cash
+        final = self.equity_curve[-1]['equity'] if self.equity_curve else initial
+
+        peak = initial
+        max_drawdown = 0.0
+        for point in self.equity_curve:
+            peak = max(peak, point['equity'])
+            if peak > 0:
+                max_drawdown = max(max_drawdown, (peak - point['equity']) / peak)
+
+        sells = [fill for fill in self.client.fills if fill['side'] == 'sell']
+        wins = sum(1 for fill in sells if (fill['realized_pnl'] or 0) > 0)
+
+        return {
+            'market': self.market,
+            'start': sessions[0].isoformat(),
+            'end': sessions[-1].isoformat(),
+            'sessions': len(sessions),
+            'initial_cash': initial,
+            'final_equity': round(final, 2),
+            'total_return': (final - initial) / initial if initial else 0.0,
+            'max_drawdown': max_drawdown,
+            'fills': len(self.client.fills),
+            'buys': len(self.client.fills) - len(sells),
+            'sells': len(sells),
+            'win_rate': wins / len(sells) if sells else 0.0,
+            'realized_pnl': round(self.client.stats['realized_pnl'], 2),
+            'fees': round(self.client.stats['fees'], 2),
+            'open_positions': len(self.client.positions),
+            'elapsed_seconds': round(elapsed, 3),
+            'stats': {**self.stats, **self.client.stats},
+            'output_dir': self.output_dir
+        }
+
+    def _save_results(self, summary: Dict[str, Any]):
+        """일별 자산 곡선 CSV + 요약 JSON 저장"""
+        equity_path = os.path.join(self.output_dir, f"{self.market}_equity_curve.csv")
+        with open(equity_path, 'w', newline='', encoding='utf-8-sig') as f:
+            writer = csv.DictWriter(f, fieldnames=['date', 'cash', 'equity', 'positions'])
+            writer.writeheader()
+            writer.writerows(self.equity_curve)
+
+        summary_path = os.path.join(self.output_dir, f"{self.market}_backtest_summary.json")
+        with open(summary_path, 'w', encoding='utf-8') as f:
+            json.dump(summary, f, ensure_ascii=False, indent=2)
@@ -0,0 +1,284 @@
+"""
+시뮬레이션 API 클라이언트 - 과거 봉 데이터로 시세/잔고/체결을 재현
+
+KRAPIClient/USAPIClient와 같은 BaseAPIClient 인터페이스를 구현하므로
+KRStrategy/USStrategy를 수정 없이 그대로 실행할 수 있다.
+
+- 시세: SimulatedClock 시각 기준 완성된 봉의 종가 (KR은 호가 단위로 반올림)
+- 장 운영: 시뮬레이션 시각이 장 시간 안이고 해당 날짜 데이터가 있을 때만 열림
+- 체결: 시장가는 현재가(+슬리피지 틱) 전량 체결, 지정가는 현재가보다 불리하면 미체결
+- 비용: 매수/매도 수수료 + 매도 거래세 (KR 기본값은 KRConfig 기준)
+- 잔고: 실거래 클라이언트와 같은 형식 (profit_rate는 %, 평균단가는 수수료 제외)
+"""
+from datetime import datetime
+from typing import Optional, Dict, Any, List
+
+import pytz
+
+from common.base_api import BaseAPIClient
+from .bars import BarData
+from .clock import SimulatedClock
+
+
+# 미국 주식 기본 거래 비용 (USConfig에 설정이 없어 여기서 정의)
+US_COMMISSION_RATE = 0.0025     # 해외주식 온라인 수수료 0.25% (예시)
+US_SELL_FEE_RATE = 0.0          # SEC fee 등 매도 부대비용
+
+
+def _us_tick_size(price: float) -> float:
+    """미국 주식 호가 단위 ($1 이상 0.01, 미만 0.0001)"""
+    return 0.01 if price >= 1 else 0.0001
+
+
+def _us_round_to_tick(price: float) -> float:
+    tick = _us_tick_size(price)
+    return round(round(price / tick) * tick, 4)
+
+
+def market_profile(market: str) -> Dict[str, Any]:
+    """
+    시장별 시간/비용/호가 단위 설정
+
+    Args:
+        market: 'kr' 또는 'us'
+
+    Returns:
+        dict: timezone, market_hours, commission_rate, sell_tax_rate, tick_size, round_to_tick
+    """
+    if market == 'kr':
+        from kr.config import KRConfig
+        return {
+            'timezone': KRConfig.TIMEZONE,
+            'market_hours': (KRConfig.TRADING_START_TIME, KRConfig.TRADING_END_TIME),
+            'commission_rate': KRConfig.COMMISSION_RATE,
+            'sell_tax_rate': KRConfig.SELLING_TAX_RATE,
+            'tick_size': KRConfig.get_tick_size,
+            'round_to_tick': KRConfig.round_to_tick
+        }
+    if market == 'us':
+        from us.config import USConfig
+        return {
+            'timezone': USConfig.TIMEZONE,
+            'market_hours': (USConfig.TRADING_START_TIME, USConfig.TRADING_END_TIME),
+            'commission_rate': US_COMMISSION_RATE,
+            'sell_tax_rate': US_SELL_FEE_RATE,
+            'tick_size': _us_tick_size,
+            'round_to_tick': _us_round_to_tick
+        }
+    raise ValueError(f"지원하지 않는 시장: {market}")
+
+
+class SimulatedAPIClient(BaseAPIClient):
+    """
+    과거 봉 데이터 기반 가상 계좌 클라이언트
+
+    사용 예:
+        clock = SimulatedClock()
+        client = SimulatedAPIClient(bars, clock, market='kr', initial_cash=10_000_000)
+        strategy = KRStrategy(api_client=client)
+    """
+
+    def __init__(self, bars: BarData, clock: SimulatedClock, market: str = 'kr',
+                 initial_cash: float = 10_000_000,
+                 commission_rate: Optional[float] = None,
+                 sell_tax_rate: Optional[float] = None,
+                 slippage_ticks: int = 0,
+                 log_level: str = 'WARNING'):
+        """
+        Args:
+            bars: 봉 데이터
+            clock: 시뮬레이션 시계
+            market: 'kr' 또는 'us'
+            initial_cash: 초기 예수금
+            commission_rate: 매수/매도 수수료율 (없으면 시장 기본값)
+            sell_tax_rate: 매도 거래세율 (없으면 시장 기본값)
+            slippage_ticks: 시장가 체결 시 불리한 방향으로 밀리는 호가 단위 수
+            log_level: 로그 레벨
+        """
+        super().__init__(log_level)
+        profile = market_profile(market)
+
+        self.market = market
+        self.bars = bars
+        self.clock = clock
+        self.profile = profile
+        self.commission_rate = profile['commission_rate'] if commission_rate is None else commission_rate
+        self.sell_tax_rate = profile['sell_tax_rate'] if sell_tax_rate is None else sell_tax_rate
+        self.slippage_ticks = slippage_ticks
+        self._tz = pytz.timezone(profile['timezone'])
+
+        self.initial_cash = float(initial_cash)
+        self.cash = float(initial_cash)
+        self.positions: Dict[str, Dict[str, float]] = {}   # {symbol: {quantity, avg_price, fees}}
+        self.fills: List[Dict[str, Any]] = []
+        self._order_seq = 0
+
+        self.stats = {
+            'price_requests': 0,
+            'balance_requests': 0,
+            'orders': 0,
+            'rejects': 0,
+            'fees': 0.0,
+            'realized_pnl': 0.0
+        }
+
+    def get_timezone(self) -> str:
+        return self.profile['timezone']
+
+    def get_market_hours(self) -> tuple:
+        return self.profile['market_hours']
+
+    def now(self) -> datetime:
+        """시뮬레이션 현재 시각 (시장 타임존)"""
+        return self.clock.now(self._tz)
+
+    def is_market_open(self) -> bool:
+        """시뮬레이션 시각 기준 장 운영 여부 (데이터 없는 날은 휴장)"""
+        now = self.now()
+        if now.weekday() >= 5 or not self.bars.has_session(now.date()):
+            return False
+        start_ts, end_ts = self.bars.session_bounds(now.date())
+        return start_ts <= self.clock.timestamp() <= end_ts
+
+    def _quote(self, symbol: str) -> tuple:
+        """(호가 단위 현재가, 누적 거래량)"""
+        price, volume = self.bars.quote_at(symbol, self.clock.timestamp())
+        if price is None:
+            return None, None
+        return self.profile['round_to_tick'](price), volume
+
+    def _mark_price(self, symbol: str) -> Optional[float]:
+        """평가 가격 (당일 시세가 없으면 직전 종가)"""
+        price = self._quote(symbol)[0]
+        if price is None:
+            price = self.bars.day_close(symbol, self.now().date())
+        return price
+
+    def get_current_price(self, symbol: str) -> Optional[float]:
+        price, volume = self._quote(symbol)
+        if price is None:
+            return None
+        self.stats['price_requests'] += 1
+        self._notify_price(symbol, price, volume)
+        return price
+
+    def get_previous_close(self, symbol: str) -> Optional[float]:
+        """직전 장 날짜 종가"""
+        return self.bars.previous_close(symbol, self.now().date())
+
+    def get_account_balance(self) -> Dict[str, Any]:
+        self.stats['balance_requests'] += 1
+
+        positions = []
+        eval_total = 0.0
+        purchase_total = 0.0
+        for symbol, pos in self.positions.items():
+            quantity = int(pos['quantity'])
+            avg_price = pos['avg_price']
+            current_price = self._mark_price(symbol) or avg_price
+            eval_amount = current_price * quantity
+            purchase = avg_price * quantity
+            profit_loss = eval_amount - purchase
+
+            positions.append({
+                'symbol': symbol,
+                'name': symbol,
+                'quantity': quantity,
+                'avg_price': avg_price,
+                'current_price': current_price,
+                'eval_amount': eval_amount,
+                'profit_loss': profit_loss,
+                'profit_rate': profit_loss / purchase * 100 if purchase > 0 else 0,
+                'sellable_qty': quantity
+            })
+            eval_total += eval_amount
+            purchase_total += purchase
+
+        return {
+            'total_eval': self.cash + eval_total,
+            'total_profit': eval_total - purchase_total,
+            'available_cash': self.cash,
+            'positions': positions
+        }
+
+    def get_equity(self) -> float:
+        """예수금 + 보유 종목 평가금액"""
+        return self.cash + sum(pos['quantity'] * (self._mark_price(symbol) or pos['avg_price'])
+                               for symbol, pos in self.positions.items())
+
+    def _reject(self, symbol: str, side: str, message: str) -> Dict[str, Any]:
+        self.stats['rejects'] += 1
+        self.logger.info(f"[SIM] {symbol} {side} 주문 거부: {message}")
+        return self.format_order_result(False, message=message)
+
+    def place_order(self, symbol: str, side: str, quantity: int,
+                    price: Optional[float] = None) -> Dict[str, Any]:
+        self.stats['orders'] += 1
+
+        if quantity <= 0:
+            return self._reject(symbol, side, "주문 수량 오류")
+        if not self.is_market_open():
+            return self._reject(symbol, side, "장 운영시간 아님")
+
+        market_price = self._quote(symbol)[0]
+        if market_price is None:
+            return self._reject(symbol, side, "시세 없음 (거래정지 또는 데이터 없음)")
+
+        # 지정가는 현재가가 지정가보다 유리할 때만 현재가로 체결
+        if price is not None and ((side == 'buy' and price < market_price)
+                                  or (side == 'sell' and price > market_price)):
+            return self._reject(symbol, side, f"지정가 미체결 (지정가 {price}, 현재가 {market_price})")
+
+        slippage = self.slippage_ticks * self.profile['tick_size'](market_price)
+        fill_price = self.profile['round_to_tick'](market_price + slippage if side == 'buy'
+                                                   else max(market_price - slippage, 0))
+        amount = fill_price * quantity
+        realized = None
+
+        if side == 'buy':
+            fee = amount * self.commission_rate
+            if amount + fee > self.cash + 1e-9:
+                return self._reject(symbol, side, f"주문가능금액 부족 (필요 {amount + fee:,.2f}, 예수금 {self.cash:,.2f})")
+            pos = self.positions.setdefault(symbol, {'quantity': 0, 'avg_price': 0.0, 'fees': 0.0})
+            held = pos['quantity']
+            pos['avg_price'] = (pos['avg_price'] * held + amount) / (held + quantity)
+            pos['quantity'] = held + quantity
+            pos['fees'] += fee
+            self.cash -= amount + fee
+        elif side == 'sell':
+            pos = self.positions.get(symbol)
+            held = pos['quantity'] if pos else 0
+            if held < quantity:
+                return self._reject(symbol, side, f"매도가능수량 부족 (보유 {held}주)")
+            fee = amount * (self.commission_rate + self.sell_tax_rate)
+            buy_fee = pos['fees'] * quantity / held
+            realized = (fill_price - pos['avg_price']) * quantity - fee - buy_fee
+            pos['quantity'] = held - quantity
+            pos['fees'] -= buy_fee
+            if pos['quantity'] == 0:
+                del self.positions[symbol]
+            self.cash += amount - fee
+            self.stats['realized_pnl'] += realized
+        else:
+            return self._reject(symbol, side, f"주문 구분 오류: {side}")
+
+        self._order_seq += 1
+        order_id = f"SIM{self._order_seq:08d}"
+        now = self.now()
+        self.stats['fees'] += fee
+        self.fills.append({
+            'timestamp': now.isoformat(),
+            'order_id': order_id,
+            'symbol': symbol,
+            'side': side,
+            'quantity': quantity,
+            'price': fill_price,
+            'fee': fee,
+            'realized_pnl': realized,
+            'cash': self.cash
+        })
+
+        result = self.format_order_result(True, order_id=order_id, message="체결 (시뮬레이션)",
+                                          filled_qty=quantity, filled_price=fill_price)
+        result['timestamp'] = now.isoformat()
+        return result
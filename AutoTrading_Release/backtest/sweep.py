@@ -0,0 +1,342 @@
+"""
+파라미터 스윕 - 벡터화 백테스트를 프로세스 풀로 분산 실행 + 결과 캐시
+
+- 시세 패널: 입력(봉 파일/종목 설정/기간/비용) 지문별로 한 번만 만들어 .npy로 저장하고,
+  워커는 np.load(mmap_mode='r')로 열어 같은 페이지 캐시를 공유한다 (워커마다 피클 전송 없음)
+- 분산: 아직 계산하지 않은 조합만 청크로 나눠 ProcessPoolExecutor에 분배 (기본 워커 수 = CPU 코어 수)
+- 캐시: (데이터 버전, 파라미터 해시) → 결과. 데이터 버전은 패널 배열 해시이므로
+  봉 데이터나 비용 설정이 바뀌면 자동으로 새로 계산하고, 그리드를 넓혀 재실행하면 새 조합만 계산한다
+
+사용 예:
+    sweep = ParameterSweep('kr', 'data/kr_minute_2025.csv')
+    report = sweep.run(build_param_grid(profit_threshold=[0.03, 0.05], top_k=[1, 3, 5]))
+    print(format_table(report['results']))
+"""
+import csv
+import hashlib
+import json
+import logging
+import math
+import os
+import shutil
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import date as dt_date
+from typing import Optional, Dict, Any, List
+
+from .bars import load_bars_csv
+from .engine import BACKTEST_SELL_INTERVAL_MINUTES, BACKTEST_BUY_INTERVAL_MINUTES
+from .sim_client import market_profile
+from .vectorized import VectorizedBacktest, PARAM_KEYS, PANEL_META_FILE
+
+
+DEFAULT_CACHE_DIR = "backtest_cache"
+
+# 청크 크기: 워커당 청크 수를 늘리면 부하 분산이 고르고, 청크가 크면 조합당 순회 비용이 줄어든다
+SWEEP_CHUNKS_PER_WORKER = 4
+SWEEP_MAX_CHUNK = 256
+
+# 순위 기준 (키, 내림차순 여부)
+SORT_KEYS = {
+    'return': ('total_return', True),
+    'drawdown': ('max_drawdown', False),
+    'win_rate': ('win_rate', True),
+    'trades': ('trades', True)
+}
+
+TABLE_COLUMNS = ('total_return', 'max_drawdown', 'trades', 'stop_losses', 'win_rate', 'final_equity')
+
+
+def param_hash(params: Dict[str, Any]) -> str:
+    """시장 기본값을 채운 파라미터 조합의 해시 (키 순서 무관)"""
+    payload = json.dumps({key: params.get(key) for key in PARAM_KEYS}, sort_keys=True)
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()[:16]
+
+
+def _file_fingerprint(path: str) -> List[tuple]:
+    """봉 파일(또는 디렉토리 안 CSV)의 (이름, 크기, 수정 시각)"""
+    if os.path.isdir(path):
+        paths = [os.path.join(path, name) for name in sorted(os.listdir(path))
+                 if name.lower().endswith('.csv')]
+    else:
+        paths = [path]
+    entries = []
+    for file_path in paths:
+        stat = os.stat(file_path)
+        entries.append((os.path.abspath(file_path), stat.st_size, stat.st_mtime_ns))
+    return entries
+
+
+# 워커 프로세스 전역 (initializer에서 패널을 한 번만 메모리 매핑)
+_worker_backtest: Optional[VectorizedBacktest] = None
+
+
+def _init_worker(panel_dir: str):
+    global _worker_backtest
+    logging.getLogger('VectorizedBacktest').setLevel(logging.WARNING)
+    _worker_backtest = VectorizedBacktest.from_panel(panel_dir)
+
+
+def _run_chunk(combos: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """워커: 조합 청크 평가 → 입력 순서대로 결과 반환"""
+    report = _worker_backtest.run(combos)
+    return sorted(report['results'], key=lambda r: r['index'])
+
+
+class ParameterSweep:
+    """
+    프로세스 풀 파라미터 스윕 (패널 메모리 매핑 공유 + 디스크 결과 캐시)
+
+    캐시 디렉토리 구조:
+        <cache_dir>/panels/<입력 지문>/    패널 배열 (*.npy) + panel.json
+        <cache_dir>/results/<데이터 버전>.json   {파라미터 해시: 결과}
+    """
+
+    def __init__(self, market: str, bars_path: str,
+                 stocks_config_file: Optional[str] = None,
+                 cache_dir: str = DEFAULT_CACHE_DIR,
+                 initial_cash: float = 10_000_000,
+                 start: Optional[dt_date] = None, end: Optional[dt_date] = None,
+                 interval: Optional[str] = None,
+                 slippage_ticks: int = 0,
+                 workers: Optional[int] = None):
+        """
+        Args:
+            market: 'kr' 또는 'us'
+            bars_path: 봉 데이터 CSV 파일 또는 종목별 CSV 디렉토리
+            stocks_config_file: 종목 설정 파일 (없으면 시장 기본 파일)
+            cache_dir: 패널/결과 캐시 디렉토리
+            initial_cash: 초기 예수금
+            start: 시작 날짜 (없으면 데이터 처음)
+            end: 종료 날짜 (없으면 데이터 끝)
+            interval: 'daily' / 'minute' (없으면 자동 판별)
+            slippage_ticks: 시장가 슬리피지 (호가 단위 수)
+            workers: 워커 프로세스 수 (없으면 CPU 코어 수)
+        """
+        if stocks_config_file is None:
+            stocks_config_file = ("kr_stocks_config.json" if market == 'kr' else "us_stocks_config.json")
+
+        self.market = market
+        self.bars_path = bars_path
+        self.stocks_config_file = stocks_config_file
+        self.cache_dir = cache_dir
+        self.initial_cash = float(initial_cash)
+        self.start = start
+        self.end = end
+        self.interval = interval
+        self.slippage_ticks = slippage_ticks
+        self.workers = max(1, workers or os.cpu_count() or 1)
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+        self.panel_dir: Optional[str] = None
+        self.data_version: Optional[str] = None
+
+        self.stats = {
+            'panel_builds': 0,
+            'panel_reuses': 0,
+            'cached': 0,
+            'computed': 0
+        }
+
+    def _input_fingerprint(self) -> str:
+        """패널을 결정하는 입력의 지문 (봉 파일 크기/수정 시각, 종목 설정 내용, 기간/비용)"""
+        with open(self.stocks_config_file, 'rb') as f:
+            config_digest = hashlib.sha1(f.read()).hexdigest()
+        payload = {
+            'market': self.market,
+            'bars': _file_fingerprint(self.bars_path),
+            'stocks_config': config_digest,
+            'start': self.start.isoformat() if self.start else None,
+            'end': self.end.isoformat() if self.end else None,
+            'interval': self.interval,
+            'initial_cash': self.initial_cash,
+            'slippage_ticks': self.slippage_ticks,
+            'intervals': (BACKTEST_SELL_INTERVAL_MINUTES, BACKTEST_BUY_INTERVAL_MINUTES)
+        }
+        return hashlib.sha1(json.dumps(payload, sort_keys=True).encode('utf-8')).hexdigest()[:16]
+
+    def prepare(self) -> str:
+        """
+        패널 준비 (같은 입력의 패널이 있으면 재사용, 없으면 봉 데이터를 읽어 생성)
+
+        Returns:
+            str: 패널 디렉토리
+        """
+        panel_dir = os.path.join(self.cache_dir, 'panels', self._input_fingerprint())
+        meta_path = os.path.join(panel_dir, PANEL_META_FILE)
+
+        if os.path.exists(meta_path):
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                self.data_version = json.load(f)['data_version']
+            self.stats['panel_reuses'] += 1
+            self.logger.info(f"[SWEEP] 패널 재사용: {panel_dir} (데이터 버전 {self.data_version})")
+        else:
+            started = time.perf_counter()
+            profile = market_profile(self.market)
+            bars = load_bars_csv(self.bars_path, profile['timezone'], profile['market_hours'],
+                                 interval=self.interval)
+            vectorized = VectorizedBacktest(self.market, bars, stocks_config_file=self.stocks_config_file,
+                                            initial_cash=self.initial_cash, start=self.start, end=self.end,
+                                            slippage_ticks=self.slippage_ticks)
+            # 중간에 중단된 패널 디렉토리는 지우고 다시 저장
+            shutil.rmtree(panel_dir, ignore_errors=True)
+            self.data_version = vectorized.save_panel(panel_dir)
+            self.stats['panel_builds'] += 1
+            self.logger.info(f"[SWEEP] 패널 생성: {panel_dir} (데이터 버전 {self.data_version}, "
+                             f"{time.perf_counter() - started:.2f}초)")
+
+        self.panel_dir = panel_dir
+        return panel_dir
+
+    def _results_path(self) -> str:
+        return os.path.join(self.cache_dir, 'results', f"{self.data_version}.json")
+
+    def _load_cache(self) -> Dict[str, Dict[str, Any]]:
+        path = self._results_path()
+        if not os.path.exists(path):
+            return {}
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (json.JSONDecodeError, OSError) as e:
+            self.logger.warning(f"[SWEEP] 결과 캐시 읽기 실패, 새로 계산합니다: {e}")
+            return {}
+
+    def _save_cache(self, cache: Dict[str, Dict[str, Any]]):
+        path = self._results_path()
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = f"{path}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(cache, f, ensure_ascii=False)
+        os.replace(temp_path, path)
+
+    def _chunks(self, combos: List[Dict[str, Any]]) -> List[List[Dict[str, Any]]]:
+        size = math.ceil(len(combos) / (self.workers * SWEEP_CHUNKS_PER_WORKER))
+        size = min(max(size, 1), SWEEP_MAX_CHUNK)
+        return [combos[i:i + size] for i in range(0, len(combos), size)]
+
+    def run(self, grid: List[Dict[str, Any]], sort_by: str = 'return') -> Dict[str, Any]:
+        """
+        그리드 평가 (캐시에 없는 조합만 계산)
+
+        Args:
+            grid: 조합 리스트 (build_param_grid 결과)
+            sort_by: 순위 기준 (SORT_KEYS: return, drawdown, win_rate, trades)
+
+        Returns:
+            dict: results (순위순), data_version, combos, cached, computed, workers, elapsed_seconds
+        """
+        if sort_by not in SORT_KEYS:
+            raise ValueError(f"sort_by는 {tuple(SORT_KEYS)} 중 하나여야 합니다: {sort_by}")
+
+        started = time.perf_counter()
+        panel_dir = self.panel_dir or self.prepare()
+        with open(os.path.join(panel_dir, PANEL_META_FILE), 'r', encoding='utf-8') as f:
+            defaults = json.load(f)['defaults']
+
+        # 기본값을 채운 뒤 해시 (같은 조합의 중복 제거)
+        combos: Dict[str, Dict[str, Any]] = {}
+        for combo in grid or [{}]:
+            params = {**defaults, **combo}
+            combos.setdefault(param_hash(params), {key: params[key] for key in PARAM_KEYS})
+
+        cache = self._load_cache()
+        pending = [(key, params) for key, params in combos.items() if key not in cache]
+        self.stats['cached'] += len(combos) - len(pending)
+        self.logger.info(f"[SWEEP] {len(combos)}개 조합 중 캐시 {len(combos) - len(pending)}개, "
+                         f"계산 {len(pending)}개 (워커 {self.workers}개)")
+
+        try:
+            if pending:
+                self._compute(pending, panel_dir, cache)
+        finally:
+            # 중단되어도 완료된 청크 결과는 남김
+            self._save_cache(cache)
+
+        results = []
+        for key in combos:
+            results.append(dict(cache[key], param_hash=key))
+        sort_key, descending = SORT_KEYS[sort_by]
+        results.sort(key=lambda r: r[sort_key], reverse=descending)
+
+        elapsed = time.perf_counter() - started
+        self.logger.info(f"[SWEEP] 완료: {len(results)}개 조합 ({elapsed:.2f}초)")
+        return {
+            'market': self.market,
+            'data_version': self.data_version,
+            'combos': len(combos),
+            'cached': len(combos) - len(pending),
+            'computed': len(pending),
+            'workers': self.workers,
+            'elapsed_seconds': round(elapsed, 3),
+            'results': results
+        }
+
+    def _compute(self, pending: List[tuple], panel_dir: str, cache: Dict[str, Dict[str, Any]]):
+        """캐시에 없는 조합 계산 → cache에 추가"""
+        keys = [key for key, _ in pending]
+        chunks = self._chunks([params for _, params in pending])
+        offsets = [0]
+        for chunk in chunks[:-1]:
+            offsets.append(offsets[-1] + len(chunk))
+
+        def store(offset: int, chunk_results: List[Dict[str, Any]]):
+            for i, result in enumerate(chunk_results):
+                result.pop('index', None)
+                result['trades'] = result['buys'] + result['sells']
+                cache[keys[offset + i]] = result
+            self.stats['computed'] += len(chunk_results)
+
+        if self.workers == 1 or len(chunks) == 1:
+            _init_worker(panel_dir)
+            for offset, chunk in zip(offsets, chunks):
+                store(offset, _run_chunk(chunk))
+            return
+
+        workers = min(self.workers, len(chunks))
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(panel_dir,)) as executor:
+            futures = {executor.submit(_run_chunk, chunk): offset for offset, chunk in zip(offsets, chunks)}
+            done = 0
+            for future in as_completed(futures):
+                store(futures[future], future.result())
+                done += 1
+                self.logger.debug(f"[SWEEP] 청크 {done}/{len(chunks)} 완료")
+
+    def get_stats(self) -> Dict[str, Any]:
+        return dict(self.stats, data_version=self.data_version, workers=self.workers)
+
+
+def format_table(results: List[Dict[str, Any]], top: Optional[int] = None) -> str:
+    """순위 표 (순위, 바뀐 파라미터, 수익률, 최대 낙폭, 거래 수, 손절 수, 승률, 최종 자산)"""
+    rows = results[:top] if top else results
+    if not rows:
+        return "(결과 없음)"
+
+    # 모든 조합에서 같은 값인 파라미터는 생략
+    keys = [key for key in PARAM_KEYS if len({json.dumps(r['params'][key]) for r in results}) > 1]
+    header = ['rank'] + keys + ['return', 'max_dd', 'trades', 'stop_loss', 'win_rate', 'final_equity']
+    lines = [header]
+    for rank, r in enumerate(rows, 1):
+        lines.append([str(rank)] + [str(r['params'][key]) for key in keys] + [
+            f"{r['total_return'] * 100:+.2f}%",
+            f"{r['max_drawdown'] * 100:.2f}%",
+            str(r['trades']),
+            str(r['stop_losses']),
+            f"{r['win_rate'] * 100:.1f}%",
+            f"{r['final_equity']:,.0f}"
+        ])
+
+    widths = [max(len(line[i]) for line in lines) for i in range(len(header))]
+    return '\n'.join('  '.join(cell.rjust(width) for cell, width in zip(line, widths)) for line in lines)
+
+
+def save_results_csv(results: List[Dict[str, Any]], path: str):
+    """순위 결과 CSV 저장 (파라미터 + 지표 컬럼)"""
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path, 'w', encoding='utf-8-sig', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['rank'] + list(PARAM_KEYS) + list(TABLE_COLUMNS) + ['param_hash'])
+        for rank, r in enumerate(results, 1):
+            writer.writerow([rank] + [r['params'][key] for key in PARAM_KEYS]
+                            + [r[column] for column in TABLE_COLUMNS] + [r['param_hash']])
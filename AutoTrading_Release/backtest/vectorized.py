@@ -0,0 +1,671 @@
+"""
+벡터화 백테스트 - 파라미터 그리드 전체를 한 번의 시간 순회로 평가
+
+이벤트 기반 엔진(BacktestEngine)은 전략 객체를 그대로 호출하므로 정확하지만
+조합마다 재생해야 해서 수천 개 조합 탐색에는 느리다. 여기서는
+
+- 시세 패널: 정기 주기 시각 x 종목 가격 행렬을 한 번만 만들고
+- 계좌 상태: (조합, 종목) 배열 (수량/평균단가/재매수 금지 시각/마지막 매도가)
+- 규칙: 매도(익절/손절 → 손절 시 재매수 금지)와 매수(필터 게이트 → 하락률 상위 k
+  → 재매수 금지/매도가 체크 → 예수금 1/3 수량)를 NumPy 배열 연산으로 표현
+
+해 모든 조합을 동시에 진행한다. 규칙과 체결/비용 계산은 KRStrategy/USStrategy와
+SimulatedAPIClient를 그대로 따르므로 같은 파라미터에서는 이벤트 기반 결과와 일치해야 하며,
+check_consistency()로 확인할 수 있다. 시세 패널은 save_panel()로 .npy 파일에 저장한 뒤
+from_panel()로 메모리 매핑해 다시 열 수 있다 (sweep.py의 프로세스 병렬 실행).
+
+모델링하지 않는 것: 트레일링 스탑, 조건식(conditions), 포지션 감시 스레드
+
+그리드 파라미터 (PARAM_KEYS, 없는 키는 시장 기본값):
+    profit_threshold          목표 수익률 (예: 0.05)
+    stop_loss_threshold       손절 기준 (예: -0.10, None이면 손절 없음)
+    stop_loss_cooldown_days   손절 후 재매수 금지 기간 (일)
+    top_k                     하락률 상위 매수 후보 수
+    sector_rule               섹터 필터 규칙 ('any': 필터 종목 하나라도 상승, 'all': 모두 상승)
+"""
+import hashlib
+import itertools
+import json
+import logging
+import math
+import os
+import time
+from datetime import datetime, date as dt_date
+from typing import Optional, Dict, Any, List
+
+import numpy as np
+import pytz
+
+from .bars import BarData
+from .engine import (BacktestEngine, cycle_times,
+                     BACKTEST_SELL_INTERVAL_MINUTES, BACKTEST_BUY_INTERVAL_MINUTES)
+from .sim_client import market_profile
+
+
+PARAM_KEYS = ('profit_threshold', 'stop_loss_threshold', 'stop_loss_cooldown_days',
+              'top_k', 'sector_rule')
+SECTOR_RULES = ('any', 'all')
+
+# execute_buy_strategy와 동일한 수량 계산 상수 (calculate_position_size 인자)
+MAX_POSITIONS = 3
+MAX_SHARES = {'kr': 1000, 'us': 100}
+DEFAULT_TOP_K = 3
+
+# save_panel/from_panel 대상 배열 (섹터 모드/레거시 모드별 게이트 배열 추가)
+PANEL_ARRAYS = ('cycle_ts', 'cycle_is_sell', 'cycle_is_buy', 'cycle_day', 'day_ranges',
+                'prices', 'buy_fills', 'sell_fills', 'prev_close', 'marks', 'decline', 'decline_order')
+SECTOR_ARRAYS = ('sector_any', 'sector_all', 'sector_watch')
+LEGACY_ARRAYS = ('legacy_gate', 'legacy_watch')
+PANEL_META_FILE = "panel.json"
+
+
+def market_defaults(market: str) -> Dict[str, Any]:
+    """시장별 기본 파라미터 (실거래 전략과 동일)"""
+    from config import PROFIT_THRESHOLD
+
+    if market == 'kr':
+        from kr.config import KRConfig
+        return {
+            'profit_threshold': PROFIT_THRESHOLD,
+            'stop_loss_threshold': KRConfig.STOP_LOSS_THRESHOLD,
+            'stop_loss_cooldown_days': KRConfig.STOP_LOSS_COOLDOWN_DAYS,
+            'top_k': DEFAULT_TOP_K,
+            'sector_rule': 'any'
+        }
+    # US 전략은 손절 없음 (익절/트레일링만)
+    return {
+        'profit_threshold': PROFIT_THRESHOLD,
+        'stop_loss_threshold': None,
+        'stop_loss_cooldown_days': 0,
+        'top_k': DEFAULT_TOP_K,
+        'sector_rule': 'any'
+    }
+
+
+def build_param_grid(**axes) -> List[Dict[str, Any]]:
+    """
+    파라미터 축의 모든 조합
+
+    사용 예:
+        grid = build_param_grid(profit_threshold=[0.03, 0.05, 0.08], top_k=[1, 3, 5])
+
+    Returns:
+        [{'profit_threshold': 0.03, 'top_k': 1}, ...]
+    """
+    unknown = set(axes) - set(PARAM_KEYS)
+    if unknown:
+        raise ValueError(f"지원하지 않는 파라미터: {sorted(unknown)}")
+    keys = list(axes)
+    return [dict(zip(keys, values)) for values in itertools.product(*(axes[key] for key in keys))]
+
+
+def load_universe(stocks_config: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    종목 설정 → 필터/감시 종목 구조 (KRStrategy._load_stock_config와 같은 해석)
+
+    Returns:
+        dict: filter (레거시 필터 종목), watch (레거시 감시 종목),
+              sectors ([{key, filter, watch}] 또는 None), has_conditions
+    """
+    def filter_symbols(section) -> List[str]:
+        if isinstance(section, dict):
+            return [symbol for symbol, enabled in section.items() if enabled]
+        return list(section or [])
+
+    sectors = None
+    if stocks_config.get('sectors'):
+        sectors = [{
+            'key': key,
+            'filter': filter_symbols(info.get('filter_stocks', {})),
+            'watch': list(info.get('watch_list', []))
+        } for key, info in stocks_config['sectors'].items()]
+
+    has_conditions = bool(stocks_config.get('conditions')) or any(
+        info.get('filter_condition') for info in (stocks_config.get('sectors') or {}).values())
+
+    return {
+        'filter': filter_symbols(stocks_config.get('filter_stocks', {})),
+        'watch': list(stocks_config.get('watch_list', [])),
+        'sectors': sectors,
+        'has_conditions': has_conditions
+    }
+
+
+class VectorizedBacktest:
+    """
+    시세 패널 기반 파라미터 그리드 백테스터
+
+    사용 예:
+        vb = VectorizedBacktest('kr', bars, stocks_config_file="kr_stocks_config.json")
+        grid = build_param_grid(profit_threshold=[0.03, 0.05], stop_loss_cooldown_days=[20, 50])
+        report = vb.run(grid)
+        best = report['results'][0]
+    """
+
+    def __init__(self, market: str, bars: BarData,
+                 stocks_config_file: Optional[str] = None,
+                 initial_cash: float = 10_000_000,
+                 start: Optional[dt_date] = None, end: Optional[dt_date] = None,
+                 sell_interval_minutes: int = BACKTEST_SELL_INTERVAL_MINUTES,
+                 buy_interval_minutes: int = BACKTEST_BUY_INTERVAL_MINUTES,
+                 commission_rate: Optional[float] = None,
+                 sell_tax_rate: Optional[float] = None,
+                 slippage_ticks: int = 0):
+        """
+        Args:
+            market: 'kr' 또는 'us'
+            bars: 봉 데이터
+            stocks_config_file: 종목 설정 파일 (없으면 시장 기본 파일)
+            initial_cash: 초기 예수금
+            start: 시작 날짜 (없으면 데이터 처음)
+            end: 종료 날짜 (없으면 데이터 끝)
+            sell_interval_minutes: 매도 주기 (분)
+            buy_interval_minutes: 매수 주기 (분)
+            commission_rate: 수수료율 (없으면 시장 기본값)
+            sell_tax_rate: 매도 거래세율 (없으면 시장 기본값)
+            slippage_ticks: 시장가 슬리피지 (호가 단위 수)
+        """
+        self.market = market
+        self.bars = bars
+        self.tz = bars.tz
+        self.initial_cash = float(initial_cash)
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+        profile = market_profile(market)
+        self.profile = profile
+        self.commission_rate = profile['commission_rate'] if commission_rate is None else commission_rate
+        self.sell_tax_rate = profile['sell_tax_rate'] if sell_tax_rate is None else sell_tax_rate
+        self.slippage_ticks = slippage_ticks
+        self.max_shares = MAX_SHARES.get(market, MAX_SHARES['kr'])
+        self.defaults = market_defaults(market)
+
+        if stocks_config_file is None:
+            stocks_config_file = ("kr_stocks_config.json" if market == 'kr' else "us_stocks_config.json")
+        with open(stocks_config_file, 'r', encoding='utf-8') as f:
+            self.universe = load_universe(json.load(f))
+        if self.universe['has_conditions']:
+            self.logger.warning("[VECTOR] 조건식(conditions)은 벡터화 백테스트에서 무시됩니다")
+
+        self.sessions = bars.sessions(start, end)
+        if not self.sessions:
+            raise ValueError("백테스트 기간에 봉 데이터가 없습니다")
+
+        started = time.perf_counter()
+        self._build_panel(sell_interval_minutes, buy_interval_minutes)
+        self.panel_seconds = time.perf_counter() - started
+
+    def _build_panel(self, sell_interval_minutes: int, buy_interval_minutes: int):
+        """주기 시각 x 종목 시세/전일 종가/체결가 행렬 생성 (1회)"""
+        universe = self.universe
+        symbols = list(dict.fromkeys(
+            universe['filter'] + universe['watch']
+            + [s for sector in (universe['sectors'] or []) for s in sector['filter'] + sector['watch']]
+        ))
+        self.symbols = symbols
+        index = {symbol: i for i, symbol in enumerate(symbols)}
+        n_symbols = len(symbols)
+        round_to_tick = self.profile['round_to_tick']
+        tick_size = self.profile['tick_size']
+
+        ts_list, sell_flags, buy_flags, day_of_cycle = [], [], [], []
+        day_ranges = []
+        for d, day in enumerate(self.sessions):
+            first = len(ts_list)
+            for ts, run_sell, run_buy in cycle_times(self.bars, day, sell_interval_minutes,
+                                                     buy_interval_minutes):
+                ts_list.append(ts)
+                sell_flags.append(run_sell)
+                buy_flags.append(run_buy)
+                day_of_cycle.append(d)
+            day_ranges.append((first, len(ts_list)))
+
+        n_cycles = len(ts_list)
+        prices = np.full((n_cycles, n_symbols), np.nan)
+        buy_fills = np.full((n_cycles, n_symbols), np.nan)
+        sell_fills = np.full((n_cycles, n_symbols), np.nan)
+        prev_close = np.full((len(self.sessions), n_symbols), np.nan)
+        marks = np.full((len(self.sessions), n_symbols), np.nan)
+
+        slippage = self.slippage_ticks
+        for symbol, j in index.items():
+            for d, day in enumerate(self.sessions):
+                pc = self.bars.previous_close(symbol, day)
+                if pc is not None:
+                    prev_close[d, j] = pc
+                # 장 마감 평가 가격 (SimulatedAPIClient._mark_price와 동일)
+                close_price = self.bars.price_at(symbol, self.bars.session_bounds(day)[1])
+                mark = round_to_tick(close_price) if close_price is not None else self.bars.day_close(symbol, day)
+                if mark is not None:
+                    marks[d, j] = mark
+            for t, ts in enumerate(ts_list):
+                price = self.bars.price_at(symbol, ts)
+                if price is None:
+                    continue
+                price = round_to_tick(price)
+                prices[t, j] = price
+                step = slippage * tick_size(price)
+                buy_fills[t, j] = round_to_tick(price + step)
+                sell_fills[t, j] = round_to_tick(max(price - step, 0))
+
+        self.cycle_ts = np.array(ts_list)
+        self.cycle_is_sell = np.array(sell_flags, dtype=bool)
+        self.cycle_is_buy = np.array(buy_flags, dtype=bool)
+        self.cycle_day = np.array(day_of_cycle, dtype=np.int64)
+        self.day_ranges = np.array(day_ranges, dtype=np.int64).reshape(-1, 2)
+        self.prices = prices
+        self.buy_fills = buy_fills
+        self.sell_fills = sell_fills
+        self.prev_close = prev_close
+        self.marks = marks
+
+        # 필터 게이트/하락률 (파라미터와 무관한 부분은 미리 계산)
+        pc = prev_close[self.cycle_day]
+        valid = ~np.isnan(prices) & ~np.isnan(pc)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            rising = valid & (prices > pc)
+            decline = np.where(valid & (pc > 0), (pc - prices) / pc, np.nan)
+        self.decline = decline
+        # 하락률 내림차순 (NaN은 뒤로, 동률은 종목 순서 유지)
+        self.decline_order = np.argsort(np.where(np.isnan(decline), np.inf, -decline), axis=1, kind='stable')
+
+        def no_decline(members: List[str]) -> np.ndarray:
+            """시세가 있는 필터 종목 중 하락/보합이 하나도 없음 (레거시 AND 규칙)"""
+            cols = [index[s] for s in members]
+            return ~(valid[:, cols] & ~rising[:, cols]).any(axis=1)
+
+        if universe['sectors']:
+            # 섹터 통과: 'any' 필터 종목 하나라도 상승 / 'all' 시세가 있는 필터 종목 모두 상승
+            # (필터 종목이 없는 섹터는 어느 규칙으로도 통과하지 않음)
+            self.sector_mode = True
+            sector_any, sector_all, sector_watch = [], [], []
+            for sector in universe['sectors']:
+                cols = [index[s] for s in sector['filter']]
+                any_rising = rising[:, cols].any(axis=1)
+                sector_any.append(any_rising)
+                sector_all.append(any_rising & no_decline(sector['filter']))
+                mask = np.zeros(n_symbols, dtype=bool)
+                mask[[index[s] for s in sector['watch']]] = True
+                sector_watch.append(mask)
+            self.sector_any = np.array(sector_any).T        # (주기, 섹터)
+            self.sector_all = np.array(sector_all).T
+            self.sector_watch = np.array(sector_watch)      # (섹터, 종목)
+        else:
+            self.sector_mode = False
+            self.legacy_gate = no_decline(universe['filter'])
+            self.legacy_watch = np.zeros(n_symbols, dtype=bool)
+            self.legacy_watch[[index[s] for s in universe['watch']]] = True
+
+    def _resolve_grid(self, grid: List[Dict[str, Any]]) -> Dict[str, np.ndarray]:
+        """조합 리스트 → 파라미터별 배열 (없는 키는 시장 기본값)"""
+        if not grid:
+            grid = [{}]
+        params = [{**self.defaults, **combo} for combo in grid]
+        for combo in params:
+            if combo['sector_rule'] not in SECTOR_RULES:
+                raise ValueError(f"sector_rule은 {SECTOR_RULES} 중 하나여야 합니다: {combo['sector_rule']}")
+        return {
+            'profit_threshold': np.array([p['profit_threshold'] for p in params], dtype=float),
+            'stop_loss_threshold': np.array([-np.inf if p['stop_loss_threshold'] is None
+                                             else p['stop_loss_threshold'] for p in params], dtype=float),
+            'cooldown_seconds': np.array([(p['stop_loss_cooldown_days'] or 0) * 86400 for p in params],
+                                         dtype=float),
+            'top_k': np.array([p['top_k'] for p in params], dtype=np.int64),
+            'sector_all': np.array([p['sector_rule'] == 'all' for p in params], dtype=bool),
+            'params': params
+        }
+
+    def run(self, grid: List[Dict[str, Any]] = None, record_fills: Optional[int] = None) -> Dict[str, Any]:
+        """
+        파라미터 그리드 평가
+
+        Args:
+            grid: 조합 리스트 (build_param_grid 결과, 없으면 기본값 1개)
+            record_fills: 체결 내역을 기록할 조합 인덱스 (일치 검증용)
+
+        Returns:
+            dict: results (수익률 내림차순 조합별 결과), fills, elapsed_seconds
+        """
+        started = time.perf_counter()
+        g = self._resolve_grid(grid)
+        n_combos = len(g['params'])
+        n_symbols = len(self.symbols)
+
+        tp = g['profit_threshold'][:, None]
+        sl = g['stop_loss_threshold'][:, None]
+        cooldown = g['cooldown_seconds'][:, None]
+        top_k = g['top_k']
+        use_all_rule = g['sector_all']
+
+        cash = np.full(n_combos, self.initial_cash)
+        qty = np.zeros((n_combos, n_symbols), dtype=np.int64)
+        avg = np.zeros((n_combos, n_symbols))
+        buy_fees = np.zeros((n_combos, n_symbols))
+        block_until = np.full((n_combos, n_symbols), -np.inf)
+        last_sell = np.full((n_combos, n_symbols), np.nan)
+
+        n_buys = np.zeros(n_combos, dtype=np.int64)
+        n_sells = np.zeros(n_combos, dtype=np.int64)
+        n_wins = np.zeros(n_combos, dtype=np.int64)
+        n_stops = np.zeros(n_combos, dtype=np.int64)
+        fees = np.zeros(n_combos)
+        realized = np.zeros(n_combos)
+        equity = np.zeros((n_combos, len(self.sessions)))
+
+        fills: List[Dict[str, Any]] = []
+        tz = self.tz
+        commission = self.commission_rate
+        sell_cost = self.commission_rate + self.sell_tax_rate
+
+        for d in range(len(self.sessions)):
+            first, last = self.day_ranges[d]
+            for t in range(first, last):
+                ts = self.cycle_ts[t]
+                price = self.prices[t]
+
+                if self.cycle_is_sell[t]:
+                    block_until, last_sell = self._sell_step(
+                        t, ts, price, tp, sl, cooldown, cash, qty, avg, buy_fees, block_until, last_sell,
+                        n_sells, n_wins, n_stops, fees, realized, sell_cost, fills, record_fills, tz)
+
+                if self.cycle_is_buy[t]:
+                    self._buy_step(t, ts, price, cash, qty, avg, buy_fees, block_until, last_sell,
+                                   n_buys, fees, top_k, use_all_rule, commission, fills, record_fills, tz)
+
+            # 장 마감 평가 (시세 없는 종목은 평균단가)
+            mark = np.where(np.isnan(self.marks[d]), avg, self.marks[d])
+            equity[:, d] = cash + (qty * mark).sum(axis=1)
+
+        elapsed = time.perf_counter() - started
+        results = self._summarize(g['params'], cash, equity, n_buys, n_sells, n_wins, n_stops,
+                                  fees, realized, qty)
+        ranked = sorted(results, key=lambda r: r['total_return'], reverse=True)
+
+        self.logger.info(f"[VECTOR] {self.market.upper()} {n_combos}개 조합 x {len(self.sessions)}일 평가 완료 "
+                         f"({elapsed:.2f}초, 패널 생성 {self.panel_seconds:.2f}초)")
+        return {
+            'market': self.market,
+            'start': self.sessions[0].isoformat(),
+            'end': self.sessions[-1].isoformat(),
+            'combos': n_combos,
+            'elapsed_seconds': round(elapsed, 3),
+            'panel_seconds': round(self.panel_seconds, 3),
+            'results': ranked,
+            'equity': equity,
+            'fills': fills
+        }
+
+    def _sell_step(self, t, ts, price, tp, sl, cooldown, cash, qty, avg, buy_fees, block_until, last_sell,
+                   n_sells, n_wins, n_stops, fees, realized, sell_cost, fills, record_fills, tz):
+        """
+        매도: 익절/손절 (execute_sell_strategy + should_sell + sell_position)
+
+        Returns:
+            (block_until, last_sell) 갱신된 재매수 금지 시각/마지막 매도가
+        """
+        held = (qty > 0) & ~np.isnan(price)
+        if not held.any():
+            return block_until, last_sell
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            purchase = avg * qty
+            profit_rate = (price * qty - purchase) / purchase * 100 / 100
+            is_stop = held & (profit_rate <= sl)
+            sell = held & ((profit_rate >= tp) | is_stop)
+            if not sell.any():
+                return block_until, last_sell
+
+            fill = np.broadcast_to(self.sell_fills[t], sell.shape)
+            amount = np.where(sell, fill * qty, 0.0)
+            fee = amount * sell_cost
+            pnl = np.where(sell, (fill - avg) * qty - fee - buy_fees, 0.0)
+
+        cash += (amount - fee).sum(axis=1)
+        fees += fee.sum(axis=1)
+        realized += pnl.sum(axis=1)
+        n_sells += sell.sum(axis=1)
+        n_wins += (sell & (pnl > 0)).sum(axis=1)
+        n_stops += is_stop.sum(axis=1)
+
+        # 손절은 재매수 금지, 익절은 매도가 기록 (재매수 방지 체크용)
+        block_until = np.where(is_stop, ts + cooldown, block_until)
+        last_sell = np.where(sell & ~is_stop, np.broadcast_to(price, sell.shape), last_sell)
+
+        if record_fills is not None:
+            # 실거래 매도 루프와 같은 순서 (수익률 높은 종목부터)
+            sold = np.flatnonzero(sell[record_fills])
+            for j in sold[np.argsort(-profit_rate[record_fills, sold], kind='stable')]:
+                fills.append(self._fill(tz, ts, j, 'sell', int(qty[record_fills, j]), fill[record_fills, j]))
+
+        qty[sell] = 0
+        avg[sell] = 0.0
+        buy_fees[sell] = 0.0
+        return block_until, last_sell
+
+    def _buy_step(self, t, ts, price, cash, qty, avg, buy_fees, block_until, last_sell,
+                  n_buys, fees, top_k, use_all_rule, commission, fills, record_fills, tz):
+        """매수: 필터 게이트 → 하락률 상위 k → should_buy → 수량 계산 (execute_buy_strategy)"""
+        n_combos = len(cash)
+
+        if self.sector_mode:
+            passing = np.where(use_all_rule[:, None], self.sector_all[t][None, :], self.sector_any[t][None, :])
+            gate = passing.any(axis=1)
+            active = (passing.astype(np.int8) @ self.sector_watch.astype(np.int8)) > 0   # (조합, 종목)
+        else:
+            gate = np.full(n_combos, bool(self.legacy_gate[t]))
+            active = np.broadcast_to(self.legacy_watch, qty.shape)
+
+        gate &= cash > 0
+        if not gate.any():
+            return
+
+        available = cash.copy()
+        ranked = np.zeros(n_combos, dtype=np.int64)
+        decline = self.decline[t]
+
+        for j in self.decline_order[t]:
+            if np.isnan(decline[j]):
+                break
+            candidate = active[:, j] & (ranked < top_k)
+            ranked += active[:, j]
+            if not candidate.any():
+                if (ranked >= top_k).all():
+                    break
+                continue
+
+            p = price[j]
+            # should_buy: 손절 재매수 금지 → 이전 매도가 체크
+            ok = candidate & gate & (ts > block_until[:, j]) & ~(p > last_sell[:, j])
+            quantity = np.minimum(np.floor(available / MAX_POSITIONS / p), self.max_shares).astype(np.int64)
+            ok &= quantity > 0
+
+            fill = self.buy_fills[t, j]
+            amount = fill * quantity
+            fee = amount * commission
+            ok &= amount + fee <= cash + 1e-9
+            if not ok.any():
+                continue
+
+            held = qty[:, j]
+            new_qty = held + quantity
+            avg[:, j] = np.where(ok, (avg[:, j] * held + amount) / np.maximum(new_qty, 1), avg[:, j])
+            qty[:, j] = np.where(ok, new_qty, held)
+            buy_fees[:, j] += np.where(ok, fee, 0.0)
+            cash -= np.where(ok, amount + fee, 0.0)
+            fees += np.where(ok, fee, 0.0)
+            available -= np.where(ok, quantity * p, 0.0)
+            n_buys += ok
+
+            if record_fills is not None and ok[record_fills]:
+                fills.append(self._fill(tz, ts, j, 'buy', int(quantity[record_fills]), fill))
+
+    def _fill(self, tz, ts: float, j: int, side: str, quantity: int, price: float) -> Dict[str, Any]:
+        return {
+            'timestamp': datetime.fromtimestamp(ts, tz).isoformat(),
+            'symbol': self.symbols[j],
+            'side': side,
+            'quantity': quantity,
+            'price': float(price)
+        }
+
+    def _summarize(self, params, cash, equity, n_buys, n_sells, n_wins, n_stops, fees, realized,
+                   qty) -> List[Dict[str, Any]]:
+        """조합별 수익률/최대 낙폭/승률"""
+        initial = self.initial_cash
+        peaks = np.maximum.accumulate(np.concatenate([np.full((len(cash), 1), initial), equity], axis=1),
+                                      axis=1)[:, 1:]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            drawdown = np.where(peaks > 0, (peaks - equity) / peaks, 0.0).max(axis=1)
+        final = equity[:, -1]
+
+        results = []
+        for i, combo in enumerate(params):
+            results.append({
+                'index': i,
+                'params': {key: combo[key] for key in PARAM_KEYS},
+                'final_equity': round(float(final[i]), 2),
+                'total_return': float((final[i] - initial) / initial) if initial else 0.0,
+                'max_drawdown': float(drawdown[i]),
+                'buys': int(n_buys[i]),
+                'sells': int(n_sells[i]),
+                'win_rate': float(n_wins[i] / n_sells[i]) if n_sells[i] else 0.0,
+                'stop_losses': int(n_stops[i]),
+                'realized_pnl': round(float(realized[i]), 2),
+                'fees': round(float(fees[i]), 2),
+                'open_positions': int((qty[i] > 0).sum())
+            })
+        return results
+
+    def _panel_arrays(self) -> tuple:
+        return PANEL_ARRAYS + (SECTOR_ARRAYS if self.sector_mode else LEGACY_ARRAYS)
+
+    def save_panel(self, panel_dir: str) -> str:
+        """
+        시세 패널을 배열별 .npy 파일 + panel.json으로 저장
+
+        panel.json은 배열 저장이 끝난 뒤 마지막에 기록하므로 panel.json이 있으면 완성된 패널이다.
+
+        Args:
+            panel_dir: 저장 디렉토리
+
+        Returns:
+            str: 데이터 버전 (패널 배열 + 비용/기간 설정의 해시)
+        """
+        os.makedirs(panel_dir, exist_ok=True)
+        meta = {
+            'market': self.market,
+            'timezone': self.tz.zone,
+            'symbols': self.symbols,
+            'sessions': [day.isoformat() for day in self.sessions],
+            'sector_mode': self.sector_mode,
+            'initial_cash': self.initial_cash,
+            'commission_rate': self.commission_rate,
+            'sell_tax_rate': self.sell_tax_rate,
+            'slippage_ticks': self.slippage_ticks,
+            'max_shares': self.max_shares,
+            'defaults': self.defaults,
+            'panel_seconds': self.panel_seconds
+        }
+
+        digest = hashlib.sha256(json.dumps({k: v for k, v in meta.items() if k != 'panel_seconds'},
+                                           sort_keys=True).encode('utf-8'))
+        for name in self._panel_arrays():
+            array = np.ascontiguousarray(getattr(self, name))
+            np.save(os.path.join(panel_dir, f"{name}.npy"), array)
+            digest.update(name.encode('utf-8'))
+            digest.update(str(array.dtype).encode('utf-8'))
+            digest.update(str(array.shape).encode('utf-8'))
+            digest.update(array.tobytes())
+        meta['data_version'] = digest.hexdigest()[:16]
+
+        meta_path = os.path.join(panel_dir, PANEL_META_FILE)
+        temp_path = f"{meta_path}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(meta, f, ensure_ascii=False, indent=2)
+        os.replace(temp_path, meta_path)
+        self.data_version = meta['data_version']
+        return self.data_version
+
+    @classmethod
+    def from_panel(cls, panel_dir: str, mmap: bool = True) -> 'VectorizedBacktest':
+        """
+        save_panel()로 저장한 패널 열기 (봉 데이터/종목 설정 파일 불필요)
+
+        Args:
+            panel_dir: 패널 디렉토리
+            mmap: True면 배열을 읽기 전용 메모리 매핑 (여러 프로세스가 같은 페이지 캐시 공유)
+        """
+        with open(os.path.join(panel_dir, PANEL_META_FILE), 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+
+        self = cls.__new__(cls)
+        self.logger = logging.getLogger(cls.__name__)
+        self.market = meta['market']
+        self.bars = None
+        self.tz = pytz.timezone(meta['timezone'])
+        self.symbols = meta['symbols']
+        self.sessions = [dt_date.fromisoformat(day) for day in meta['sessions']]
+        self.sector_mode = meta['sector_mode']
+        self.initial_cash = meta['initial_cash']
+        self.commission_rate = meta['commission_rate']
+        self.sell_tax_rate = meta['sell_tax_rate']
+        self.slippage_ticks = meta['slippage_ticks']
+        self.max_shares = meta['max_shares']
+        self.defaults = meta['defaults']
+        self.panel_seconds = meta['panel_seconds']
+        self.data_version = meta['data_version']
+
+        for name in self._panel_arrays():
+            setattr(self, name, np.load(os.path.join(panel_dir, f"{name}.npy"),
+                                        mmap_mode='r' if mmap else None))
+        return self
+
+
+def check_consistency(market: str, bars: BarData, stocks_config_file: Optional[str] = None,
+                      initial_cash: float = 10_000_000,
+                      start: Optional[dt_date] = None, end: Optional[dt_date] = None,
+                      output_dir: str = "backtest_results/consistency",
+                      tolerance: float = 1e-6) -> Dict[str, Any]:
+    """
+    벡터화 경로와 이벤트 기반 경로(실제 전략 객체)의 결과 일치 확인
+
+    시장 기본 파라미터 1개 조합으로 두 경로를 실행해 체결 내역(시각/종목/방향/수량/가격)과
+    최종 자산을 비교한다. 트레일링 스탑/조건식이 설정된 종목 설정은 벡터화 경로가
+    모델링하지 않으므로 불일치할 수 있다.
+
+    Returns:
+        dict: match, fills (건수), mismatches (처음 10건), event/vectorized 최종 자산
+    """
+    engine = BacktestEngine(market, bars, initial_cash=initial_cash, output_dir=output_dir,
+                            stocks_config_file=stocks_config_file)
+    event = engine.run(start=start, end=end)
+    event_fills = [(f['timestamp'], f['symbol'], f['side'], f['quantity'], round(f['price'], 4))
+                   for f in engine.client.fills]
+
+    vectorized = VectorizedBacktest(market, bars, stocks_config_file=stocks_config_file,
+                                    initial_cash=initial_cash, start=start, end=end)
+    defaults = dict(vectorized.defaults, profit_threshold=engine.strategy.profit_threshold)
+    report = vectorized.run([defaults], record_fills=0)
+    vector_fills = [(f['timestamp'], f['symbol'], f['side'], f['quantity'], round(f['price'], 4))
+                    for f in report['fills']]
+
+    mismatches = []
+    for i in range(max(len(event_fills), len(vector_fills))):
+        a = event_fills[i] if i < len(event_fills) else None
+        b = vector_fills[i] if i < len(vector_fills) else None
+        if a != b:
+            mismatches.append({'index': i, 'event': a, 'vectorized': b})
+            if len(mismatches) >= 10:
+                break
+
+    event_equity = event['final_equity']
+    vector_equity = report['results'][0]['final_equity']
+    equity_match = math.isclose(event_equity, vector_equity, rel_tol=tolerance, abs_tol=0.01)
+
+    return {
+        'match': not mismatches and equity_match,
+        'fills': {'event': len(event_fills), 'vectorized': len(vector_fills)},
+        'mismatches': mismatches,
+        'final_equity': {'event': event_equity, 'vectorized': vector_equity},
+        'elapsed_seconds': {'event': event['elapsed_seconds'], 'vectorized': report['elapsed_seconds']},
+        'output_dir': os.path.abspath(output_dir)
+    }
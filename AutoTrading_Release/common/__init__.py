@@ -4,5 +4,24 @@ Common module - 미국/한국 주식 공통 기능
 from .base_token_manager import BaseTokenManager
 from .base_api import BaseAPIClient
 from .base_strategy import BaseStrategy
+from .rate_limiter import RateLimiter
+from .price_trigger import PriceTriggerIndex, PriceTrigger
+from .indicators import IndicatorBook
+from .market_data import MarketDataHub
+from .order_dispatcher import OrderDispatcher
+from .risk_engine import RiskEngine
+from .refresh_scheduler import RefreshScheduler
+from .paper_broker import PaperBroker
+from .cassette import Cassette
+from .bar_store import BarStore
+from .minute_bars import MinuteBarAggregator
+from .quote_fallback import BulkQuoteFallback
+from .event_scheduler import EventScheduler
+from .market_calendar import MarketCalendar, get_calendar
+from .market_worker import MarketWorker
 
-__all__ = ['BaseTokenManager', 'BaseAPIClient', 'BaseStrategy']
+__all__ = ['BaseTokenManager', 'BaseAPIClient', 'BaseStrategy', 'RateLimiter',
+           'PriceTriggerIndex', 'PriceTrigger', 'IndicatorBook',
+           'MarketDataHub', 'OrderDispatcher', 'RiskEngine', 'RefreshScheduler', 'PaperBroker',
+           'Cassette', 'BarStore', 'MinuteBarAggregator', 'BulkQuoteFallback',
+           'EventScheduler', 'MarketCalendar', 'get_calendar', 'MarketWorker']
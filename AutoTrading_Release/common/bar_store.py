@@ -0,0 +1,429 @@
+"""
+로컬 일봉 저장소 - 종목별 컬럼 파일을 메모리 매핑으로 공유하고 새 일봉만 이어 붙임
+
+전일 종가를 조회할 때마다 일별 시세 전체를 내려받던 것을 로컬 이력으로 대체한다.
+
+- 배치: <root>/<market>/<symbol>/{date.i4, open.f8, high.f8, low.f8, close.f8, volume.f8, meta.json}
+  (date는 YYYYMMDD 정수, 나머지는 float64, 날짜 오름차순)
+- 분봉(frame='minute'): <root>/<market>/<symbol>/1m/{time.i8, open.f8, ...} (time은 봉 시작 epoch 초,
+  장중 관측 시세로 만든 1분봉을 MinuteBarAggregator가 장 마감 후 저장)
+- 읽기: np.memmap (읽기 전용) - 여러 프로세스가 같은 페이지 캐시를 공유하므로 프로세스별 복사본이 없음
+- 쓰기: 컬럼 파일 끝에 새 행만 추가한 뒤 meta.json(rows)을 원자적으로 교체
+  (읽기는 meta의 rows까지만 보므로 추가 도중에도 일관된 값을 읽고, 중단된 추가분은 다음 쓰기에서 잘라냄)
+- 갱신: update()가 마지막 저장 날짜 다음날부터 어제까지를 클라이언트 fetch_daily_bars로 받아 추가
+  (당일 갱신을 마친 종목은 meta.checked에 장 날짜를 기록 → previous_close가 네트워크 없이 응답)
+
+사용 예:
+    store = BarStore('bar_store')
+    store.update('kr', KRAPIClient(), ['005930', '000660'])
+    series = store.get_series('kr', ['005930', '000660'], start=date(2025, 1, 1))
+    series['close']   # (종목 수, 날짜 수) 배열, 없는 날은 NaN
+"""
+import json
+import logging
+import os
+import threading
+from datetime import date, datetime, timedelta
+from typing import Optional, Dict, Any, List, Iterable, Tuple, Union
+
+import numpy as np
+
+
+DEFAULT_STORE_DIR = "bar_store"
+DEFAULT_LOOKBACK_DAYS = 400         # 처음 받는 종목의 이력 기간 (달력일)
+META_FILE = "meta.json"
+
+# (컬럼, dtype, 파일 확장자)
+BAR_COLUMNS = (
+    ('date', np.int32, 'i4'),
+    ('open', np.float64, 'f8'),
+    ('high', np.float64, 'f8'),
+    ('low', np.float64, 'f8'),
+    ('close', np.float64, 'f8'),
+    ('volume', np.float64, 'f8'),
+)
+PRICE_FIELDS = ('open', 'high', 'low', 'close', 'volume')
+MINUTE_COLUMNS = (('time', np.int64, 'i8'),) + BAR_COLUMNS[1:]
+
+# KIS 기간별시세 output2 필드 (날짜, 시가, 고가, 저가, 종가, 거래량)
+KIS_OVERSEAS_DAILY_FIELDS = ('xymd', 'open', 'high', 'low', 'clos', 'tvol')
+KIS_DOMESTIC_DAILY_FIELDS = ('stck_bsop_date', 'stck_oprc', 'stck_hgpr', 'stck_lwpr', 'stck_clpr', 'acml_vol')
+
+DAILY = 'daily'
+MINUTE = 'minute'
+# 봉 종류별 (하위 디렉토리, 컬럼, 메타의 마지막 키 이름)
+FRAMES = {
+    DAILY: ('', BAR_COLUMNS, 'last_date'),
+    MINUTE: ('1m', MINUTE_COLUMNS, 'last_time'),
+}
+
+DateLike = Union[date, int, str, None]
+
+
+def to_yyyymmdd(value: DateLike) -> Optional[int]:
+    """date / 'YYYY-MM-DD' / 'YYYYMMDD' / int → YYYYMMDD 정수"""
+    if value is None:
+        return None
+    if isinstance(value, (int, np.integer)):
+        return int(value)
+    if isinstance(value, datetime):
+        value = value.date()
+    if isinstance(value, date):
+        return value.year * 10000 + value.month * 100 + value.day
+    return int(str(value).replace('-', '')[:8])
+
+
+def from_yyyymmdd(value: int) -> date:
+    value = int(value)
+    return date(value // 10000, value // 100 % 100, value % 100)
+
+
+def _to_float(value, default: float = 0.0) -> float:
+    if value is None or value == '' or value == 'N/A':
+        return default
+    try:
+        return float(value)
+    except (ValueError, TypeError):
+        return default
+
+
+def parse_daily_rows(output2, fields: Tuple[str, ...] = KIS_OVERSEAS_DAILY_FIELDS) -> List[tuple]:
+    """
+    KIS 기간별시세 output2 → 일봉 행 (모든 클라이언트의 fetch_daily_bars 공용)
+
+    Args:
+        output2: 응답 output2 리스트
+        fields: (날짜, 시가, 고가, 저가, 종가, 거래량) 필드 이름 (해외/국내)
+
+    Returns:
+        [(YYYYMMDD, open, high, low, close, volume), ...] 응답 순서 그대로 (종가 없는 행 제외,
+        시가/고가/저가가 비면 종가로 채움)
+    """
+    day_field, open_field, high_field, low_field, close_field, volume_field = fields
+    rows = []
+    for item in output2 or []:
+        day = str(item.get(day_field) or '').strip()
+        close = _to_float(item.get(close_field))
+        if not day or close <= 0:
+            continue
+        rows.append((int(day),
+                     _to_float(item.get(open_field), close),
+                     _to_float(item.get(high_field), close),
+                     _to_float(item.get(low_field), close),
+                     close,
+                     _to_float(item.get(volume_field))))
+    return rows
+
+
+def _row_key(frame: str, value) -> int:
+    """행 키 (일봉 YYYYMMDD, 분봉 epoch 초)"""
+    if frame == DAILY:
+        return to_yyyymmdd(value)
+    if isinstance(value, datetime):
+        return int(value.timestamp())
+    return int(value)
+
+
+class BarStore:
+    """
+    시장/종목별 일봉 컬럼 저장소 (프로세스 안에서 스레드 안전, 쓰기는 프로세스 1개 기준)
+    """
+
+    def __init__(self, root: str = DEFAULT_STORE_DIR):
+        """
+        Args:
+            root: 저장 디렉토리
+        """
+        self.root = root
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self._lock = threading.RLock()
+        # {(market, symbol, frame): (meta mtime_ns, rows, {column: memmap})}
+        self._maps: Dict[Tuple[str, str, str], Tuple[int, int, Dict[str, np.ndarray]]] = {}
+
+        self.stats = {
+            'series_reads': 0,
+            'prev_close_hits': 0,
+            'prev_close_misses': 0,
+            'appended_rows': 0,
+            'fetches': 0,
+            'fetch_errors': 0
+        }
+
+    # ===== 파일 =====
+
+    def _dir(self, market: str, symbol: str, frame: str = DAILY) -> str:
+        subdir = FRAMES[frame][0]
+        base = os.path.join(self.root, market, symbol)
+        return os.path.join(base, subdir) if subdir else base
+
+    def _column_path(self, market: str, symbol: str, column: str, ext: str, frame: str = DAILY) -> str:
+        return os.path.join(self._dir(market, symbol, frame), f"{column}.{ext}")
+
+    def _meta_path(self, market: str, symbol: str, frame: str = DAILY) -> str:
+        return os.path.join(self._dir(market, symbol, frame), META_FILE)
+
+    def get_meta(self, market: str, symbol: str, frame: str = DAILY) -> Dict[str, Any]:
+        """종목 메타 {rows, last_date(분봉은 last_time), checked} (없으면 rows 0)"""
+        path = self._meta_path(market, symbol, frame)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {'rows': 0, FRAMES[frame][2]: None, 'checked': None}
+
+    def _write_meta(self, market: str, symbol: str, meta: Dict[str, Any], frame: str = DAILY):
+        path = self._meta_path(market, symbol, frame)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(meta, f)
+        os.replace(tmp_path, path)
+
+    def symbols(self, market: str, frame: str = DAILY) -> List[str]:
+        """저장된 종목 리스트"""
+        directory = os.path.join(self.root, market)
+        if not os.path.isdir(directory):
+            return []
+        return sorted(name for name in os.listdir(directory)
+                      if os.path.exists(self._meta_path(market, name, frame)))
+
+    # ===== 쓰기 =====
+
+    def append(self, market: str, symbol: str, rows: Iterable[tuple],
+               checked: DateLike = None, frame: str = DAILY) -> int:
+        """
+        봉 추가 (마지막 저장 키 이후 행만, 키 오름차순으로 정렬해 추가)
+
+        Args:
+            market: 'kr' 또는 'us'
+            symbol: 종목 코드
+            rows: [(키, open, high, low, close, volume), ...] (일봉 키는 date/YYYYMMDD, 분봉 키는 epoch 초/datetime)
+            checked: 갱신 완료 장 날짜 (지정하면 meta.checked 기록)
+            frame: 'daily' 또는 'minute'
+
+        Returns:
+            추가한 행 수
+        """
+        _, columns, last_key = FRAMES[frame]
+        with self._lock:
+            meta = self.get_meta(market, symbol, frame)
+            last = meta.get(last_key) or 0
+            new_rows = {}
+            for row in rows:
+                key = _row_key(frame, row[0])
+                if key > last:
+                    new_rows[key] = row
+            keys = sorted(new_rows)
+
+            os.makedirs(self._dir(market, symbol, frame), exist_ok=True)
+            if keys:
+                count = meta.get('rows', 0)
+                for index, (column, dtype, ext) in enumerate(columns):
+                    values = np.array(keys if index == 0 else [float(new_rows[key][index] or 0.0) for key in keys],
+                                      dtype=dtype)
+                    path = self._column_path(market, symbol, column, ext, frame)
+                    with open(path, 'ab') as f:
+                        # 이전에 중단된 추가분 제거 (meta rows 이후 바이트)
+                        f.truncate(count * values.itemsize)
+                        f.seek(count * values.itemsize)
+                        f.write(values.tobytes())
+                meta['rows'] = count + len(keys)
+                meta[last_key] = keys[-1]
+                self.stats['appended_rows'] += len(keys)
+
+            if checked is not None:
+                meta['checked'] = to_yyyymmdd(checked)
+            if keys or checked is not None:
+                self._write_meta(market, symbol, meta, frame)
+                self._maps.pop((market, symbol, frame), None)
+            return len(keys)
+
+    def absorb(self, market: str, symbol: str, rows: List[tuple], today: DateLike) -> int:
+        """
+        다른 조회 결과로 받은 최근 일봉 저장 (전일 종가 조회 시 받은 일별 시세 등)
+
+        기존 이력과 빈틈없이 이어질 때만 저장하고 갱신 완료(checked)로 표시한다 (빈틈은 update가 채움).
+
+        Args:
+            rows: [(날짜, open, high, low, close, volume), ...] (당일 봉 포함 가능)
+            today: 기준 장 날짜 (이 날짜 이후 봉은 저장하지 않음)
+
+        Returns:
+            추가한 행 수
+        """
+        today_int = to_yyyymmdd(today)
+        completed = [row for row in rows if to_yyyymmdd(row[0]) < today_int]
+        if not completed:
+            return 0
+        last = self.get_meta(market, symbol).get('last_date')
+        if last and min(to_yyyymmdd(row[0]) for row in completed) > last:
+            return 0
+        return self.append(market, symbol, completed, checked=today_int)
+
+    # ===== 읽기 =====
+
+    def _columns(self, market: str, symbol: str, frame: str = DAILY) -> Tuple[int, Dict[str, np.ndarray]]:
+        """메모리 매핑된 컬럼 (meta가 바뀌면 다시 매핑)"""
+        try:
+            mtime = os.stat(self._meta_path(market, symbol, frame)).st_mtime_ns
+        except OSError:
+            return 0, {}
+
+        key = (market, symbol, frame)
+        with self._lock:
+            cached = self._maps.get(key)
+            if cached and cached[0] == mtime:
+                return cached[1], cached[2]
+
+            rows = self.get_meta(market, symbol, frame).get('rows', 0)
+            maps = {}
+            if rows:
+                for column, dtype, ext in FRAMES[frame][1]:
+                    maps[column] = np.memmap(self._column_path(market, symbol, column, ext, frame),
+                                             dtype=dtype, mode='r', shape=(rows,))
+            self._maps[key] = (mtime, rows, maps)
+            return rows, maps
+
+    def get_bars(self, market: str, symbol: str, start=None, end=None,
+                 frame: str = DAILY) -> Dict[str, np.ndarray]:
+        """
+        종목 1개의 봉 구간 (메모리 매핑 뷰, 복사 없음)
+
+        Args:
+            start: 시작 (포함, 일봉은 날짜, 분봉은 epoch 초/datetime)
+            end: 종료 (포함)
+            frame: 'daily' 또는 'minute'
+
+        Returns:
+            {'date'(분봉은 'time'), 'open', 'high', 'low', 'close', 'volume'} (없으면 빈 배열)
+        """
+        columns = FRAMES[frame][1]
+        rows, maps = self._columns(market, symbol, frame)
+        if not rows:
+            return {column: np.empty(0, dtype=dtype) for column, dtype, _ in columns}
+
+        keys = maps[columns[0][0]]
+        lo = 0 if start is None else int(np.searchsorted(keys, _row_key(frame, start), side='left'))
+        hi = rows if end is None else int(np.searchsorted(keys, _row_key(frame, end), side='right'))
+        return {column: maps[column][lo:hi] for column, _, _ in columns}
+
+    def get_series(self, market: str, symbols: List[str], start: DateLike = None,
+                   end: DateLike = None, fields: Iterable[str] = PRICE_FIELDS) -> Dict[str, Any]:
+        """
+        여러 종목 일봉을 날짜 기준으로 정렬한 배열
+
+        Args:
+            symbols: 종목 리스트 (결과 행 순서)
+            start: 시작 날짜 (포함)
+            end: 종료 날짜 (포함)
+            fields: 반환할 필드
+
+        Returns:
+            {'symbols': [...], 'dates': int32 (D,) YYYYMMDD, field: float64 (종목 수, D) - 없는 날은 NaN}
+        """
+        self.stats['series_reads'] += 1
+        bars = [self.get_bars(market, symbol, start, end) for symbol in symbols]
+        non_empty = [b['date'] for b in bars if len(b['date'])]
+        dates = np.unique(np.concatenate(non_empty)) if non_empty else np.empty(0, dtype=np.int32)
+
+        result: Dict[str, Any] = {'symbols': list(symbols), 'dates': dates}
+        fields = list(fields)
+        for field in fields:
+            result[field] = np.full((len(symbols), len(dates)), np.nan)
+        for i, b in enumerate(bars):
+            if not len(b['date']):
+                continue
+            index = np.searchsorted(dates, b['date'])
+            for field in fields:
+                result[field][i, index] = b[field]
+        return result
+
+    def last_date(self, market: str, symbol: str) -> Optional[date]:
+        last = self.get_meta(market, symbol).get('last_date')
+        return from_yyyymmdd(last) if last else None
+
+    def previous_close(self, market: str, symbol: str, day: DateLike,
+                       fresh_only: bool = True) -> Optional[float]:
+        """
+        day 이전 마지막 장의 종가 (네트워크 없음)
+
+        Args:
+            day: 기준 장 날짜 (보통 오늘)
+            fresh_only: True면 기준 날짜에 갱신을 마친 종목만 응답 (휴장일을 모르므로 갱신 전에는 None)
+
+        Returns:
+            종가 (없으면 None)
+        """
+        target = to_yyyymmdd(day)
+        if fresh_only and self.get_meta(market, symbol).get('checked') != target:
+            self.stats['prev_close_misses'] += 1
+            return None
+
+        rows, maps = self._columns(market, symbol)
+        if not rows:
+            self.stats['prev_close_misses'] += 1
+            return None
+        index = int(np.searchsorted(maps['date'], target, side='left')) - 1
+        if index < 0:
+            self.stats['prev_close_misses'] += 1
+            return None
+        self.stats['prev_close_hits'] += 1
+        return float(maps['close'][index])
+
+    # ===== 갱신 =====
+
+    def update(self, market: str, client, symbols: Iterable[str], today: DateLike = None,
+               lookback_days: int = DEFAULT_LOOKBACK_DAYS) -> Dict[str, int]:
+        """
+        마지막 저장 날짜 다음날 ~ 어제 일봉을 받아 추가 (당일 이미 갱신한 종목은 건너뜀)
+
+        Args:
+            market: 'kr' 또는 'us'
+            client: fetch_daily_bars(symbol, start, end)를 제공하는 API 클라이언트
+            symbols: 갱신할 종목
+            today: 기준 장 날짜 (없으면 시스템 날짜, 시장 타임존 날짜를 넘기는 것을 권장)
+            lookback_days: 처음 받는 종목의 이력 기간 (달력일)
+
+        Returns:
+            {'updated': 추가가 있었던 종목 수, 'rows': 추가 행 수, 'skipped': 이미 최신, 'failed': 실패}
+        """
+        today_date = from_yyyymmdd(to_yyyymmdd(today)) if today is not None else date.today()
+        today_int = to_yyyymmdd(today_date)
+        result = {'updated': 0, 'rows': 0, 'skipped': 0, 'failed': 0}
+
+        for symbol in dict.fromkeys(symbols):
+            meta = self.get_meta(market, symbol)
+            if meta.get('checked') == today_int:
+                result['skipped'] += 1
+                continue
+
+            last = meta.get('last_date')
+            start = (from_yyyymmdd(last) + timedelta(days=1)) if last else today_date - timedelta(days=lookback_days)
+            end = today_date - timedelta(days=1)
+            rows = []
+            if start <= end:
+                self.stats['fetches'] += 1
+                try:
+                    rows = client.fetch_daily_bars(symbol, start, end)
+                except Exception as e:
+                    rows = None
+                    self.logger.error(f"[BARS] {market.upper()} {symbol} 일봉 조회 오류: {e}")
+                if rows is None:
+                    self.stats['fetch_errors'] += 1
+                    result['failed'] += 1
+                    continue
+
+            # 당일(진행 중) 봉은 저장하지 않음
+            added = self.append(market, symbol, [row for row in rows if to_yyyymmdd(row[0]) < today_int],
+                                checked=today_int)
+            if added:
+                result['updated'] += 1
+                result['rows'] += added
+            else:
+                result['skipped'] += 1
+
+        self.logger.info(f"[BARS] {market.upper()} 일봉 갱신: 종목 {result['updated']}개 / {result['rows']}행 추가, "
+                         f"최신 {result['skipped']}개, 실패 {result['failed']}개")
+        return result
+
+    def get_stats(self) -> Dict[str, Any]:
+        return dict(self.stats)
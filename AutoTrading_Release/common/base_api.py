@@ -8,6 +8,8 @@ from datetime import datetime, time as dt_time
 from typing import Optional, Dict, Any, List
 import pytz
 
+from .market_calendar import get_calendar, market_for_timezone
+
 
 class BaseAPIClient(ABC):
     """
@@ -29,10 +31,14 @@ class BaseAPIClient(ABC):
         self.price_cache: Dict[str, tuple] = {}  # {symbol: (price, timestamp)}
         self.cache_timeout: int = 60  # 기본 60초
 
+        # 가격 리스너 (장중 지표 등 시세 구독자)
+        self._price_listeners: List = []
+
         # 타임존 설정 (서브클래스에서 오버라이드)
         self._timezone = None
         self._start_time = None
         self._end_time = None
+        self._calendar = None  # 거래소 캘린더 (휴장일/조기 폐장 반영)
 
     @abstractmethod
     def get_timezone(self) -> str:
@@ -113,22 +119,22 @@ class BaseAPIClient(ABC):
         start_str, end_str = self.get_market_hours()
         self._start_time = dt_time.fromisoformat(start_str)
         self._end_time = dt_time.fromisoformat(end_str)
+        timezone = self.get_timezone()
+        self._calendar = get_calendar(market_for_timezone(timezone), (start_str, end_str), timezone)
+
+    def get_calendar(self):
+        """시장 캘린더 (MarketCalendar)"""
+        if self._calendar is None:
+            self._init_market_time()
+        return self._calendar
 
     def is_market_open(self) -> bool:
-        """현재 시장이 열려있는지 확인"""
+        """현재 시장이 열려있는지 확인 (휴장일/조기 폐장/지연 개장 반영)"""
         try:
-            if self._timezone is None:
+            if self._calendar is None:
                 self._init_market_time()
 
-            now = datetime.now(self._timezone)
-            current_time = now.time()
-
-            # 주말 체크 (토요일=5, 일요일=6)
-            if now.weekday() >= 5:
-                return False
-
-            # 시장 시간 체크
-            return self._start_time <= current_time <= self._end_time
+            return self._calendar.is_open()
 
         except Exception as e:
             self.logger.error(f"시장 시간 확인 오류: {e}")
@@ -143,12 +149,16 @@ class BaseAPIClient(ABC):
             now = datetime.now(self._timezone)
             is_open = self.is_market_open()
 
+            calendar = self._calendar.get_status()
+
             return {
                 'is_open': is_open,
                 'current_time': now.strftime('%Y-%m-%d %H:%M:%S'),
                 'timezone': self.get_timezone(),
                 'market_hours': f"{self._start_time.isoformat()} - {self._end_time.isoformat()}",
-                'weekday': now.strftime('%A')
+                'weekday': now.strftime('%A'),
+                'holiday': calendar['holiday'],
+                'next_open': calendar['next_open']
             }
         except Exception as e:
             self.logger.error(f"시장 상태 조회 오류: {e}")
@@ -166,6 +176,36 @@ class BaseAPIClient(ABC):
         """가격 캐시 저장"""
         self.price_cache[symbol] = (price, time.time())
 
+    def add_price_listener(self, listener):
+        """
+        시세 조회 성공 시 호출될 리스너 등록
+
+        Args:
+            listener: callable(symbol, price, volume=None) (예: IndicatorBook.update)
+        """
+        if listener not in self._price_listeners:
+            self._price_listeners.append(listener)
+
+    def remove_price_listener(self, listener):
+        """가격 리스너 해제"""
+        if listener in self._price_listeners:
+            self._price_listeners.remove(listener)
+
+    def _notify_price(self, symbol: str, price: float, volume: float = None):
+        """
+        조회한 시세를 리스너에 전달 (서브클래스 get_current_price에서 호출)
+
+        Args:
+            symbol: 종목 코드
+            price: 현재가
+            volume: 당일 누적 거래량 (선택)
+        """
+        for listener in self._price_listeners:
+            try:
+                listener(symbol, price, volume)
+            except Exception as e:
+                self.logger.debug(f"가격 리스너 오류 ({symbol}): {e}")
+
     def clear_cache(self):
         """캐시 전체 삭제"""
         self.price_cache.clear()
@@ -1,11 +1,20 @@
 """
 베이스 전략 클래스 - 미국/한국 주식 공통 전략 기능
 """
+import os
 import logging
+import threading
+import time
 from abc import ABC, abstractmethod
 from typing import Optional, Dict, Any, List
 from datetime import datetime
 
+from .price_trigger import PriceTrigger, ABOVE
+from .indicators import IndicatorBook
+from .condition_dsl import compile_condition, build_frame, ConditionSyntaxError
+from .refresh_scheduler import (proximity, REFRESH_EXIT_SCALE,
+                                REFRESH_RANKING_SCALE, REFRESH_FILTER_SCALE)
+
 
 class BaseStrategy(ABC):
     """
@@ -18,6 +27,7 @@ class BaseStrategy(ABC):
     - should_sell(symbol, profit_rate): 매도 조건 확인
     - get_watch_list(): 감시 종목 리스트 반환
     - get_filter_stocks(): 필터 종목 딕셔너리 반환
+    - sell_position(position, profit_rate): 단일 보유 종목 매도
     """
 
     def __init__(self, api_client, profit_threshold: float = 0.05,
@@ -44,11 +54,47 @@ class BaseStrategy(ABC):
         self.logger = logging.getLogger(self.__class__.__name__)
 
         # 매도 가격 기록 (재매수 방지용)
+        # 영구 저장소(SellPriceStore)가 있으면 재시작 후에도 유지, 없으면 메모리만 사용
         self.last_sell_prices: Dict[str, float] = {}
+        self.sell_price_store = None
+        self.sell_price_expiry_days: Optional[float] = None
 
         # 손절 추적 (서브클래스에서 초기화)
         self.stop_loss_tracker = None
 
+        # 상태 파일 디렉토리 (None이면 현재 디렉토리 = 실거래 상태, 백테스트는 결과 디렉토리)
+        self.state_dir: Optional[str] = None
+
+        # 트레일링 스탑 추적 (종목 설정 파일에서 활성화 시 _setup_trailing_stop으로 초기화)
+        self.trailing_stop = None
+
+        # 설정 파일 조건식 (conditions.filter / conditions.buy / 섹터별 filter_condition)
+        self.filter_condition = None
+        self.buy_condition = None
+        self.sector_conditions: Dict[str, Any] = {}
+
+        # 장중 지표 (API 클라이언트 시세 조회 시 자동 갱신, 추가 API 호출 없음)
+        # 공유 데이터 계층(MarketDataHub)을 쓰면 전략 간 같은 지표 상태를 공유
+        shared_indicators = getattr(api_client, 'indicators', None)
+        if isinstance(shared_indicators, IndicatorBook):
+            self.indicators = shared_indicators
+        else:
+            self.indicators = IndicatorBook(timezone=self._get_client_timezone())
+            if hasattr(api_client, 'add_price_listener'):
+                api_client.add_price_listener(self.indicators.update)
+
+        # 적응형 시세 갱신 (StrategyHost에서 설정, 없으면 경계 근접도 보고 생략)
+        self.refresh_scheduler = None
+
+        # 마지막 잔고 스냅샷 (포지션 감시 등에서 재사용)
+        self._balance_snapshot: Optional[Dict[str, Any]] = None
+        self._balance_snapshot_time: float = 0.0
+        self._balance_snapshot_stale: bool = True
+
+        # 매도 경로 직렬화 (정기 매도 주기와 포지션 감시 스레드 간 중복 매도 방지)
+        self.sell_lock = threading.RLock()
+        self._last_sold_at: Dict[str, float] = {}
+
         # 전략 실행 통계
         self.stats = {
             'buy_attempts': 0,
@@ -123,6 +169,112 @@ class BaseStrategy(ABC):
         """필터 종목 딕셔너리 반환"""
         pass
 
+    @abstractmethod
+    def sell_position(self, position: Dict[str, Any], profit_rate: float,
+                      reason: str = None, as_of: float = None) -> Optional[Dict[str, Any]]:
+        """
+        단일 보유 종목 매도 (정기 매도 주기와 포지션 감시가 공유하는 매도 경로)
+
+        Args:
+            position: get_account_balance()의 positions 항목
+                      (current_price는 매도 판단에 사용한 가격)
+            profit_rate: 수익률 (소수, 예: 0.05 = 5%)
+            reason: 매도 사유 (로그용, 예: 'watcher')
+            as_of: position 정보의 조회 시각 (이후 이미 매도됐으면 스킵)
+
+        Returns:
+            실행된 주문 정보 딕셔너리 (미실행/실패 시 None)
+        """
+        pass
+
+    def get_exit_triggers(self, position: Dict[str, Any]) -> List[PriceTrigger]:
+        """
+        보유 종목 청산 조건을 절대 가격선으로 변환 (PriceTriggerIndex 구성용)
+
+        should_sell(symbol, profit_rate)과 같은 조건을 가격으로 표현해야 함.
+        기본 구현은 익절선만 반환하며, 손절 등은 서브클래스에서 추가.
+
+        Args:
+            position: get_account_balance()의 positions 항목
+
+        Returns:
+            list: [PriceTrigger(price, direction, reason), ...]
+        """
+        avg_price = position.get('avg_price', 0)
+        if avg_price <= 0:
+            return []
+        triggers = [PriceTrigger(avg_price * (1 + self.profit_threshold), ABOVE, 'take_profit')]
+
+        if self.trailing_stop is not None:
+            trailing = self.trailing_stop.get_trigger(position['symbol'])
+            if trailing is not None:
+                triggers.append(trailing)
+
+        return triggers
+
+    def _setup_trailing_stop(self, stocks_config: Dict[str, Any], state_file: str, timezone: str):
+        """
+        종목 설정 파일의 "trailing_stop" 블록으로 트레일링 스탑 초기화
+
+        Args:
+            stocks_config: 종목 설정 JSON 딕셔너리
+            state_file: 최고가 저장 파일 (예: "kr_trailing_stop.json")
+            timezone: 시장 타임존
+        """
+        from trailing_stop import TrailingStopTracker
+
+        self.trailing_stop = TrailingStopTracker.from_stocks_config(stocks_config, state_file, timezone)
+        if self.trailing_stop is not None:
+            config = self.trailing_stop.config
+            self.logger.info(f"트레일링 스탑 활성화: 최고가 대비 -{config['trail_rate']*100:.1f}% "
+                             f"(활성화 기준 +{config.get('activation_rate', 0)*100:.1f}%, "
+                             f"섹터별 설정 {len(self.trailing_stop.sector_configs)}개)")
+
+    def _state_path(self, filename: str) -> str:
+        """상태 파일 경로 (state_dir 지정 시 그 아래로 - 다른 디렉토리의 파일을 건드리지 않도록 파일명만 사용)"""
+        if self.state_dir:
+            return os.path.join(self.state_dir, os.path.basename(filename))
+        return filename
+
+    def _trailing_state_file(self, default_state_file: str, default_config_file: str) -> str:
+        """
+        트레일링 스탑 저장 파일 경로
+
+        기본 종목 설정 파일이 아닌 설정(멀티 전략)을 쓰면 설정 파일 이름 기준으로 분리
+
+        Args:
+            default_state_file: 기본 저장 파일 (예: "kr_trailing_stop.json")
+            default_config_file: 시장 기본 종목 설정 파일
+        """
+        config_file = getattr(self, 'stocks_config_file', None)
+        if not config_file or config_file == default_config_file:
+            return self._state_path(default_state_file)
+        return self._state_path(f"{os.path.splitext(config_file)[0]}_trailing_stop.json")
+
+    def check_trailing_stop(self, position: Dict[str, Any]) -> bool:
+        """
+        트레일링 스탑 발동 여부 확인 (현재가로 최고가 갱신 포함)
+
+        Args:
+            position: get_account_balance()의 positions 항목
+
+        Returns:
+            True: 최고가 대비 하락폭이 기준 이상 (매도 필요)
+        """
+        if self.trailing_stop is None:
+            return False
+
+        symbol = position['symbol']
+        current_price = position.get('current_price', 0)
+        if current_price <= 0:
+            return False
+
+        if self.trailing_stop.is_triggered(symbol, current_price):
+            self.logger.warning(f"{symbol}: 트레일링 스탑 조건 충족 (현재가 {current_price}, "
+                                f"손절선 {self.trailing_stop.get_stop_price(symbol):.2f})")
+            return True
+        return False
+
     def get_sectors(self) -> Optional[Dict[str, Any]]:
         """
         섹터 구조 반환 (섹터별 필터링 사용 시)
@@ -146,6 +298,10 @@ class BaseStrategy(ABC):
             self.logger.debug("필터 체크 비활성화됨")
             return True
 
+        # 설정 파일에 조건식이 있으면 조건식으로 평가
+        if self.filter_condition is not None or self.sector_conditions:
+            return self._check_condition_filter()
+
         # 섹터 구조가 있으면 섹터별 OR 필터 로직 사용
         sectors = self.get_sectors()
         if sectors:
@@ -158,6 +314,7 @@ class BaseStrategy(ABC):
             self.logger.debug("필터 종목 없음 - 필터 조건 통과")
             return True
 
+        changes = {}
         for symbol in filter_stocks.keys():
             try:
                 current_price = self.api_client.get_current_price(symbol)
@@ -167,16 +324,23 @@ class BaseStrategy(ABC):
                     self.logger.warning(f"필터 종목 {symbol} 가격 조회 실패")
                     continue
 
+                if previous_close > 0:
+                    changes[symbol] = (current_price - previous_close) / previous_close
+
                 if current_price <= previous_close:
                     self.logger.info(f"필터 조건 미충족: {symbol} 하락 중 "
                                    f"(현재: {current_price}, 전일: {previous_close})")
                     self.stats['filter_blocks'] += 1
+                    self._report_refresh_signals('filter', {
+                        s: proximity(c, REFRESH_FILTER_SCALE) for s, c in changes.items()})
                     return False
 
             except Exception as e:
                 self.logger.error(f"필터 종목 {symbol} 확인 오류: {e}")
                 continue
 
+        self._report_refresh_signals('filter', {
+            s: proximity(c, REFRESH_FILTER_SCALE) for s, c in changes.items()})
         self.logger.info("필터 조건 충족 - 모든 필터 종목 상승 중")
         return True
 
@@ -194,6 +358,7 @@ class BaseStrategy(ABC):
             False: 모든 섹터가 필터 조건 미충족
         """
         passing_sectors = []
+        filter_urgencies = {}
 
         for sector_key, sector_info in sectors.items():
             sector_name = sector_info.get('name', sector_key)
@@ -206,6 +371,7 @@ class BaseStrategy(ABC):
             # 섹터 내부 OR 로직: 하나라도 상승하면 해당 섹터 통과
             sector_passed = False
             rising_stocks = []
+            changes = {}
 
             for symbol in filter_stocks.keys():
                 try:
@@ -216,6 +382,9 @@ class BaseStrategy(ABC):
                         self.logger.warning(f"섹터 {sector_name} 필터 종목 {symbol} 가격 조회 실패")
                         continue
 
+                    if previous_close > 0:
+                        changes[symbol] = (current_price - previous_close) / previous_close
+
                     if current_price > previous_close:
                         rising_stocks.append(symbol)
                         sector_passed = True
@@ -226,6 +395,11 @@ class BaseStrategy(ABC):
                     self.logger.error(f"섹터 {sector_name} 필터 종목 {symbol} 확인 오류: {e}")
                     continue
 
+            # 경계 근접도: 섹터의 유일한 상승 종목은 하락 전환 시 섹터가 탈락하므로 최우선
+            for symbol, change in changes.items():
+                urgency = 1.0 if rising_stocks == [symbol] else proximity(change, REFRESH_FILTER_SCALE)
+                filter_urgencies[symbol] = max(urgency, filter_urgencies.get(symbol, 0.0))
+
             if sector_passed:
                 passing_sectors.append({
                     'sector_key': sector_key,
@@ -236,6 +410,8 @@ class BaseStrategy(ABC):
             else:
                 self.logger.debug(f"✗ 섹터 {sector_name} 미통과: 모든 필터 종목 하락/보합")
 
+        self._report_refresh_signals('filter', filter_urgencies)
+
         # 섹터 간 OR 로직: 하나 이상의 섹터가 통과하면 OK
         if passing_sectors:
             self.logger.info(f"필터 조건 충족 - {len(passing_sectors)}개 섹터 통과")
@@ -248,6 +424,274 @@ class BaseStrategy(ABC):
             self._passing_sectors = []
             return False
 
+    def _load_conditions(self, config: Dict[str, Any]):
+        """
+        종목 설정 파일의 조건식 컴파일 (설정 로드 시 1회)
+
+        - conditions.filter: 매수 게이트 (섹터 모드에서는 섹터마다 평가)
+        - conditions.buy: 매수 후보 종목별 조건
+        - sectors.<key>.filter_condition: 섹터별 매수 게이트 (conditions.filter 대신 사용)
+
+        문법 오류가 있는 조건식은 로그만 남기고 무시 (기존 필터 로직 유지)
+
+        Args:
+            config: 종목 설정 JSON 딕셔너리
+        """
+        conditions = config.get('conditions') or {}
+        sectors = config.get('sectors') or {}
+
+        filter_groups = ['filter_stocks', 'sector.filter_stocks', 'all.filter_stocks']
+        filter_groups += [f"{key}.filter_stocks" for key in sectors]
+
+        def compile_or_none(text, groups, label):
+            if not text:
+                return None
+            try:
+                condition = compile_condition(text, allowed_groups=groups)
+                self.logger.info(f"[CONDITION] {label}: {text}")
+                return condition
+            except ConditionSyntaxError as e:
+                self.logger.error(f"[CONDITION] {label} 조건식 오류 → 무시: {e}")
+                return None
+
+        self.filter_condition = compile_or_none(conditions.get('filter'), filter_groups, "필터")
+        self.buy_condition = compile_or_none(conditions.get('buy'), [], "매수")
+        self.sector_conditions = {}
+        for key, info in sectors.items():
+            condition = compile_or_none(info.get('filter_condition'), filter_groups,
+                                        f"섹터 {info.get('name', key)} 필터")
+            if condition is not None:
+                self.sector_conditions[key] = condition
+
+    def _fetch_condition_rows(self, symbols: List[str]) -> List[Dict[str, Any]]:
+        """조건 평가용 종목별 현재가/전일 종가 (종목당 1회 조회)"""
+        rows = []
+        for symbol in symbols:
+            try:
+                rows.append({
+                    'symbol': symbol,
+                    'current_price': self.api_client.get_current_price(symbol),
+                    'previous_close': self._get_previous_close(symbol)
+                })
+            except Exception as e:
+                self.logger.error(f"필터 종목 {symbol} 확인 오류: {e}")
+                rows.append({'symbol': symbol, 'current_price': None, 'previous_close': None})
+        return rows
+
+    def _check_condition_filter(self) -> bool:
+        """
+        조건식 기반 필터 조건 확인
+
+        - 섹터 모드: 전체 섹터의 필터 종목을 한 번에 조회/배열화한 뒤 섹터마다 조건 평가
+          (섹터 조건 → 시장 조건 → 기존 OR 규칙 순), 하나라도 통과하면 매수 허용
+        - 레거시 모드: 필터 종목 전체에 시장 조건 평가
+        - 퀀티파이어 없는 조건은 대상 필터 종목 전체가 만족해야 통과
+        """
+        sectors = self.get_sectors()
+        if sectors:
+            members = {key: list(info.get('filter_stocks', {}).keys()) for key, info in sectors.items()}
+        else:
+            members = {None: list(self.get_filter_stocks().keys())}
+
+        symbols = list(dict.fromkeys(s for group in members.values() for s in group))
+        if not symbols:
+            self.logger.debug("필터 종목 없음 - 필터 조건 통과")
+            return True
+
+        conditions = [c for c in [self.filter_condition, *self.sector_conditions.values()] if c]
+        fields = set().union(*(c.fields for c in conditions)) | {'change'}
+        groups = {'all.filter_stocks': symbols}
+        groups.update({f"{key}.filter_stocks": group for key, group in members.items() if key})
+        frame = build_frame(self._fetch_condition_rows(symbols), fields, self.indicators, groups)
+
+        if not sectors:
+            rows = frame.indices(members[None])
+            scoped = frame.with_groups({'filter_stocks': rows, 'sector.filter_stocks': rows})
+            if self.filter_condition.evaluate_all(scoped, rows):
+                self.logger.info(f"필터 조건 충족 - {self.filter_condition.text}")
+                return True
+            self.logger.info(f"필터 조건 미충족 - {self.filter_condition.text}")
+            self.stats['filter_blocks'] += 1
+            return False
+
+        change = frame.column('change')
+        passing_sectors = []
+        for sector_key, sector_info in sectors.items():
+            sector_name = sector_info.get('name', sector_key)
+            rows = frame.indices(members[sector_key])
+            if not rows.size:
+                continue
+
+            scoped = frame.with_groups({'filter_stocks': rows, 'sector.filter_stocks': rows})
+            condition = self.sector_conditions.get(sector_key) or self.filter_condition
+            if condition is not None:
+                passed = condition.evaluate_all(scoped, rows)
+            else:
+                passed = bool((change[rows] > 0).any())
+
+            if passed:
+                rising = [frame.symbols[i] for i in rows if change[i] > 0]
+                passing_sectors.append({
+                    'sector_key': sector_key,
+                    'sector_name': sector_name,
+                    'rising_stocks': rising
+                })
+                self.logger.info(f"✓ 섹터 {sector_name} 통과"
+                                 f"{f' ({condition.text})' if condition is not None else ''}")
+            else:
+                self.logger.debug(f"✗ 섹터 {sector_name} 미통과")
+
+        self._passing_sectors = passing_sectors
+        if passing_sectors:
+            self.logger.info(f"필터 조건 충족 - {len(passing_sectors)}개 섹터 통과")
+            return True
+
+        self.logger.info("필터 조건 미충족 - 모든 섹터 미통과")
+        self.stats['filter_blocks'] += 1
+        return False
+
+    def apply_buy_condition(self, candidates: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        매수 후보에 conditions.buy 조건식 적용 (후보 전체를 한 번에 벡터 평가)
+
+        Args:
+            candidates: [{'symbol', 'current_price', 'previous_close', ...}, ...]
+
+        Returns:
+            조건을 만족하는 후보 (조건식 없으면 그대로)
+        """
+        if self.buy_condition is None or not candidates:
+            return candidates
+
+        frame = build_frame(candidates, self.buy_condition.fields, self.indicators)
+        mask = self.buy_condition.evaluate(frame)
+        selected = [c for c, ok in zip(candidates, mask) if ok]
+
+        if len(selected) < len(candidates):
+            self.logger.info(f"[CONDITION] 매수 조건 통과 {len(selected)}/{len(candidates)}종목 "
+                             f"({self.buy_condition.text})")
+        return selected
+
+    def refresh_balance_snapshot(self) -> Optional[Dict[str, Any]]:
+        """
+        계좌 잔고 조회 후 스냅샷으로 보관
+
+        Returns:
+            잔고 딕셔너리 (실패 시 None, 기존 스냅샷은 유지)
+        """
+        balance = self.api_client.get_account_balance()
+        if balance:
+            self._balance_snapshot = balance
+            self._balance_snapshot_time = time.time()
+            self._balance_snapshot_stale = False
+            if self.trailing_stop is not None:
+                self.trailing_stop.sync_positions(balance.get('positions', []))
+            self._report_exit_signals(balance.get('positions', []))
+        return balance
+
+    def _report_refresh_signals(self, source: str, urgencies: Dict[str, float]):
+        """경계 근접도를 적응형 시세 갱신기에 보고 (갱신기 없으면 무시)"""
+        if self.refresh_scheduler is not None:
+            self.refresh_scheduler.update_signals(source, urgencies)
+
+    def _report_exit_signals(self, positions: List[Dict[str, Any]]):
+        """보유 종목 현재가와 가장 가까운 청산 가격선 거리로 근접도 보고"""
+        if self.refresh_scheduler is None:
+            return
+
+        urgencies = {}
+        for position in positions:
+            price = position.get('current_price', 0)
+            if price <= 0 or position.get('avg_price', 0) <= 0:
+                continue
+            try:
+                triggers = self.get_exit_triggers(position)
+            except Exception as e:
+                self.logger.debug(f"청산 가격선 계산 오류 ({position.get('symbol')}): {e}")
+                continue
+            if triggers:
+                distance = min(abs(price - trigger.price) for trigger in triggers) / price
+                urgencies[position['symbol']] = proximity(distance, REFRESH_EXIT_SCALE)
+        self._report_refresh_signals('exit', urgencies)
+
+    def _report_ranking_signals(self, candidates: List[Dict[str, Any]], count: int):
+        """
+        하락률 상위 N 커트라인까지의 거리로 근접도 보고
+
+        Args:
+            candidates: 하락률 내림차순 정렬된 후보 리스트
+            count: 매수 대상 상위 종목 수
+        """
+        if self.refresh_scheduler is None or not candidates:
+            return
+
+        if len(candidates) <= count:
+            # 후보가 모두 선택되므로 순위 경계 없음
+            urgencies = {stock['symbol']: 0.0 for stock in candidates}
+        else:
+            cutoff = (candidates[count - 1]['decline_rate'] + candidates[count]['decline_rate']) / 2
+            urgencies = {stock['symbol']: proximity(stock['decline_rate'] - cutoff, REFRESH_RANKING_SCALE)
+                         for stock in candidates}
+        self._report_refresh_signals('ranking', urgencies)
+
+    def get_balance_snapshot(self) -> tuple:
+        """
+        마지막 잔고 스냅샷 반환 (API 호출 없음)
+
+        Returns:
+            (balance 또는 None, 스냅샷 경과 시간(초), 만료 처리된 경우 inf)
+        """
+        if self._balance_snapshot is None or self._balance_snapshot_stale:
+            return self._balance_snapshot, float('inf')
+        return self._balance_snapshot, time.time() - self._balance_snapshot_time
+
+    def get_balance_snapshot_time(self) -> float:
+        """마지막 잔고 스냅샷 조회 시각 (epoch 초, 없으면 0)"""
+        return self._balance_snapshot_time
+
+    def invalidate_balance_snapshot(self):
+        """주문 체결 등으로 보유 현황이 바뀌었을 때 스냅샷 만료 처리"""
+        self._balance_snapshot_stale = True
+
+    def mark_sold(self, symbol: str):
+        """매도 주문 성공 기록 (스냅샷 만료 포함)"""
+        self._last_sold_at[symbol] = time.time()
+        self.invalidate_balance_snapshot()
+        if self.trailing_stop is not None:
+            self.trailing_stop.remove(symbol)
+
+    def was_sold_since(self, symbol: str, as_of: Optional[float]) -> bool:
+        """
+        as_of 시각 이후 해당 종목이 이미 매도되었는지 확인
+
+        Args:
+            symbol: 종목 코드
+            as_of: 포지션 정보 조회 시각 (None이면 확인 안 함)
+        """
+        if not as_of:
+            return False
+        return self._last_sold_at.get(symbol, 0) >= as_of
+
+    def _get_client_timezone(self) -> Optional[str]:
+        """API 클라이언트의 시장 타임존 (조회 실패 시 None)"""
+        try:
+            return self.api_client.get_timezone()
+        except Exception:
+            return None
+
+    def get_indicator(self, symbol: str, name: str) -> Optional[float]:
+        """
+        장중 지표 값 조회 (should_buy, 필터 조건 등에서 사용)
+
+        Args:
+            symbol: 종목 코드
+            name: 'vwap', 'ema_12', 'ema_26', 'return', 'volatility', 'high', 'low', 'price'
+
+        Returns:
+            지표 값 (당일 시세 데이터가 부족하면 None)
+        """
+        return self.indicators.get_value(symbol, name)
+
     def get_passing_sectors(self) -> List[Dict[str, Any]]:
         """
         필터 조건을 통과한 섹터 리스트 반환
@@ -270,18 +714,24 @@ class BaseStrategy(ABC):
         return None
 
     def record_sell_price(self, symbol: str, price: float):
-        """매도 가격 기록"""
+        """매도 가격 기록 (영구 저장소가 있으면 즉시 파일 반영)"""
         self.last_sell_prices[symbol] = price
+        if self.sell_price_store is not None:
+            self.sell_price_store.record(symbol, price)
         self.logger.debug(f"매도 가격 기록: {symbol} @ {price}")
 
     def get_last_sell_price(self, symbol: str) -> Optional[float]:
-        """마지막 매도 가격 조회"""
+        """마지막 매도 가격 조회 (만료 기간이 지난 기록은 None)"""
+        if self.sell_price_store is not None:
+            return self.sell_price_store.get(symbol, self.sell_price_expiry_days)
         return self.last_sell_prices.get(symbol)
 
     def clear_sell_price(self, symbol: str):
         """매도 가격 기록 삭제"""
         if symbol in self.last_sell_prices:
             del self.last_sell_prices[symbol]
+        if self.sell_price_store is not None:
+            self.sell_price_store.remove(symbol)
 
     def is_price_above_last_sell(self, symbol: str, current_price: float) -> bool:
         """
@@ -337,8 +787,10 @@ class BaseStrategy(ABC):
                 self.logger.debug(f"종목 {symbol} 하락률 계산 오류: {e}")
                 continue
 
-        # 하락률 내림차순 정렬 후 상위 N개 반환
+        # 매수 조건식 적용 후 하락률 내림차순 정렬, 상위 N개 반환
+        declining_stocks = self.apply_buy_condition(declining_stocks)
         declining_stocks.sort(key=lambda x: x['decline_rate'], reverse=True)
+        self._report_ranking_signals(declining_stocks, count)
         return declining_stocks[:count]
 
     def get_strategy_stats(self) -> Dict[str, Any]:
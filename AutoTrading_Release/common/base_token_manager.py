@@ -6,9 +6,12 @@ import time
 import os
 import requests
 import logging
+import threading
 from abc import ABC, abstractmethod
 from datetime import datetime
 
+from . import http
+
 
 class BaseTokenManager(ABC):
     """
@@ -24,6 +27,10 @@ class BaseTokenManager(ABC):
     TOKEN_EXPIRY_HOURS = 24  # KIS API 토큰 유효 기간
     REFRESH_THRESHOLD_HOURS = 5  # 이 시간 이하 남으면 갱신
 
+    # 토큰 파일별 잠금 (같은 토큰을 쓰는 여러 시장/워커가 동시에 재발급하지 않도록 인스턴스 간 공유)
+    _file_locks = {}
+    _file_locks_guard = threading.Lock()
+
     def __init__(self, token_dir=None):
         """
         Args:
@@ -54,6 +61,14 @@ class BaseTokenManager(ABC):
         filename = f"{prefix}_token_issued_at.dat" if prefix else "token_issued_at.dat"
         return os.path.join(self.token_dir, filename)
 
+    def _token_lock(self) -> threading.Lock:
+        """토큰 파일 단위 잠금 (프로세스 공용)"""
+        with BaseTokenManager._file_locks_guard:
+            lock = BaseTokenManager._file_locks.get(self.token_file)
+            if lock is None:
+                lock = BaseTokenManager._file_locks[self.token_file] = threading.Lock()
+            return lock
+
     @abstractmethod
     def get_api_url(self) -> str:
         """API 베이스 URL 반환 (실전/모의 구분 포함)"""
@@ -168,7 +183,7 @@ class BaseTokenManager(ABC):
             }
 
             self.logger.info("[TOKEN] 새 토큰 발급 API 호출 중...")
-            response = requests.post(url, headers=headers, json=data, timeout=10)
+            response = http.post(url, headers=headers, json=data, timeout=10)
 
             if response.status_code == 200:
                 result = response.json()
@@ -269,7 +284,11 @@ class BaseTokenManager(ABC):
             self.logger.error(f"[TOKEN] 파일 삭제 오류: {e}")
 
     def get_valid_token(self, force_refresh=False) -> str:
-        """유효한 토큰 반환 (만료 시 자동 재발급)"""
+        """유효한 토큰 반환 (만료 시 자동 재발급, 같은 토큰 파일은 한 번에 한 곳에서만 재발급)"""
+        with self._token_lock():
+            return self._get_valid_token(force_refresh)
+
+    def _get_valid_token(self, force_refresh=False) -> str:
         if not force_refresh:
             existing_token = self.load_token()
             if existing_token:
@@ -0,0 +1,393 @@
+"""
+API 녹화/재생 카세트 - KIS/mojito2/yfinance 트래픽을 기록해 같은 입력으로 주기를 다시 실행
+
+느리거나 잘못된 주기를 재현하려면 시장이 같은 상황을 다시 만들기를 기다려야 했다.
+카세트는 모든 API 클라이언트 아래에서 요청/응답과 소요 시간을 기록하고, 재생 모드에서
+기록된 순서 그대로 (기록 속도 또는 가속) 응답해 전략 주기 성능을 오프라인에서 같은 입력으로 측정한다.
+
+- HTTP: requests.Session.request 패치 (클라이언트의 requests.get/post와 mojito2 브로커 호출 모두 포함)
+- 호출: 시계 의존 메서드(is_market_open)와 yfinance 호출(거래소 감지, 일괄 폴백 다운로드)은 반환값을 기록
+  (DEFAULT_CALL_TARGETS - 현재가/전일 종가 폴백은 모두 BulkQuoteFallback._download를 거침)
+- 형식: gzip JSON Lines (첫 줄 헤더, 이후 이벤트 1줄씩)
+- 키: 메서드 + 경로(호스트 제외) + tr_id + 정렬된 파라미터/본문, 같은 키는 기록 순서대로 응답
+  (기록보다 더 많이 호출되면 마지막 응답을 반복, 기록에 없는 요청은 CassetteMiss)
+- 보안: 앱키/시크릿/토큰/계좌번호는 기록 전에 가림 (REDACT_KEYS)
+
+사용 예:
+    with Cassette('cassettes/kr_cycle.jsonl.gz', mode='record'):
+        scheduler.host.execute_sell_strategy()
+
+    with Cassette('cassettes/kr_cycle.jsonl.gz', mode='replay', speed=0):
+        scheduler.host.execute_sell_strategy()
+"""
+import base64
+import gzip
+import importlib
+import json
+import logging
+import os
+import re
+import threading
+import time
+from collections import deque
+from datetime import datetime, timedelta
+from typing import Optional, Dict, Any, List, Tuple
+from urllib.parse import urlsplit, parse_qsl
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+
+CASSETTE_FORMAT_VERSION = 1
+FLUSH_EVERY = 50            # 녹화 시 이벤트 N개마다 gzip 버퍼 비우기 (비정상 종료 대비)
+REDACTED = '***'
+
+# 기록 전에 값을 가리는 키 (헤더/파라미터/본문/응답, 대소문자 무시)
+REDACT_KEYS = {'appkey', 'appsecret', 'secretkey', 'authorization', 'access_token',
+               'approval_key', 'cano', 'hash', 'hashkey'}
+# 매칭 키와 기록에 포함하는 요청 헤더
+KEY_HEADERS = ('tr_id', 'tr_cont')
+# 기록하는 응답 헤더
+RESPONSE_HEADERS = ('content-type', 'tr_id', 'tr_cont')
+
+# (모듈, 클래스, 메서드) - 반환값을 기록/재생하는 호출 (시계 의존 + 외부 라이브러리)
+DEFAULT_CALL_TARGETS = (
+    ('kis_api', 'KISAPIClient', ('is_market_open', '_detect_exchange_yfinance')),
+    ('us.api_client', 'USAPIClient', ('is_market_open', '_detect_exchange_yfinance')),
+    ('kr.api_client', 'KRAPIClient', ('is_market_open',)),
+    ('common.quote_fallback', 'BulkQuoteFallback', ('_download',)),
+)
+
+# 재생 시 다시 발생시키는 requests 예외
+REQUEST_ERRORS = {name: getattr(requests.exceptions, name) for name in
+                  ('Timeout', 'ReadTimeout', 'ConnectTimeout', 'ConnectionError', 'HTTPError', 'RequestException')}
+
+
+class CassetteMiss(requests.exceptions.ConnectionError):
+    """재생 중 카세트에 없는 요청 (클라이언트에는 네트워크 오류로 보임)"""
+
+
+def _redact(value):
+    """딕셔너리/리스트 안의 민감 키 값 가리기"""
+    if isinstance(value, dict):
+        return {key: (REDACTED if str(key).lower() in REDACT_KEYS else _redact(item))
+                for key, item in value.items()}
+    if isinstance(value, list):
+        return [_redact(item) for item in value]
+    return value
+
+
+def _canonical(value) -> str:
+    return json.dumps(value, ensure_ascii=False, sort_keys=True, separators=(',', ':'), default=str)
+
+
+class Cassette:
+    """
+    HTTP/호출 녹화 및 재생기 (설치 중에는 프로세스 전역, 스레드 안전)
+
+    install()/uninstall() 또는 with 문으로 사용한다.
+    """
+
+    _active: Optional['Cassette'] = None
+
+    def __init__(self, path: str, mode: str = 'replay', speed: float = 1.0,
+                 call_targets: Tuple = DEFAULT_CALL_TARGETS):
+        """
+        Args:
+            path: 카세트 파일 (.jsonl.gz)
+            mode: 'record' 또는 'replay'
+            speed: 재생 속도 배수 (1.0 기록 속도, 10.0 10배 가속, 0이면 지연 없음)
+            call_targets: 반환값을 기록/재생할 (모듈, 클래스, 메서드들)
+        """
+        if mode not in ('record', 'replay'):
+            raise ValueError(f"지원하지 않는 카세트 모드: {mode}")
+        self.path = path
+        self.mode = mode
+        self.speed = speed
+        self.call_targets = call_targets
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+        self._lock = threading.Lock()
+        self._file = None
+        self._started = 0.0
+        self._seq = 0
+        self._queues: Dict[str, deque] = {}
+        self._last: Dict[str, Dict[str, Any]] = {}
+        self._patches: List[Tuple[Any, str, Any]] = []
+        self.header: Dict[str, Any] = {}
+
+        self.stats = {
+            'http': 0,
+            'calls': 0,
+            'errors': 0,
+            'misses': 0,
+            'repeats': 0,
+            'recorded_seconds': 0.0
+        }
+
+    # ===== 설치/해제 =====
+
+    def __enter__(self):
+        self.install()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.uninstall()
+        return False
+
+    def install(self):
+        """requests와 호출 대상 메서드 패치"""
+        if Cassette._active is not None:
+            raise RuntimeError("이미 다른 카세트가 설치되어 있습니다")
+
+        if self.mode == 'record':
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._file = gzip.open(self.path, 'wt', encoding='utf-8')
+            self.header = {
+                'version': CASSETTE_FORMAT_VERSION,
+                'created': datetime.now().isoformat(),
+                'started_at': time.time()
+            }
+            self._file.write(json.dumps(self.header) + '\n')
+        else:
+            self._load()
+
+        self._started = time.monotonic()
+        self._patch(requests.sessions.Session, 'request', self._wrap_request)
+        for module_name, class_name, methods in self.call_targets:
+            try:
+                cls = getattr(importlib.import_module(module_name), class_name)
+            except Exception as e:
+                self.logger.debug(f"[CASSETTE] 호출 대상 건너뜀: {module_name}.{class_name} ({e})")
+                continue
+            for method in methods:
+                if hasattr(cls, method):
+                    self._patch(cls, method, lambda original, name=f"{class_name}.{method}": self._wrap_call(name, original))
+
+        Cassette._active = self
+        self.logger.info(f"[CASSETTE] {'녹화' if self.mode == 'record' else '재생'} 시작: {self.path}"
+                         + (f" (속도 x{self.speed:g})" if self.mode == 'replay' else ''))
+
+    def uninstall(self):
+        """패치 복원 및 녹화 파일 닫기"""
+        for owner, name, original in reversed(self._patches):
+            if original is None:
+                delattr(owner, name)
+            else:
+                setattr(owner, name, original)
+        self._patches.clear()
+
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+        if Cassette._active is self:
+            Cassette._active = None
+
+        self.logger.info(f"[CASSETTE] 종료: HTTP {self.stats['http']}건, 호출 {self.stats['calls']}건, "
+                         f"미일치 {self.stats['misses']}건, 반복 {self.stats['repeats']}건")
+
+    def is_installed(self) -> bool:
+        return Cassette._active is self
+
+    def _patch(self, owner, name: str, wrap):
+        original = owner.__dict__.get(name)
+        current = getattr(owner, name)
+        self._patches.append((owner, name, original))
+        setattr(owner, name, wrap(current))
+
+    # ===== 기록 =====
+
+    def _write(self, event: Dict[str, Any]):
+        with self._lock:
+            if self._file is None:
+                return
+            self._seq += 1
+            event['seq'] = self._seq
+            self._file.write(json.dumps(event, ensure_ascii=False, default=str) + '\n')
+            if self._seq % FLUSH_EVERY == 0:
+                self._file.flush()
+
+    def _load(self):
+        """카세트 읽기 (녹화 중 비정상 종료로 잘린 끝부분은 무시)"""
+        events = []
+        try:
+            with gzip.open(self.path, 'rt', encoding='utf-8') as f:
+                for line in f:
+                    if line.strip():
+                        events.append(json.loads(line))
+        except (EOFError, gzip.BadGzipFile, json.JSONDecodeError) as e:
+            self.logger.warning(f"[CASSETTE] 카세트 끝부분 손상 - {len(events)}줄까지 사용: {e}")
+
+        if not events:
+            raise ValueError(f"빈 카세트: {self.path}")
+        self.header = events[0]
+        for event in events[1:]:
+            self._queues.setdefault(event['key'], deque()).append(event)
+        if len(events) > 1:
+            self.stats['recorded_seconds'] = round(events[-1]['t'] + events[-1].get('elapsed', 0), 3)
+
+    def _take(self, key: str) -> Optional[Dict[str, Any]]:
+        """키의 다음 기록 (소진되면 마지막 기록 반복)"""
+        with self._lock:
+            queue = self._queues.get(key)
+            if queue:
+                event = queue.popleft()
+                self._last[key] = event
+                return event
+            event = self._last.get(key)
+            if event is not None:
+                self.stats['repeats'] += 1
+            else:
+                self.stats['misses'] += 1
+            return event
+
+    def _delay(self, event: Dict[str, Any]):
+        if self.speed and event.get('elapsed'):
+            time.sleep(event['elapsed'] / self.speed)
+
+    # ===== HTTP =====
+
+    @staticmethod
+    def request_key(method: str, url: str, params=None, data=None, json_body=None,
+                    headers=None) -> Tuple[str, Dict[str, Any]]:
+        """
+        요청 매칭 키 (호스트 제외 경로 + tr_id + 정렬된 파라미터/본문, 민감 값 제외)
+
+        Returns:
+            (키 문자열, 기록용 요청 요약)
+        """
+        parts = urlsplit(url)
+        path = re.sub(r'/+', '/', parts.path)
+        query = dict(parse_qsl(parts.query, keep_blank_values=True))
+        if isinstance(params, dict):
+            query.update({key: value for key, value in params.items() if value is not None})
+
+        body = json_body
+        if body is None and data:
+            try:
+                body = json.loads(data)
+            except (TypeError, ValueError):
+                body = data if isinstance(data, str) else None
+
+        header_map = {str(key).lower(): value for key, value in (headers or {}).items()}
+        request = {
+            'method': method.upper(),
+            'path': path,
+            'headers': {key: header_map[key] for key in KEY_HEADERS if header_map.get(key)},
+            'params': _redact(query),
+            'body': _redact(body)
+        }
+        return _canonical(request), request
+
+    def _wrap_request(self, original):
+        cassette = self
+
+        def request(session, method, url, params=None, data=None, headers=None, **kwargs):
+            key, summary = cassette.request_key(method, url, params, data, kwargs.get('json'), headers)
+            if cassette.mode == 'replay':
+                return cassette._replay_http(key, url)
+
+            started = time.monotonic()
+            try:
+                response = original(session, method, url, params=params, data=data, headers=headers, **kwargs)
+            except requests.exceptions.RequestException as e:
+                cassette._record_http(key, summary, started, error=e)
+                raise
+            cassette._record_http(key, summary, started, response=response)
+            return response
+
+        return request
+
+    def _record_http(self, key: str, summary: Dict[str, Any], started: float,
+                     response: requests.Response = None, error: Exception = None):
+        event = {
+            'type': 'http',
+            'key': key,
+            't': round(started - self._started, 4),
+            'elapsed': round(time.monotonic() - started, 4),
+            'request': summary
+        }
+        if error is not None:
+            event['error'] = type(error).__name__
+            event['message'] = str(error)
+            self.stats['errors'] += 1
+        else:
+            event['status'] = response.status_code
+            event['headers'] = {name: response.headers[name] for name in RESPONSE_HEADERS if name in response.headers}
+            content = response.content or b''
+            try:
+                body = json.loads(content)
+                event['json'] = _redact(body)
+            except (ValueError, UnicodeDecodeError):
+                try:
+                    event['text'] = content.decode('utf-8')
+                except UnicodeDecodeError:
+                    event['base64'] = base64.b64encode(content).decode('ascii')
+        self.stats['http'] += 1
+        self._write(event)
+
+    def _replay_http(self, key: str, url: str) -> requests.Response:
+        event = self._take(key)
+        if event is None:
+            raise CassetteMiss(f"카세트에 없는 요청: {key}")
+        self._delay(event)
+        self.stats['http'] += 1
+
+        if 'error' in event:
+            raise REQUEST_ERRORS.get(event['error'], requests.exceptions.RequestException)(event.get('message', ''))
+
+        if 'json' in event:
+            content = json.dumps(event['json'], ensure_ascii=False).encode('utf-8')
+        elif 'text' in event:
+            content = event['text'].encode('utf-8')
+        else:
+            content = base64.b64decode(event.get('base64', ''))
+
+        response = requests.models.Response()
+        response.status_code = event['status']
+        response.headers = CaseInsensitiveDict(event.get('headers', {}))
+        response._content = content
+        response.encoding = 'utf-8'
+        response.url = url
+        response.elapsed = timedelta(seconds=event.get('elapsed', 0))
+        return response
+
+    # ===== 호출 =====
+
+    def _wrap_call(self, name: str, original):
+        cassette = self
+
+        def call(instance, *args, **kwargs):
+            key = _canonical({'call': name, 'args': args, 'kwargs': kwargs})
+            if cassette.mode == 'replay':
+                event = cassette._take(key)
+                if event is None:
+                    return original(instance, *args, **kwargs)
+                cassette._delay(event)
+                cassette.stats['calls'] += 1
+                return event['result']
+
+            started = time.monotonic()
+            result = original(instance, *args, **kwargs)
+            cassette.stats['calls'] += 1
+            cassette._write({
+                'type': 'call',
+                'key': key,
+                't': round(started - cassette._started, 4),
+                'elapsed': round(time.monotonic() - started, 4),
+                'result': result
+            })
+            return result
+
+        call.__name__ = getattr(original, '__name__', name)
+        call.__doc__ = getattr(original, '__doc__', None)
+        return call
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self.stats)
+            stats['pending'] = sum(len(queue) for queue in self._queues.values())
+        return stats
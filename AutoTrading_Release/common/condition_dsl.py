@@ -0,0 +1,420 @@
+"""
+조건식 DSL - 종목 설정 파일의 매수/필터 조건을 한 번 파싱해서
+NumPy 벡터 연산 평가 함수로 컴파일
+
+설정 예 (kr_stocks_config.json / us_stocks_config.json):
+
+    "conditions": {
+        "filter": "any of filter_stocks change > 0.5%",
+        "buy": "decline between 3% and 12% and volume > 100000"
+    }
+
+섹터 구조에서는 섹터별 "filter_condition"이 시장 "filter" 조건을 덮어쓴다.
+
+문법:
+    식        := or식
+    or식      := and식 ('or' and식)*
+    and식     := not식 ('and' not식)*
+    not식     := 'not' not식 | 기본식
+    기본식    := '(' 식 ')'
+               | ('any' | 'all') ['of'] 그룹 not식      # 그룹 내 OR / AND
+               | 값 비교연산자 값
+               | 값 'between' 값 'and' 값
+    값        := 항 (('+' | '-') 항)*
+    항        := 인자 (('*' | '/') 인자)*
+    인자      := 숫자['%'] | 필드 | '-' 인자
+
+    필드: price, prev_close, change, decline, volume, vwap, ema_<기간>,
+          return, volatility, high, low
+    그룹: filter_stocks, watch_list, sector.filter_stocks, all.filter_stocks,
+          <섹터키>.filter_stocks
+
+    퀀티파이어 본문은 not식 단위로 묶이므로 여러 조건은 괄호로 감싼다:
+        any of filter_stocks (change > 0.5% and volume > 1000)
+
+평가: 종목 배열(ConditionFrame)의 컬럼 전체에 대해 한 번에 계산하며,
+      값이 없는 종목(NaN)은 비교 결과가 False가 된다.
+"""
+import re
+from typing import Optional, Dict, Any, List, Iterable, Callable
+
+import numpy as np
+
+
+# 조건식에서 사용할 수 있는 필드
+CONDITION_FIELDS = {
+    'price', 'prev_close', 'change', 'decline', 'volume',
+    'vwap', 'return', 'volatility', 'high', 'low'
+}
+EMA_FIELD_PATTERN = re.compile(r'^ema_\d+$')
+
+# 장중 지표(IndicatorBook)에서 가져오는 필드
+INDICATOR_FIELDS = {'volume', 'vwap', 'return', 'volatility', 'high', 'low'}
+
+KEYWORDS = {'and', 'or', 'not', 'any', 'all', 'of', 'between'}
+
+_TOKEN_PATTERN = re.compile(r'''
+    \s*(?:
+        (?P<number>\d+(?:\.\d+)?%?)
+      | (?P<name>[A-Za-z_][A-Za-z0-9_]*(?:\.[A-Za-z0-9_]+)*)
+      | (?P<op>>=|<=|==|!=|>|<|\(|\)|\+|-|\*|/)
+    )''', re.VERBOSE)
+
+_COMPARE_OPS = {
+    '>': np.greater,
+    '>=': np.greater_equal,
+    '<': np.less,
+    '<=': np.less_equal,
+    '==': np.equal,
+    '!=': np.not_equal
+}
+
+_ARITH_OPS = {
+    '+': np.add,
+    '-': np.subtract,
+    '*': np.multiply,
+    '/': np.divide
+}
+
+
+class ConditionSyntaxError(ValueError):
+    """조건식 문법 오류"""
+    pass
+
+
+def is_valid_field(name: str) -> bool:
+    """조건식 필드명 검증"""
+    return name in CONDITION_FIELDS or bool(EMA_FIELD_PATTERN.match(name))
+
+
+class ConditionFrame:
+    """
+    조건 평가 입력 - 종목 배열과 필드별 NumPy 컬럼
+
+    Args:
+        symbols: 종목 코드 리스트 (행 순서)
+        columns: {필드명: np.ndarray(float, len(symbols))}
+        groups: {그룹명: 행 인덱스 배열}
+    """
+
+    def __init__(self, symbols: List[str], columns: Dict[str, np.ndarray],
+                 groups: Dict[str, np.ndarray] = None):
+        self.symbols = list(symbols)
+        self.columns = columns
+        self.groups = groups or {}
+        self._nan = np.full(len(self.symbols), np.nan)
+
+    def __len__(self) -> int:
+        return len(self.symbols)
+
+    def column(self, name: str) -> np.ndarray:
+        """필드 컬럼 (없으면 NaN 배열)"""
+        return self.columns.get(name, self._nan)
+
+    def group(self, name: str) -> np.ndarray:
+        """그룹 행 인덱스 (없으면 빈 배열)"""
+        return self.groups.get(name, np.empty(0, dtype=np.intp))
+
+    def indices(self, symbols: Iterable[str]) -> np.ndarray:
+        """종목 리스트 → 행 인덱스 배열"""
+        positions = {symbol: i for i, symbol in enumerate(self.symbols)}
+        return np.array([positions[s] for s in symbols if s in positions], dtype=np.intp)
+
+    def with_groups(self, groups: Dict[str, np.ndarray]) -> 'ConditionFrame':
+        """그룹만 바꾼 프레임 (컬럼 공유, 복사 없음)"""
+        frame = ConditionFrame.__new__(ConditionFrame)
+        frame.symbols = self.symbols
+        frame.columns = self.columns
+        frame.groups = {**self.groups, **groups}
+        frame._nan = self._nan
+        return frame
+
+
+class Condition:
+    """
+    컴파일된 조건식
+
+    Attributes:
+        text: 원본 조건식
+        fields: 조건식이 참조하는 필드 집합 (필요한 컬럼만 준비하도록)
+        groups: 조건식이 참조하는 그룹 집합
+    """
+
+    def __init__(self, text: str, evaluator: Callable, fields: set, groups: set):
+        self.text = text
+        self._evaluator = evaluator
+        self.fields = frozenset(fields)
+        self.groups = frozenset(groups)
+
+    def evaluate(self, frame: ConditionFrame) -> np.ndarray:
+        """
+        종목별 조건 결과
+
+        Returns:
+            np.ndarray(bool, len(frame))
+        """
+        result = self._evaluator(frame)
+        return np.broadcast_to(np.asarray(result, dtype=bool), (len(frame),))
+
+    def evaluate_all(self, frame: ConditionFrame, rows: np.ndarray = None) -> bool:
+        """
+        지정 행 전체가 조건을 만족하는지 (행이 없으면 False)
+
+        Args:
+            frame: 평가 프레임
+            rows: 확인할 행 인덱스 (없으면 전체)
+        """
+        mask = self.evaluate(frame)
+        if rows is not None:
+            mask = mask[rows]
+        return bool(mask.size) and bool(mask.all())
+
+    def __repr__(self):
+        return f"Condition({self.text!r})"
+
+
+class _Parser:
+    """재귀 하강 파서 (토큰 → NumPy 평가 클로저)"""
+
+    def __init__(self, text: str, allowed_groups: Optional[Iterable[str]] = None):
+        self.text = text
+        self.tokens = self._tokenize(text)
+        self.pos = 0
+        self.allowed_groups = set(allowed_groups) if allowed_groups is not None else None
+        self.fields = set()
+        self.groups = set()
+
+    def _tokenize(self, text: str) -> List[tuple]:
+        tokens = []
+        pos = 0
+        text = text.rstrip()
+        while pos < len(text):
+            match = _TOKEN_PATTERN.match(text, pos)
+            if not match or match.end() == pos:
+                raise ConditionSyntaxError(f"알 수 없는 문자 (위치 {pos}): {text[pos:pos + 10]!r}")
+            kind = match.lastgroup
+            value = match.group(kind)
+            if kind == 'name' and value.lower() in KEYWORDS:
+                kind, value = 'keyword', value.lower()
+            tokens.append((kind, value))
+            pos = match.end()
+        return tokens
+
+    def _peek(self) -> Optional[tuple]:
+        return self.tokens[self.pos] if self.pos < len(self.tokens) else None
+
+    def _accept(self, kind: str, value: str = None) -> Optional[str]:
+        token = self._peek()
+        if token and token[0] == kind and (value is None or token[1] == value):
+            self.pos += 1
+            return token[1]
+        return None
+
+    def _expect(self, kind: str, value: str = None) -> str:
+        result = self._accept(kind, value)
+        if result is None:
+            found = self._peek()
+            raise ConditionSyntaxError(f"{value or kind} 필요, 발견: {found[1] if found else '식의 끝'} "
+                                       f"({self.text!r})")
+        return result
+
+    def parse(self) -> Callable:
+        if not self.tokens:
+            raise ConditionSyntaxError("빈 조건식")
+        node = self._or()
+        if self._peek() is not None:
+            raise ConditionSyntaxError(f"해석할 수 없는 토큰: {self._peek()[1]!r} ({self.text!r})")
+        return node
+
+    def _or(self) -> Callable:
+        node = self._and()
+        while self._accept('keyword', 'or'):
+            left, right = node, self._and()
+            node = lambda f, l=left, r=right: np.logical_or(l(f), r(f))
+        return node
+
+    def _and(self) -> Callable:
+        node = self._not()
+        while self._accept('keyword', 'and'):
+            left, right = node, self._not()
+            node = lambda f, l=left, r=right: np.logical_and(l(f), r(f))
+        return node
+
+    def _not(self) -> Callable:
+        if self._accept('keyword', 'not'):
+            inner = self._not()
+            return lambda f: np.logical_not(inner(f))
+        return self._primary()
+
+    def _primary(self) -> Callable:
+        # 괄호: 논리식 우선, 실패하면 산술식으로 재해석
+        token = self._peek()
+        if token == ('op', '('):
+            start = self.pos
+            self.pos += 1
+            try:
+                node = self._or()
+                self._expect('op', ')')
+                return node
+            except ConditionSyntaxError:
+                self.pos = start
+
+        quantifier = self._accept('keyword', 'any') or self._accept('keyword', 'all')
+        if quantifier:
+            return self._quantifier(quantifier)
+
+        return self._comparison()
+
+    def _quantifier(self, kind: str) -> Callable:
+        self._accept('keyword', 'of')
+        group = self._expect('name')
+        if self.allowed_groups is not None and group not in self.allowed_groups:
+            raise ConditionSyntaxError(f"알 수 없는 그룹: {group} (사용 가능: {sorted(self.allowed_groups)})")
+        self.groups.add(group)
+
+        body = self._not()
+        reduce = np.any if kind == 'any' else np.all
+
+        def evaluate(f, body=body, group=group):
+            rows = f.group(group)
+            mask = np.broadcast_to(np.asarray(body(f), dtype=bool), (len(f),))[rows]
+            return bool(reduce(mask)) if (mask.size or kind == 'any') else False
+
+        return evaluate
+
+    def _comparison(self) -> Callable:
+        left = self._arith()
+
+        if self._accept('keyword', 'between'):
+            low = self._arith()
+            self._expect('keyword', 'and')
+            high = self._arith()
+            return lambda f: np.logical_and(np.greater_equal(left(f), low(f)),
+                                            np.less_equal(left(f), high(f)))
+
+        token = self._peek()
+        if not token or token[0] != 'op' or token[1] not in _COMPARE_OPS:
+            raise ConditionSyntaxError(f"비교 연산자 필요, 발견: {token[1] if token else '식의 끝'} "
+                                       f"({self.text!r})")
+        self.pos += 1
+        op = _COMPARE_OPS[token[1]]
+        right = self._arith()
+
+        def evaluate(f):
+            with np.errstate(invalid='ignore'):
+                return op(left(f), right(f))
+        return evaluate
+
+    def _arith(self) -> Callable:
+        node = self._term()
+        while True:
+            op = self._accept('op', '+') or self._accept('op', '-')
+            if not op:
+                return node
+            left, right, fn = node, self._term(), _ARITH_OPS[op]
+            node = lambda f, l=left, r=right, fn=fn: fn(l(f), r(f))
+
+    def _term(self) -> Callable:
+        node = self._factor()
+        while True:
+            op = self._accept('op', '*') or self._accept('op', '/')
+            if not op:
+                return node
+            left, right, fn = node, self._factor(), _ARITH_OPS[op]
+
+            def divide_safe(f, l=left, r=right, fn=fn):
+                with np.errstate(divide='ignore', invalid='ignore'):
+                    return fn(l(f), r(f))
+            node = divide_safe
+
+    def _factor(self) -> Callable:
+        if self._accept('op', '-'):
+            inner = self._factor()
+            return lambda f: np.negative(inner(f))
+
+        if self._accept('op', '('):
+            node = self._arith()
+            self._expect('op', ')')
+            return node
+
+        number = self._accept('number')
+        if number is not None:
+            value = float(number[:-1]) / 100 if number.endswith('%') else float(number)
+            return lambda f: value
+
+        name = self._accept('name')
+        if name is not None:
+            if not is_valid_field(name):
+                raise ConditionSyntaxError(f"알 수 없는 필드: {name} ({self.text!r})")
+            self.fields.add(name)
+            return lambda f: f.column(name)
+
+        token = self._peek()
+        raise ConditionSyntaxError(f"값 필요, 발견: {token[1] if token else '식의 끝'} ({self.text!r})")
+
+
+def compile_condition(text: str, allowed_groups: Optional[Iterable[str]] = None) -> Condition:
+    """
+    조건식 컴파일 (설정 로드 시 1회)
+
+    Args:
+        text: 조건식 문자열
+        allowed_groups: 허용 그룹명 (None이면 검사 안 함)
+
+    Returns:
+        Condition
+
+    Raises:
+        ConditionSyntaxError: 문법 오류, 알 수 없는 필드/그룹
+    """
+    parser = _Parser(text, allowed_groups)
+    evaluator = parser.parse()
+    return Condition(text, evaluator, parser.fields, parser.groups)
+
+
+def build_frame(rows: List[Dict[str, Any]], fields: Iterable[str] = None,
+                indicators=None, groups: Dict[str, Iterable[str]] = None) -> ConditionFrame:
+    """
+    종목별 시세 정보로 평가 프레임 생성
+
+    Args:
+        rows: [{'symbol': str, 'current_price': float, 'previous_close': float}, ...]
+        fields: 필요한 필드 (None이면 전체 기본 필드)
+        indicators: IndicatorBook (지표 필드용, 선택)
+        groups: {그룹명: 종목 리스트}
+
+    Returns:
+        ConditionFrame
+    """
+    symbols = [row['symbol'] for row in rows]
+    n = len(symbols)
+    fields = set(fields) if fields is not None else set(CONDITION_FIELDS)
+
+    price = np.fromiter((row.get('current_price') or np.nan for row in rows), dtype=float, count=n)
+    prev_close = np.fromiter((row.get('previous_close') or np.nan for row in rows), dtype=float, count=n)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        columns = {
+            'price': price,
+            'prev_close': prev_close,
+            'change': price / prev_close - 1,
+            'decline': 1 - price / prev_close
+        }
+
+    for name in fields:
+        if name in columns:
+            continue
+        if indicators is not None and (name in INDICATOR_FIELDS or EMA_FIELD_PATTERN.match(name)):
+            columns[name] = np.fromiter(
+                (_nan_if_none(indicators.get_value(symbol, name)) for symbol in symbols),
+                dtype=float, count=n
+            )
+
+    frame = ConditionFrame(symbols, columns)
+    if groups:
+        frame.groups = {name: frame.indices(members) for name, members in groups.items()}
+    return frame
+
+
+def _nan_if_none(value) -> float:
+    return np.nan if value is None else float(value)
@@ -0,0 +1,427 @@
+"""
+타이머 힙 이벤트 스케줄러 - 다음 예정 작업 시각까지 정확히 잠들었다가 실행
+
+schedule.run_pending() + time.sleep(30/300) 폴링이나 10초 슬립 + current_minute % 30 검사는
+주기 시작이 최대 30초 늦어지거나 분 경계를 통째로 놓칠 수 있고, 장 밖에서도 계속 깨어난다.
+
+EventScheduler는 작업마다 다음 실행 시각(epoch 초)을 계산해 힙에 넣고, 가장 이른 시각까지만
+대기한 뒤 실행한다.
+
+- 시각: 시장 타임존 벽시계 기준 경계 (자정부터 interval 배수, 예: 30분 → :00/:30)
+- 세션: window=(시작, 종료) 지정 시 창 안의 경계만 실행, 창 밖이면 다음 세션 첫 경계로 건너뜀
+  (주말 제외, 서머타임은 pytz가 처리)
+- 캘린더: calendar(MarketCalendar) 지정 시 휴장일은 건너뛰고, window가 없으면 그날 실제 세션
+  (조기 폐장/지연 개장 반영)을 창으로 사용. at_session()은 실제 개장/폐장 시각에 실행
+- 선조회: prepare_lead 초 전에 prepare(예정 시각) 호출 (시세 선조회 예약용)
+- 관측: 작업별 다음 실행 시각, 예정 대비 실행 지연(lag), 깨어난 횟수, 실행 중인 작업
+  (on_job 콜백으로 작업 시작/종료 통지 - 워커 감시용)
+
+사용 예:
+    events = EventScheduler('US')
+    events.every(30, strategy.execute_sell_strategy, 'US/Eastern', window=(dt_time(9, 30), dt_time(16, 0)),
+                 name='us_sell', pass_scheduled_at=True)
+    events.at_session('close', host.flush_minute_bars, get_calendar('us'), name='us_close')
+    events.run()        # stop() 호출 전까지 블로킹
+"""
+import heapq
+import itertools
+import logging
+import math
+import threading
+import time
+from datetime import datetime, timedelta, time as dt_time
+from typing import Optional, Dict, Any, List, Callable, Tuple, Iterable
+
+import pytz
+
+
+SECONDS_PER_DAY = 86400
+MAX_LOOKAHEAD_DAYS = 16      # 다음 실행 시각 탐색 범위 (주말 + 명절 연휴)
+LAG_WARN_SECONDS = 60        # 이 이상 늦게 실행되면 경고 로그 (앞 작업이 길어진 경우 등)
+
+
+def _seconds_of_day(value: dt_time) -> float:
+    return value.hour * 3600 + value.minute * 60 + value.second + value.microsecond / 1e6
+
+
+class ScheduledJob:
+    """
+    반복 작업 1개 (벽시계 경계 + 세션 창)
+    """
+
+    def __init__(self, name: str, fn: Callable, tz, interval_seconds: float, anchor_seconds: float = 0.0,
+                 window: Optional[Tuple[dt_time, dt_time]] = None, weekdays_only: bool = True,
+                 tags: Iterable[str] = (), pass_scheduled_at: bool = False,
+                 prepare: Optional[Callable[[float], Any]] = None, prepare_lead: float = 0.0,
+                 calendar=None, session_event: Optional[str] = None, offset_seconds: float = 0.0):
+        """
+        Args:
+            name: 작업 이름 (로그/통계 키)
+            fn: 실행 함수
+            tz: 시장 타임존 (pytz)
+            interval_seconds: 실행 간격 (초)
+            anchor_seconds: 경계 기준점 (자정부터 초, 기본 자정)
+            window: (시작, 종료) 세션 창 - 양끝 포함, None이면 하루 전체
+            weekdays_only: 주말 제외 여부
+            tags: 일괄 취소용 태그
+            pass_scheduled_at: True면 fn(scheduled_at=예정 epoch 초)로 호출
+            prepare: 예정 시각 prepare_lead 초 전에 호출할 함수 (인자: 예정 epoch 초)
+            prepare_lead: prepare 호출 리드 타임 (초)
+            calendar: MarketCalendar (휴장일 제외, window가 없으면 그날 세션 시간 사용)
+            session_event: 'open' 또는 'close' - 지정 시 캘린더 개장/폐장 시각에 실행
+            offset_seconds: session_event 시각 기준 오프셋 (초, 음수면 이전)
+        """
+        if interval_seconds <= 0:
+            raise ValueError(f"interval must be positive: {interval_seconds}")
+        self.name = name
+        self.fn = fn
+        self.tz = tz
+        self.interval = float(interval_seconds)
+        self.anchor = float(anchor_seconds)
+        self.window = window
+        self.weekdays_only = weekdays_only
+        self.tags = set(tags)
+        self.pass_scheduled_at = pass_scheduled_at
+        self.prepare = prepare
+        self.prepare_lead = prepare_lead
+        self.calendar = calendar
+        self.session_event = session_event
+        self.offset = offset_seconds
+
+        self.next_run: Optional[float] = None
+        self.cancelled = False
+        self.runs = 0
+        self.errors = 0
+        self.last_lag = None
+        self.max_lag = 0.0
+
+    def next_after(self, after: float) -> Optional[float]:
+        """
+        after(epoch 초) 이후 첫 실행 시각
+
+        Returns:
+            epoch 초 (탐색 범위 안에 없으면 None)
+        """
+        if self.session_event is not None:
+            lookup = self.calendar.next_open if self.session_event == 'open' else self.calendar.next_close
+            due = lookup(after - self.offset)
+            return None if due is None else due + self.offset
+
+        local = datetime.fromtimestamp(after, self.tz)
+        if self.window:
+            low, high = _seconds_of_day(self.window[0]), _seconds_of_day(self.window[1])
+        else:
+            low, high = 0.0, SECONDS_PER_DAY - 1e-6
+
+        for offset in range(MAX_LOOKAHEAD_DAYS):
+            day = local.date() + timedelta(days=offset)
+            if self.calendar is not None:
+                hours = self.calendar.session_hours(day)
+                if hours is None:
+                    continue
+                if not self.window:
+                    low, high = _seconds_of_day(hours[0]), _seconds_of_day(hours[1])
+            elif self.weekdays_only and day.weekday() >= 5:
+                continue
+            k = math.ceil((low - self.anchor) / self.interval)
+            if offset == 0:
+                elapsed = _seconds_of_day(local.time())
+                k = max(k, math.floor((elapsed - self.anchor) / self.interval) + 1)
+            seconds = self.anchor + k * self.interval
+            if seconds > high or seconds >= SECONDS_PER_DAY:
+                continue
+            moment = self.tz.localize(datetime.combine(day, dt_time()) + timedelta(seconds=seconds))
+            due = moment.timestamp()
+            if due > after:
+                return due
+        return None
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'next_run': datetime.fromtimestamp(self.next_run, self.tz).isoformat() if self.next_run else None,
+            'runs': self.runs,
+            'errors': self.errors,
+            'last_lag_ms': None if self.last_lag is None else round(self.last_lag * 1000, 1),
+            'max_lag_ms': round(self.max_lag * 1000, 1)
+        }
+
+
+class EventScheduler:
+    """
+    타이머 힙 기반 작업 스케줄러 (run()을 호출한 스레드에서 작업을 순서대로 실행)
+    """
+
+    def __init__(self, name: str = None, on_job: Optional[Callable[[Optional[str], Optional[Exception]], Any]] = None):
+        """
+        Args:
+            name: 스케줄러 이름 (로그 식별용)
+            on_job: callable(job_name, error) - 작업 시작 시 (이름, None), 종료 시 (None, 오류 또는 None)
+        """
+        self.name = name or 'default'
+        self.on_job = on_job
+        self.logger = logging.getLogger(f"{self.__class__.__name__}.{self.name}")
+
+        self._jobs: Dict[str, ScheduledJob] = {}
+        self._heap: List[tuple] = []     # [(fire_at, seq, job, phase)] phase: 'prepare' 또는 'run'
+        self._seq = itertools.count()
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._running = False
+        self._current: Optional[Tuple[str, float]] = None   # (실행 중인 작업 이름, 시작 monotonic)
+
+        self.stats = {
+            'wakeups': 0,
+            'dispatches': 0,
+            'prepares': 0,
+            'errors': 0,
+            'total_lag': 0.0,
+            'max_lag': 0.0
+        }
+
+    # ------------------------------------------------------------------
+    # 작업 등록
+    # ------------------------------------------------------------------
+    def every(self, minutes: float, fn: Callable, tz, window: Optional[Tuple[dt_time, dt_time]] = None,
+              weekdays_only: bool = True, name: str = None, tags: Iterable[str] = (),
+              pass_scheduled_at: bool = False, prepare: Optional[Callable[[float], Any]] = None,
+              prepare_lead: float = 0.0, calendar=None) -> ScheduledJob:
+        """
+        벽시계 경계 반복 작업 등록 (자정부터 minutes 배수 시각, 예: 30 → 매시 :00/:30)
+
+        Args:
+            minutes: 실행 간격 (분)
+            fn: 실행 함수
+            tz: 시장 타임존 이름 또는 pytz 타임존
+            window: (시작, 종료) 세션 창 (양끝 포함)
+            weekdays_only: 주말 제외 여부
+            name: 작업 이름 (같은 이름은 교체)
+            tags: 일괄 취소용 태그
+            pass_scheduled_at: True면 fn(scheduled_at=예정 epoch 초)
+            prepare: 예정 시각 prepare_lead 초 전에 호출할 함수 (인자: 예정 epoch 초)
+            prepare_lead: prepare 리드 타임 (초)
+            calendar: MarketCalendar (휴장일 제외, window가 없으면 그날 실제 세션 시간을 창으로 사용)
+        """
+        job = ScheduledJob(name or getattr(fn, '__name__', 'job'), fn, self._tz(tz), minutes * 60,
+                           window=window, weekdays_only=weekdays_only, tags=tags,
+                           pass_scheduled_at=pass_scheduled_at, prepare=prepare, prepare_lead=prepare_lead,
+                           calendar=calendar)
+        return self._add(job)
+
+    def at_session(self, event: str, fn: Callable, calendar, offset_minutes: float = 0,
+                   name: str = None, tags: Iterable[str] = ()) -> ScheduledJob:
+        """
+        캘린더 개장/폐장 시각 작업 등록 (휴장일 건너뜀, 조기 폐장/지연 개장 반영)
+
+        Args:
+            event: 'open' 또는 'close'
+            fn: 실행 함수
+            calendar: MarketCalendar
+            offset_minutes: 개장/폐장 시각 기준 오프셋 (분, 음수면 이전)
+            name: 작업 이름
+            tags: 일괄 취소용 태그
+        """
+        if event not in ('open', 'close'):
+            raise ValueError(f"event must be 'open' or 'close': {event}")
+        job = ScheduledJob(name or f"{getattr(fn, '__name__', 'job')}_{event}", fn, calendar.tz, SECONDS_PER_DAY,
+                           tags=tags, calendar=calendar, session_event=event, offset_seconds=offset_minutes * 60)
+        return self._add(job)
+
+    def daily(self, at: dt_time, fn: Callable, tz, weekdays_only: bool = True,
+              name: str = None, tags: Iterable[str] = ()) -> ScheduledJob:
+        """
+        매일 같은 시각 작업 등록 (세션 개장/마감 이벤트용)
+
+        Args:
+            at: 실행 시각 (시장 타임존)
+            fn: 실행 함수
+            tz: 시장 타임존 이름 또는 pytz 타임존
+            weekdays_only: 주말 제외 여부
+            name: 작업 이름
+            tags: 일괄 취소용 태그
+        """
+        job = ScheduledJob(name or getattr(fn, '__name__', 'job'), fn, self._tz(tz), SECONDS_PER_DAY,
+                           anchor_seconds=_seconds_of_day(at), weekdays_only=weekdays_only, tags=tags)
+        return self._add(job)
+
+    def _tz(self, tz):
+        return pytz.timezone(tz) if isinstance(tz, str) else tz
+
+    def _add(self, job: ScheduledJob) -> ScheduledJob:
+        with self._lock:
+            old = self._jobs.get(job.name)
+            if old is not None:
+                old.cancelled = True
+            self._jobs[job.name] = job
+            self._push(job, time.time())
+        self._wake.set()
+        return job
+
+    def _push(self, job: ScheduledJob, after: float):
+        """다음 실행 시각 계산 후 힙에 추가 (락 보유 상태에서 호출)"""
+        job.next_run = job.next_after(after)
+        if job.next_run is None:
+            return
+        heapq.heappush(self._heap, (job.next_run, next(self._seq), job, 'run'))
+        if job.prepare is not None and job.prepare_lead > 0:
+            heapq.heappush(self._heap, (job.next_run - job.prepare_lead, next(self._seq), job, 'prepare'))
+
+    def cancel(self, tag: str) -> int:
+        """
+        태그(또는 이름)가 일치하는 작업 취소
+
+        Returns:
+            취소한 작업 수
+        """
+        with self._lock:
+            names = [name for name, job in self._jobs.items() if name == tag or tag in job.tags]
+            for name in names:
+                self._jobs.pop(name).cancelled = True
+        return len(names)
+
+    # ------------------------------------------------------------------
+    # 실행
+    # ------------------------------------------------------------------
+    def idle_seconds(self) -> Optional[float]:
+        """가장 이른 예정 이벤트까지 남은 시간 (초, 작업이 없으면 None)"""
+        with self._lock:
+            self._discard_stale()
+            if not self._heap:
+                return None
+            return self._heap[0][0] - time.time()
+
+    def _discard_stale(self):
+        """취소/교체된 작업의 힙 항목 제거 (락 보유 상태에서 호출)"""
+        while self._heap:
+            fire_at, _, job, phase = self._heap[0]
+            due = fire_at + job.prepare_lead if phase == 'prepare' else fire_at
+            if job.cancelled or job.next_run is None or abs(job.next_run - due) > 1e-6:
+                heapq.heappop(self._heap)
+            else:
+                return
+
+    def run_pending(self) -> int:
+        """
+        예정 시각이 지난 이벤트 실행
+
+        Returns:
+            실행한 작업 수
+        """
+        dispatched = 0
+        while True:
+            with self._lock:
+                self._discard_stale()
+                if not self._heap or self._heap[0][0] > time.time():
+                    return dispatched
+                fire_at, _, job, phase = heapq.heappop(self._heap)
+                if phase == 'run':
+                    # 실행이 길어져도 지난 경계를 몰아서 실행하지 않도록 현재 시각 기준으로 다음 실행 예약
+                    self._push(job, max(fire_at, time.time()))
+
+            if phase == 'prepare':
+                self._prepare(job, fire_at + job.prepare_lead)
+            else:
+                self._dispatch(job, fire_at)
+                dispatched += 1
+
+    def _notify(self, name: Optional[str], error: Optional[Exception] = None):
+        """실행 중 작업 갱신 + on_job 통지"""
+        self._current = (name, time.monotonic()) if name else None
+        if self.on_job is not None:
+            try:
+                self.on_job(name, error)
+            except Exception as e:
+                self.logger.debug(f"[EVENT] on_job 콜백 오류: {e}")
+
+    def _prepare(self, job: ScheduledJob, due: float):
+        self.stats['prepares'] += 1
+        self._notify(f"{job.name}:prepare")
+        error = None
+        try:
+            job.prepare(due)
+        except Exception as e:
+            error = e
+            self.logger.error(f"[EVENT] {job.name} 선조회 예약 오류: {e}")
+        finally:
+            self._notify(None, error)
+
+    def _dispatch(self, job: ScheduledJob, due: float):
+        lag = time.time() - due
+        job.runs += 1
+        job.last_lag = lag
+        job.max_lag = max(job.max_lag, lag)
+        self.stats['dispatches'] += 1
+        self.stats['total_lag'] += lag
+        self.stats['max_lag'] = max(self.stats['max_lag'], lag)
+        if lag >= LAG_WARN_SECONDS:
+            self.logger.warning(f"[EVENT] {job.name} 예정 대비 {lag:.1f}초 늦게 실행")
+        else:
+            self.logger.debug(f"[EVENT] {job.name} 실행 (지연 {lag * 1000:.1f}ms)")
+
+        self._notify(job.name)
+        error = None
+        try:
+            if job.pass_scheduled_at:
+                job.fn(scheduled_at=due)
+            else:
+                job.fn()
+        except Exception as e:
+            error = e
+            job.errors += 1
+            self.stats['errors'] += 1
+            self.logger.error(f"[EVENT] {job.name} 실행 오류: {e}")
+        finally:
+            self._notify(None, error)
+
+    def run(self):
+        """stop() 호출 전까지 다음 예정 시각까지 대기 → 실행 반복 (호출 스레드 블로킹)"""
+        self._running = True
+        while self._running:
+            self._wake.clear()
+            self.run_pending()
+            idle = self.idle_seconds()
+            if not self._running:
+                break
+            # 다음 이벤트 시각까지 대기 (작업 등록/중지 시 즉시 깨어남)
+            self._wake.wait(None if idle is None else max(0.0, idle))
+            self.stats['wakeups'] += 1
+
+    def stop(self):
+        """run() 루프 중지"""
+        self._running = False
+        self._wake.set()
+
+    # ------------------------------------------------------------------
+    # 관측
+    # ------------------------------------------------------------------
+    def current_job(self) -> Optional[Tuple[str, float]]:
+        """
+        실행 중인 작업
+
+        Returns:
+            (작업 이름, 실행 경과 초) - 대기 중이면 None
+        """
+        current = self._current
+        if current is None:
+            return None
+        return current[0], time.monotonic() - current[1]
+
+    def next_fire_times(self) -> Dict[str, datetime]:
+        """작업별 다음 실행 시각 (작업 타임존 기준, 이른 순)"""
+        with self._lock:
+            jobs = sorted((job for job in self._jobs.values() if job.next_run is not None),
+                          key=lambda job: job.next_run)
+            return {job.name: datetime.fromtimestamp(job.next_run, job.tz) for job in jobs}
+
+    def get_stats(self) -> Dict[str, Any]:
+        stats = dict(self.stats)
+        dispatches = stats.pop('dispatches')
+        total_lag = stats.pop('total_lag')
+        stats['dispatches'] = dispatches
+        stats['avg_lag_ms'] = round(total_lag / dispatches * 1000, 1) if dispatches else 0.0
+        stats['max_lag_ms'] = round(stats.pop('max_lag') * 1000, 1)
+        current = self.current_job()
+        stats['current_job'] = current[0] if current else None
+        stats['current_seconds'] = round(current[1], 1) if current else 0.0
+        with self._lock:
+            stats['jobs'] = {name: job.get_stats() for name, job in self._jobs.items()}
+        return stats
@@ -0,0 +1,177 @@
+"""
+공용 HTTP 전송 계층 - 모든 시장 클라이언트가 하나의 커넥션 풀과 호출 예산을 공유
+
+시장마다 requests.get/post를 따로 부르면 호출마다 TCP/TLS 연결을 새로 맺고, 여러 시장이 동시에
+열리면 같은 앱키의 KIS 호출 한도(초당 건수)를 각자 모르는 채로 나눠 쓰게 된다.
+
+- 전송: 프로세스 공용 requests.Session (호스트별 keep-alive 커넥션 풀, 스레드 공유)
+- 예산: 공용 RateLimiter - 모든 시장/워커의 KIS 호출이 같은 분당 예산에서 차감
+  (예산 대기가 LIMIT_WAIT_SECONDS를 넘으면 요청은 그대로 보내고 초과 횟수만 기록 - 주문 누락 방지)
+  자체 전송 경로를 쓰는 라이브러리 호출(mojito2 주문)은 호출 전에 acquire()로 같은 예산만 차감
+- 관측: 요청/오류/예산 대기 시간 통계
+
+카세트 녹화/재생(requests.Session.request 패치)과 그대로 호환된다.
+
+사용 예:
+    from common import http
+    response = http.get(url, headers=headers, params=params, timeout=10)
+    response = http.post(url, headers=headers, json=data, timeout=10)
+"""
+import logging
+import threading
+import time
+from typing import Dict, Any, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from .rate_limiter import RateLimiter
+
+
+HTTP_REQUESTS_PER_MINUTE = 900   # 공용 분당 호출 예산 (KIS 실전 초당 20건 한도의 여유분 포함)
+HTTP_BURST = 15                  # 한 번에 몰아서 보낼 수 있는 최대 호출 수
+LIMIT_WAIT_SECONDS = 5           # 예산 대기 최대 시간 (초과 시 대기 없이 전송)
+POOL_CONNECTIONS = 4             # 호스트별 커넥션 풀 수
+POOL_MAXSIZE = 16                # 풀당 최대 커넥션 수 (동시 호출 스레드 수 이상)
+
+_session: Optional[requests.Session] = None
+_limiter: Optional[RateLimiter] = None
+_lock = threading.Lock()
+_logger = logging.getLogger(__name__)
+
+stats = {
+    'requests': 0,
+    'external': 0,
+    'errors': 0,
+    'limit_overruns': 0,
+    'total_wait': 0.0,
+    'max_wait': 0.0
+}
+
+
+def get_session() -> requests.Session:
+    """프로세스 공용 Session (최초 호출 시 생성)"""
+    global _session
+    with _lock:
+        if _session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_MAXSIZE)
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+            _session = session
+        return _session
+
+
+def get_limiter() -> RateLimiter:
+    """프로세스 공용 호출 예산"""
+    global _limiter
+    with _lock:
+        if _limiter is None:
+            _limiter = RateLimiter(HTTP_REQUESTS_PER_MINUTE, burst=HTTP_BURST)
+        return _limiter
+
+
+def configure(requests_per_minute: float = None, burst: int = None):
+    """
+    공용 호출 예산 변경 (다음 요청부터 적용)
+
+    Args:
+        requests_per_minute: 분당 호출 수
+        burst: 최대 누적 호출 수
+    """
+    global _limiter
+    with _lock:
+        _limiter = RateLimiter(requests_per_minute or HTTP_REQUESTS_PER_MINUTE,
+                               burst=burst if burst is not None else HTTP_BURST)
+
+
+def request(method: str, url: str, **kwargs) -> requests.Response:
+    """
+    공용 Session으로 요청 (공용 예산 차감 후 전송)
+
+    Args:
+        method: 'GET', 'POST' 등
+        url: 요청 URL
+        **kwargs: requests.Session.request 인자 (headers, params, json, timeout 등)
+
+    Returns:
+        requests.Response (네트워크 오류는 requests 예외 그대로 전달)
+    """
+    _charge(f"{method} {url}")
+    stats['requests'] += 1
+    try:
+        return get_session().request(method, url, **kwargs)
+    except requests.exceptions.RequestException:
+        stats['errors'] += 1
+        raise
+
+
+def acquire(label: str) -> bool:
+    """
+    공용 예산 1건 차감만 수행 (요청은 호출자가 직접 전송 - mojito2 주문 등 자체 전송 경로용)
+
+    Args:
+        label: 로그용 호출 이름
+
+    Returns:
+        대기 시간 안에 예산을 얻었는지 여부 (얻지 못해도 호출은 진행)
+    """
+    stats['external'] += 1
+    return _charge(label)
+
+
+def _charge(label: str) -> bool:
+    """공용 예산 차감 (LIMIT_WAIT_SECONDS까지 대기, 초과 시 기록만 하고 진행)"""
+    started = time.monotonic()
+    acquired = get_limiter().acquire(timeout=LIMIT_WAIT_SECONDS)
+    waited = time.monotonic() - started
+    stats['total_wait'] += waited
+    stats['max_wait'] = max(stats['max_wait'], waited)
+    if not acquired:
+        stats['limit_overruns'] += 1
+        _logger.warning(f"[HTTP] 호출 예산 대기 {waited:.1f}초 초과 - 대기 없이 전송: {label}")
+    return acquired
+
+
+def get(url: str, **kwargs) -> requests.Response:
+    """GET 요청 (공용 Session + 예산)"""
+    return request('GET', url, **kwargs)
+
+
+def post(url: str, **kwargs) -> requests.Response:
+    """POST 요청 (공용 Session + 예산)"""
+    return request('POST', url, **kwargs)
+
+
+def warm_up(urls, timeout: float = 5) -> Dict[str, Any]:
+    """
+    커넥션 풀 선연결 - 호스트별로 가벼운 요청 1회를 보내 TCP/TLS 연결을 미리 맺어 둠
+    (응답 코드는 무관, 호출 예산 차감 없음)
+
+    Args:
+        urls: 연결할 URL 목록 (호스트별 1개면 충분)
+        timeout: 요청 타임아웃 (초)
+
+    Returns:
+        {'connected': 연결 성공 수, 'failed': [실패 URL]}
+    """
+    session = get_session()
+    connected, failed = 0, []
+    for url in dict.fromkeys(urls):
+        try:
+            session.head(url, timeout=timeout)
+            connected += 1
+        except requests.exceptions.RequestException as e:
+            failed.append(url)
+            _logger.warning(f"[HTTP] 선연결 실패: {url} - {e}")
+    return {'connected': connected, 'failed': failed}
+
+
+def get_stats() -> Dict[str, Any]:
+    """공용 전송 통계"""
+    result = dict(stats)
+    requests_count = result['requests'] + result['external']
+    result['avg_wait_ms'] = round(result.pop('total_wait') / requests_count * 1000, 1) if requests_count else 0.0
+    result['max_wait_ms'] = round(result.pop('max_wait') * 1000, 1)
+    result['limiter'] = get_limiter().get_stats()
+    return result
@@ -0,0 +1,325 @@
+"""
+장중 지표 계산 - 시세 1건마다 O(1)로 갱신되는 증분 지표
+
+- VWAP: 누적 거래량(acml_vol / tvol) 증가분으로 가중 평균
+- EMA: 기간별 지수이동평균
+- 롤링 수익률: 최근 N개 시세의 첫 가격 대비 수익률
+- 롤링 변동성: 최근 N개 로그 수익률의 표준편차 (합/제곱합 누적)
+- 장중 고가/저가
+
+종목별 상태는 고정 크기 링 버퍼(array('d'))에 보관하며, API 클라이언트의
+가격 리스너(add_price_listener)로 연결하면 추가 API 호출 없이 갱신된다.
+장이 바뀌면(시장 타임존 기준 날짜 변경) 종목 상태를 자동 초기화한다.
+"""
+import math
+import threading
+import time
+from array import array
+from datetime import datetime
+from typing import Optional, Dict, Any, List, Iterable
+
+import pytz
+
+
+# 기본 지표 설정
+INDICATOR_WINDOW = 60            # 롤링 수익률/변동성 계산 시세 개수
+INDICATOR_EMA_SPANS = (12, 26)   # EMA 기간 (시세 개수)
+SESSION_CHECK_SECONDS = 60       # 날짜 변경 확인 주기 (초)
+
+
+class RingBuffer:
+    """
+    고정 크기 float 링 버퍼 (array('d') 기반, 메모리 재할당 없음)
+    """
+
+    __slots__ = ('_data', '_size', '_start', '_count')
+
+    def __init__(self, size: int):
+        if size <= 0:
+            raise ValueError(f"size must be positive: {size}")
+        self._data = array('d', bytes(8 * size))
+        self._size = size
+        self._start = 0
+        self._count = 0
+
+    def push(self, value: float) -> Optional[float]:
+        """
+        값 추가 (가득 찬 경우 가장 오래된 값을 밀어냄)
+
+        Returns:
+            밀려난 값 (없으면 None)
+        """
+        if self._count < self._size:
+            self._data[(self._start + self._count) % self._size] = value
+            self._count += 1
+            return None
+
+        evicted = self._data[self._start]
+        self._data[self._start] = value
+        self._start = (self._start + 1) % self._size
+        return evicted
+
+    def oldest(self) -> Optional[float]:
+        """가장 오래된 값"""
+        return self._data[self._start] if self._count else None
+
+    def latest(self) -> Optional[float]:
+        """가장 최근 값"""
+        if not self._count:
+            return None
+        return self._data[(self._start + self._count - 1) % self._size]
+
+    def is_full(self) -> bool:
+        return self._count == self._size
+
+    def clear(self):
+        self._start = 0
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __iter__(self):
+        for i in range(self._count):
+            yield self._data[(self._start + i) % self._size]
+
+
+class SymbolIndicators:
+    """
+    종목 1개의 장중 지표 상태 (모든 갱신 O(1))
+    """
+
+    def __init__(self, window: int = INDICATOR_WINDOW,
+                 ema_spans: Iterable[int] = INDICATOR_EMA_SPANS):
+        """
+        Args:
+            window: 롤링 수익률/변동성 계산 시세 개수
+            ema_spans: EMA 기간 리스트
+        """
+        self.window = window
+        self.ema_spans = tuple(ema_spans)
+        self._alphas = tuple(2.0 / (span + 1) for span in self.ema_spans)
+
+        self.prices = RingBuffer(window + 1)   # 수익률 기준가 포함
+        self.log_returns = RingBuffer(window)
+        self.reset()
+
+    def reset(self):
+        """장 시작 시 상태 초기화"""
+        self.prices.clear()
+        self.log_returns.clear()
+        self.count = 0
+        self.last_price: Optional[float] = None
+        self.high: Optional[float] = None
+        self.low: Optional[float] = None
+        self.emas: List[Optional[float]] = [None] * len(self.ema_spans)
+        self._ret_sum = 0.0
+        self._ret_sq_sum = 0.0
+        self._pv_sum = 0.0
+        self._vol_sum = 0.0
+        self._last_cum_volume: Optional[float] = None
+        self.volume: Optional[float] = None  # 당일 누적 거래량
+        self.updated_at: Optional[float] = None
+
+    def update(self, price: float, volume: float = None, timestamp: float = None):
+        """
+        시세 1건 반영
+
+        Args:
+            price: 현재가
+            volume: 당일 누적 거래량 (없거나 0이면 VWAP 갱신 생략)
+            timestamp: 시세 시각 (epoch 초, 없으면 현재 시각)
+        """
+        if price is None or price <= 0:
+            return
+
+        # 로그 수익률 (합/제곱합으로 변동성 O(1) 갱신)
+        if self.last_price is not None:
+            ret = math.log(price / self.last_price)
+            evicted = self.log_returns.push(ret)
+            self._ret_sum += ret
+            self._ret_sq_sum += ret * ret
+            if evicted is not None:
+                self._ret_sum -= evicted
+                self._ret_sq_sum -= evicted * evicted
+
+        self.prices.push(price)
+
+        # EMA
+        for i, alpha in enumerate(self._alphas):
+            ema = self.emas[i]
+            self.emas[i] = price if ema is None else ema + alpha * (price - ema)
+
+        # 장중 고가/저가
+        if self.high is None or price > self.high:
+            self.high = price
+        if self.low is None or price < self.low:
+            self.low = price
+
+        # VWAP (누적 거래량 증가분만 가중치로 사용, 0/누락은 무시)
+        if volume:
+            if self._last_cum_volume is not None and volume > self._last_cum_volume:
+                traded = volume - self._last_cum_volume
+                self._pv_sum += price * traded
+                self._vol_sum += traded
+            self._last_cum_volume = volume
+            self.volume = volume
+
+        self.last_price = price
+        self.count += 1
+        self.updated_at = timestamp if timestamp is not None else time.time()
+
+    @property
+    def vwap(self) -> Optional[float]:
+        """거래량 가중 평균가 (거래량 정보 없으면 None)"""
+        return self._pv_sum / self._vol_sum if self._vol_sum > 0 else None
+
+    def ema(self, span: int) -> Optional[float]:
+        """EMA 값 (설정되지 않은 기간이면 None)"""
+        try:
+            return self.emas[self.ema_spans.index(span)]
+        except ValueError:
+            return None
+
+    @property
+    def rolling_return(self) -> Optional[float]:
+        """최근 window개 시세 기준 수익률 (소수)"""
+        if len(self.prices) < 2:
+            return None
+        return self.prices.latest() / self.prices.oldest() - 1
+
+    @property
+    def rolling_volatility(self) -> Optional[float]:
+        """최근 window개 로그 수익률 표준편차 (표본 기준)"""
+        n = len(self.log_returns)
+        if n < 2:
+            return None
+        mean = self._ret_sum / n
+        variance = (self._ret_sq_sum - n * mean * mean) / (n - 1)
+        return math.sqrt(variance) if variance > 0 else 0.0
+
+    def snapshot(self) -> Dict[str, Any]:
+        """현재 지표 값 딕셔너리"""
+        result = {
+            'price': self.last_price,
+            'vwap': self.vwap,
+            'volume': self.volume,
+            'return': self.rolling_return,
+            'volatility': self.rolling_volatility,
+            'high': self.high,
+            'low': self.low,
+            'count': self.count,
+            'updated_at': self.updated_at
+        }
+        for span, value in zip(self.ema_spans, self.emas):
+            result[f'ema_{span}'] = value
+        return result
+
+
+class IndicatorBook:
+    """
+    종목별 장중 지표 모음 (스레드 안전)
+
+    사용 예:
+        book = IndicatorBook(timezone='Asia/Seoul')
+        api_client.add_price_listener(book.update)
+        ...
+        vwap = book.get_value('005930', 'vwap')
+    """
+
+    def __init__(self, window: int = INDICATOR_WINDOW,
+                 ema_spans: Iterable[int] = INDICATOR_EMA_SPANS,
+                 timezone: str = None):
+        """
+        Args:
+            window: 롤링 수익률/변동성 계산 시세 개수
+            ema_spans: EMA 기간 리스트
+            timezone: 장 날짜 판단 타임존 (없으면 날짜 변경 초기화 안 함)
+        """
+        self.window = window
+        self.ema_spans = tuple(ema_spans)
+        self.timezone = pytz.timezone(timezone) if timezone else None
+
+        self._symbols: Dict[str, SymbolIndicators] = {}
+        self._lock = threading.Lock()
+        self._session = None
+        self._session_checked = float('-inf')
+
+    def _check_session(self):
+        """시장 타임존 기준 날짜가 바뀌면 전체 초기화 (락 보유 상태에서 호출)"""
+        if self.timezone is None:
+            return
+
+        now = time.monotonic()
+        if now - self._session_checked < SESSION_CHECK_SECONDS:
+            return
+        self._session_checked = now
+
+        session = datetime.now(self.timezone).date()
+        if session != self._session:
+            if self._session is not None:
+                for indicators in self._symbols.values():
+                    indicators.reset()
+            self._session = session
+
+    def update(self, symbol: str, price: float, volume: float = None, timestamp: float = None):
+        """
+        시세 1건 반영 (API 클라이언트 가격 리스너 시그니처와 동일)
+
+        Args:
+            symbol: 종목 코드
+            price: 현재가
+            volume: 당일 누적 거래량 (선택)
+            timestamp: 시세 시각 (선택)
+        """
+        with self._lock:
+            self._check_session()
+            indicators = self._symbols.get(symbol)
+            if indicators is None:
+                indicators = self._symbols[symbol] = SymbolIndicators(self.window, self.ema_spans)
+            indicators.update(price, volume, timestamp)
+
+    def get(self, symbol: str) -> Optional[SymbolIndicators]:
+        """종목 지표 상태 (없으면 None)"""
+        return self._symbols.get(symbol)
+
+    def get_value(self, symbol: str, name: str) -> Optional[float]:
+        """
+        지표 값 1개 조회
+
+        Args:
+            symbol: 종목 코드
+            name: 'price', 'vwap', 'volume', 'return', 'volatility', 'high', 'low', 'ema_<기간>'
+
+        Returns:
+            지표 값 (데이터 부족/미지원 시 None)
+        """
+        with self._lock:
+            indicators = self._symbols.get(symbol)
+            if indicators is None:
+                return None
+            if name.startswith('ema_'):
+                try:
+                    return indicators.ema(int(name[4:]))
+                except ValueError:
+                    return None
+            return indicators.snapshot().get(name)
+
+    def snapshot(self, symbol: str) -> Dict[str, Any]:
+        """종목 지표 전체 (없으면 빈 딕셔너리)"""
+        with self._lock:
+            indicators = self._symbols.get(symbol)
+            return indicators.snapshot() if indicators else {}
+
+    def symbols(self) -> List[str]:
+        """지표가 있는 종목 리스트"""
+        return list(self._symbols.keys())
+
+    def reset(self, symbol: str = None):
+        """지표 초기화 (symbol 없으면 전체)"""
+        with self._lock:
+            if symbol is None:
+                self._symbols = {}
+                self._session_checked = float('-inf')
+            elif symbol in self._symbols:
+                self._symbols[symbol].reset()
@@ -0,0 +1,374 @@
+"""
+거래소 캘린더 - 휴장일/조기 폐장/지연 개장을 반영한 세션 표 (epoch 구간)
+
+요일 + 고정 시간만 보던 장 운영 판단은 거래소 휴장일과 단축 거래일에도 장이 열린 것으로 보고
+클라이언트 기동, 토큰 갱신, 시세 조회를 헛되이 반복한다.
+
+MarketCalendar는 시장별 세션을 미리 계산해 (개장 epoch, 폐장 epoch) 구간 표로 보관한다.
+
+- 미국(NYSE/NASDAQ): 규칙 기반 휴장일 (관측일 이동 포함), 성탄 전날/추수감사절 다음날/독립기념일 전날 13:00 조기 폐장,
+  서머타임은 날짜별로 타임존을 적용해 반영
+- 한국(KRX): 연도별 휴장일 표 (음력 공휴일, 대체공휴일, 선거일, 연말 휴장), 새해 첫 거래일 1시간 지연 개장,
+  수능일 개장/폐장 1시간 지연
+- 조회: is_open()은 UTC 날짜 버킷 조회로 O(1), next_open()/next_close()는 정렬된 구간 이진 탐색
+- 범위: 기본 작년~내년, 범위 밖 시각은 해당 연도를 추가로 계산 (표가 없는 연도의 KRX 휴장일은 주말만 제외)
+
+사용 예:
+    calendar = get_calendar('kr', ('09:00', '15:30'))
+    calendar.is_open()                  # 지금 장 운영 중인지
+    calendar.next_open()                # 다음 개장 epoch 초
+    calendar.session(date(2026, 11, 19))  # 수능일 (10:00, 16:30 KST) epoch 구간
+"""
+import bisect
+import logging
+import threading
+import time
+from datetime import date, datetime, timedelta, time as dt_time
+from typing import Optional, Dict, Any, List, Tuple
+
+import pytz
+
+
+MARKET_TIMEZONES = {'us': 'US/Eastern', 'kr': 'Asia/Seoul'}
+DEFAULT_MARKET_HOURS = {'us': ('09:30', '16:00'), 'kr': ('09:00', '15:30')}
+
+US_EARLY_CLOSE = dt_time(13, 0)     # 미국 조기 폐장 시각 (ET)
+KR_DELAY_MINUTES = 60               # KRX 지연 개장 (새해 첫 거래일, 수능일)
+
+# 미국 임시 휴장 (규칙으로 계산할 수 없는 날)
+US_SPECIAL_CLOSURES = {
+    date(2025, 1, 9): '카터 전 대통령 국가 애도일'
+}
+
+# KRX 휴장일 (주말 제외, 대체공휴일/선거일/연말 휴장 포함) - 새 연도는 거래소 공고 후 추가
+KR_HOLIDAYS = {
+    2025: {
+        date(2025, 1, 1): '신정',
+        date(2025, 1, 27): '임시공휴일',
+        date(2025, 1, 28): '설날',
+        date(2025, 1, 29): '설날',
+        date(2025, 1, 30): '설날',
+        date(2025, 3, 3): '삼일절 대체공휴일',
+        date(2025, 5, 1): '근로자의 날',
+        date(2025, 5, 5): '어린이날/부처님오신날',
+        date(2025, 5, 6): '대체공휴일',
+        date(2025, 6, 3): '대통령 선거일',
+        date(2025, 6, 6): '현충일',
+        date(2025, 8, 15): '광복절',
+        date(2025, 10, 3): '개천절',
+        date(2025, 10, 6): '추석',
+        date(2025, 10, 7): '추석',
+        date(2025, 10, 8): '추석 대체공휴일',
+        date(2025, 10, 9): '한글날',
+        date(2025, 12, 25): '성탄절',
+        date(2025, 12, 31): '연말 휴장일'
+    },
+    2026: {
+        date(2026, 1, 1): '신정',
+        date(2026, 2, 16): '설날',
+        date(2026, 2, 17): '설날',
+        date(2026, 2, 18): '설날',
+        date(2026, 3, 2): '삼일절 대체공휴일',
+        date(2026, 5, 1): '근로자의 날',
+        date(2026, 5, 5): '어린이날',
+        date(2026, 5, 25): '부처님오신날 대체공휴일',
+        date(2026, 6, 3): '전국동시지방선거',
+        date(2026, 8, 17): '광복절 대체공휴일',
+        date(2026, 9, 24): '추석',
+        date(2026, 9, 25): '추석',
+        date(2026, 10, 5): '개천절 대체공휴일',
+        date(2026, 10, 9): '한글날',
+        date(2026, 12, 25): '성탄절',
+        date(2026, 12, 31): '연말 휴장일'
+    },
+    2027: {
+        date(2027, 1, 1): '신정',
+        date(2027, 2, 5): '설날',
+        date(2027, 2, 8): '설날 대체공휴일',
+        date(2027, 3, 1): '삼일절',
+        date(2027, 5, 5): '어린이날',
+        date(2027, 5, 13): '부처님오신날',
+        date(2027, 8, 16): '광복절 대체공휴일',
+        date(2027, 9, 14): '추석',
+        date(2027, 9, 15): '추석',
+        date(2027, 9, 16): '추석',
+        date(2027, 10, 4): '개천절 대체공휴일',
+        date(2027, 10, 11): '한글날 대체공휴일',
+        date(2027, 12, 27): '성탄절 대체공휴일',
+        date(2027, 12, 31): '연말 휴장일'
+    }
+}
+
+# KRX 수능일 (개장/폐장 1시간 지연)
+KR_CSAT_DAYS = {date(2025, 11, 13), date(2026, 11, 19)}
+
+
+def _nth_weekday(year: int, month: int, weekday: int, n: int) -> date:
+    """month월 n번째 weekday (n=-1이면 마지막)"""
+    if n > 0:
+        first = date(year, month, 1)
+        return first + timedelta(days=(weekday - first.weekday()) % 7 + 7 * (n - 1))
+    last = date(year, month + 1, 1) - timedelta(days=1) if month < 12 else date(year, 12, 31)
+    return last - timedelta(days=(last.weekday() - weekday) % 7)
+
+
+def _easter(year: int) -> date:
+    """부활절 (그레고리력, Anonymous Gregorian algorithm)"""
+    a = year % 19
+    b, c = divmod(year, 100)
+    d, e = divmod(b, 4)
+    f = (b + 8) // 25
+    g = (b - f + 1) // 3
+    h = (19 * a + b - d - g + 15) % 30
+    i, k = divmod(c, 4)
+    l = (32 + 2 * e + 2 * i - h - k) % 7
+    m = (a + 11 * h + 22 * l) // 451
+    month, day = divmod(h + l - 7 * m + 114, 31)
+    return date(year, month, day + 1)
+
+
+def _observed(day: date) -> date:
+    """토요일 → 금요일, 일요일 → 월요일"""
+    if day.weekday() == 5:
+        return day - timedelta(days=1)
+    if day.weekday() == 6:
+        return day + timedelta(days=1)
+    return day
+
+
+def us_holidays(year: int) -> Dict[date, str]:
+    """NYSE/NASDAQ 휴장일 {date: 이름}"""
+    holidays = {}
+    new_year = date(year, 1, 1)
+    if new_year.weekday() != 5:  # 토요일 신정은 전년 12/31로 옮기지 않음 (NYSE 규칙)
+        holidays[_observed(new_year)] = "New Year's Day"
+    holidays[_nth_weekday(year, 1, 0, 3)] = 'Martin Luther King Jr. Day'
+    holidays[_nth_weekday(year, 2, 0, 3)] = "Washington's Birthday"
+    holidays[_easter(year) - timedelta(days=2)] = 'Good Friday'
+    holidays[_nth_weekday(year, 5, 0, -1)] = 'Memorial Day'
+    if year >= 2022:
+        holidays[_observed(date(year, 6, 19))] = 'Juneteenth'
+    holidays[_observed(date(year, 7, 4))] = 'Independence Day'
+    holidays[_nth_weekday(year, 9, 0, 1)] = 'Labor Day'
+    holidays[_nth_weekday(year, 11, 3, 4)] = 'Thanksgiving Day'
+    holidays[_observed(date(year, 12, 25))] = 'Christmas Day'
+    for day, name in US_SPECIAL_CLOSURES.items():
+        if day.year == year:
+            holidays[day] = name
+    return holidays
+
+
+def us_early_closes(year: int) -> Dict[date, dt_time]:
+    """NYSE/NASDAQ 조기 폐장일 {date: 폐장 시각}"""
+    holidays = us_holidays(year)
+    candidates = [
+        date(year, 7, 3),                                   # 독립기념일 전날
+        _nth_weekday(year, 11, 3, 4) + timedelta(days=1),   # 추수감사절 다음날
+        date(year, 12, 24)                                  # 성탄 전날
+    ]
+    return {day: US_EARLY_CLOSE for day in candidates if day.weekday() < 5 and day not in holidays}
+
+
+def kr_holidays(year: int) -> Optional[Dict[date, str]]:
+    """KRX 휴장일 {date: 이름} (표가 없는 연도는 None)"""
+    return KR_HOLIDAYS.get(year)
+
+
+def market_for_timezone(timezone: str) -> Optional[str]:
+    """타임존 이름 → 시장 키 ('us'/'kr', 모르면 None)"""
+    for market, name in MARKET_TIMEZONES.items():
+        if name == timezone:
+            return market
+    return None
+
+
+class MarketCalendar:
+    """
+    시장 세션 표 (스레드 안전, 조회는 O(1))
+    """
+
+    def __init__(self, market: Optional[str], market_hours: Tuple[str, str] = None, timezone: str = None):
+        """
+        Args:
+            market: 'us', 'kr' 또는 None (None이면 주말만 제외)
+            market_hours: (개장 'HH:MM', 폐장 'HH:MM') 운영 시간 (기본: 시장 정규장)
+            timezone: 시장 타임존 (기본: 시장별 타임존)
+        """
+        self.market = market
+        self.tz = pytz.timezone(timezone or MARKET_TIMEZONES.get(market, 'UTC'))
+        hours = market_hours or DEFAULT_MARKET_HOURS.get(market, ('00:00', '23:59'))
+        self.start_time = dt_time.fromisoformat(hours[0])
+        self.end_time = dt_time.fromisoformat(hours[1])
+        self.logger = logging.getLogger(f"{self.__class__.__name__}.{market or 'default'}")
+
+        self._lock = threading.Lock()
+        self._years: set = set()
+        self._sessions: Dict[date, Tuple[float, float]] = {}
+        self._opens: List[float] = []
+        self._closes: List[float] = []
+        self._by_day: Dict[int, List[Tuple[float, float]]] = {}   # {UTC 일 번호: [(open, close)]}
+        self._warned_years: set = set()
+
+        this_year = datetime.now(self.tz).year
+        self._extend(range(this_year - 1, this_year + 2))
+
+    # ------------------------------------------------------------------
+    # 세션 표 계산
+    # ------------------------------------------------------------------
+    def _holidays(self, year: int) -> Dict[date, str]:
+        if self.market == 'us':
+            return us_holidays(year)
+        if self.market == 'kr':
+            holidays = kr_holidays(year)
+            if holidays is None:
+                # 미리 계산하는 다음 연도는 경고 생략 (해당 연도가 되면 경고)
+                if year not in self._warned_years and year <= datetime.now(self.tz).year:
+                    self._warned_years.add(year)
+                    self.logger.warning(f"[CALENDAR] KRX {year}년 휴장일 표 없음 - 주말만 제외")
+                return {}
+            return holidays
+        return {}
+
+    def _year_sessions(self, year: int) -> Dict[date, Tuple[dt_time, dt_time]]:
+        """연도 거래일별 (개장, 폐장) 현지 시각"""
+        holidays = self._holidays(year)
+        early_closes = us_early_closes(year) if self.market == 'us' else {}
+        sessions = {}
+        first_day = True
+        day = date(year, 1, 1)
+        while day.year == year:
+            if day.weekday() < 5 and day not in holidays:
+                start, end = self.start_time, self.end_time
+                if day in early_closes:
+                    end = min(end, early_closes[day])
+                if self.market == 'kr':
+                    if day in KR_CSAT_DAYS:
+                        start, end = self._shift(start, KR_DELAY_MINUTES), self._shift(end, KR_DELAY_MINUTES)
+                    elif first_day:
+                        start = self._shift(start, KR_DELAY_MINUTES)
+                first_day = False
+                if start < end:
+                    sessions[day] = (start, end)
+            day += timedelta(days=1)
+        return sessions
+
+    @staticmethod
+    def _shift(value: dt_time, minutes: int) -> dt_time:
+        return (datetime.combine(date(2000, 1, 1), value) + timedelta(minutes=minutes)).time()
+
+    def _extend(self, years):
+        """연도 세션을 표에 추가 (epoch 구간 + UTC 날짜 버킷 재구성)"""
+        with self._lock:
+            new_years = [year for year in years if year not in self._years]
+            if not new_years:
+                return
+            for year in new_years:
+                for day, (start, end) in self._year_sessions(year).items():
+                    open_ts = self.tz.localize(datetime.combine(day, start)).timestamp()
+                    close_ts = self.tz.localize(datetime.combine(day, end)).timestamp()
+                    self._sessions[day] = (open_ts, close_ts)
+                self._years.add(year)
+
+            intervals = sorted(self._sessions.values())
+            self._opens = [interval[0] for interval in intervals]
+            self._closes = [interval[1] for interval in intervals]
+            by_day: Dict[int, List[Tuple[float, float]]] = {}
+            for open_ts, close_ts in intervals:
+                for utc_day in range(int(open_ts // 86400), int(close_ts // 86400) + 1):
+                    by_day.setdefault(utc_day, []).append((open_ts, close_ts))
+            self._by_day = by_day
+
+    def _ensure(self, ts: float):
+        """ts가 속한 연도(및 다음 연도)가 표에 없으면 추가"""
+        year = datetime.fromtimestamp(ts, self.tz).year
+        if year not in self._years or year + 1 not in self._years:
+            self._extend((year, year + 1))
+
+    # ------------------------------------------------------------------
+    # 조회
+    # ------------------------------------------------------------------
+    def is_open(self, ts: float = None) -> bool:
+        """
+        ts(epoch 초, 기본 현재) 시각에 장 운영 중인지 (개장/폐장 시각 포함)
+        """
+        ts = time.time() if ts is None else ts
+        bucket = self._by_day.get(int(ts // 86400))
+        if bucket is None and datetime.fromtimestamp(ts, self.tz).year not in self._years:
+            self._ensure(ts)
+            bucket = self._by_day.get(int(ts // 86400))
+        return any(open_ts <= ts <= close_ts for open_ts, close_ts in bucket or ())
+
+    def is_trading_day(self, day: date) -> bool:
+        """거래일 여부"""
+        return self.session(day) is not None
+
+    def session(self, day: date) -> Optional[Tuple[float, float]]:
+        """
+        거래일 세션 (개장 epoch, 폐장 epoch) - 휴장일이면 None
+        """
+        if day.year not in self._years:
+            self._extend((day.year,))
+        return self._sessions.get(day)
+
+    def session_hours(self, day: date) -> Optional[Tuple[dt_time, dt_time]]:
+        """거래일 (개장, 폐장) 현지 시각 - 휴장일이면 None"""
+        session = self.session(day)
+        if session is None:
+            return None
+        return (datetime.fromtimestamp(session[0], self.tz).time(),
+                datetime.fromtimestamp(session[1], self.tz).time())
+
+    def next_open(self, ts: float = None) -> Optional[float]:
+        """ts 이후 첫 개장 epoch 초"""
+        ts = time.time() if ts is None else ts
+        self._ensure(ts)
+        opens = self._opens
+        i = bisect.bisect_right(opens, ts)
+        return opens[i] if i < len(opens) else None
+
+    def next_close(self, ts: float = None) -> Optional[float]:
+        """ts 이후 첫 폐장 epoch 초"""
+        ts = time.time() if ts is None else ts
+        self._ensure(ts)
+        closes = self._closes
+        i = bisect.bisect_right(closes, ts)
+        return closes[i] if i < len(closes) else None
+
+    def holidays(self, year: int) -> Dict[date, str]:
+        """연도 휴장일 (주말 제외) {date: 이름}"""
+        return dict(self._holidays(year))
+
+    def get_status(self, ts: float = None) -> Dict[str, Any]:
+        """현재 장 상태 + 다음 개장/폐장 시각 (시장 타임존 ISO 문자열)"""
+        ts = time.time() if ts is None else ts
+        next_open, next_close = self.next_open(ts), self.next_close(ts)
+        today = datetime.fromtimestamp(ts, self.tz).date()
+        return {
+            'is_open': self.is_open(ts),
+            'is_trading_day': self.is_trading_day(today),
+            'holiday': self._holidays(today.year).get(today),
+            'next_open': datetime.fromtimestamp(next_open, self.tz).isoformat() if next_open else None,
+            'next_close': datetime.fromtimestamp(next_close, self.tz).isoformat() if next_close else None
+        }
+
+
+_calendars: Dict[tuple, MarketCalendar] = {}
+_calendars_lock = threading.Lock()
+
+
+def get_calendar(market: Optional[str], market_hours: Tuple[str, str] = None,
+                 timezone: str = None) -> MarketCalendar:
+    """
+    시장 캘린더 (같은 설정은 프로세스 안에서 공유)
+
+    Args:
+        market: 'us', 'kr' 또는 None
+        market_hours: (개장 'HH:MM', 폐장 'HH:MM') 운영 시간
+        timezone: 시장 타임존 (기본: 시장별 타임존)
+    """
+    key = (market, tuple(market_hours) if market_hours else None, timezone)
+    with _calendars_lock:
+        calendar = _calendars.get(key)
+        if calendar is None:
+            calendar = _calendars[key] = MarketCalendar(market, market_hours, timezone)
+        return calendar
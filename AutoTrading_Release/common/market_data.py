@@ -0,0 +1,301 @@
+"""
+공유 시장 데이터 - 한 시장의 여러 전략이 같은 시세/잔고 조회 결과를 재사용
+
+전략마다 API 클라이언트를 따로 두면 같은 종목 시세와 잔고를 전략 수만큼
+중복 조회하게 된다. MarketDataHub는 실제 API 클라이언트 1개를 감싸서
+- 현재가: 짧은 TTL 캐시 + 종목별 락 (동시 요청은 1회 조회로 합침),
+  적응형 갱신(RefreshScheduler) 사용 시 종목별 TTL, 주기 선조회(QuotePrefetcher) 시 주기 동안 고정
+- 전일 종가: 장 날짜 단위 캐시 (BarStore 연결 시 당일 갱신된 로컬 일봉 우선, 네트워크 없음)
+- 계좌 잔고: TTL 캐시, 주문 발생 시 즉시 만료 (새로 조회한 잔고는 리스너에 전달)
+- 호출 예산: set_rate_limiter() 지정 시 시세/전일 종가/잔고 API 호출이 시장 몫 예산 안에서만 나감
+  (듀얼 마켓 워커별 분배, 주문은 제한하지 않음)
+를 제공하고, 나머지 속성(is_market_open, token_manager 등)은 원본에 위임한다.
+"""
+import logging
+import threading
+import time
+from datetime import datetime
+from typing import Optional, Dict, Any
+
+import pytz
+
+from .indicators import IndicatorBook
+
+
+# 기본 캐시 설정
+PRICE_TTL_SECONDS = 5        # 현재가 재사용 시간 (초)
+BALANCE_TTL_SECONDS = 10     # 잔고 재사용 시간 (초)
+LIMIT_WAIT_SECONDS = 10      # 호출 예산 대기 최대 시간 (초, 초과 시 조회 생략)
+
+
+class MarketDataHub:
+    """
+    시장 1개의 공유 데이터 계층 (스레드 안전)
+
+    사용 예:
+        hub = MarketDataHub(KRAPIClient())
+        strategy_a = KRStrategy(api_client=hub)
+        strategy_b = KRStrategy(api_client=hub, profit_threshold=0.08)
+    """
+
+    def __init__(self, api_client,
+                 price_ttl: float = PRICE_TTL_SECONDS,
+                 balance_ttl: float = BALANCE_TTL_SECONDS):
+        """
+        Args:
+            api_client: 실제 API 클라이언트 (BaseAPIClient 서브클래스)
+            price_ttl: 현재가 캐시 유효 시간 (초)
+            balance_ttl: 잔고 캐시 유효 시간 (초)
+        """
+        self.client = api_client
+        self.price_ttl = price_ttl
+        self.balance_ttl = balance_ttl
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+        try:
+            timezone = api_client.get_timezone()
+        except Exception:
+            timezone = None
+        self.tz = pytz.timezone(timezone) if timezone else None
+
+        # 전략 공용 장중 지표 (시세 조회 시 1회만 갱신)
+        self.indicators = IndicatorBook(timezone=timezone)
+        if hasattr(api_client, 'add_price_listener'):
+            api_client.add_price_listener(self.indicators.update)
+
+        self._lock = threading.Lock()
+        self._symbol_locks: Dict[str, threading.Lock] = {}
+        self._prices: Dict[str, tuple] = {}            # {symbol: (price, monotonic)}
+        self._price_ttls: Dict[str, float] = {}        # {symbol: TTL} 종목별 TTL (없으면 price_ttl)
+        self._price_pins: Dict[str, tuple] = {}        # {symbol: (max_age, until monotonic)} 선조회 고정
+        self._prev_closes: Dict[str, tuple] = {}       # {symbol: (price, 장 날짜)}
+        self._balance: Optional[Dict[str, Any]] = None
+        self._balance_time = 0.0
+        self._balance_lock = threading.Lock()
+        self._balance_listeners = []
+        self.bar_store = None
+        self.market = None
+        self.limiter = None
+        self.limit_wait = LIMIT_WAIT_SECONDS
+
+        # 공유 효과 통계
+        self.stats = {
+            'price_requests': 0,
+            'price_hits': 0,
+            'prev_close_requests': 0,
+            'prev_close_hits': 0,
+            'prev_close_store_hits': 0,
+            'balance_requests': 0,
+            'balance_hits': 0,
+            'orders': 0,
+            'budget_timeouts': 0
+        }
+
+    def __getattr__(self, name):
+        # 캐시 대상이 아닌 속성/메서드는 원본 클라이언트에 위임
+        if name == 'client':
+            raise AttributeError(name)
+        return getattr(self.client, name)
+
+    def _symbol_lock(self, symbol: str) -> threading.Lock:
+        with self._lock:
+            lock = self._symbol_locks.get(symbol)
+            if lock is None:
+                lock = self._symbol_locks[symbol] = threading.Lock()
+            return lock
+
+    def _market_date(self):
+        return datetime.now(self.tz).date() if self.tz else datetime.now().date()
+
+    def get_current_price(self, symbol: str) -> Optional[float]:
+        """현재가 조회 (TTL 내 재사용, 동일 종목 동시 요청은 1회 조회)"""
+        with self._symbol_lock(symbol):
+            cached = self._prices.get(symbol)
+            if cached and time.monotonic() - cached[1] < self._effective_ttl(symbol):
+                self.stats['price_hits'] += 1
+                return cached[0]
+
+            return self._fetch_price(symbol)
+
+    def set_rate_limiter(self, limiter, wait: float = LIMIT_WAIT_SECONDS):
+        """
+        API 호출 예산 지정 (시세/전일 종가/잔고 조회에 적용)
+
+        Args:
+            limiter: RateLimiter (None이면 제한 해제)
+            wait: 예산 대기 최대 시간 (초)
+        """
+        self.limiter = limiter
+        self.limit_wait = wait
+
+    def _acquire(self) -> bool:
+        """호출 예산 1회 획득 (예산 미지정이면 항상 True)"""
+        limiter = self.limiter
+        if limiter is None or limiter.acquire(timeout=self.limit_wait):
+            return True
+        self.stats['budget_timeouts'] += 1
+        return False
+
+    def _fetch_price(self, symbol: str) -> Optional[float]:
+        """현재가 조회 후 캐시 저장 (종목 락 보유 상태에서 호출)"""
+        if not self._acquire():
+            cached = self._prices.get(symbol)
+            return cached[0] if cached else None
+        self.stats['price_requests'] += 1
+        price = self.client.get_current_price(symbol)
+        if price is not None:
+            self._prices[symbol] = (price, time.monotonic())
+        return price
+
+    def refresh_price(self, symbol: str) -> Optional[float]:
+        """현재가 강제 조회 (TTL 무시, 백그라운드 갱신용)"""
+        with self._symbol_lock(symbol):
+            return self._fetch_price(symbol)
+
+    def _effective_ttl(self, symbol: str) -> float:
+        """종목 현재가 TTL (종목별 TTL, 선조회 고정 중이면 고정 유지 시간 중 큰 값)"""
+        ttl = self._price_ttls.get(symbol, self.price_ttl)
+        pin = self._price_pins.get(symbol)
+        if pin is not None:
+            if time.monotonic() < pin[1]:
+                return max(ttl, pin[0])
+            self._price_pins.pop(symbol, None)
+        return ttl
+
+    def pin_prices(self, symbols, max_age: float, until: float):
+        """
+        선조회 시세를 주기 동안 재사용하도록 고정
+
+        Args:
+            symbols: 종목 리스트
+            max_age: 고정 중 허용할 시세 경과 시간 (초)
+            until: 고정 해제 시각 (time.monotonic 기준)
+        """
+        for symbol in symbols:
+            self._price_pins[symbol] = (max_age, until)
+
+    def unpin_prices(self):
+        """선조회 고정 전체 해제"""
+        self._price_pins.clear()
+
+    def set_price_ttl(self, symbol: str, ttl: Optional[float]):
+        """
+        종목별 현재가 TTL 설정
+
+        Args:
+            symbol: 종목 코드
+            ttl: 캐시 유효 시간 (초, None이면 기본 price_ttl로 복귀)
+        """
+        if ttl is None:
+            self._price_ttls.pop(symbol, None)
+        else:
+            self._price_ttls[symbol] = ttl
+
+    def peek_price(self, symbol: str) -> Optional[float]:
+        """캐시된 현재가 (TTL 무관, 조회하지 않음)"""
+        cached = self._prices.get(symbol)
+        return cached[0] if cached else None
+
+    def attach_bar_store(self, store, market: str):
+        """
+        전일 종가를 먼저 조회할 로컬 일봉 저장소 연결
+
+        Args:
+            store: BarStore
+            market: 저장소 시장 키 ('kr' 또는 'us')
+        """
+        self.bar_store = store
+        self.market = market
+
+    def get_previous_close(self, symbol: str) -> Optional[float]:
+        """전일 종가 조회 (장 날짜가 같으면 재사용, 로컬 일봉 → API 순)"""
+        if not hasattr(self.client, 'get_previous_close'):
+            return None
+
+        today = self._market_date()
+        with self._symbol_lock(symbol):
+            cached = self._prev_closes.get(symbol)
+            if cached and cached[1] == today:
+                self.stats['prev_close_hits'] += 1
+                return cached[0]
+
+            if self.bar_store is not None:
+                price = self.bar_store.previous_close(self.market, symbol, today)
+                if price is not None:
+                    self.stats['prev_close_store_hits'] += 1
+                    self._prev_closes[symbol] = (price, today)
+                    return price
+
+            if not self._acquire():
+                return None
+            self.stats['prev_close_requests'] += 1
+            price = self.client.get_previous_close(symbol)
+            if price is not None:
+                self._prev_closes[symbol] = (price, today)
+            return price
+
+    def get_account_balance(self) -> Optional[Dict[str, Any]]:
+        """
+        계좌 잔고 조회 (TTL 내 재사용)
+
+        Returns:
+            잔고 딕셔너리 복사본 (positions 리스트도 복사, 호출자가 정렬해도 안전)
+        """
+        with self._balance_lock:
+            if self._balance is not None and time.monotonic() - self._balance_time < self.balance_ttl:
+                self.stats['balance_hits'] += 1
+            else:
+                if not self._acquire():
+                    return None
+                self.stats['balance_requests'] += 1
+                balance = self.client.get_account_balance()
+                if not balance:
+                    return balance
+                self._balance = balance
+                self._balance_time = time.monotonic()
+                for listener in self._balance_listeners:
+                    try:
+                        listener(balance)
+                    except Exception as e:
+                        self.logger.error(f"[HUB] 잔고 리스너 오류: {e}")
+
+            balance = dict(self._balance)
+            balance['positions'] = list(self._balance.get('positions', []))
+            return balance
+
+    def add_balance_listener(self, listener):
+        """새로 조회한 잔고를 받을 콜백 등록 (listener(balance))"""
+        if listener not in self._balance_listeners:
+            self._balance_listeners.append(listener)
+
+    def invalidate_balance(self):
+        """잔고 캐시 만료 (주문 체결 후)"""
+        with self._balance_lock:
+            self._balance = None
+
+    def place_order(self, symbol: str, side: str, quantity: int,
+                    price: Optional[float] = None) -> Dict[str, Any]:
+        """주문 실행 (성공 시 잔고 캐시 만료)"""
+        result = self.client.place_order(symbol, side, quantity, price)
+        self.stats['orders'] += 1
+        if result and result.get('success'):
+            self.invalidate_balance()
+        return result
+
+    def clear_cache(self):
+        """시세/잔고 캐시 전체 삭제"""
+        with self._lock:
+            self._prices.clear()
+            self._prev_closes.clear()
+            self._price_pins.clear()
+        self.invalidate_balance()
+        if hasattr(self.client, 'clear_cache'):
+            self.client.clear_cache()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """공유 캐시 통계 반환"""
+        stats = dict(self.stats)
+        for key in ('price', 'prev_close', 'balance'):
+            total = stats[f'{key}_requests'] + stats[f'{key}_hits']
+            stats[f'{key}_hit_rate'] = round(stats[f'{key}_hits'] / total * 100, 1) if total else 0
+        return stats
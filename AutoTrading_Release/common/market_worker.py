@@ -0,0 +1,386 @@
+"""
+시장별 워커 - 시장마다 자기 작업 큐/호출 예산/상태를 가진 독립 실행 단위
+
+듀얼 마켓을 스케줄러 1개, 스레드 1개로 돌리면 느린 US 잔고 조회나 yfinance 폴백이 KR 주기를
+늦추고, 한 시장에서 예외가 반복되면 다른 시장이 밀린다. MarketWorker는 시장 1개의 작업을
+자기 EventScheduler에 등록해 전용 실행 단위에서 돌린다.
+
+- 모드: 'thread' (같은 프로세스, 전용 스레드) 또는 'process' (자식 프로세스 - 멈춘 작업도 강제 종료 가능)
+- 작업 큐: 워커마다 EventScheduler 1개 (한 시장 작업 지연은 그 시장 큐 안에서만 누적)
+- 호출 예산: 워커마다 RateLimiter(rate_per_minute) - 공용 API 한도에서 시장 몫만 사용
+- 상태: 실행 중 작업/경과 시간, 실행·오류 횟수, 마지막 오류, 재시작 횟수
+- 감시: check() - 죽은 워커는 재시작, 작업 1개가 stall_seconds를 넘기면 프로세스 모드만 강제 종료 후 재시작
+  (감독자가 주기 호출). 곧바로 다시 죽는 워커는 재시작 간격을 지수적으로 늘림 (최대 WORKER_RESTART_BACKOFF_MAX초)
+- 로그: 프로세스 모드 자식은 부모 로깅 설정을 물려받지 못하므로(spawn) 로그를 큐로 부모에 넘겨
+  부모의 핸들러(trading.log/콘솔)로 기록
+
+스레드 모드는 파이썬 스레드를 강제로 멈출 수 없고, 새 스레드를 띄워도 같은 MarketScheduler와 락을 공유해
+멈춘 작업 뒤에서 함께 막힌다. 그래서 스레드 모드의 멈춤은 재시작하지 않고 상태('stalled')와 경고로만 알린다
+(멈춘 작업까지 복구하려면 --worker-mode process).
+
+사용 예:
+    worker = MarketWorker('kr', functools.partial(setup_market_worker, 'kr'), mode='process',
+                          rate_per_minute=300)
+    worker.start()
+    ...
+    worker.check()          # 감독자 주기마다
+    worker.stop()
+
+setup(events, limiter)은 워커 안(스레드 모드는 워커 스레드, 프로세스 모드는 자식 프로세스)에서
+호출되어 작업을 등록하고, 정리 함수(또는 None)를 반환한다. 프로세스 모드에서는 spawn 방식에서도
+넘길 수 있도록 모듈 최상위 함수(functools.partial 가능)여야 한다.
+"""
+import logging
+import multiprocessing
+import threading
+import time
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional, Dict, Any, Callable
+
+from .event_scheduler import EventScheduler
+from .rate_limiter import RateLimiter
+
+
+WORKER_MODES = ('thread', 'process')
+WORKER_STALL_SECONDS = 900        # 작업 1개가 이 시간 넘게 끝나지 않으면 멈춘 것으로 판단 (초)
+WORKER_STOP_TIMEOUT = 10          # 중지/재시작 시 종료 대기 시간 (초)
+MAX_ERROR_TEXT = 200              # 프로세스 간 공유하는 마지막 오류 길이
+WORKER_RESTART_BACKOFF = 5        # 연속 재시작 대기 시작값 (초, 재시작마다 2배)
+WORKER_RESTART_BACKOFF_MAX = 600  # 연속 재시작 대기 최대값 (초)
+WORKER_STABLE_SECONDS = 600       # 이 시간 넘게 살아 있던 워커가 죽으면 대기 없이 재시작 (초)
+
+_log_queue = None                 # 프로세스 모드 자식 → 부모 로그 큐 (부모에서 1회 생성)
+_log_listener = None
+_log_lock = threading.Lock()
+
+
+def _get_log_queue():
+    """자식 프로세스 로그를 부모 루트 로거 핸들러로 넘기는 큐 (첫 호출 시 리스너 시작)"""
+    global _log_queue, _log_listener
+    with _log_lock:
+        if _log_queue is None:
+            _log_queue = multiprocessing.Queue()
+            _log_listener = QueueListener(_log_queue, *logging.getLogger().handlers,
+                                          respect_handler_level=True)
+            _log_listener.start()
+        return _log_queue
+
+
+def _init_child_logging(log_queue, level: int):
+    """자식 프로세스 로깅 - 루트 로거를 부모로 가는 큐 핸들러 1개로 교체 (fork로 물려받은 핸들러 제거)"""
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(QueueHandler(log_queue))
+    root.setLevel(level)
+
+
+class _WorkerState:
+    """
+    워커 상태 (스레드 모드: 일반 속성, 프로세스 모드: 공유 메모리)
+    """
+
+    def __init__(self, shared: bool):
+        self.shared = shared
+        if shared:
+            self._busy_since = multiprocessing.Value('d', 0.0)
+            self._job = multiprocessing.Array('c', 64)
+            self._error = multiprocessing.Array('c', MAX_ERROR_TEXT)
+            self._dispatches = multiprocessing.Value('l', 0)
+            self._errors = multiprocessing.Value('l', 0)
+        else:
+            self._values = {'busy_since': 0.0, 'job': '', 'error': '', 'dispatches': 0, 'errors': 0}
+
+    def on_job(self, name: Optional[str], error: Optional[Exception]):
+        """EventScheduler on_job 콜백 - 작업 시작/종료 기록 (벽시계 기준, 프로세스 간 비교 가능)"""
+        if name:
+            self._set('job', name)
+            self._set('busy_since', time.time())
+            return
+        self._set('busy_since', 0.0)
+        self._set('job', '')
+        self._set('dispatches', self.get('dispatches') + 1)
+        if error is not None:
+            self.record_error(error)
+
+    def record_error(self, error: Exception):
+        """오류 횟수/마지막 오류 기록"""
+        self._set('errors', self.get('errors') + 1)
+        self._set('error', f"{type(error).__name__}: {error}")
+
+    def _set(self, key: str, value):
+        if not self.shared:
+            self._values[key] = value
+            return
+        target = getattr(self, f"_{key}")
+        if isinstance(value, str):
+            target.value = value.encode('utf-8')[:len(target) - 1]
+        else:
+            target.value = value
+
+    def get(self, key: str):
+        if not self.shared:
+            return self._values[key]
+        value = getattr(self, f"_{key}").value
+        return value.decode('utf-8', errors='ignore') if isinstance(value, bytes) else value
+
+
+def _run_worker(name: str, setup: Callable, rate_per_minute: Optional[float], state: _WorkerState,
+                stop_event, events_holder: Optional[dict] = None, log_queue=None, log_level: int = logging.INFO):
+    """워커 본체 - 전용 EventScheduler에 작업 등록 후 중지 신호까지 실행 (스레드/자식 프로세스 공용)"""
+    if log_queue is not None:
+        _init_child_logging(log_queue, log_level)
+    logger = logging.getLogger(f"MarketWorker.{name}")
+    events = EventScheduler(name, on_job=state.on_job)
+    if events_holder is not None:
+        events_holder['events'] = events
+    limiter = RateLimiter(rate_per_minute) if rate_per_minute else None
+    if events_holder is not None:
+        events_holder['limiter'] = limiter
+
+    cleanup = None
+    try:
+        cleanup = setup(events, limiter)
+
+        # 중지 신호가 오면 run() 루프 해제 (프로세스 모드는 부모의 Event)
+        def watch_stop():
+            stop_event.wait()
+            events.stop()
+
+        threading.Thread(target=watch_stop, name=f"{name}-stop", daemon=True).start()
+        if not stop_event.is_set():
+            events.run()
+    except Exception as e:
+        logger.error(f"[WORKER] {name} 워커 오류: {e}")
+        state.record_error(e)
+        raise
+    finally:
+        if cleanup is not None:
+            try:
+                cleanup()
+            except Exception as e:
+                logger.error(f"[WORKER] {name} 정리 오류: {e}")
+
+
+class MarketWorker:
+    """
+    시장 1개 전용 실행 단위 (스레드 또는 자식 프로세스)
+    """
+
+    def __init__(self, market: str, setup: Callable, mode: str = 'thread',
+                 rate_per_minute: Optional[float] = None,
+                 stall_seconds: float = WORKER_STALL_SECONDS):
+        """
+        Args:
+            market: 시장 이름 ('us', 'kr')
+            setup: callable(events, limiter) -> 정리 함수 또는 None (워커 안에서 작업 등록)
+            mode: 'thread' 또는 'process'
+            rate_per_minute: 이 시장 몫의 분당 API 호출 예산 (None이면 제한 없음)
+            stall_seconds: 작업 1개 최대 실행 시간 (초과 시 멈춤으로 판단, 프로세스 모드는 재시작)
+        """
+        if mode not in WORKER_MODES:
+            raise ValueError(f"mode must be one of {WORKER_MODES}: {mode}")
+
+        self.market = market
+        self.name = market.upper()
+        self.setup = setup
+        self.mode = mode
+        self.rate_per_minute = rate_per_minute
+        self.stall_seconds = stall_seconds
+        self.logger = logging.getLogger(f"{self.__class__.__name__}.{self.name}")
+
+        self._unit = None            # threading.Thread 또는 multiprocessing.Process
+        self._stop_event = None
+        self._state: Optional[_WorkerState] = None
+        self._holder: Dict[str, Any] = {}
+        self._started_at = 0.0
+        self._stopping = False
+        self._stall_reported = 0.0   # 경고를 남긴 멈춤 작업의 시작 시각 (스레드 모드, 작업당 1회)
+        self._backoff = 0.0          # 다음 연속 재시작까지 대기 시간 (초)
+        self._restart_after = 0.0    # 이 시각 전에는 재시작하지 않음 (epoch 초)
+        self._dead_reported = False  # 현재 죽은 워커를 기록했는지 (죽음당 1회 집계/로그)
+
+        self.stats = {
+            'starts': 0,
+            'restarts': 0,
+            'stalls': 0,
+            'deaths': 0,
+            'backoff_seconds': 0.0,
+            'last_restart_reason': None
+        }
+
+    # ------------------------------------------------------------------
+    # 실행 제어
+    # ------------------------------------------------------------------
+    def start(self):
+        """워커 시작"""
+        if self.is_alive():
+            return
+
+        self._stopping = False
+        self._holder = {}
+        if self.mode == 'process':
+            self._state = _WorkerState(shared=True)
+            self._stop_event = multiprocessing.Event()
+            self._unit = multiprocessing.Process(
+                target=_run_worker, name=f"MarketWorker-{self.name}",
+                args=(self.name, self.setup, self.rate_per_minute, self._state, self._stop_event,
+                      None, _get_log_queue(), logging.getLogger().getEffectiveLevel()),
+                daemon=True)
+        else:
+            self._state = _WorkerState(shared=False)
+            self._stop_event = threading.Event()
+            self._unit = threading.Thread(
+                target=_run_worker, name=f"MarketWorker-{self.name}",
+                args=(self.name, self.setup, self.rate_per_minute, self._state, self._stop_event, self._holder),
+                daemon=True)
+
+        self._unit.start()
+        self._started_at = time.time()
+        self._dead_reported = False
+        self.stats['starts'] += 1
+        budget = f"분당 {self.rate_per_minute:g}회" if self.rate_per_minute else "제한 없음"
+        self.logger.info(f"[WORKER] {self.name} 워커 시작 ({self.mode}, 호출 예산 {budget})")
+
+    def stop(self, timeout: float = WORKER_STOP_TIMEOUT):
+        """워커 중지 (실행 중 작업이 끝날 때까지 timeout초 대기, 프로세스 모드는 초과 시 강제 종료)"""
+        self._stopping = True
+        if self._unit is None:
+            return
+        self._stop_event.set()
+        self._unit.join(timeout)
+        if self._unit.is_alive():
+            if self.mode == 'process':
+                self.logger.warning(f"[WORKER] {self.name} 종료 대기 초과 - 프로세스 강제 종료")
+                self._unit.terminate()
+                self._unit.join(timeout)
+            else:
+                self.logger.warning(f"[WORKER] {self.name} 종료 대기 초과 - 실행 중 작업 종료 후 스레드 정리")
+
+    def restart(self, reason: str):
+        """
+        워커 재시작 (죽은 워커 또는 멈춘 프로세스 - 프로세스는 강제 종료 후 새로 시작)
+
+        WORKER_STABLE_SECONDS 안에 다시 재시작하게 되면 다음 재시작까지 대기 시간을 2배로 늘린다
+        (WORKER_RESTART_BACKOFF ~ WORKER_RESTART_BACKOFF_MAX초, check()가 대기 시간 동안 재시작 보류).
+        """
+        self.logger.warning(f"[WORKER] {self.name} 워커 재시작: {reason}")
+        self.stats['restarts'] += 1
+        self.stats['last_restart_reason'] = reason
+        if time.time() - self._started_at >= WORKER_STABLE_SECONDS:
+            self._backoff = 0.0
+        self._backoff = (min(self._backoff * 2, WORKER_RESTART_BACKOFF_MAX) if self._backoff
+                         else WORKER_RESTART_BACKOFF)
+        self.stats['backoff_seconds'] = self._backoff
+        self.stop(timeout=1)
+        self._unit = None
+        self.start()
+        self._restart_after = self._started_at + self._backoff
+
+    def is_alive(self) -> bool:
+        return self._unit is not None and self._unit.is_alive()
+
+    @property
+    def events(self) -> Optional[EventScheduler]:
+        """워커 EventScheduler (스레드 모드만, 프로세스 모드는 None)"""
+        return self._holder.get('events')
+
+    def busy_seconds(self) -> float:
+        """실행 중인 작업 경과 시간 (초, 대기 중이면 0)"""
+        if self._state is None:
+            return 0.0
+        since = self._state.get('busy_since')
+        return max(0.0, time.time() - since) if since else 0.0
+
+    def check(self) -> Optional[str]:
+        """
+        상태 점검 후 필요 시 재시작 (감독자가 주기 호출)
+
+        스레드 모드의 멈춘 작업은 재시작하지 않고 작업당 1회 경고만 남긴다 (상태는 'stalled').
+        직전 재시작 후 대기 시간(backoff)이 지나지 않았으면 재시작을 보류한다.
+
+        Returns:
+            재시작 사유 (재시작하지 않았으면 None)
+        """
+        if self._stopping or self._unit is None:
+            return None
+
+        reason = None
+        if not self.is_alive():
+            exitcode = getattr(self._unit, 'exitcode', None)
+            reason = "워커 종료됨" + (f" (exitcode {exitcode})" if exitcode is not None else "")
+            if not self._dead_reported:
+                self._dead_reported = True
+                self.stats['deaths'] += 1
+                if time.time() - self._started_at >= WORKER_STABLE_SECONDS:
+                    self._restart_after = 0.0
+                elif time.time() < self._restart_after:
+                    self.logger.warning(f"[WORKER] {self.name} {reason} - 연속 재시작 대기 "
+                                        f"{self._restart_after - time.time():.0f}초")
+        else:
+            busy = self.busy_seconds()
+            if busy > self.stall_seconds:
+                stalled = f"{self._state.get('job')} 작업 {busy:.0f}초 경과 (한도 {self.stall_seconds:g}초)"
+                if self.mode == 'process':
+                    self.stats['stalls'] += 1
+                    reason = stalled
+                else:
+                    since = self._state.get('busy_since')
+                    if since != self._stall_reported:
+                        self._stall_reported = since
+                        self.stats['stalls'] += 1
+                        self.logger.warning(f"[WORKER] {self.name} 작업 멈춤: {stalled} - "
+                                            f"스레드 모드는 강제 종료할 수 없어 작업 종료까지 대기")
+
+        if not reason or time.time() < self._restart_after:
+            return None
+        self.restart(reason)
+        return reason
+
+    # ------------------------------------------------------------------
+    # 관측
+    # ------------------------------------------------------------------
+    def get_status(self) -> Dict[str, Any]:
+        """
+        워커 상태
+
+        Returns:
+            {'market', 'mode', 'state', 'current_job', 'busy_seconds', 'dispatches', 'errors',
+             'last_error', 'uptime_seconds', 'rate', 'events', + stats}
+        """
+        alive = self.is_alive()
+        busy = self.busy_seconds() if alive else 0.0
+        if self._unit is None or self._stopping:
+            state = 'stopped'
+        elif not alive:
+            state = 'dead'
+        elif busy > self.stall_seconds:
+            state = 'stalled'
+        else:
+            state = 'busy' if busy else 'idle'
+
+        status = {
+            'market': self.market,
+            'mode': self.mode,
+            'state': state,
+            'current_job': (self._state.get('job') or None) if self._state else None,
+            'busy_seconds': round(busy, 1),
+            'dispatches': self._state.get('dispatches') if self._state else 0,
+            'errors': self._state.get('errors') if self._state else 0,
+            'last_error': (self._state.get('error') or None) if self._state else None,
+            'uptime_seconds': round(time.time() - self._started_at, 1) if alive else 0.0,
+            'rate': None,
+            'events': None
+        }
+        status.update(self.stats)
+
+        # 스레드 모드는 작업 큐/예산 상세까지 (프로세스 모드는 자식 프로세스 로그 참고)
+        limiter = self._holder.get('limiter')
+        if limiter is not None:
+            status['rate'] = limiter.get_stats()
+        events = self._holder.get('events')
+        if events is not None:
+            stats = events.get_stats()
+            stats.pop('jobs', None)
+            status['events'] = stats
+        return status
@@ -0,0 +1,260 @@
+"""
+장중 1분봉 집계 - 관측한 시세를 추가 API 호출 없이 종목별 1분 OHLCV 봉으로 묶음
+
+현재가 캐시(60초)가 지나면 버려지던 시세(REST 조회, yfinance 폴백, 스트리밍 체결 등)를
+가격 리스너(add_price_listener)로 받아 종목별 1분봉으로 집계한다.
+
+- 보관: 종목별 고정 크기 링 버퍼 (NumPy 배열, 세션 길이와 무관하게 메모리 상한 고정)
+- 거래량: 누적 거래량(acml_vol / tvol) 증가분 (누적값이 줄면 기준만 다시 잡음)
+- 시각: 시장 타임존 기준 1분 경계 (장 시간 지정 시 장 밖 시세는 무시)
+- 저장: 장 마감(flush) 또는 다음 세션 첫 시세 도착 시 완성된 봉을 BarStore 분봉(frame='minute')으로 저장
+  (버퍼가 가득 차면 가장 오래된 봉이 밀려나기 전에 저장)
+
+사용 예:
+    aggregator = MinuteBarAggregator('Asia/Seoul', ('09:00', '15:30'), store=BarStore(), market='kr')
+    api_client.add_price_listener(aggregator.update)
+    ...
+    aggregator.get_bars('005930')['close']
+    aggregator.flush()   # 장 마감 후
+"""
+import logging
+import threading
+import time
+from datetime import datetime, time as dt_time
+from typing import Optional, Dict, Any, List, Tuple
+
+import numpy as np
+import pytz
+
+from .bar_store import MINUTE
+
+
+DEFAULT_CAPACITY = 480     # 종목당 보관 1분봉 수 (정규장 390분 + 여유)
+BAR_SECONDS = 60
+
+
+class MinuteBarRing:
+    """
+    종목 1개의 1분봉 링 버퍼 (시각/시가/고가/저가/종가/거래량 배열, 재할당 없음)
+    """
+
+    __slots__ = ('times', 'opens', 'highs', 'lows', 'closes', 'volumes',
+                 '_size', '_start', '_count', 'last_volume', 'session', 'evicted')
+
+    def __init__(self, size: int):
+        if size <= 0:
+            raise ValueError(f"size must be positive: {size}")
+        self.times = np.zeros(size, dtype=np.int64)
+        self.opens = np.zeros(size)
+        self.highs = np.zeros(size)
+        self.lows = np.zeros(size)
+        self.closes = np.zeros(size)
+        self.volumes = np.zeros(size)
+        self._size = size
+        self._start = 0
+        self._count = 0
+        self.last_volume: Optional[float] = None
+        self.session = None
+        self.evicted = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def is_full(self) -> bool:
+        return self._count == self._size
+
+    def last_time(self) -> Optional[int]:
+        """마지막 봉 시작 시각 (없으면 None)"""
+        if not self._count:
+            return None
+        return int(self.times[(self._start + self._count - 1) % self._size])
+
+    def clear(self):
+        self._start = 0
+        self._count = 0
+        self.last_volume = None
+        self.session = None
+
+    def update(self, bar_time: int, price: float, volume: Optional[float]):
+        """
+        시세 1건 반영 (같은 분이면 마지막 봉 갱신, 새 분이면 봉 추가)
+
+        Args:
+            bar_time: 봉 시작 epoch 초 (1분 경계)
+            price: 현재가
+            volume: 당일 누적 거래량 (선택)
+        """
+        delta = 0.0
+        if volume is not None:
+            if self.last_volume is not None and volume >= self.last_volume:
+                delta = volume - self.last_volume
+            self.last_volume = volume
+
+        if self._count:
+            i = (self._start + self._count - 1) % self._size
+            last_time = self.times[i]
+            if bar_time == last_time:
+                self.highs[i] = max(self.highs[i], price)
+                self.lows[i] = min(self.lows[i], price)
+                self.closes[i] = price
+                self.volumes[i] += delta
+                return
+            if bar_time < last_time:
+                # 늦게 도착한 이전 분 시세는 현재 봉 종가를 덮지 않도록 무시
+                return
+
+        if self._count < self._size:
+            i = (self._start + self._count) % self._size
+            self._count += 1
+        else:
+            i = self._start
+            self._start = (self._start + 1) % self._size
+            self.evicted += 1
+
+        self.times[i] = bar_time
+        self.opens[i] = self.highs[i] = self.lows[i] = self.closes[i] = price
+        self.volumes[i] = delta
+
+    def to_arrays(self) -> Dict[str, np.ndarray]:
+        """시간순 복사본 {'time', 'open', 'high', 'low', 'close', 'volume'}"""
+        index = (self._start + np.arange(self._count)) % self._size
+        return {
+            'time': self.times[index],
+            'open': self.opens[index],
+            'high': self.highs[index],
+            'low': self.lows[index],
+            'close': self.closes[index],
+            'volume': self.volumes[index]
+        }
+
+
+class MinuteBarAggregator:
+    """
+    종목별 1분봉 집계기 (가격 리스너, 스레드 안전)
+    """
+
+    def __init__(self, timezone: str, market_hours: Optional[Tuple[str, str]] = None,
+                 capacity: int = DEFAULT_CAPACITY, store=None, market: Optional[str] = None):
+        """
+        Args:
+            timezone: 시장 타임존 (1분 경계/세션 날짜 기준)
+            market_hours: (장 시작 'HH:MM', 장 종료 'HH:MM') - 지정하면 장 밖 시세 무시
+            capacity: 종목당 보관 1분봉 수
+            store: 완성 세션을 저장할 BarStore (없으면 메모리에만 보관)
+            market: BarStore 시장 키 ('kr' 또는 'us')
+        """
+        self.tz = pytz.timezone(timezone)
+        self.market_hours = None
+        if market_hours:
+            self.market_hours = (dt_time.fromisoformat(market_hours[0]), dt_time.fromisoformat(market_hours[1]))
+        self.capacity = capacity
+        self.store = store
+        self.market = market
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+        self._rings: Dict[str, MinuteBarRing] = {}
+        self._lock = threading.Lock()
+
+        self.stats = {
+            'ticks': 0,
+            'ignored': 0,
+            'flushed_rows': 0,
+            'flush_errors': 0
+        }
+
+    def update(self, symbol: str, price: float, volume: float = None, timestamp: float = None):
+        """
+        시세 1건 반영 (API 클라이언트 가격 리스너 시그니처와 동일)
+
+        Args:
+            symbol: 종목 코드
+            price: 현재가
+            volume: 당일 누적 거래량 (선택)
+            timestamp: 시세 시각 epoch 초 (없으면 현재 시각)
+        """
+        if price is None or price <= 0:
+            return
+        ts = time.time() if timestamp is None else timestamp
+        local = datetime.fromtimestamp(ts, self.tz)
+        if self.market_hours is not None:
+            start, end = self.market_hours
+            if local.weekday() >= 5 or not start <= local.time() < end:
+                self.stats['ignored'] += 1
+                return
+
+        session = local.date()
+        bar_time = int(ts) - local.second
+        with self._lock:
+            ring = self._rings.get(symbol)
+            if ring is None:
+                ring = self._rings[symbol] = MinuteBarRing(self.capacity)
+            if ring.session != session:
+                if ring.session is not None:
+                    # 이전 세션 봉 저장 후 새 세션 시작
+                    self._flush_ring(symbol, ring)
+                ring.clear()
+                ring.session = session
+            elif ring.is_full() and bar_time > ring.last_time():
+                # 가장 오래된 봉이 밀려나기 전에 저장
+                self._flush_ring(symbol, ring)
+            ring.update(bar_time, float(price), None if volume is None else float(volume))
+            self.stats['ticks'] += 1
+
+    def _flush_ring(self, symbol: str, ring: MinuteBarRing, until: Optional[float] = None) -> int:
+        """완성된 봉을 저장소에 추가 (락 보유 상태에서 호출)"""
+        if self.store is None or not len(ring):
+            return 0
+        bars = ring.to_arrays()
+        rows = [row for row in zip(bars['time'].tolist(), bars['open'].tolist(), bars['high'].tolist(),
+                                   bars['low'].tolist(), bars['close'].tolist(), bars['volume'].tolist())
+                if until is None or row[0] + BAR_SECONDS <= until]
+        try:
+            added = self.store.append(self.market, symbol, rows, frame=MINUTE)
+        except Exception as e:
+            self.stats['flush_errors'] += 1
+            self.logger.error(f"[MINUTE] {symbol} 1분봉 저장 실패: {e}")
+            return 0
+        self.stats['flushed_rows'] += added
+        return added
+
+    def flush(self, complete_only: bool = False) -> int:
+        """
+        보관 중인 1분봉을 저장소에 저장 (이미 저장한 봉은 건너뜀, 메모리 버퍼는 유지)
+
+        Args:
+            complete_only: True면 진행 중인 현재 분 봉은 제외 (장중 중간 저장용)
+
+        Returns:
+            저장한 봉 수
+        """
+        until = time.time() if complete_only else None
+        with self._lock:
+            added = sum(self._flush_ring(symbol, ring, until) for symbol, ring in self._rings.items())
+        if added:
+            self.logger.info(f"[MINUTE] {(self.market or '').upper()} 1분봉 {added}개 저장")
+        return added
+
+    def get_bars(self, symbol: str) -> Dict[str, np.ndarray]:
+        """
+        종목 당일 1분봉 (시간순 복사본, 진행 중인 봉 포함)
+
+        Returns:
+            {'time': epoch 초, 'open', 'high', 'low', 'close', 'volume'} (없으면 빈 배열)
+        """
+        with self._lock:
+            ring = self._rings.get(symbol)
+            if ring is None:
+                return MinuteBarRing(1).to_arrays()
+            return ring.to_arrays()
+
+    def symbols(self) -> List[str]:
+        """1분봉이 있는 종목 리스트"""
+        return [symbol for symbol, ring in self._rings.items() if len(ring)]
+
+    def get_stats(self) -> Dict[str, Any]:
+        stats = dict(self.stats)
+        stats['symbols'] = len(self.symbols())
+        stats['bars'] = sum(len(ring) for ring in self._rings.values())
+        stats['evicted'] = sum(ring.evicted for ring in self._rings.values())
+        stats['memory_bytes'] = len(self._rings) * self.capacity * 6 * 8
+        return stats
@@ -0,0 +1,321 @@
+"""
+주문 디스패처 - 한 시장의 여러 전략 주문을 단일 경로로 직렬화하고
+전략별 예산(일일 매수 금액, 일일 주문 수)을 적용
+
+- 모든 주문은 디스패처 락 안에서 순서대로 실행 (같은 계좌 동시 주문 방지)
+- 보유 종목 소유 전략 기록: 체결된 매수/매도 수량을 전략별로 기록해 전략은 자기 보유분만 보고 매도
+  (기록 없는 보유분 = 기존 잔고/수동 매수는 기본 전략(default_owner, 처음 등록한 전략) 소유)
+- 같은 전략의 같은 종목 매도는 SELL_DEDUP_SECONDS 안에 한 번만 허용 (감시/정기 주기 중복 매도 방지)
+- 예산 초과 주문은 API 호출 없이 실패 결과 반환
+- 리스크 엔진이 있으면 주문 전 노출/손실 한도 검사, 체결 후 노출 합계 갱신
+"""
+import os
+import json
+import logging
+import threading
+import time
+from datetime import datetime
+from typing import Optional, Dict, Any, List
+
+import pytz
+
+
+SELL_DEDUP_SECONDS = 60  # 같은 전략의 같은 종목 매도 중복 차단 시간 (초)
+OWNER_PRUNE_SECONDS = 300  # 잔고에 없는 종목의 소유 기록 정리 유예 시간 (초, 미체결 매수 보호)
+
+
+class OrderDispatcher:
+    """
+    전략별 예산을 적용하는 단일 주문 경로 (스레드 안전)
+
+    사용 예:
+        dispatcher = OrderDispatcher(hub)
+        dispatcher.set_budget('aggressive', max_buy_amount=1_000_000, max_orders=10)
+        result = dispatcher.submit('aggressive', '005930', 'buy', 10)
+    """
+
+    def __init__(self, api_client, timezone: str = None, risk_engine=None,
+                 state_file: Optional[str] = None):
+        """
+        Args:
+            api_client: 주문을 실행할 API 클라이언트 (MarketDataHub 권장)
+            timezone: 일일 예산 초기화 기준 타임존
+            risk_engine: 주문 전 한도 검사기 (RiskEngine, 없으면 검사 생략)
+            state_file: 보유 종목 소유 기록 저장 파일 (전략 2개 이상일 때만 기록, 없으면 메모리에만 유지)
+        """
+        self.api_client = api_client
+        self.risk_engine = risk_engine
+        self.state_file = state_file
+        self.tz = pytz.timezone(timezone) if timezone else None
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+        self._lock = threading.RLock()
+        self._budgets: Dict[str, Dict[str, Any]] = {}   # {strategy: {'max_buy_amount', 'max_orders'}}
+        self._usage: Dict[str, Dict[str, Any]] = {}     # {strategy: {'buy_amount', 'orders'}}
+        self._usage_date = None
+        self._recent_sells: Dict[tuple, float] = {}    # {(symbol, strategy): monotonic}
+        self._owners: Dict[str, Dict[str, int]] = {}   # {symbol: {strategy: 보유 수량}}
+        self._owner_times: Dict[str, float] = {}       # {symbol: 마지막 체결 monotonic}
+        self.default_owner: Optional[str] = None       # 기록 없는 보유분의 소유 전략
+
+        self.stats = {
+            'submitted': 0,
+            'executed': 0,
+            'budget_rejects': 0,
+            'duplicate_rejects': 0,
+            'ownership_rejects': 0,
+            'risk_rejects': 0,
+            'failed': 0
+        }
+
+        if state_file:
+            self._load_owners()
+
+    def set_budget(self, strategy: str, max_buy_amount: float = None, max_orders: int = None):
+        """
+        전략 예산 설정 (None이면 제한 없음)
+
+        Args:
+            strategy: 전략 이름
+            max_buy_amount: 일일 최대 매수 금액 (시장 통화 기준)
+            max_orders: 일일 최대 주문 수 (매수 + 매도)
+        """
+        with self._lock:
+            self._budgets[strategy] = {
+                'max_buy_amount': max_buy_amount,
+                'max_orders': max_orders
+            }
+            if self.default_owner is None:
+                self.default_owner = strategy
+
+    def _today(self):
+        return datetime.now(self.tz).date() if self.tz else datetime.now().date()
+
+    def _get_usage(self, strategy: str) -> Dict[str, Any]:
+        """전략 사용량 (날짜가 바뀌면 초기화, 락 보유 상태에서 호출)"""
+        today = self._today()
+        if today != self._usage_date:
+            self._usage = {}
+            self._usage_date = today
+        usage = self._usage.get(strategy)
+        if usage is None:
+            usage = self._usage[strategy] = {'buy_amount': 0.0, 'orders': 0}
+        return usage
+
+    def get_remaining_buy_amount(self, strategy: str) -> Optional[float]:
+        """
+        오늘 남은 매수 가능 금액
+
+        Returns:
+            남은 금액 (예산 미설정 시 None = 제한 없음)
+        """
+        with self._lock:
+            budget = self._budgets.get(strategy, {})
+            if budget.get('max_buy_amount') is None:
+                return None
+            return max(0.0, budget['max_buy_amount'] - self._get_usage(strategy)['buy_amount'])
+
+    def get_owned_quantity(self, strategy: str, symbol: str, account_quantity: int) -> int:
+        """
+        전략 보유 수량 (기본 전략은 기록 없는 보유분 포함, 계좌 수량 이하)
+
+        Args:
+            strategy: 전략 이름
+            symbol: 종목 코드
+            account_quantity: 계좌 전체 보유 수량
+        """
+        with self._lock:
+            owners = self._owners.get(symbol, {})
+            owned = owners.get(strategy, 0)
+            if strategy == self.default_owner:
+                owned += max(0, account_quantity - sum(owners.values()))
+            return max(0, min(owned, account_quantity))
+
+    def scope_positions(self, strategy: str, positions: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        계좌 보유 종목 중 전략 소유분만 반환 (quantity/sellable_qty를 소유 수량 이하로 제한)
+
+        Args:
+            strategy: 전략 이름
+            positions: get_account_balance()의 positions 리스트
+
+        Returns:
+            전략 소유 종목 리스트 (항목은 복사본)
+        """
+        scoped = []
+        with self._lock:
+            self._prune_owners({pos['symbol'] for pos in positions if pos.get('quantity', 0) > 0})
+            for pos in positions:
+                account_quantity = pos.get('quantity', 0)
+                owned = self.get_owned_quantity(strategy, pos['symbol'], account_quantity)
+                if owned <= 0:
+                    continue
+                if owned < account_quantity:
+                    pos = dict(pos)
+                    pos['quantity'] = owned
+                    pos['sellable_qty'] = min(pos.get('sellable_qty', owned), owned)
+                scoped.append(pos)
+        return scoped
+
+    def _record_fill(self, strategy: str, symbol: str, side: str, quantity: int):
+        """체결 수량을 전략 소유 기록에 반영 (락 보유 상태에서 호출)"""
+        owners = self._owners.setdefault(symbol, {})
+        if side == 'buy':
+            owners[strategy] = owners.get(strategy, 0) + quantity
+        else:
+            remaining = owners.get(strategy, 0) - quantity
+            if remaining > 0:
+                owners[strategy] = remaining
+            else:
+                owners.pop(strategy, None)
+        if not owners:
+            self._owners.pop(symbol, None)
+        self._owner_times[symbol] = time.monotonic()
+        self._save_owners()
+
+    def _prune_owners(self, held_symbols):
+        """잔고에 없는 종목의 소유 기록 정리 (최근 체결 종목은 유예, 락 보유 상태에서 호출)"""
+        now = time.monotonic()
+        stale = [symbol for symbol in self._owners
+                 if symbol not in held_symbols
+                 and now - self._owner_times.get(symbol, 0) >= OWNER_PRUNE_SECONDS]
+        for symbol in stale:
+            self._owners.pop(symbol, None)
+            self._owner_times.pop(symbol, None)
+        if stale:
+            self._save_owners()
+
+    def _save_owners(self):
+        """소유 기록 저장 (전략 2개 이상일 때만, 임시 파일 기록 후 교체)"""
+        if not self.state_file or len(self._budgets) < 2:
+            return
+        try:
+            directory = os.path.dirname(self.state_file)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            tmp_file = f"{self.state_file}.tmp"
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump({'owners': self._owners, 'updated': datetime.now().isoformat()},
+                          f, ensure_ascii=False, indent=2)
+            os.replace(tmp_file, self.state_file)
+        except Exception as e:
+            self.logger.error(f"[DISPATCH] 소유 기록 저장 실패: {e}")
+
+    def _load_owners(self):
+        if not os.path.exists(self.state_file):
+            return
+        try:
+            with open(self.state_file, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+            self._owners = {symbol: {strategy: int(qty) for strategy, qty in owners.items()}
+                            for symbol, owners in state.get('owners', {}).items()}
+        except Exception as e:
+            self.logger.error(f"[DISPATCH] 소유 기록 로드 실패 (기본 전략 소유로 시작): {e}")
+
+    def _reject(self, message: str) -> Dict[str, Any]:
+        return {
+            'success': False,
+            'order_id': '',
+            'message': message,
+            'filled_qty': 0,
+            'filled_price': 0.0,
+            'timestamp': datetime.now().isoformat()
+        }
+
+    def submit(self, strategy: str, symbol: str, side: str, quantity: int,
+               price: Optional[float] = None, reference_price: Optional[float] = None) -> Dict[str, Any]:
+        """
+        주문 제출
+
+        Args:
+            strategy: 주문 전략 이름
+            symbol: 종목 코드
+            side: 'buy' 또는 'sell'
+            quantity: 수량
+            price: 지정가 (None이면 시장가)
+            reference_price: 예산 계산용 가격 (없으면 price 또는 현재가)
+
+        Returns:
+            place_order와 같은 형식의 결과 딕셔너리
+        """
+        with self._lock:
+            self.stats['submitted'] += 1
+            budget = self._budgets.get(strategy, {})
+            usage = self._get_usage(strategy)
+
+            max_orders = budget.get('max_orders')
+            if max_orders is not None and usage['orders'] >= max_orders:
+                self.stats['budget_rejects'] += 1
+                self.logger.warning(f"[DISPATCH] {strategy}: 일일 주문 수 한도 초과 ({max_orders}건) → {symbol} {side} 거부")
+                return self._reject('일일 주문 수 한도 초과')
+
+            amount = 0.0
+            unit_price = reference_price or price
+            if side == 'buy':
+                unit_price = unit_price or self.api_client.get_current_price(symbol) or 0
+                amount = unit_price * quantity
+                max_amount = budget.get('max_buy_amount')
+                if max_amount is not None and usage['buy_amount'] + amount > max_amount:
+                    self.stats['budget_rejects'] += 1
+                    self.logger.warning(f"[DISPATCH] {strategy}: 매수 예산 초과 "
+                                        f"(사용 {usage['buy_amount']:,.2f} + {amount:,.2f} > {max_amount:,.2f}) → {symbol} 거부")
+                    return self._reject('전략 매수 예산 초과')
+            else:
+                recent = self._recent_sells.get((symbol, strategy))
+                if recent and time.monotonic() - recent < SELL_DEDUP_SECONDS:
+                    self.stats['duplicate_rejects'] += 1
+                    self.logger.info(f"[DISPATCH] {strategy}: {symbol} 이미 매도 → 중복 매도 거부")
+                    return self._reject('같은 전략에서 이미 매도됨')
+
+                # 기본 전략 외에는 기록된 소유 수량까지만 매도 (다른 전략 포지션 보호)
+                owned = self._owners.get(symbol, {}).get(strategy, 0)
+                if strategy != self.default_owner and quantity > owned:
+                    self.stats['ownership_rejects'] += 1
+                    self.logger.warning(f"[DISPATCH] {strategy}: {symbol} 소유 수량 {owned}주 < 매도 {quantity}주 → 거부")
+                    return self._reject('전략 소유 수량 초과')
+
+            if self.risk_engine is not None:
+                allowed, reason = self.risk_engine.check(symbol, side, quantity, unit_price)
+                if not allowed:
+                    self.stats['risk_rejects'] += 1
+                    self.logger.warning(f"[RISK] {strategy}: {reason} → {symbol} {side} 거부")
+                    return self._reject(reason)
+
+            result = self.api_client.place_order(symbol, side, quantity, price)
+
+            if result and result.get('success'):
+                self.stats['executed'] += 1
+                usage['orders'] += 1
+                usage['buy_amount'] += amount
+                fill_qty = result.get('filled_qty') or quantity
+                if side == 'sell':
+                    self._recent_sells[(symbol, strategy)] = time.monotonic()
+                self._record_fill(strategy, symbol, side, fill_qty)
+                if self.risk_engine is not None:
+                    fill_price = result.get('filled_price') or unit_price or self._peek_price(symbol)
+                    self.risk_engine.on_fill(symbol, side, fill_qty, fill_price or 0)
+                self.logger.info(f"[DISPATCH] {strategy}: {symbol} {side} {quantity}주 실행")
+            else:
+                self.stats['failed'] += 1
+
+            return result
+
+    def _peek_price(self, symbol: str) -> Optional[float]:
+        """캐시된 현재가 (추가 조회 없음)"""
+        peek = getattr(self.api_client, 'peek_price', None)
+        return peek(symbol) if peek else None
+
+    def get_status(self) -> Dict[str, Any]:
+        """전략별 예산/사용량 및 통계 반환"""
+        with self._lock:
+            strategies = {}
+            for strategy in set(self._budgets) | set(self._usage):
+                strategies[strategy] = {
+                    **self._budgets.get(strategy, {'max_buy_amount': None, 'max_orders': None}),
+                    **self._get_usage(strategy)
+                }
+            status = {'strategies': strategies, 'owners': {symbol: dict(owners) for symbol, owners in self._owners.items()},
+                      **self.stats}
+            if self.risk_engine is not None:
+                status['risk'] = self.risk_engine.get_status()
+            return status
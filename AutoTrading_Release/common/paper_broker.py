@@ -0,0 +1,487 @@
+"""
+인프로세스 모의 브로커 - 실시간/재생 시세로 주문을 가상 체결 (KIS 주문 호출 없음)
+
+KIS 모의투자 서버는 호출 한도가 낮고 체결이 실제와 달라, 시세만 실제(또는 재생) 클라이언트에서
+받고 주문/잔고는 프로세스 안의 가상 계좌로 처리한다. BaseAPIClient를 구현하므로
+StrategyHost/전략을 수정 없이 실전과 같은 요청 주기로 실행할 수 있다.
+
+- 시세: quote_client(KRAPIClient/USAPIClient 또는 backtest.SimulatedAPIClient)의 현재가,
+  또는 on_quote(symbol, price, volume)로 직접 밀어 넣은 시세
+- 체결: 시장가는 현재가 전량 체결, 지정가는 호가 단위(KRConfig.round_to_tick)로 맞춘 뒤
+  현재가보다 유리하면 현재가로 즉시 체결, 아니면 미체결 대기 후 시세가 지정가에 닿으면 지정가로 체결
+  (당일 미체결분은 다음 장 날짜에 자동 취소, 매수 대기는 예수금, 매도 대기는 수량을 묶어둠)
+- 결제: 매수 수량은 settlement_days 영업일(주말 제외) 뒤부터 매도 가능 (sellable_qty),
+  매도 대금은 바로 주문가능금액에 반영
+- 비용: 매수/매도 수수료 + 매도 거래세 (기본값은 backtest.sim_client.market_profile과 동일)
+- 상태 파일을 지정하면 예수금/보유 종목/미체결 주문/체결 내역을 저장해 재시작 후 이어서 사용
+
+종목 설정 파일 "paper_broker" 블록으로 켠다 (StrategyHost):
+
+    "paper_broker": {"enabled": true, "initial_cash": 10000000, "settlement_days": 2}
+"""
+import json
+import os
+import threading
+import time
+from datetime import datetime, date, timedelta
+from typing import Optional, Dict, Any, List, Callable
+
+import pytz
+
+from .base_api import BaseAPIClient
+
+
+DEFAULT_SETTLEMENT_DAYS = 2     # T+2 결제
+MAX_FILL_HISTORY = 1000         # 상태 파일에 보관할 체결 내역 수
+
+# 시세 클라이언트에서 그대로 빌려 쓰는 속성 (토큰 관리/일봉 조회용, 주문 관련 메서드는 절대 위임하지 않음)
+QUOTE_CLIENT_ATTRS = ('token_manager', 'reinitialize_brokers', 'fetch_daily_bars', 'resolve_exchanges')
+
+
+def add_business_days(day: date, days: int, calendar=None) -> date:
+    """주말(캘린더 지정 시 휴장일 포함)을 건너뛰고 영업일 수만큼 더한 날짜"""
+    while days > 0:
+        day += timedelta(days=1)
+        if calendar.is_trading_day(day) if calendar is not None else day.weekday() < 5:
+            days -= 1
+    return day
+
+
+class PaperBroker(BaseAPIClient):
+    """
+    시세 기반 가상 체결 클라이언트 (스레드 안전)
+
+    사용 예:
+        broker = PaperBroker('kr', quote_client=KRAPIClient(), initial_cash=10_000_000)
+        host = StrategyHost('kr', api_client=broker)
+
+        # 재생 시세
+        broker = PaperBroker('kr', clock=sim_clock.timestamp)
+        broker.on_quote('005930', 55000)
+    """
+
+    def __init__(self, market: str = 'kr', quote_client: Optional[BaseAPIClient] = None,
+                 initial_cash: float = 10_000_000,
+                 commission_rate: Optional[float] = None,
+                 sell_tax_rate: Optional[float] = None,
+                 settlement_days: int = DEFAULT_SETTLEMENT_DAYS,
+                 state_file: Optional[str] = None,
+                 clock: Optional[Callable[[], float]] = None,
+                 log_level: str = 'INFO'):
+        """
+        Args:
+            market: 'kr' 또는 'us'
+            quote_client: 시세/전일 종가/장 운영 여부를 조회할 클라이언트 (없으면 on_quote 시세만 사용)
+            initial_cash: 초기 예수금 (상태 파일이 있으면 파일 값 사용)
+            commission_rate: 매수/매도 수수료율 (없으면 시장 기본값)
+            sell_tax_rate: 매도 거래세율 (없으면 시장 기본값)
+            settlement_days: 매수 후 매도 가능까지 영업일 수 (0이면 즉시 매도 가능)
+            state_file: 계좌 상태 저장 파일 (없으면 메모리에만 유지)
+            clock: 현재 시각 함수 (epoch 초, 재생 시 시뮬레이션 시계, 기본 time.time)
+            log_level: 로그 레벨
+        """
+        super().__init__(log_level)
+        from backtest.sim_client import market_profile
+        profile = market_profile(market)
+
+        self.market = market
+        self.quote_client = quote_client
+        self.profile = profile
+        self.commission_rate = profile['commission_rate'] if commission_rate is None else commission_rate
+        self.sell_tax_rate = profile['sell_tax_rate'] if sell_tax_rate is None else sell_tax_rate
+        self.settlement_days = max(0, int(settlement_days))
+        self.state_file = state_file
+        self._clock = clock or time.time
+        self._tz = pytz.timezone(profile['timezone'])
+        self._lock = threading.RLock()
+
+        self.initial_cash = float(initial_cash)
+        self.cash = float(initial_cash)
+        self.reserved_cash = 0.0
+        # {symbol: {quantity, avg_price, fees, reserved, lots: [{quantity, settle_date}]}}
+        self.positions: Dict[str, Dict[str, Any]] = {}
+        self.open_orders: List[Dict[str, Any]] = []
+        self.fills: List[Dict[str, Any]] = []
+        self._quotes: Dict[str, tuple] = {}     # {symbol: (price, volume)}
+        self._order_seq = 0
+        self._session_date: Optional[date] = None
+
+        self.stats = {
+            'quotes': 0,
+            'orders': 0,
+            'fills': 0,
+            'resting': 0,
+            'expired': 0,
+            'rejects': 0,
+            'fees': 0.0,
+            'realized_pnl': 0.0
+        }
+
+        if state_file:
+            self._load_state()
+
+        # 시세 클라이언트가 조회한 시세로 대기 주문 매칭 (위치 감시/선조회 등 다른 경로 조회 포함)
+        self._listening = hasattr(quote_client, 'add_price_listener')
+        if self._listening:
+            quote_client.add_price_listener(self.on_quote)
+
+        self.logger.info(f"[PAPER] {market.upper()} 모의 브로커 시작: 예수금 {self.cash:,.2f}, "
+                         f"보유 {len(self.positions)}종목, 결제 T+{self.settlement_days}")
+
+    def __getattr__(self, name):
+        if name in QUOTE_CLIENT_ATTRS and self.__dict__.get('quote_client') is not None:
+            return getattr(self.quote_client, name)
+        raise AttributeError(name)
+
+    # ===== 시장 정보 =====
+
+    def get_timezone(self) -> str:
+        return self.profile['timezone']
+
+    def get_market_hours(self) -> tuple:
+        return self.profile['market_hours']
+
+    def now(self) -> datetime:
+        """현재 시각 (시장 타임존)"""
+        return datetime.fromtimestamp(self._clock(), self._tz)
+
+    def is_market_open(self) -> bool:
+        if self.quote_client is not None:
+            return self.quote_client.is_market_open()
+        return self.get_calendar().is_open(self._clock())
+
+    # ===== 시세 =====
+
+    def on_quote(self, symbol: str, price: float, volume: float = None):
+        """
+        시세 수신 → 대기 주문 매칭 + 가격 리스너 전달 (price listener 형식)
+
+        Args:
+            symbol: 종목 코드
+            price: 현재가
+            volume: 당일 누적 거래량 (선택)
+        """
+        if price is None or price <= 0:
+            return
+        price = self.profile['round_to_tick'](price)
+        with self._lock:
+            self.stats['quotes'] += 1
+            self._quotes[symbol] = (price, volume)
+            self._roll_session()
+            self._match(symbol, price)
+        self._notify_price(symbol, price, volume)
+
+    def get_current_price(self, symbol: str) -> Optional[float]:
+        if self.quote_client is not None:
+            price = self.quote_client.get_current_price(symbol)
+            if price is None:
+                return None
+            if not self._listening:
+                self.on_quote(symbol, price)
+        quote = self._quotes.get(symbol)
+        return quote[0] if quote else None
+
+    def get_previous_close(self, symbol: str) -> Optional[float]:
+        if self.quote_client is not None and hasattr(self.quote_client, 'get_previous_close'):
+            return self.quote_client.get_previous_close(symbol)
+        return None
+
+    # ===== 잔고 =====
+
+    def _sellable(self, pos: Dict[str, Any], today: date) -> int:
+        """결제 완료 수량 - 매도 대기 수량"""
+        settled = sum(lot['quantity'] for lot in pos['lots'] if lot['settle_date'] <= today.isoformat())
+        return max(0, settled - pos['reserved'])
+
+    def get_account_balance(self) -> Dict[str, Any]:
+        with self._lock:
+            today = self.now().date()
+            positions = []
+            eval_total = 0.0
+            purchase_total = 0.0
+            for symbol, pos in self.positions.items():
+                quantity = pos['quantity']
+                avg_price = pos['avg_price']
+                quote = self._quotes.get(symbol)
+                current_price = quote[0] if quote else avg_price
+                eval_amount = current_price * quantity
+                purchase = avg_price * quantity
+                profit_loss = eval_amount - purchase
+
+                positions.append({
+                    'symbol': symbol,
+                    'name': symbol,
+                    'quantity': quantity,
+                    'avg_price': avg_price,
+                    'current_price': current_price,
+                    'eval_amount': eval_amount,
+                    'profit_loss': profit_loss,
+                    'profit_rate': profit_loss / purchase * 100 if purchase > 0 else 0,
+                    'sellable_qty': self._sellable(pos, today)
+                })
+                eval_total += eval_amount
+                purchase_total += purchase
+
+            return {
+                'total_eval': self.cash + eval_total,
+                'total_profit': eval_total - purchase_total,
+                'available_cash': self.cash - self.reserved_cash,
+                'positions': positions
+            }
+
+    def get_realized_profit_today(self) -> Dict[str, Any]:
+        """당일 실현손익 (실거래 클라이언트와 같은 형식)"""
+        with self._lock:
+            today = self.now().date().isoformat()
+            trades = [{'symbol': fill['symbol'], 'name': fill['symbol'], 'realized_profit': fill['realized_pnl']}
+                      for fill in self.fills
+                      if fill['side'] == 'sell' and fill['timestamp'][:10] == today]
+            return {
+                'total_realized_profit': sum(trade['realized_profit'] for trade in trades),
+                'trades': trades,
+                'date': today
+            }
+
+    # ===== 주문 =====
+
+    def _reject(self, symbol: str, side: str, message: str) -> Dict[str, Any]:
+        self.stats['rejects'] += 1
+        self.logger.info(f"[PAPER] {symbol} {side} 주문 거부: {message}")
+        return self.format_order_result(False, message=message)
+
+    def place_order(self, symbol: str, side: str, quantity: int,
+                    price: Optional[float] = None) -> Dict[str, Any]:
+        if side not in ('buy', 'sell'):
+            return self._reject(symbol, side, f"주문 구분 오류: {side}")
+        if quantity <= 0:
+            return self._reject(symbol, side, "주문 수량 오류")
+        if not self.is_market_open():
+            return self._reject(symbol, side, "장 운영시간 아님")
+
+        market_price = self.get_current_price(symbol)
+        if market_price is None:
+            return self._reject(symbol, side, "시세 없음")
+
+        with self._lock:
+            self.stats['orders'] += 1
+            self._roll_session()
+            limit = self.profile['round_to_tick'](price) if price is not None else None
+            marketable = limit is None or (limit >= market_price if side == 'buy' else limit <= market_price)
+            # 대기 주문은 지정가 기준으로 예수금을 묶음
+            reserve_price = market_price if marketable else limit
+
+            if side == 'buy':
+                required = reserve_price * quantity * (1 + self.commission_rate)
+                available = self.cash - self.reserved_cash
+                if required > available + 1e-9:
+                    return self._reject(symbol, side, f"주문가능금액 부족 (필요 {required:,.2f}, 가능 {available:,.2f})")
+            else:
+                pos = self.positions.get(symbol)
+                sellable = self._sellable(pos, self.now().date()) if pos else 0
+                if sellable < quantity:
+                    held = pos['quantity'] if pos else 0
+                    return self._reject(symbol, side, f"매도가능수량 부족 (보유 {held}주, 매도가능 {sellable}주)")
+
+            self._order_seq += 1
+            order = {
+                'order_id': f"PAPER{self._order_seq:08d}",
+                'symbol': symbol,
+                'side': side,
+                'quantity': quantity,
+                'price': limit,
+                'created': self.now().isoformat()
+            }
+
+            if marketable:
+                fill = self._fill(order, market_price)
+                self._save_state()
+                result = self.format_order_result(True, order_id=order['order_id'], message="체결 (모의)",
+                                                  filled_qty=quantity, filled_price=fill['price'])
+                result['timestamp'] = fill['timestamp']
+                return result
+
+            if side == 'buy':
+                order['reserved'] = required
+                self.reserved_cash += required
+            else:
+                self.positions[symbol]['reserved'] += quantity
+            self.open_orders.append(order)
+            self.stats['resting'] += 1
+            self._save_state()
+            self.logger.info(f"[PAPER] {symbol} {side} {quantity}주 지정가 {limit} 미체결 대기 (현재가 {market_price})")
+            result = self.format_order_result(True, order_id=order['order_id'], message="접수 (미체결 대기)")
+            result['timestamp'] = order['created']
+            return result
+
+    def cancel_order(self, order_id: str) -> bool:
+        """미체결 주문 취소 (묶인 예수금/수량 해제)"""
+        with self._lock:
+            for order in self.open_orders:
+                if order['order_id'] == order_id:
+                    self._release(order)
+                    self.open_orders.remove(order)
+                    self._save_state()
+                    return True
+        return False
+
+    def get_open_orders(self) -> List[Dict[str, Any]]:
+        """미체결 주문 목록"""
+        with self._lock:
+            return [dict(order) for order in self.open_orders]
+
+    def _release(self, order: Dict[str, Any]):
+        if order['side'] == 'buy':
+            self.reserved_cash = max(0.0, self.reserved_cash - order['reserved'])
+        else:
+            pos = self.positions.get(order['symbol'])
+            if pos:
+                pos['reserved'] = max(0, pos['reserved'] - order['quantity'])
+
+    def _roll_session(self):
+        """장 날짜가 바뀌면 전일 미체결 주문 만료 (당일 주문)"""
+        today = self.now().date()
+        if self._session_date == today:
+            return
+        self._session_date = today
+        expired = [order for order in self.open_orders if order['created'][:10] < today.isoformat()]
+        for order in expired:
+            self._release(order)
+            self.open_orders.remove(order)
+        if expired:
+            self.stats['expired'] += len(expired)
+            self.logger.info(f"[PAPER] 전일 미체결 주문 {len(expired)}건 만료")
+            self._save_state()
+
+    def _match(self, symbol: str, price: float):
+        """시세가 지정가에 닿은 대기 주문 체결 (지정가로 체결)"""
+        matched = [order for order in self.open_orders if order['symbol'] == symbol and
+                   (price <= order['price'] if order['side'] == 'buy' else price >= order['price'])]
+        if not matched:
+            return
+        for order in matched:
+            self.open_orders.remove(order)
+            self._release(order)
+            self._fill(order, order['price'])
+        self._save_state()
+
+    def _fill(self, order: Dict[str, Any], price: float) -> Dict[str, Any]:
+        """체결 반영 (락 보유 상태에서 호출)"""
+        symbol = order['symbol']
+        quantity = order['quantity']
+        amount = price * quantity
+        now = self.now()
+        realized = None
+
+        if order['side'] == 'buy':
+            fee = amount * self.commission_rate
+            pos = self.positions.setdefault(symbol, {'quantity': 0, 'avg_price': 0.0, 'fees': 0.0,
+                                                     'reserved': 0, 'lots': []})
+            held = pos['quantity']
+            pos['avg_price'] = (pos['avg_price'] * held + amount) / (held + quantity)
+            pos['quantity'] = held + quantity
+            pos['fees'] += fee
+            settle = add_business_days(now.date(), self.settlement_days, self.get_calendar())
+            pos['lots'].append({'quantity': quantity, 'settle_date': settle.isoformat()})
+            self.cash -= amount + fee
+        else:
+            pos = self.positions[symbol]
+            held = pos['quantity']
+            fee = amount * (self.commission_rate + self.sell_tax_rate)
+            buy_fee = pos['fees'] * quantity / held
+            realized = (price - pos['avg_price']) * quantity - fee - buy_fee
+            self._consume_lots(pos, quantity)
+            pos['quantity'] = held - quantity
+            pos['fees'] -= buy_fee
+            if pos['quantity'] == 0:
+                del self.positions[symbol]
+            self.cash += amount - fee
+            self.stats['realized_pnl'] += realized
+
+        fill = {
+            'timestamp': now.isoformat(),
+            'order_id': order['order_id'],
+            'symbol': symbol,
+            'side': order['side'],
+            'quantity': quantity,
+            'price': price,
+            'fee': fee,
+            'realized_pnl': realized,
+            'cash': self.cash
+        }
+        self.fills.append(fill)
+        self.stats['fills'] += 1
+        self.stats['fees'] += fee
+        self.logger.info(f"[PAPER] {symbol} {order['side']} {quantity}주 @ {price} 체결 (수수료 {fee:,.2f})")
+        return fill
+
+    @staticmethod
+    def _consume_lots(pos: Dict[str, Any], quantity: int):
+        """결제 완료 매수분부터 먼저 차감 (FIFO)"""
+        lots = sorted(pos['lots'], key=lambda lot: lot['settle_date'])
+        remaining = quantity
+        for lot in lots:
+            if remaining <= 0:
+                break
+            used = min(lot['quantity'], remaining)
+            lot['quantity'] -= used
+            remaining -= used
+        pos['lots'] = [lot for lot in lots if lot['quantity'] > 0]
+
+    # ===== 상태 저장 =====
+
+    def _save_state(self):
+        """계좌 상태 저장 (임시 파일 기록 후 교체)"""
+        if not self.state_file:
+            return
+        state = {
+            'market': self.market,
+            'cash': self.cash,
+            'reserved_cash': self.reserved_cash,
+            'positions': self.positions,
+            'open_orders': self.open_orders,
+            'fills': self.fills[-MAX_FILL_HISTORY:],
+            'order_seq': self._order_seq,
+            'realized_pnl': self.stats['realized_pnl'],
+            'updated': self.now().isoformat()
+        }
+        try:
+            directory = os.path.dirname(self.state_file)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            tmp_file = f"{self.state_file}.tmp"
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump(state, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_file, self.state_file)
+        except Exception as e:
+            self.logger.error(f"[PAPER] 상태 저장 실패: {e}")
+
+    def _load_state(self):
+        if not os.path.exists(self.state_file):
+            return
+        try:
+            with open(self.state_file, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+            self.cash = float(state['cash'])
+            self.reserved_cash = float(state.get('reserved_cash', 0.0))
+            self.positions = state.get('positions', {})
+            self.open_orders = state.get('open_orders', [])
+            self.fills = state.get('fills', [])
+            self._order_seq = int(state.get('order_seq', 0))
+            self.stats['realized_pnl'] = float(state.get('realized_pnl', 0.0))
+        except Exception as e:
+            self.logger.error(f"[PAPER] 상태 로드 실패 (초기 예수금으로 시작): {e}")
+
+    def reset(self):
+        """계좌 초기화 (초기 예수금, 보유/미체결/체결 내역 삭제)"""
+        with self._lock:
+            self.cash = self.initial_cash
+            self.reserved_cash = 0.0
+            self.positions.clear()
+            self.open_orders.clear()
+            self.fills.clear()
+            self._save_state()
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return dict(self.stats, cash=self.cash, positions=len(self.positions),
+                        open_orders=len(self.open_orders))
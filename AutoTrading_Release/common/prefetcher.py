@@ -0,0 +1,153 @@
+"""
+정기 주기 직전 시세 선조회 (프리페치)
+
+매수/매도 주기는 정해진 시각에 시작하지만 시세 조회도 그 시각에 시작되므로
+실제 판단은 예정 시각보다 수 초~수 분 늦어진다. QuotePrefetcher는 다음 주기의
+조회 대상 종목을 주기 직전에 호출 예산 안에서 미리 조회해 공유 캐시
+(MarketDataHub)에 채워 두고, 주기 실행 동안 그 시세를 재사용하도록 캐시를 고정한다.
+
+- 시작 시각: 마지막 조회가 주기 시작 PREFETCH_SAFETY_SECONDS 전에 끝나도록 역산
+  (가능한 한 늦게 조회해 신선도 유지)
+- 호출 간격: RateLimiter 예산 (여러 주기 선조회가 예산을 공유)
+- 캐시 고정: 선조회한 시세는 주기 종료 전까지 기본 TTL과 관계없이 재사용
+"""
+import logging
+import threading
+import time
+from typing import Optional, Dict, Any, List, Callable
+
+from .rate_limiter import RateLimiter
+
+
+# 기본 선조회 설정
+PREFETCH_LEAD_SECONDS = 60                # 주기 시작 몇 초 전부터 선조회 시작 가능
+PREFETCH_SAFETY_SECONDS = 3               # 주기 시작 전 선조회 완료 여유 (초)
+PREFETCH_MAX_REQUESTS_PER_MINUTE = 120    # 선조회 분당 호출 상한
+PREFETCH_HOLD_SECONDS = 300               # 주기 시작 후 고정 캐시 유지 시간 (초)
+
+
+class QuotePrefetcher:
+    """
+    주기 직전 시세 선조회기
+
+    사용 예:
+        prefetcher = QuotePrefetcher(hub, symbols_fn=host.get_cycle_symbols)
+        prefetcher.schedule('buy', cycle_at=time.time() + 60)
+    """
+
+    def __init__(self, hub, symbols_fn: Callable[[str], List[str]],
+                 lead_seconds: float = PREFETCH_LEAD_SECONDS,
+                 max_requests_per_minute: float = PREFETCH_MAX_REQUESTS_PER_MINUTE,
+                 name: str = None):
+        """
+        Args:
+            hub: MarketDataHub (refresh_price / pin_prices 필요)
+            symbols_fn: 주기 종류('buy'/'sell') → 조회 대상 종목 리스트
+            lead_seconds: 주기 시작 전 선조회 허용 시간 (초)
+            max_requests_per_minute: 분당 호출 상한
+            name: 로그 식별용 이름
+        """
+        self.hub = hub
+        self.symbols_fn = symbols_fn
+        self.lead_seconds = lead_seconds
+        self.name = name or 'default'
+        self.limiter = RateLimiter(max_requests_per_minute)
+        self.logger = logging.getLogger(f"{self.__class__.__name__}.{self.name}")
+
+        self._lock = threading.Lock()
+        self._jobs: Dict[str, Dict[str, Any]] = {}   # {kind: 마지막 선조회 작업}
+
+        self.stats = {
+            'jobs': 0,
+            'quotes': 0,
+            'failures': 0
+        }
+
+    def schedule(self, kind: str, cycle_at: float) -> bool:
+        """
+        주기 선조회 예약 (같은 주기는 1회만)
+
+        Args:
+            kind: 'buy' 또는 'sell'
+            cycle_at: 주기 예정 시각 (epoch 초)
+
+        Returns:
+            새로 예약했으면 True
+        """
+        if cycle_at - time.time() > self.lead_seconds:
+            return False
+
+        with self._lock:
+            job = self._jobs.get(kind)
+            if job is not None and abs(job['cycle_at'] - cycle_at) < 1:
+                return False
+            job = self._jobs[kind] = {
+                'kind': kind,
+                'cycle_at': cycle_at,
+                'symbols': 0,
+                'fetched': 0,
+                'failed': 0,
+                'started_at': None,
+                'finished_at': None
+            }
+            self.stats['jobs'] += 1
+
+        thread = threading.Thread(target=self._run, args=(job,), name=f"Prefetch-{self.name}-{kind}")
+        thread.daemon = True
+        thread.start()
+        return True
+
+    def _run(self, job: Dict[str, Any]):
+        """선조회 실행 (주기 직전에 끝나도록 시작 시각 조절)"""
+        try:
+            symbols = list(dict.fromkeys(self.symbols_fn(job['kind'])))
+        except Exception as e:
+            self.logger.error(f"[PREFETCH] {job['kind']} 대상 종목 조회 실패: {e}")
+            return
+
+        job['symbols'] = len(symbols)
+        if not symbols:
+            return
+
+        spacing = 60.0 / self.limiter.rate_per_minute
+        start_at = job['cycle_at'] - PREFETCH_SAFETY_SECONDS - len(symbols) * spacing
+        delay = start_at - time.time()
+        if delay > 0:
+            time.sleep(delay)
+
+        # 주기 종료 전까지 선조회 시세 재사용 (조회 시점부터 최대 lead + hold 초)
+        hold_until = time.monotonic() + (job['cycle_at'] - time.time()) + PREFETCH_HOLD_SECONDS
+        self.hub.pin_prices(symbols, max_age=self.lead_seconds + PREFETCH_HOLD_SECONDS, until=hold_until)
+
+        job['started_at'] = time.time()
+        for symbol in symbols:
+            self.limiter.acquire()
+            try:
+                price = self.hub.refresh_price(symbol)
+                self.hub.get_previous_close(symbol)  # 장 날짜 단위 캐시 (하루 1회만 조회)
+            except Exception as e:
+                self.logger.debug(f"[PREFETCH] {symbol} 조회 오류: {e}")
+                price = None
+
+            if price is None:
+                job['failed'] += 1
+                self.stats['failures'] += 1
+            else:
+                job['fetched'] += 1
+                self.stats['quotes'] += 1
+        job['finished_at'] = time.time()
+
+        self.logger.info(f"[PREFETCH] {job['kind']} 주기 선조회 완료: {job['fetched']}/{len(symbols)}종목 "
+                         f"(주기 시작 {job['cycle_at'] - job['finished_at']:.1f}초 전)")
+
+    def get_job(self, kind: str) -> Optional[Dict[str, Any]]:
+        """주기 종류별 마지막 선조회 작업 정보"""
+        with self._lock:
+            job = self._jobs.get(kind)
+            return dict(job) if job else None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """선조회 통계 반환"""
+        with self._lock:
+            jobs = {kind: dict(job) for kind, job in self._jobs.items()}
+        return {**self.stats, 'last_jobs': jobs, 'budget': self.limiter.get_stats()}
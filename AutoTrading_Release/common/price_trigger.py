@@ -0,0 +1,226 @@
+"""
+가격 트리거 인덱스 - 보유 종목 청산 조건을 절대 가격으로 미리 계산해 두고
+시세 1건마다 이진 탐색(bisect)으로 발동 여부만 확인
+
+수익률(profit_rate) 기반 should_sell 판단은 매 시세마다 평균단가 대비 손익을
+다시 계산해야 하지만, 청산 조건은 포지션이 바뀌지 않는 한 고정된 가격선이므로
+    익절: avg_price * (1 + profit_threshold) 이상
+    손절: avg_price * (1 + STOP_LOSS_THRESHOLD) 이하
+처럼 절대 가격으로 한 번만 계산해 종목별 정렬 리스트에 보관한다.
+"""
+import threading
+from bisect import bisect_left, bisect_right
+from collections import namedtuple
+from typing import Optional, Dict, Any, List, Iterable
+
+
+# 트리거 방향
+ABOVE = 'above'  # price >= level 이면 발동 (익절)
+BELOW = 'below'  # price <= level 이면 발동 (손절, 트레일링 스탑)
+
+# 청산 트리거
+#   price: 발동 가격선
+#   direction: ABOVE / BELOW
+#   reason: 발동 사유 (예: 'take_profit', 'stop_loss', 'trailing_stop')
+PriceTrigger = namedtuple('PriceTrigger', ['price', 'direction', 'reason'])
+
+
+class _SymbolTriggers:
+    """종목 1개의 트리거 목록 (방향별 가격 오름차순 정렬)"""
+
+    __slots__ = ('above_prices', 'above', 'below_prices', 'below', 'position')
+
+    def __init__(self, position: Optional[Dict[str, Any]] = None):
+        self.above_prices: List[float] = []
+        self.above: List[PriceTrigger] = []
+        self.below_prices: List[float] = []
+        self.below: List[PriceTrigger] = []
+        self.position = position
+
+    def add(self, trigger: PriceTrigger):
+        if trigger.direction == ABOVE:
+            idx = bisect_right(self.above_prices, trigger.price)
+            self.above_prices.insert(idx, trigger.price)
+            self.above.insert(idx, trigger)
+        elif trigger.direction == BELOW:
+            idx = bisect_right(self.below_prices, trigger.price)
+            self.below_prices.insert(idx, trigger.price)
+            self.below.insert(idx, trigger)
+        else:
+            raise ValueError(f"unknown trigger direction: {trigger.direction}")
+
+    def __len__(self):
+        return len(self.above) + len(self.below)
+
+
+class PriceTriggerIndex:
+    """
+    종목별 청산 가격 인덱스 (스레드 안전)
+
+    - rebuild(): 포지션 목록이 바뀌었을 때만 전체 재구성
+    - check(symbol, price): O(log n) 발동 트리거 조회 (손익 재계산/잔고 조회 없음)
+    - set_triggers()/remove(): 종목 단위 갱신 (트레일링 스탑 가격선 이동 등)
+
+    사용 예:
+        index = PriceTriggerIndex()
+        index.rebuild(positions, strategy.get_exit_triggers)
+        fired = index.check('005930', 71200)
+        if fired:
+            strategy.sell_position(...)
+    """
+
+    def __init__(self):
+        self._symbols: Dict[str, _SymbolTriggers] = {}
+        self._fingerprint: Optional[tuple] = None
+        self._lock = threading.Lock()
+
+        # 인덱스 통계
+        self.rebuilds = 0
+        self.checks = 0
+        self.hits = 0
+
+    @staticmethod
+    def _position_fingerprint(positions: Iterable[Dict[str, Any]]) -> tuple:
+        """포지션 변경 감지용 키 (종목, 평균단가, 매도 가능 수량)"""
+        return tuple(sorted(
+            (pos['symbol'], pos.get('avg_price', 0), pos.get('sellable_qty', pos.get('quantity', 0)))
+            for pos in positions
+        ))
+
+    def rebuild(self, positions: List[Dict[str, Any]], trigger_fn, force: bool = False) -> bool:
+        """
+        포지션 목록으로 인덱스 재구성 (포지션 변경이 없으면 재구성 생략)
+
+        Args:
+            positions: get_account_balance()의 positions 항목 리스트
+            trigger_fn: position -> List[PriceTrigger] (예: strategy.get_exit_triggers)
+            force: 포지션 변경이 없어도 강제 재구성 (청산 규칙 변경 시)
+
+        Returns:
+            True: 재구성됨, False: 변경 없음
+        """
+        fingerprint = self._position_fingerprint(positions)
+        if not force and fingerprint == self._fingerprint:
+            return False
+
+        symbols: Dict[str, _SymbolTriggers] = {}
+        for pos in positions:
+            entry = _SymbolTriggers(pos)
+            for trigger in trigger_fn(pos) or []:
+                entry.add(trigger)
+            if len(entry):
+                symbols[pos['symbol']] = entry
+
+        with self._lock:
+            self._symbols = symbols
+            self._fingerprint = fingerprint
+            self.rebuilds += 1
+        return True
+
+    def set_triggers(self, symbol: str, triggers: List[PriceTrigger],
+                     position: Optional[Dict[str, Any]] = None):
+        """종목 1개의 트리거 전체 교체"""
+        with self._lock:
+            previous = self._symbols.get(symbol)
+            entry = _SymbolTriggers(position if position is not None
+                                    else (previous.position if previous else None))
+            for trigger in triggers:
+                entry.add(trigger)
+            if len(entry):
+                self._symbols[symbol] = entry
+            else:
+                self._symbols.pop(symbol, None)
+
+    def add_trigger(self, symbol: str, trigger: PriceTrigger):
+        """종목에 트리거 1개 추가"""
+        with self._lock:
+            entry = self._symbols.get(symbol)
+            if entry is None:
+                entry = self._symbols[symbol] = _SymbolTriggers()
+            entry.add(trigger)
+
+    def remove(self, symbol: str):
+        """종목 트리거 삭제 (매도 완료 등)"""
+        with self._lock:
+            self._symbols.pop(symbol, None)
+
+    def clear(self):
+        """인덱스 초기화"""
+        with self._lock:
+            self._symbols = {}
+            self._fingerprint = None
+
+    def check(self, symbol: str, price: float) -> List[PriceTrigger]:
+        """
+        시세 1건에 대해 발동된 트리거 조회
+
+        Args:
+            symbol: 종목 코드
+            price: 현재가
+
+        Returns:
+            발동된 트리거 리스트 (BELOW 먼저 = 손절 우선, 없으면 빈 리스트)
+        """
+        with self._lock:
+            self.checks += 1
+            entry = self._symbols.get(symbol)
+            if entry is None:
+                return []
+
+            # BELOW: level >= price 인 트리거 (정렬 리스트의 뒤쪽)
+            fired = entry.below[bisect_left(entry.below_prices, price):]
+            # ABOVE: level <= price 인 트리거 (정렬 리스트의 앞쪽)
+            fired += entry.above[:bisect_right(entry.above_prices, price)]
+
+            if fired:
+                self.hits += 1
+            return fired
+
+    def get_position(self, symbol: str) -> Optional[Dict[str, Any]]:
+        """인덱스 구성에 사용된 포지션 정보"""
+        entry = self._symbols.get(symbol)
+        return entry.position if entry else None
+
+    def get_triggers(self, symbol: str) -> List[PriceTrigger]:
+        """종목의 전체 트리거 (BELOW, ABOVE 순)"""
+        with self._lock:
+            entry = self._symbols.get(symbol)
+            if entry is None:
+                return []
+            return list(entry.below) + list(entry.above)
+
+    def get_band(self, symbol: str) -> Optional[tuple]:
+        """
+        발동되지 않는 가격 구간 반환
+
+        Returns:
+            (가장 높은 BELOW 가격선 또는 None, 가장 낮은 ABOVE 가격선 또는 None)
+            종목이 없으면 None
+        """
+        with self._lock:
+            entry = self._symbols.get(symbol)
+            if entry is None:
+                return None
+            return (entry.below_prices[-1] if entry.below_prices else None,
+                    entry.above_prices[0] if entry.above_prices else None)
+
+    def symbols(self) -> List[str]:
+        """트리거가 등록된 종목 리스트"""
+        return list(self._symbols.keys())
+
+    def __contains__(self, symbol: str) -> bool:
+        return symbol in self._symbols
+
+    def __len__(self) -> int:
+        return len(self._symbols)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """인덱스 통계 반환"""
+        with self._lock:
+            return {
+                'symbols': len(self._symbols),
+                'triggers': sum(len(entry) for entry in self._symbols.values()),
+                'rebuilds': self.rebuilds,
+                'checks': self.checks,
+                'hits': self.hits
+            }
@@ -0,0 +1,215 @@
+"""
+yfinance 일괄 폴백 시세 - KIS 조회 실패 시 종목마다 따로 긁지 않고 한 번에 받음
+
+KIS 장애 시 종목마다 yf.Ticker(...).history(period="1d")와 느린 .info를 차례로 호출하던 것을
+다중 종목 yf.download 1회로 대체한다.
+
+- 대상: 이번 세션에 조회된 종목(track) 중 캐시가 만료된 종목 전체 (+ 요청 종목)
+- 결과: 현재가(마지막 종가), 전일 종가, 거래량을 한 번에 파싱해 TTL 동안 재사용
+- 마감 시한: 다운로드 전체에 deadline(초)을 적용하고 소요 시간/초과 여부를 로그와 통계로 보고
+
+시장 전체 장애가 나도 주기당 폴백 요청은 1회로 끝난다.
+
+사용 예:
+    fallback = BulkQuoteFallback(timezone='US/Eastern')
+    quote = fallback.get_quote('AAPL')   # {'price', 'prev_close', 'volume', 'fetched_at'}
+"""
+import logging
+import threading
+import time
+from datetime import datetime
+from typing import Optional, Dict, Any, Iterable, List
+
+import pytz
+
+
+DEFAULT_TTL_SECONDS = 60        # 폴백 시세 재사용 시간 (초)
+DEFAULT_DEADLINE_SECONDS = 10   # 일괄 다운로드 전체 마감 시한 (초)
+MAX_BULK_SYMBOLS = 200          # 요청 1회 최대 종목 수
+HISTORY_PERIOD = "5d"           # 휴장일이 끼어도 전일 종가가 남도록 5일 일봉
+
+
+class BulkQuoteFallback:
+    """
+    yfinance 다중 종목 폴백 시세 (스레드 안전, 동시 요청은 1회 다운로드로 합침)
+    """
+
+    def __init__(self, timezone: str = 'US/Eastern',
+                 ttl: float = DEFAULT_TTL_SECONDS,
+                 deadline: float = DEFAULT_DEADLINE_SECONDS,
+                 max_symbols: int = MAX_BULK_SYMBOLS,
+                 on_quote=None):
+        """
+        Args:
+            timezone: 시장 타임존 (마지막 봉이 오늘 봉인지 판단)
+            ttl: 폴백 시세 재사용 시간 (초)
+            deadline: 일괄 다운로드 마감 시한 (초)
+            max_symbols: 요청 1회 최대 종목 수
+            on_quote: callable(symbol, price) - 받은 시세를 클라이언트 현재가 캐시에 채우는 콜백
+        """
+        self.tz = pytz.timezone(timezone)
+        self.ttl = ttl
+        self.deadline = deadline
+        self.max_symbols = max_symbols
+        self.on_quote = on_quote
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+        self._quotes: Dict[str, Dict[str, Any]] = {}
+        self._tracked: Dict[str, None] = {}     # 조회된 종목 (삽입 순서 유지)
+        self._lock = threading.Lock()
+        self._fetch_lock = threading.Lock()
+
+        self.stats = {
+            'requests': 0,
+            'hits': 0,
+            'downloads': 0,
+            'symbols_downloaded': 0,
+            'failures': 0,
+            'deadline_misses': 0,
+            'last_elapsed': 0.0
+        }
+
+    def track(self, symbols: Iterable[str]):
+        """다음 일괄 다운로드에 포함할 종목 등록"""
+        with self._lock:
+            for symbol in symbols:
+                self._tracked[symbol] = None
+
+    def _fresh(self, symbol: str) -> Optional[Dict[str, Any]]:
+        quote = self._quotes.get(symbol)
+        if quote and time.time() - quote['fetched_at'] < self.ttl:
+            return quote
+        return None
+
+    def get_quote(self, symbol: str) -> Optional[Dict[str, Any]]:
+        """
+        폴백 시세 조회 (TTL 내면 재사용, 아니면 만료된 등록 종목 전체를 한 번에 다운로드)
+
+        Returns:
+            {'price', 'prev_close', 'volume', 'fetched_at'} (실패 시 None)
+        """
+        self.stats['requests'] += 1
+        self.track([symbol])
+        quote = self._fresh(symbol)
+        if quote:
+            self.stats['hits'] += 1
+            return quote
+
+        with self._fetch_lock:
+            # 대기 중 다른 스레드가 받아 왔으면 재사용
+            quote = self._fresh(symbol)
+            if quote:
+                self.stats['hits'] += 1
+                return quote
+
+            with self._lock:
+                missing = [s for s in self._tracked if s != symbol and self._fresh(s) is None]
+            self.refresh([symbol] + missing[:self.max_symbols - 1])
+            return self._fresh(symbol)
+
+    def refresh(self, symbols: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        종목 일괄 다운로드 후 캐시 갱신
+
+        Returns:
+            {symbol: quote} 이번에 받은 시세
+        """
+        if not symbols:
+            return {}
+
+        quotes = self._download(symbols)
+        if quotes is None:
+            return {}
+
+        now = time.time()
+        quotes = {symbol: dict(quote, fetched_at=now) for symbol, quote in quotes.items()}
+        with self._lock:
+            self._quotes.update(quotes)
+        if self.on_quote is not None:
+            for symbol, quote in quotes.items():
+                self.on_quote(symbol, quote['price'])
+        self.stats['symbols_downloaded'] += len(quotes)
+        return quotes
+
+    def _download(self, symbols: List[str]) -> Optional[Dict[str, Dict[str, Any]]]:
+        """
+        yf.download 1회 (마감 시한 적용) - yfinance를 부르는 유일한 경로 (카세트가 반환값을 녹화/재생)
+
+        Returns:
+            {symbol: {'price', 'prev_close', 'volume'}} (마감 초과/실패 시 None)
+        """
+        result: Dict[str, Any] = {}
+
+        def download():
+            try:
+                import yfinance as yf
+                result['data'] = yf.download(' '.join(symbols), period=HISTORY_PERIOD, interval='1d',
+                                             group_by='ticker', auto_adjust=False, progress=False,
+                                             threads=True, timeout=self.deadline)
+            except Exception as e:
+                result['error'] = e
+
+        started = time.perf_counter()
+        self.stats['downloads'] += 1
+        worker = threading.Thread(target=download, name="YFBulkFallback", daemon=True)
+        worker.start()
+        worker.join(self.deadline)
+        elapsed = time.perf_counter() - started
+        self.stats['last_elapsed'] = round(elapsed, 3)
+
+        if worker.is_alive():
+            self.stats['deadline_misses'] += 1
+            self.stats['failures'] += 1
+            self.logger.warning(f"[YF_BULK] {len(symbols)}종목 다운로드 마감 초과 "
+                                f"({elapsed:.2f}초 > {self.deadline:g}초)")
+            return None
+        if 'error' in result:
+            self.stats['failures'] += 1
+            self.logger.error(f"[YF_BULK] {len(symbols)}종목 다운로드 실패 ({elapsed:.2f}초): {result['error']}")
+            return None
+
+        quotes = self._parse(result.get('data'), symbols)
+        self.logger.info(f"[YF_BULK] {len(quotes)}/{len(symbols)}종목 폴백 시세 수신 "
+                         f"({elapsed:.2f}초 / 마감 {self.deadline:g}초)")
+        return quotes
+
+    def _parse(self, data, symbols: List[str]) -> Dict[str, Dict[str, Any]]:
+        """yf.download 결과 → {symbol: {'price', 'prev_close', 'volume'}}"""
+        quotes = {}
+        if data is None or getattr(data, 'empty', True):
+            return quotes
+
+        today = datetime.now(self.tz).date()
+        columns = data.columns
+        for symbol in symbols:
+            try:
+                if getattr(columns, 'nlevels', 1) > 1:
+                    if symbol not in columns.get_level_values(0):
+                        continue
+                    frame = data[symbol]
+                else:
+                    frame = data
+                frame = frame.dropna(subset=['Close'])
+                if frame.empty:
+                    continue
+
+                closes = frame['Close']
+                price = float(closes.iloc[-1])
+                last_day = frame.index[-1].date() if hasattr(frame.index[-1], 'date') else None
+                # 마지막 봉이 오늘 봉이면 그 전 봉, 장 시작 전이면 마지막 봉이 전일 종가
+                if last_day == today:
+                    prev_close = float(closes.iloc[-2]) if len(closes) >= 2 else None
+                else:
+                    prev_close = price
+                volume = float(frame['Volume'].iloc[-1]) if 'Volume' in frame else None
+
+                if price > 0:
+                    quotes[symbol] = {'price': price, 'prev_close': prev_close, 'volume': volume}
+            except Exception as e:
+                self.logger.debug(f"[YF_BULK] {symbol} 파싱 실패: {e}")
+        return quotes
+
+    def get_stats(self) -> Dict[str, Any]:
+        stats = dict(self.stats)
+        stats['tracked'] = len(self._tracked)
+        return stats
@@ -0,0 +1,106 @@
+"""
+API 호출 예산 관리 - 토큰 버킷 기반 호출 제한기
+"""
+import threading
+import time
+from typing import Dict, Any
+
+
+class RateLimiter:
+    """
+    토큰 버킷 방식의 호출 제한기 (스레드 안전)
+
+    - rate_per_minute: 분당 허용 호출 수 (버킷 충전 속도)
+    - burst: 한 번에 몰아서 쓸 수 있는 최대 호출 수 (버킷 크기)
+
+    KIS API 초당/분당 호출 제한을 넘지 않도록 감시 루프, 프리페치 등
+    백그라운드 작업의 호출량을 고정 예산 안에 묶어두는 용도
+    """
+
+    def __init__(self, rate_per_minute: float, burst: int = None):
+        """
+        Args:
+            rate_per_minute: 분당 허용 호출 수
+            burst: 최대 누적 토큰 수 (기본: 분당 호출 수의 1/6, 최소 1)
+        """
+        if rate_per_minute <= 0:
+            raise ValueError(f"rate_per_minute must be positive: {rate_per_minute}")
+
+        self.rate_per_minute = float(rate_per_minute)
+        self.burst = burst if burst is not None else max(1, int(rate_per_minute / 6))
+        self._tokens = float(self.burst)
+        self._last_refill = time.monotonic()
+        self._lock = threading.Lock()
+
+        # 통계
+        self.acquired = 0
+        self.rejected = 0
+
+    def _refill(self, now: float):
+        """경과 시간만큼 토큰 충전 (락 보유 상태에서 호출)"""
+        elapsed = now - self._last_refill
+        if elapsed > 0:
+            self._tokens = min(self.burst, self._tokens + elapsed * self.rate_per_minute / 60.0)
+            self._last_refill = now
+
+    def try_acquire(self, tokens: int = 1) -> bool:
+        """
+        토큰 즉시 획득 시도 (대기 없음)
+
+        Returns:
+            True: 획득 성공 (호출 가능)
+            False: 예산 소진
+        """
+        with self._lock:
+            self._refill(time.monotonic())
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                self.acquired += tokens
+                return True
+            self.rejected += tokens
+            return False
+
+    def acquire(self, tokens: int = 1, timeout: float = None) -> bool:
+        """
+        토큰 획득 (필요 시 충전될 때까지 대기)
+
+        Args:
+            tokens: 필요한 토큰 수
+            timeout: 최대 대기 시간 (초, None이면 무제한)
+
+        Returns:
+            True: 획득 성공, False: 타임아웃
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    self.acquired += tokens
+                    return True
+                wait = (tokens - self._tokens) * 60.0 / self.rate_per_minute
+
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    with self._lock:
+                        self.rejected += tokens
+                    return False
+                wait = min(wait, remaining)
+
+            time.sleep(wait)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """호출 제한 통계 반환"""
+        with self._lock:
+            self._refill(time.monotonic())
+            return {
+                'rate_per_minute': self.rate_per_minute,
+                'burst': self.burst,
+                'available': round(self._tokens, 2),
+                'acquired': self.acquired,
+                'rejected': self.rejected
+            }
@@ -0,0 +1,323 @@
+"""
+적응형 시세 갱신 스케줄러 - 고정 호출 예산 안에서 종목별 갱신 주기 차등 적용
+
+모든 감시 종목을 같은 주기로 조회하면 결정 경계와 먼 종목에 예산을 낭비하고,
+경계 근처 종목(익절/손절선 근접, 하락률 상위 N 커트라인 근접, 섹터의 유일한
+상승 필터 종목)은 오래된 시세로 판단하게 된다.
+
+RefreshScheduler는 전략이 보고한 경계 근접도(urgency, 0~1)와 거래량 기반
+유동성으로 종목별 가중치를 정하고, 분당 호출 예산을 가중치 비율로 나눠
+종목별 갱신 주기를 계산한다.
+
+- 신호: update_signals(source, {symbol: urgency}) - 출처별로 통째로 교체, 종목은 최댓값 사용
+- 주기: interval = 총가중치 / (가중치 × 초당 예산), [min_interval, max_interval]로 제한
+- 실행: 갱신 시각 힙에서 만기 종목만 꺼내 조회 (RateLimiter로 예산 고정)
+- 공유 캐시(MarketDataHub)에는 종목별 TTL로 주기를 전달해 정기 주기 조회도 같은 주기를 따름
+"""
+import heapq
+import logging
+import threading
+import time
+from typing import Optional, Dict, Any, List, Callable
+
+from .rate_limiter import RateLimiter
+
+
+# 기본 갱신 설정
+REFRESH_MAX_REQUESTS_PER_MINUTE = 60  # 분당 최대 시세 조회 수
+REFRESH_MIN_INTERVAL_SECONDS = 3      # 가장 짧은 종목 갱신 주기 (초)
+REFRESH_MAX_INTERVAL_SECONDS = 300    # 가장 긴 종목 갱신 주기 (초)
+REFRESH_URGENCY_FLOOR = 0.05          # 신호 없는 종목의 기본 가중치
+REFRESH_MIN_LIQUIDITY = 0.25          # 거래량 적은 종목 가중치 하한 배율
+REFRESH_POLL_SECONDS = 1              # 스케줄러 루프 주기 (초)
+
+# 경계 근접도 스케일 (이 거리에서 근접도 0.5)
+REFRESH_EXIT_SCALE = 0.01             # 익절/손절/트레일링 가격선까지 1%
+REFRESH_RANKING_SCALE = 0.005         # 하락률 상위 N 커트라인까지 0.5%p
+REFRESH_FILTER_SCALE = 0.003          # 필터 종목 전일 대비 0.3%
+
+
+def proximity(distance: float, scale: float) -> float:
+    """
+    경계까지의 거리 → 근접도 (0~1, 거리 0이면 1)
+
+    Args:
+        distance: 경계까지의 거리 (비율, 예: 0.01 = 1%)
+        scale: 근접도가 0.5가 되는 거리
+    """
+    return scale / (scale + abs(distance))
+
+
+class RefreshScheduler:
+    """
+    종목별 적응형 시세 갱신기
+
+    사용 예:
+        scheduler = RefreshScheduler(hub.refresh_price, ttl_sink=hub.set_price_ttl)
+        scheduler.update_signals('exit', {'005930': 0.9})
+        scheduler.start()
+    """
+
+    def __init__(self, fetch_fn: Callable[[str], Optional[float]],
+                 max_requests_per_minute: float = REFRESH_MAX_REQUESTS_PER_MINUTE,
+                 min_interval: float = REFRESH_MIN_INTERVAL_SECONDS,
+                 max_interval: float = REFRESH_MAX_INTERVAL_SECONDS,
+                 indicators=None,
+                 ttl_sink: Callable[[str, Optional[float]], None] = None,
+                 is_active: Callable[[], bool] = None,
+                 name: str = None):
+        """
+        Args:
+            fetch_fn: 종목 시세 강제 조회 함수 (예: MarketDataHub.refresh_price)
+            max_requests_per_minute: 분당 조회 예산
+            min_interval: 최소 갱신 주기 (초)
+            max_interval: 최대 갱신 주기 (초)
+            indicators: 유동성 판단용 IndicatorBook (없으면 유동성 보정 생략)
+            ttl_sink: 종목별 주기를 캐시 TTL로 전달할 콜백 (symbol, ttl 또는 None)
+            is_active: 조회 허용 여부 (예: is_market_open, 없으면 항상 허용)
+            name: 로그 식별용 이름
+        """
+        self.fetch_fn = fetch_fn
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.indicators = indicators
+        self.ttl_sink = ttl_sink
+        self.is_active = is_active
+        self.name = name or 'default'
+        self.limiter = RateLimiter(max_requests_per_minute)
+        self.logger = logging.getLogger(f"{self.__class__.__name__}.{self.name}")
+
+        self._lock = threading.Lock()
+        self._signals: Dict[str, Dict[str, float]] = {}   # {source: {symbol: urgency}}
+        self._symbols: Dict[str, Dict[str, Any]] = {}     # {symbol: 갱신 상태}
+        self._heap: List[tuple] = []                      # [(next_due, version, symbol)]
+
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        self.stats = {
+            'refreshes': 0,
+            'failures': 0,
+            'budget_skips': 0,
+            'reallocations': 0
+        }
+
+    # ------------------------------------------------------------------
+    # 신호 / 주기 계산
+    # ------------------------------------------------------------------
+    def update_signals(self, source: str, urgencies: Dict[str, float]):
+        """
+        출처별 경계 근접도 교체 후 주기 재계산
+
+        Args:
+            source: 신호 출처 (예: 'exit', 'ranking', 'filter')
+            urgencies: {symbol: 0~1 근접도}
+        """
+        with self._lock:
+            self._signals[source] = {symbol: min(1.0, max(0.0, u)) for symbol, u in urgencies.items()}
+            self._reallocate()
+
+    def clear(self):
+        """신호/갱신 상태 전체 삭제 (시장 전환 등)"""
+        with self._lock:
+            symbols = list(self._symbols)
+            self._signals.clear()
+            self._symbols.clear()
+            self._heap = []
+        if self.ttl_sink is not None:
+            for symbol in symbols:
+                self.ttl_sink(symbol, None)
+
+    def _liquidity(self, volumes: Dict[str, float], median: float, symbol: str) -> float:
+        """거래량 중앙값 대비 유동성 배율 (REFRESH_MIN_LIQUIDITY ~ 1)"""
+        volume = volumes.get(symbol)
+        if not volume or not median:
+            return 1.0
+        return min(1.0, max(REFRESH_MIN_LIQUIDITY, volume / median))
+
+    def _reallocate(self):
+        """종목별 가중치 → 갱신 주기 재계산 (락 보유 상태에서 호출)"""
+        merged: Dict[str, tuple] = {}
+        for source, urgencies in self._signals.items():
+            for symbol, urgency in urgencies.items():
+                current = merged.get(symbol)
+                if current is None or urgency > current[0]:
+                    merged[symbol] = (urgency, source)
+
+        volumes = {}
+        if self.indicators is not None:
+            for symbol in merged:
+                volume = self.indicators.get_value(symbol, 'volume')
+                if volume:
+                    volumes[symbol] = volume
+        ordered = sorted(volumes.values())
+        median = ordered[len(ordered) // 2] if ordered else 0
+
+        weights = {}
+        for symbol, (urgency, _) in merged.items():
+            weights[symbol] = (REFRESH_URGENCY_FLOOR + urgency) * self._liquidity(volumes, median, symbol)
+        total_weight = sum(weights.values())
+        rate_per_second = self.limiter.rate_per_minute / 60.0
+
+        removed = [symbol for symbol in self._symbols if symbol not in merged]
+        for symbol in removed:
+            del self._symbols[symbol]
+            if self.ttl_sink is not None:
+                self.ttl_sink(symbol, None)
+
+        now = time.monotonic()
+        for symbol, (urgency, source) in merged.items():
+            interval = total_weight / (weights[symbol] * rate_per_second)
+            interval = round(min(self.max_interval, max(self.min_interval, interval)), 1)
+
+            state = self._symbols.get(symbol)
+            if state is None:
+                state = self._symbols[symbol] = {
+                    'refreshed_at': None, 'refreshes': 0, 'version': 0, 'interval': None
+                }
+            state['urgency'] = urgency
+            state['source'] = source
+
+            if state['interval'] != interval:
+                state['interval'] = interval
+                state['version'] += 1
+                last = state['refreshed_at']
+                next_due = now if last is None else last + interval
+                heapq.heappush(self._heap, (next_due, state['version'], symbol))
+                if self.ttl_sink is not None:
+                    self.ttl_sink(symbol, interval)
+
+        self.stats['reallocations'] += 1
+
+    def get_interval(self, symbol: str) -> Optional[float]:
+        """종목 갱신 주기 (초, 대상이 아니면 None)"""
+        state = self._symbols.get(symbol)
+        return state['interval'] if state else None
+
+    # ------------------------------------------------------------------
+    # 실행
+    # ------------------------------------------------------------------
+    def due_symbols(self, now: float = None, limit: int = None) -> List[str]:
+        """
+        갱신 시각이 지난 종목을 힙에서 꺼냄 (조회 후 record_refresh로 재등록)
+
+        Args:
+            now: 기준 시각 (time.monotonic, 없으면 현재)
+            limit: 최대 종목 수
+        """
+        now = time.monotonic() if now is None else now
+        due = []
+        with self._lock:
+            while self._heap and self._heap[0][0] <= now and (limit is None or len(due) < limit):
+                _, version, symbol = heapq.heappop(self._heap)
+                state = self._symbols.get(symbol)
+                if state is None or state['version'] != version:
+                    continue  # 주기 변경/삭제로 무효화된 항목
+                due.append(symbol)
+        return due
+
+    def record_refresh(self, symbol: str, now: float = None):
+        """조회 완료 기록 후 다음 갱신 시각 등록"""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            state = self._symbols.get(symbol)
+            if state is None:
+                return
+            state['refreshed_at'] = now
+            state['refreshes'] += 1
+            state['version'] += 1
+            heapq.heappush(self._heap, (now + state['interval'], state['version'], symbol))
+
+    def poll_once(self) -> int:
+        """
+        만기 종목 1회 갱신
+
+        Returns:
+            조회한 종목 수
+        """
+        if self.is_active is not None and not self.is_active():
+            return 0
+
+        count = 0
+        for symbol in self.due_symbols():
+            if not self.limiter.try_acquire():
+                self.stats['budget_skips'] += 1
+                # 예산 소진: 다음 루프에서 다시 만기 처리되도록 재등록
+                with self._lock:
+                    state = self._symbols.get(symbol)
+                    if state is not None:
+                        heapq.heappush(self._heap, (time.monotonic() + REFRESH_POLL_SECONDS,
+                                                    state['version'], symbol))
+                continue
+
+            try:
+                price = self.fetch_fn(symbol)
+            except Exception as e:
+                self.logger.debug(f"[REFRESH] {symbol} 조회 오류: {e}")
+                price = None
+
+            if price is None:
+                self.stats['failures'] += 1
+            else:
+                self.stats['refreshes'] += 1
+                count += 1
+            self.record_refresh(symbol)
+        return count
+
+    def start(self):
+        """갱신 스레드 시작"""
+        if self.is_running():
+            return
+
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name=f"RefreshScheduler-{self.name}")
+        self._thread.daemon = True
+        self._thread.start()
+        self.logger.info(f"[REFRESH] 적응형 시세 갱신 시작 (예산: 분당 {self.limiter.rate_per_minute:.0f}회)")
+
+    def stop(self, timeout: float = 5.0):
+        """갱신 스레드 중지"""
+        self._stop_event.set()
+        if self._thread and self._thread.is_alive():
+            self._thread.join(timeout)
+        self._thread = None
+        self.logger.info("[REFRESH] 적응형 시세 갱신 중지")
+
+    def is_running(self) -> bool:
+        """갱신 스레드 실행 여부"""
+        return self._thread is not None and self._thread.is_alive()
+
+    def _run(self):
+        """갱신 루프"""
+        while not self._stop_event.is_set():
+            try:
+                self.poll_once()
+            except Exception as e:
+                self.logger.error(f"[REFRESH] 갱신 루프 오류: {e}")
+
+            self._stop_event.wait(REFRESH_POLL_SECONDS)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """갱신 통계 및 종목별 주기/분당 조회 수 반환"""
+        now = time.monotonic()
+        with self._lock:
+            symbols = {}
+            for symbol, state in self._symbols.items():
+                refreshed_at = state['refreshed_at']
+                symbols[symbol] = {
+                    'interval': round(state['interval'], 1),
+                    'per_minute': round(60.0 / state['interval'], 2),
+                    'urgency': round(state['urgency'], 3),
+                    'source': state['source'],
+                    'refreshes': state['refreshes'],
+                    'age': round(now - refreshed_at, 1) if refreshed_at is not None else None
+                }
+            planned = sum(60.0 / state['interval'] for state in self._symbols.values())
+
+        return {
+            **self.stats,
+            'symbols': symbols,
+            'planned_per_minute': round(planned, 1),
+            'budget': self.limiter.get_stats(),
+            'running': self.is_running()
+        }
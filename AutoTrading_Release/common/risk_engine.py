@@ -0,0 +1,261 @@
+"""
+주문 전 리스크 엔진 - 종목/섹터/시장 노출 합계를 미리 유지하고
+주문 후보마다 O(1)로 한도 검사 (네트워크 호출 없음)
+
+노출 합계는
+- 잔고 스냅샷 (sync_balance): 전체 재계산, 스냅샷마다 1회
+- 체결 (on_fill): 해당 종목/섹터/시장 합계만 증감 (분당 주문 수도 체결된 매수만 집계)
+으로 갱신되고, 당일 실현손익은 매도 체결 시 평균단가 기준으로 누적하되
+브로커 조회값(get_realized_profit_today)이 있으면 sync_realized_profit으로 보정한다.
+
+한도 설정 (종목 설정 파일 "risk" 블록, 금액은 시장 통화 기준, 없으면 제한 없음):
+
+    "risk": {
+        "max_symbol_exposure": 3000000,
+        "max_sector_exposure": 8000000,
+        "max_market_exposure": 20000000,
+        "max_orders_per_minute": 10,
+        "max_daily_loss": 500000
+    }
+
+매도 주문은 노출을 줄이므로 항상 허용한다 (손절이 한도에 막히지 않도록).
+"""
+import logging
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from typing import Dict, Any, Tuple
+
+import pytz
+
+
+RISK_LIMIT_KEYS = ('max_symbol_exposure', 'max_sector_exposure', 'max_market_exposure',
+                   'max_orders_per_minute', 'max_daily_loss')
+
+
+class RiskEngine:
+    """
+    노출 합계 기반 주문 전 리스크 검사기 (스레드 안전)
+
+    사용 예:
+        risk = RiskEngine({'max_symbol_exposure': 3_000_000}, symbol_sectors={'005930': 'semi'})
+        risk.sync_balance(balance)
+        ok, reason = risk.check('005930', 'buy', 10, 71000)
+        if ok:
+            result = api_client.place_order(...)
+            risk.on_fill('005930', 'buy', 10, 71000)
+    """
+
+    def __init__(self, limits: Dict[str, Any] = None,
+                 symbol_sectors: Dict[str, str] = None,
+                 timezone: str = None):
+        """
+        Args:
+            limits: RISK_LIMIT_KEYS 한도 딕셔너리 (없는 키는 제한 없음)
+            symbol_sectors: {symbol: sector_key} 종목 → 섹터 매핑
+            timezone: 일일 손실 초기화 기준 타임존
+        """
+        limits = limits or {}
+        self.limits = {key: limits.get(key) for key in RISK_LIMIT_KEYS}
+        self.symbol_sectors = dict(symbol_sectors or {})
+        self.tz = pytz.timezone(timezone) if timezone else None
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+        self._lock = threading.Lock()
+        self._symbol_qty: Dict[str, int] = {}
+        self._symbol_avg: Dict[str, float] = {}
+        self._symbol_exposure: Dict[str, float] = {}
+        self._sector_exposure: Dict[str, float] = {}
+        self._market_exposure = 0.0
+
+        self._order_times: deque = deque()
+        self._date = self._today()
+        self._realized_today = 0.0
+
+        self.stats = {
+            'checks': 0,
+            'rejects': 0,
+            'fills': 0,
+            'balance_syncs': 0
+        }
+
+    def _today(self):
+        return datetime.now(self.tz).date() if self.tz else datetime.now().date()
+
+    def _roll_day(self):
+        """날짜가 바뀌면 당일 실현손익 초기화 (락 보유 상태에서 호출)"""
+        today = self._today()
+        if today != self._date:
+            self._date = today
+            self._realized_today = 0.0
+
+    def set_symbol_sectors(self, symbol_sectors: Dict[str, str]):
+        """종목 → 섹터 매핑 교체 (설정 재로드 시, 섹터 합계 재계산)"""
+        with self._lock:
+            self.symbol_sectors = dict(symbol_sectors)
+            self._sector_exposure = {}
+            for symbol, exposure in self._symbol_exposure.items():
+                sector = self.symbol_sectors.get(symbol)
+                if sector:
+                    self._sector_exposure[sector] = self._sector_exposure.get(sector, 0.0) + exposure
+
+    def _add_exposure(self, symbol: str, amount: float):
+        """종목/섹터/시장 합계 증감 (락 보유 상태에서 호출)"""
+        self._symbol_exposure[symbol] = self._symbol_exposure.get(symbol, 0.0) + amount
+        sector = self.symbol_sectors.get(symbol)
+        if sector:
+            self._sector_exposure[sector] = self._sector_exposure.get(sector, 0.0) + amount
+        self._market_exposure += amount
+
+    def sync_balance(self, balance: Dict[str, Any]):
+        """
+        잔고 스냅샷으로 노출 합계 재계산
+
+        Args:
+            balance: get_account_balance() 결과
+        """
+        if not balance:
+            return
+
+        with self._lock:
+            self._symbol_qty = {}
+            self._symbol_avg = {}
+            self._symbol_exposure = {}
+            self._sector_exposure = {}
+            self._market_exposure = 0.0
+
+            for pos in balance.get('positions', []):
+                symbol = pos['symbol']
+                quantity = pos.get('quantity', 0)
+                if quantity <= 0:
+                    continue
+                amount = pos.get('eval_amount') or quantity * (pos.get('current_price') or pos.get('avg_price', 0))
+                self._symbol_qty[symbol] = quantity
+                self._symbol_avg[symbol] = pos.get('avg_price', 0)
+                self._add_exposure(symbol, amount)
+
+            self.stats['balance_syncs'] += 1
+
+    def sync_realized_profit(self, realized_profit: float):
+        """브로커 조회 당일 실현손익으로 보정"""
+        with self._lock:
+            self._roll_day()
+            self._realized_today = realized_profit
+
+    def on_fill(self, symbol: str, side: str, quantity: int, price: float):
+        """
+        체결 반영 (O(1))
+
+        Args:
+            symbol: 종목 코드
+            side: 'buy' 또는 'sell'
+            quantity: 체결 수량
+            price: 체결 가격 (0이면 노출만 비율로 감소)
+        """
+        if quantity <= 0:
+            return
+
+        with self._lock:
+            self._roll_day()
+            self.stats['fills'] += 1
+            held = self._symbol_qty.get(symbol, 0)
+
+            if side == 'buy':
+                if self.limits['max_orders_per_minute'] is not None:
+                    self._order_times.append(time.monotonic())
+                avg = self._symbol_avg.get(symbol, 0)
+                self._symbol_avg[symbol] = (avg * held + price * quantity) / (held + quantity) if price else avg
+                self._symbol_qty[symbol] = held + quantity
+                self._add_exposure(symbol, price * quantity)
+                return
+
+            if held <= 0:
+                return
+            sold = min(quantity, held)
+            avg = self._symbol_avg.get(symbol, 0)
+            if price and avg:
+                self._realized_today += (price - avg) * sold
+
+            exposure = self._symbol_exposure.get(symbol, 0.0)
+            self._add_exposure(symbol, -exposure * sold / held)
+            if sold == held:
+                self._symbol_qty.pop(symbol, None)
+                self._symbol_avg.pop(symbol, None)
+                self._symbol_exposure.pop(symbol, None)
+            else:
+                self._symbol_qty[symbol] = held - sold
+
+    def check(self, symbol: str, side: str, quantity: int, price: float) -> Tuple[bool, str]:
+        """
+        주문 후보 한도 검사 (O(1), 네트워크 호출 없음)
+
+        Args:
+            symbol: 종목 코드
+            side: 'buy' 또는 'sell'
+            quantity: 수량
+            price: 예상 체결 가격
+
+        Returns:
+            (허용 여부, 거부 사유)
+        """
+        if side != 'buy':
+            return True, ''
+
+        limits = self.limits
+        amount = quantity * (price or 0)
+
+        with self._lock:
+            self._roll_day()
+            self.stats['checks'] += 1
+
+            reason = ''
+            max_loss = limits['max_daily_loss']
+            max_rate = limits['max_orders_per_minute']
+            max_symbol = limits['max_symbol_exposure']
+            max_sector = limits['max_sector_exposure']
+            max_market = limits['max_market_exposure']
+            sector = self.symbol_sectors.get(symbol)
+
+            if max_rate is not None:
+                cutoff = time.monotonic() - 60
+                while self._order_times and self._order_times[0] < cutoff:
+                    self._order_times.popleft()
+
+            if max_loss is not None and self._realized_today <= -abs(max_loss):
+                reason = f"일일 손실 한도 도달 ({self._realized_today:,.2f})"
+            elif max_rate is not None and len(self._order_times) >= max_rate:
+                reason = f"분당 주문 한도 도달 ({max_rate}건)"
+            elif max_symbol is not None and self._symbol_exposure.get(symbol, 0.0) + amount > max_symbol:
+                reason = f"종목 노출 한도 초과 ({self._symbol_exposure.get(symbol, 0.0) + amount:,.0f} > {max_symbol:,.0f})"
+            elif (max_sector is not None and sector
+                  and self._sector_exposure.get(sector, 0.0) + amount > max_sector):
+                reason = f"섹터 {sector} 노출 한도 초과 ({self._sector_exposure.get(sector, 0.0) + amount:,.0f} > {max_sector:,.0f})"
+            elif max_market is not None and self._market_exposure + amount > max_market:
+                reason = f"시장 노출 한도 초과 ({self._market_exposure + amount:,.0f} > {max_market:,.0f})"
+
+            if reason:
+                self.stats['rejects'] += 1
+                return False, reason
+            return True, ''
+
+    def get_exposure(self, symbol: str = None, sector: str = None) -> float:
+        """노출 금액 조회 (인자 없으면 시장 전체)"""
+        if symbol is not None:
+            return self._symbol_exposure.get(symbol, 0.0)
+        if sector is not None:
+            return self._sector_exposure.get(sector, 0.0)
+        return self._market_exposure
+
+    def get_status(self) -> Dict[str, Any]:
+        """리스크 상태 반환 (모니터링용)"""
+        with self._lock:
+            self._roll_day()
+            return {
+                'limits': dict(self.limits),
+                'market_exposure': round(self._market_exposure, 2),
+                'sector_exposure': {k: round(v, 2) for k, v in self._sector_exposure.items()},
+                'symbols': len(self._symbol_exposure),
+                'realized_today': round(self._realized_today, 2),
+                **self.stats
+            }
@@ -6,25 +6,35 @@
 한국 시장: 09:00-15:30 KST
 
 두 시장은 시간대가 겹치지 않아 하나의 프로세스에서 동시 운영 가능
+(주기 작업은 시장 타임존 벽시계 경계에 맞춰 EventScheduler 타이머 힙으로 실행)
+
+시장마다 전용 워커(MarketWorker - 스레드 또는 자식 프로세스)에서 자기 작업 큐와 API 호출 예산으로
+실행하므로 한 시장의 지연/오류 반복이 다른 시장 주기를 밀지 않는다. 메인 스레드는 감독자로서
+워커 상태를 점검하고 멈춘 워커를 재시작한다.
 """
-import schedule
 import time
 import logging
-from datetime import datetime, time as dt_time
+import functools
+from datetime import date, datetime, timedelta, time as dt_time
 import pytz
 import argparse
-from typing import Optional
+from typing import Optional, Dict, Any
 
 # US 모듈
-from us.strategy import USStrategy
 from us.config import USConfig
 
 # KR 모듈
-from kr.strategy import KRStrategy
 from kr.config import KRConfig
 
 from order_manager import OrderManager
 from transaction_logger import TransactionLogger
+from position_watcher import PositionWatcher
+from strategy_host import StrategyHost
+from common.cassette import Cassette
+from common.event_scheduler import EventScheduler
+from common.market_calendar import get_calendar
+from common.market_worker import MarketWorker, WORKER_MODES, WORKER_STALL_SECONDS
+from common.prefetcher import PREFETCH_LEAD_SECONDS
 from config import (
     SELL_INTERVAL_MINUTES,
     BUY_INTERVAL_MINUTES,
@@ -37,53 +47,212 @@ from config import (
 )
 
 
+# 시장 레지스트리 - 시장을 추가할 때 타임존/표시 이름/운영 시간 설정을 등록 (StrategyHost에 클라이언트 연결 필요)
+MARKETS = {
+    'us': {'timezone': 'US/Eastern', 'name': '미국', 'tz_label': 'ET', 'config': USConfig},
+    'kr': {'timezone': 'Asia/Seoul', 'name': '한국', 'tz_label': 'KST', 'config': KRConfig},
+}
+
+# 시장 워커 설정
+API_REQUESTS_PER_MINUTE = 600      # 시장 전체가 나눠 쓰는 분당 API 호출 예산 (조회 기준, 주문 제외)
+SUPERVISOR_INTERVAL_MINUTES = 0.5  # 감독자 워커 점검 주기 (분)
+
+
+def register_market_jobs(events: EventScheduler, scheduler: 'MarketScheduler'):
+    """
+    시장 1개의 주기 작업 등록 (시장 타임존 벽시계 경계, 거래일 세션 안에서만 실행 - 휴장일/조기 폐장 반영)
+
+    Args:
+        events: 작업을 등록할 EventScheduler (시장 워커 전용)
+        scheduler: MarketScheduler
+    """
+    market = scheduler.market
+    calendar = scheduler.calendar
+    # 토큰 체크는 개장 30분 전부터 (개장 직후 첫 주기 전에 재발급)
+    pre_open = (datetime.combine(date.today(), scheduler.start_time) - timedelta(minutes=30)).time()
+
+    # 토큰 체크 (30분 주기, 같은 시각 매도/매수보다 먼저 실행)
+    events.every(30, scheduler.check_and_refresh_token, scheduler.tz,
+                 window=(pre_open, scheduler.end_time), name=f"{market}_token", tags=(market,),
+                 calendar=calendar)
+
+    # 매도 전략 (30분 주기)
+    events.every(SELL_INTERVAL_MINUTES, scheduler.execute_sell_strategy, scheduler.tz,
+                 name=f"{market}_sell", tags=(market, 'sell'), pass_scheduled_at=True,
+                 prepare=lambda at, s=scheduler: s.prepare_cycle('sell', at),
+                 prepare_lead=PREFETCH_LEAD_SECONDS, calendar=calendar)
+
+    # 매수 전략 (60분 주기)
+    events.every(BUY_INTERVAL_MINUTES, scheduler.execute_buy_strategy, scheduler.tz,
+                 name=f"{market}_buy", tags=(market, 'buy'), pass_scheduled_at=True,
+                 prepare=lambda at, s=scheduler: s.prepare_cycle('buy', at),
+                 prepare_lead=PREFETCH_LEAD_SECONDS, calendar=calendar)
+
+    # 상태 출력 (15분 주기)
+    events.every(15, scheduler.print_status, scheduler.tz,
+                 name=f"{market}_status", tags=(market,), calendar=calendar)
+
+    # 개장 전 워밍업 (실제 개장 시각 기준 lead_minutes분 전, 휴장일 제외)
+    lead = scheduler.host.warmup_lead_minutes
+    if lead:
+        events.at_session('open', scheduler.warmup, calendar, offset_minutes=-lead,
+                          name=f"{market}_warmup", tags=(market,))
+
+    # 장 마감 시 모은 1분봉 저장 (조기 폐장일은 실제 폐장 시각)
+    events.at_session('close', scheduler.host.flush_minute_bars, calendar,
+                      name=f"{market}_close", tags=(market,))
+
+    for name, fire_at in events.next_fire_times().items():
+        scheduler.logger.info(f"[SCHEDULE] {name}: {fire_at.strftime('%Y-%m-%d %H:%M %Z')}")
+
+
+def setup_market_worker(market: str, events: EventScheduler, limiter, scheduler: 'MarketScheduler' = None):
+    """
+    MarketWorker setup - 워커 안에서 시장 작업 등록
+
+    Args:
+        market: 'us' 또는 'kr'
+        events: 워커 전용 EventScheduler
+        limiter: 워커 몫 API 호출 예산 (RateLimiter 또는 None)
+        scheduler: 스레드 모드에서 공유하는 MarketScheduler (None이면 워커 안에서 생성 - 프로세스 모드)
+
+    Returns:
+        정리 함수 (워커 안에서 생성한 경우) 또는 None
+    """
+    owned = scheduler is None
+    if owned:
+        scheduler = MarketScheduler(market)
+        scheduler.log_startup_status()
+        scheduler.check_and_refresh_token()
+        scheduler.start_position_watcher()
+
+    scheduler.host.hub.set_rate_limiter(limiter)
+    register_market_jobs(events, scheduler)
+    scheduler.logger.info(f"[{market.upper()}] 스케줄 설정 완료")
+
+    if owned:
+        def cleanup():
+            scheduler.stop_position_watcher()
+            scheduler.log_summary()
+        return cleanup
+    return None
+
+
+def trading_hours(market: str):
+    """시장 운영 시간 (시작, 종료) - 설정 파일 기준"""
+    config = MARKETS[market]['config']
+    return dt_time.fromisoformat(config.TRADING_START_TIME), dt_time.fromisoformat(config.TRADING_END_TIME)
+
+
 class MarketScheduler:
     """단일 시장 스케줄러 (US 또는 KR)"""
 
-    def __init__(self, market: str):
+    def __init__(self, market: str, enable_position_watcher: bool = True):
         """
         Args:
             market: 'us' 또는 'kr'
+            enable_position_watcher: 매도 주기 사이 보유 종목 고빈도 감시 사용 여부
         """
         self.market = market.lower()
         self.logger = logging.getLogger(f"{__name__}.{self.market.upper()}")
 
-        if self.market == 'us':
-            self.strategy = USStrategy()
-            self.tz = pytz.timezone('US/Eastern')
-            self.start_time = dt_time.fromisoformat(USConfig.TRADING_START_TIME)
-            self.end_time = dt_time.fromisoformat(USConfig.TRADING_END_TIME)
-            self.transaction_logger = TransactionLogger(prefix="us")
-            self.market_name = "미국"
-        else:  # kr
-            self.strategy = KRStrategy()
-            self.tz = pytz.timezone('Asia/Seoul')
-            self.start_time = dt_time.fromisoformat(KRConfig.TRADING_START_TIME)
-            self.end_time = dt_time.fromisoformat(KRConfig.TRADING_END_TIME)
-            self.transaction_logger = TransactionLogger(prefix="kr")
-            self.market_name = "한국"
+        # 멀티 전략 호스트 (공유 시세/잔고 + 주문 디스패처)
+        self.host = StrategyHost(self.market)
+        self.strategy = self.host.primary
+
+        self.start_time, self.end_time = trading_hours(self.market)
+        self.tz = pytz.timezone(MARKETS[self.market]['timezone'])
+        self.tz_label = MARKETS[self.market]['tz_label']
+        self.market_name = MARKETS[self.market]['name']
+        self.transaction_logger = TransactionLogger(prefix=self.market)
+
+        # 거래소 캘린더 (휴장일/조기 폐장/지연 개장 반영)
+        self.calendar = get_calendar(self.market, (self.start_time.strftime('%H:%M'), self.end_time.strftime('%H:%M')))
 
         self.order_manager = OrderManager()
         self._last_broker_reinit_time = 0
+        self._pending_cycles = {}  # {'buy'/'sell': 선조회 예약한 주기 예정 시각}
+
+        # 보유 종목 고빈도 감시 (익절/손절 즉시 대응, 대표 전략 기준)
+        self.position_watcher = None
+        if enable_position_watcher:
+            self.position_watcher = PositionWatcher(self.strategy, name=self.market.upper())
+
+    def start_position_watcher(self):
+        """포지션 감시 / 적응형 시세 갱신 스레드 시작"""
+        self.host.start()
+        if self.position_watcher:
+            self.position_watcher.start()
+
+    def stop_position_watcher(self):
+        """포지션 감시 / 적응형 시세 갱신 스레드 중지 및 통계 로그"""
+        self.host.stop()
+        if self.position_watcher and self.position_watcher.is_running():
+            self.position_watcher.stop()
+            stats = self.position_watcher.get_stats()
+            self.logger.info(f"[{self.market.upper()}_WATCH] 시세 {stats['quote_requests']}회, "
+                             f"매도 {stats['orders']}건, 평균 감지→주문 {stats['avg_latency_ms']}ms")
+
+    def suspend(self):
+        """
+        세션 종료 - 감시/갱신 스레드만 멈춤
 
-    def is_trading_hours(self) -> bool:
-        """현재 시간이 해당 시장 운영 시간인지 확인"""
-        try:
-            now = datetime.now(self.tz)
-            current_time = now.time()
+        전략/API 클라이언트/토큰 매니저/브로커/주문 관리자와 시세·전일 종가·거래소 코드 캐시는
+        유지되어 다음 세션에 resume()으로 그대로 재사용한다.
+        """
+        self.stop_position_watcher()
+        self.host.hub.unpin_prices()
+        self._pending_cycles.clear()
 
-            # 주말 체크
-            if now.weekday() >= 5:
-                return False
+    def resume(self):
+        """세션 재개 - 바뀐 종목 설정만 다시 읽고, 토큰 확인 후 감시/갱신 스레드 시작"""
+        self.host.reload_stock_configs()
+        self.check_and_refresh_token()
+        self.start_position_watcher()
 
-            return self.start_time <= current_time <= self.end_time
+    def is_trading_hours(self) -> bool:
+        """현재 시간이 해당 시장 운영 시간인지 확인 (거래소 세션 표 조회)"""
+        try:
+            return self.calendar.is_open()
 
         except Exception as e:
             self.logger.error(f"운영 시간 확인 오류: {e}")
             return False
 
-    def execute_sell_strategy(self):
+    def prepare_cycle(self, kind: str, cycle_at: float):
+        """
+        다음 주기 시세 선조회 예약
+
+        Args:
+            kind: 'buy' 또는 'sell'
+            cycle_at: 주기 예정 시각 (epoch 초)
+        """
+        if not self.is_trading_hours():
+            return
+        self._pending_cycles[kind] = cycle_at
+        self.host.prefetch(kind, cycle_at)
+
+    def _take_scheduled_at(self, kind: str, scheduled_at: Optional[float]) -> Optional[float]:
+        """주기 예정 시각 (인자가 없으면 선조회 예약 시각 사용)"""
+        pending = self._pending_cycles.pop(kind, None)
+        if scheduled_at is not None:
+            return scheduled_at
+        if pending is not None and -5 <= time.time() - pending <= 120:
+            return pending
+        return None
+
+    def _log_cycle_timing(self, result: dict):
+        """주기 판단 시작/완료 시각 로그"""
+        timing = result.get('timing')
+        if not timing or timing['start_delay'] is None:
+            return
+        self.logger.info(f"[{self.market.upper()}_TIMING] {timing['kind']}: 예정 대비 시작 +{timing['start_delay']:.1f}초, "
+                         f"판단 {timing['decision_seconds']:.1f}초, 선조회 {timing['prefetched']}종목, "
+                         f"시세 캐시 {timing['price_hits']}/{timing['price_hits'] + timing['price_requests']}")
+
+    def execute_sell_strategy(self, scheduled_at: Optional[float] = None):
         """매도 전략 실행"""
+        scheduled_at = self._take_scheduled_at('sell', scheduled_at)
         if not self.is_trading_hours():
             return
 
@@ -91,7 +260,8 @@ class MarketScheduler:
             self.logger.info(f"=== [{self.market_name}] 매도 조건 검사 시작 ===")
             self.transaction_logger.log_strategy_execution("sell", "started", f"매도 조건 검사 시작")
 
-            result = self.strategy.execute_sell_strategy()
+            result = self.host.execute_sell_strategy(scheduled_at=scheduled_at)
+            self._log_cycle_timing(result)
 
             self.logger.info(f"=== [{self.market_name}] 매도 조건 검사 완료: {result.get('message', '')} ===")
             self.transaction_logger.log_strategy_execution("sell", "completed", f"매도 조건 검사 완료 - {result.get('message', '')}")
@@ -100,8 +270,9 @@ class MarketScheduler:
             self.logger.error(f"[{self.market_name}] 매도 전략 오류: {e}")
             self.transaction_logger.log_strategy_execution("sell", "error", str(e))
 
-    def execute_buy_strategy(self):
+    def execute_buy_strategy(self, scheduled_at: Optional[float] = None):
         """매수 전략 실행"""
+        scheduled_at = self._take_scheduled_at('buy', scheduled_at)
         if not self.is_trading_hours():
             return
 
@@ -109,7 +280,8 @@ class MarketScheduler:
             self.logger.info(f"=== [{self.market_name}] 매수 조건 검사 시작 ===")
             self.transaction_logger.log_strategy_execution("buy", "started", f"매수 조건 검사 시작")
 
-            result = self.strategy.execute_buy_strategy()
+            result = self.host.execute_buy_strategy(scheduled_at=scheduled_at)
+            self._log_cycle_timing(result)
 
             self.logger.info(f"=== [{self.market_name}] 매수 조건 검사 완료: {result.get('message', '')} ===")
             self.transaction_logger.log_strategy_execution("buy", "completed", f"매수 조건 검사 완료 - {result.get('message', '')}")
@@ -118,13 +290,19 @@ class MarketScheduler:
             self.logger.error(f"[{self.market_name}] 매수 전략 오류: {e}")
             self.transaction_logger.log_strategy_execution("buy", "error", str(e))
 
-    def check_and_refresh_token(self):
-        """토큰 상태 확인 및 필요시 재발급"""
+    def check_and_refresh_token(self) -> bool:
+        """
+        토큰 상태 확인 및 필요시 재발급
+
+        Returns:
+            유효한 토큰 확보 여부 (토큰을 쓰지 않는 클라이언트는 True)
+        """
         try:
-            if not hasattr(self.strategy.api_client, 'token_manager'):
-                return
+            api_client = self.host.api_client
+            if not hasattr(api_client, 'token_manager'):
+                return True
 
-            token_manager = self.strategy.api_client.token_manager
+            token_manager = api_client.token_manager
             token_info = token_manager.get_token_info()
             self.logger.debug(f"[{self.market.upper()}_TOKEN] {token_info}")
 
@@ -134,14 +312,60 @@ class MarketScheduler:
 
             token_changed = (old_token != new_token)
 
-            if token_changed and hasattr(self.strategy.api_client, 'reinitialize_brokers'):
+            if token_changed and hasattr(api_client, 'reinitialize_brokers'):
                 self.logger.info(f"[{self.market.upper()}_TOKEN] 브로커 재초기화...")
-                if self.strategy.api_client.reinitialize_brokers():
+                if api_client.reinitialize_brokers():
                     self._last_broker_reinit_time = time.time()
                     self.logger.info(f"[{self.market.upper()}_TOKEN] 재초기화 성공")
+            return new_token is not None
 
         except Exception as e:
             self.logger.error(f"[{self.market.upper()}_TOKEN] 토큰 체크 오류: {e}")
+            return False
+
+    def warmup(self) -> Dict[str, Any]:
+        """
+        개장 전 워밍업 (토큰 → 연결 → 잔고 → 블랙리스트 → 거래소 코드 → 전일 종가) 후 준비 상태 로그
+
+        Returns:
+            준비 상태 (StrategyHost.warmup 참고)
+        """
+        market = self.market.upper()
+        self.logger.info(f"[{market}_WARMUP] 개장 전 워밍업 시작")
+        readiness = self.host.warmup(token_step=self.check_and_refresh_token)
+
+        steps = ', '.join(f"{name} {'OK' if step['ok'] else 'FAIL'}({step['seconds']:.1f}s)"
+                          for name, step in readiness['steps'].items())
+        if readiness['ready']:
+            self.logger.info(f"[{market}_WARMUP] 준비 완료 ({readiness['elapsed']:.1f}초, {readiness['symbols']}종목): {steps}")
+        else:
+            self.logger.warning(f"[{market}_WARMUP] 준비 미완료 ({readiness['elapsed']:.1f}초): {steps}")
+        for name, step in readiness['steps'].items():
+            if step['detail'] not in (None, True, False):
+                self.logger.debug(f"[{market}_WARMUP] {name}: {step['detail']}")
+        return readiness
+
+    def log_startup_status(self):
+        """시작 시 시장 상태 (개장 여부, 현재 시각, 운영 시간, 다음 개장)"""
+        market = self.market.upper()
+        now = datetime.now(self.tz)
+        tz_name = self.tz_label
+        is_open = self.is_trading_hours()
+        status = "개장중" if is_open else "폐장중"
+
+        self.logger.info(f"[{market}] {self.market_name} 시장: {status}")
+        self.logger.info(f"[{market}] 현재 시간: {now.strftime('%Y-%m-%d %H:%M:%S')} {tz_name}")
+        self.logger.info(f"[{market}] 운영 시간: {self.start_time} ~ {self.end_time} {tz_name}")
+        if not is_open:
+            calendar_status = self.calendar.get_status()
+            holiday = f" (휴장: {calendar_status['holiday']})" if calendar_status['holiday'] else ""
+            self.logger.info(f"[{market}] 다음 개장: {calendar_status['next_open']}{holiday}")
+
+    def log_summary(self):
+        """오늘 거래 요약 로그"""
+        summary = self.transaction_logger.get_summary()
+        self.logger.info(f"[{self.market.upper()}] 오늘 거래: {summary['total_transactions']}건")
+        self.logger.info(f"[{self.market.upper()}] 매수: {summary['buy_orders']}건, 매도: {summary['sell_orders']}건")
 
     def print_status(self):
         """현재 상태 출력"""
@@ -150,12 +374,17 @@ class MarketScheduler:
 
         try:
             now = datetime.now(self.tz)
-            tz_name = "ET" if self.market == 'us' else "KST"
+            tz_name = self.tz_label
 
             self.logger.info(f"=== [{self.market_name}] 상태 ({now.strftime('%H:%M:%S')} {tz_name}) ===")
 
+            readiness = self.host.readiness
+            if readiness:
+                state = "준비 완료" if readiness['ready'] else "준비 미완료"
+                self.logger.info(f"  워밍업: {state} ({readiness['finished_at']}, {readiness['elapsed']:.1f}초)")
+
             # 잔고 요약
-            balance = self.strategy.api_client.get_account_balance()
+            balance = self.host.hub.get_account_balance()
             if balance:
                 positions = balance.get('positions', [])
                 cash = balance.get('available_cash', 0)
@@ -165,60 +394,145 @@ class MarketScheduler:
                 else:
                     self.logger.info(f"  예수금: {cash:,.0f}원, 보유: {len(positions)}종목")
 
+            if len(self.host.strategies) > 1:
+                host_status = self.host.get_status()
+                data = host_status['data']
+                self.logger.info(f"  전략: {', '.join(host_status['strategies'])}, "
+                                 f"시세 캐시 적중 {data['price_hit_rate']}%, "
+                                 f"예산 초과 거부 {host_status['dispatcher']['budget_rejects']}건")
+
+            if self.host.refresh_scheduler is not None:
+                refresh = self.host.refresh_scheduler.get_stats()
+                fastest = sorted(refresh['symbols'].items(), key=lambda item: item[1]['interval'])[:3]
+                fastest_text = ', '.join(f"{symbol}={info['interval']}s" for symbol, info in fastest) or '-'
+                self.logger.info(f"  시세 갱신: {len(refresh['symbols'])}종목, 계획 분당 {refresh['planned_per_minute']}회, "
+                                 f"최단 주기 {fastest_text}")
+
+            if self.position_watcher:
+                stats = self.position_watcher.get_stats()
+                self.logger.info(f"  감시: {len(stats['watched_symbols'])}종목, 시세 {stats['quote_requests']}회, "
+                                 f"감시 매도 {stats['orders']}건 (최대 감지→주문 {stats['max_latency_ms']}ms)")
+
         except Exception as e:
             self.logger.error(f"상태 출력 오류: {e}")
 
 
 class DualMarketScheduler:
-    """US/KR 듀얼 마켓 스케줄러"""
+    """US/KR 듀얼 마켓 스케줄러 (시장별 워커 + 감독자)"""
 
-    def __init__(self, markets: list = None):
+    def __init__(self, markets: list = None, worker_mode: str = 'thread',
+                 requests_per_minute: float = API_REQUESTS_PER_MINUTE,
+                 stall_seconds: float = WORKER_STALL_SECONDS):
         """
         Args:
             markets: 운영할 시장 리스트 ['us', 'kr'] (기본: 둘 다)
+            worker_mode: 시장 워커 실행 방식 'thread' 또는 'process'
+            requests_per_minute: 시장 전체 분당 API 호출 예산 (시장 수로 균등 분배)
+            stall_seconds: 워커 작업 1개 최대 실행 시간 (초과 시 감독자가 재시작)
         """
         self.logger = logging.getLogger(__name__)
 
         if markets is None:
             markets = ['us', 'kr']
+        if worker_mode not in WORKER_MODES:
+            raise ValueError(f"worker_mode must be one of {WORKER_MODES}: {worker_mode}")
 
         self.markets = markets
+        self.worker_mode = worker_mode
         self.schedulers = {}
 
+        # 프로세스 모드는 자식 프로세스가 MarketScheduler를 직접 만든다 (부모는 감독만)
+        if worker_mode == 'thread':
+            for market in markets:
+                self.schedulers[market] = MarketScheduler(market)
+                self.logger.info(f"[{market.upper()}] 스케줄러 초기화 완료")
+
+        self.calendars = {}
         for market in markets:
-            self.schedulers[market] = MarketScheduler(market)
-            self.logger.info(f"[{market.upper()}] 스케줄러 초기화 완료")
+            start_time, end_time = trading_hours(market)
+            self.calendars[market] = get_calendar(market, (start_time.strftime('%H:%M'), end_time.strftime('%H:%M')))
+
+        # 시장별 워커 (호출 예산은 시장 수로 균등 분배 - 한 시장 지연이 다른 시장 몫을 쓰지 않음)
+        share = requests_per_minute / len(markets) if requests_per_minute else None
+        self.workers: Dict[str, MarketWorker] = {}
+        for market in markets:
+            setup = functools.partial(setup_market_worker, market, scheduler=self.schedulers.get(market))
+            self.workers[market] = MarketWorker(market, setup, mode=worker_mode,
+                                                rate_per_minute=share, stall_seconds=stall_seconds)
 
         self.is_running = False
         self.us_tz = pytz.timezone('US/Eastern')
         self.kr_tz = pytz.timezone('Asia/Seoul')
+        self.events = EventScheduler('dual')
 
     def _get_current_status(self) -> dict:
-        """현재 각 시장 상태 조회"""
+        """현재 각 시장 상태 조회 (개장 여부 + 워커 상태)"""
         status = {}
-        for market, scheduler in self.schedulers.items():
+        for market, calendar in self.calendars.items():
             status[market] = {
-                'is_open': scheduler.is_trading_hours(),
-                'market_name': scheduler.market_name
+                'is_open': calendar.is_open(),
+                'market_name': MARKETS[market]['name'],
+                'worker': self.workers[market].get_status()
             }
         return status
 
     def setup_schedule(self):
-        """스케줄 설정"""
-        for market, scheduler in self.schedulers.items():
-            # 매도 전략 (30분 주기)
-            schedule.every(SELL_INTERVAL_MINUTES).minutes.do(scheduler.execute_sell_strategy)
-
-            # 매수 전략 (60분 주기)
-            schedule.every(BUY_INTERVAL_MINUTES).minutes.do(scheduler.execute_buy_strategy)
-
-            # 토큰 체크 (30분 주기)
-            schedule.every(30).minutes.do(scheduler.check_and_refresh_token)
-
-            # 상태 출력 (15분 주기)
-            schedule.every(15).minutes.do(scheduler.print_status)
+        """감독자 스케줄 설정 (시장 작업은 각 워커가 자기 EventScheduler에 등록)"""
+        # 워커 점검 (30초 주기, 죽은 워커와 멈춘 프로세스 워커 재시작)
+        self.events.every(SUPERVISOR_INTERVAL_MINUTES, self.supervise, self.kr_tz,
+                          weekdays_only=False, name='supervisor')
+
+        # 전체 상태 로그 (1시간 주기)
+        self.events.every(60, self.log_status, self.kr_tz, weekdays_only=False, name='status')
+
+    def supervise(self):
+        """워커 상태 점검 - 죽은 워커와 작업이 한도를 넘겨 멈춘 프로세스 워커 재시작"""
+        for market, worker in self.workers.items():
+            reason = worker.check()
+            if reason:
+                self.logger.warning(f"[SUPERVISOR] {market.upper()} 워커 재시작 ({reason})")
+
+    def log_status(self):
+        """전체 상태 로그 (시장별 개장 여부 + 워커 상태/지연)"""
+        us_now = datetime.now(self.us_tz)
+        kr_now = datetime.now(self.kr_tz)
+        self.logger.info(f"[STATUS] US: {us_now.strftime('%H:%M')} ET, KR: {kr_now.strftime('%H:%M')} KST")
+
+        for market, s in self._get_current_status().items():
+            state = "OPEN" if s['is_open'] else "CLOSED"
+            worker = s['worker']
+            current = f", 실행 중 {worker['current_job']} {worker['busy_seconds']:.0f}초" if worker['current_job'] else ""
+            self.logger.info(f"[STATUS] {market.upper()}: {state} - 워커 {worker['state']} ({worker['mode']}{current}), "
+                             f"실행 {worker['dispatches']}회, 오류 {worker['errors']}회, 재시작 {worker['restarts']}회")
+            if worker['last_error']:
+                self.logger.info(f"[STATUS] {market.upper()}: 마지막 오류 - {worker['last_error']}")
+
+            events = worker['events']
+            if events:
+                self.logger.info(f"[STATUS] {market.upper()}: 스케줄 평균 지연 {events['avg_lag_ms']}ms, "
+                                 f"최대 지연 {events['max_lag_ms']}ms, 깨어남 {events['wakeups']}회")
+            if worker['rate']:
+                rate = worker['rate']
+                self.logger.info(f"[STATUS] {market.upper()}: 호출 예산 분당 {rate['rate_per_minute']:g}회, "
+                                 f"사용 {rate['acquired']}회, 대기 초과 {rate['rejected']}회")
+
+    def run_once(self) -> Dict[str, Any]:
+        """
+        시장별 매도/매수 주기를 즉시 1회 실행 (운영 시간 검사 없음, 카세트 재생 성능 측정용)
 
-            self.logger.info(f"[{market.upper()}] 스케줄 설정 완료")
+        Returns:
+            dict: {'<market>_<sell/buy>': 소요 시간(초)}
+        """
+        durations = {}
+        schedulers = self.schedulers or {market: MarketScheduler(market) for market in self.markets}
+        for market, scheduler in schedulers.items():
+            for kind in ('sell', 'buy'):
+                started = time.perf_counter()
+                result = getattr(scheduler.host, f"execute_{kind}_strategy")()
+                elapsed = time.perf_counter() - started
+                durations[f"{market}_{kind}"] = round(elapsed, 3)
+                self.logger.info(f"[{market.upper()}_ONCE] {kind}: {elapsed:.3f}초 - {result.get('message', '')}")
+        return durations
 
     def start(self):
         """스케줄러 시작"""
@@ -235,53 +549,25 @@ class DualMarketScheduler:
             print("WARNING: REAL TRADING MODE ACTIVE!")
             print("=" * 60)
 
-        # 각 시장 초기 상태 표시
+        # 각 시장 초기 상태 표시 (프로세스 모드는 워커가 직접 표시)
         for market, scheduler in self.schedulers.items():
-            now = datetime.now(scheduler.tz)
-            tz_name = "ET" if market == 'us' else "KST"
-            is_open = scheduler.is_trading_hours()
-            status = "개장중" if is_open else "폐장중"
-
-            self.logger.info(f"[{market.upper()}] {scheduler.market_name} 시장: {status}")
-            self.logger.info(f"[{market.upper()}] 현재 시간: {now.strftime('%Y-%m-%d %H:%M:%S')} {tz_name}")
-            self.logger.info(f"[{market.upper()}] 운영 시간: {scheduler.start_time} ~ {scheduler.end_time} {tz_name}")
+            scheduler.log_startup_status()
 
             # 초기 토큰 확인
             scheduler.check_and_refresh_token()
 
-        # 스케줄 설정
+            # 포지션 감시 시작 (폐장 중에는 감시 루프가 자체적으로 대기)
+            scheduler.start_position_watcher()
+
+        # 시장별 워커 시작 후 감독자 스케줄 설정
+        for worker in self.workers.values():
+            worker.start()
         self.setup_schedule()
         self.is_running = True
 
-        # 메인 루프
-        last_status_log = time.time()
-
+        # 메인 루프 - 감독자 (다음 점검 시각까지 대기 후 실행)
         try:
-            while self.is_running:
-                schedule.run_pending()
-
-                # 현재 상태 확인
-                status = self._get_current_status()
-                any_market_open = any(s['is_open'] for s in status.values())
-
-                # 1시간마다 전체 상태 로그
-                if time.time() - last_status_log >= 3600:
-                    us_now = datetime.now(self.us_tz)
-                    kr_now = datetime.now(self.kr_tz)
-
-                    self.logger.info(f"[STATUS] US: {us_now.strftime('%H:%M')} ET, KR: {kr_now.strftime('%H:%M')} KST")
-
-                    for market, s in status.items():
-                        state = "OPEN" if s['is_open'] else "CLOSED"
-                        self.logger.info(f"[STATUS] {market.upper()}: {state}")
-
-                    last_status_log = time.time()
-
-                # 슬립 간격 조절
-                if any_market_open:
-                    time.sleep(30)   # 시장 열림: 30초
-                else:
-                    time.sleep(300)  # 시장 닫힘: 5분
+            self.events.run()
 
         except KeyboardInterrupt:
             self.logger.info("사용자에 의한 중단")
@@ -299,12 +585,15 @@ class DualMarketScheduler:
         self.logger.info("=" * 60)
 
         self.is_running = False
+        self.events.stop()
+
+        for worker in self.workers.values():
+            worker.stop()
 
-        # 각 시장별 요약
+        # 각 시장별 요약 (프로세스 모드는 워커 종료 시 표시)
         for market, scheduler in self.schedulers.items():
-            summary = scheduler.transaction_logger.get_summary()
-            self.logger.info(f"[{market.upper()}] 오늘 거래: {summary['total_transactions']}건")
-            self.logger.info(f"[{market.upper()}] 매수: {summary['buy_orders']}건, 매도: {summary['sell_orders']}건")
+            scheduler.stop_position_watcher()
+            scheduler.log_summary()
 
 
 def main():
@@ -313,7 +602,24 @@ def main():
     parser.add_argument('--market', type=str, default='both',
                         choices=['us', 'kr', 'both'],
                         help='시장 선택: us, kr, both (기본값)')
+    parser.add_argument('--record', type=str, default=None, metavar='CASSETTE',
+                        help='API 요청/응답을 카세트 파일로 녹화 (예: cassettes/kr.jsonl.gz)')
+    parser.add_argument('--replay', type=str, default=None, metavar='CASSETTE',
+                        help='녹화한 카세트로 API 응답 재생 (오프라인)')
+    parser.add_argument('--replay-speed', type=float, default=1.0,
+                        help='재생 속도 배수 (기본값: 1.0 기록 속도, 0이면 지연 없음)')
+    parser.add_argument('--once', action='store_true',
+                        help='매도/매수 주기를 즉시 1회 실행하고 소요 시간 출력 후 종료')
+    parser.add_argument('--worker-mode', type=str, default='thread', choices=list(WORKER_MODES),
+                        help='시장 워커 실행 방식: thread (기본값) 또는 process (시장별 자식 프로세스)')
+    parser.add_argument('--api-budget', type=float, default=API_REQUESTS_PER_MINUTE,
+                        help=f'시장 전체 분당 API 조회 예산, 시장 수로 균등 분배 (기본값: {API_REQUESTS_PER_MINUTE})')
     args = parser.parse_args()
+    if args.record and args.replay:
+        parser.error('--record와 --replay는 함께 사용할 수 없습니다')
+    if (args.record or args.replay) and args.worker_mode == 'process' and not args.once:
+        # 카세트는 이 프로세스의 requests/브로커 호출만 가로채므로 자식 프로세스 호출은 녹화/재생되지 않음 (--once는 이 프로세스에서 실행)
+        parser.error('--record/--replay는 --worker-mode thread에서만 사용할 수 있습니다')
 
     # 로깅 설정
     from logging.handlers import RotatingFileHandler
@@ -340,12 +646,21 @@ def main():
 
     logger = logging.getLogger(__name__)
 
+    cassette = None
+    if args.record:
+        cassette = Cassette(args.record, mode='record')
+    elif args.replay:
+        cassette = Cassette(args.replay, mode='replay', speed=args.replay_speed)
+
     try:
-        # API 키 확인
-        if KIS_APP_KEY == "your_app_key_here":
+        # API 키 확인 (재생은 네트워크를 쓰지 않으므로 생략)
+        if KIS_APP_KEY == "your_app_key_here" and not args.replay:
             logger.error("API 키가 설정되지 않았습니다. config.py를 확인해주세요.")
             return
 
+        if cassette is not None:
+            cassette.install()
+
         # 시장 선택
         if args.market == 'both':
             markets = ['us', 'kr']
@@ -355,13 +670,21 @@ def main():
         logger.info(f"운영 시장: {', '.join([m.upper() for m in markets])}")
 
         # 스케줄러 시작
-        scheduler = DualMarketScheduler(markets=markets)
+        scheduler = DualMarketScheduler(markets=markets, worker_mode=args.worker_mode,
+                                        requests_per_minute=args.api_budget)
+        if args.once:
+            durations = scheduler.run_once()
+            logger.info(f"[ONCE] 주기 소요 시간: {durations}")
+            return
         scheduler.start()
 
     except Exception as e:
         logger.error(f"시스템 시작 오류: {e}")
         import traceback
         logger.error(traceback.format_exc())
+    finally:
+        if cassette is not None and cassette.is_installed():
+            cassette.uninstall()
 
 
 if __name__ == "__main__":
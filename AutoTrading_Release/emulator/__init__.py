@@ -0,0 +1,7 @@
+"""
+Emulator module - 부하 테스트용 로컬 KIS OpenAPI 에뮬레이터
+"""
+from .exchange import EmulatedExchange
+from .server import KISEmulator
+
+__all__ = ['EmulatedExchange', 'KISEmulator']
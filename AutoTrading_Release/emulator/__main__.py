@@ -0,0 +1,75 @@
+"""
+KIS OpenAPI 에뮬레이터 실행
+
+사용 예:
+    python -m emulator
+    python -m emulator --port 8765 --latency-ms 30 --jitter-ms 20 --rate-limit 20
+    python -m emulator --prices prices.json --exchanges exchanges.json --token-ttl 600 --page-size 5
+
+prices.json: {"kr": {"005930": 55000}, "us": {"AAPL": 190.5}}
+exchanges.json: {"AAPL": "NAS", "KO": "NYS"}
+"""
+import argparse
+import json
+import logging
+
+from .exchange import EmulatedExchange, DEFAULT_CASH, DEFAULT_VOLATILITY
+from .server import (KISEmulator, DEFAULT_HOST, DEFAULT_PORT, DEFAULT_RATE_LIMIT,
+                     DEFAULT_TOKEN_TTL, DEFAULT_TOKEN_ISSUE_INTERVAL, DEFAULT_PAGE_SIZE)
+
+
+def _load_json(path):
+    if not path:
+        return None
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def main():
+    """메인 실행 함수"""
+    parser = argparse.ArgumentParser(description='KIS OpenAPI 로컬 에뮬레이터')
+    parser.add_argument('--host', type=str, default=DEFAULT_HOST, help=f'바인드 주소 (기본값: {DEFAULT_HOST})')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT, help=f'포트 (기본값: {DEFAULT_PORT}, 0이면 자동)')
+    parser.add_argument('--latency-ms', type=float, default=0.0, help='응답 기본 지연 (밀리초)')
+    parser.add_argument('--jitter-ms', type=float, default=0.0, help='추가 무작위 지연 상한 (밀리초)')
+    parser.add_argument('--rate-limit', type=float, default=DEFAULT_RATE_LIMIT,
+                        help=f'앱키별 초당 허용 호출 수 (기본값: {DEFAULT_RATE_LIMIT}, 0이면 제한 없음)')
+    parser.add_argument('--token-ttl', type=int, default=DEFAULT_TOKEN_TTL, help='토큰 유효기간 (초)')
+    parser.add_argument('--token-issue-interval', type=float, default=DEFAULT_TOKEN_ISSUE_INTERVAL,
+                        help='앱키별 토큰 재발급 최소 간격 (초, 0이면 제한 없음)')
+    parser.add_argument('--page-size', type=int, default=DEFAULT_PAGE_SIZE, help='잔고 조회 페이지당 종목 수')
+    parser.add_argument('--kr-cash', type=float, default=DEFAULT_CASH['kr'], help='국내 계좌 초기 예수금 (원)')
+    parser.add_argument('--us-cash', type=float, default=DEFAULT_CASH['us'], help='해외 계좌 초기 예수금 (달러)')
+    parser.add_argument('--prices', type=str, default=None, help='초기 가격 JSON 파일')
+    parser.add_argument('--exchanges', type=str, default=None, help='미국 종목 거래소 JSON 파일')
+    parser.add_argument('--volatility', type=float, default=DEFAULT_VOLATILITY, help='일간 변동성 (0이면 가격 고정)')
+    parser.add_argument('--seed', type=int, default=None, help='랜덤 워크 시드')
+    parser.add_argument('--verbose', action='store_true', help='요청별 로그 출력')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.INFO,
+                        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+    exchange = EmulatedExchange(
+        prices=_load_json(args.prices),
+        volatility=args.volatility,
+        seed=args.seed,
+        cash={'kr': args.kr_cash, 'us': args.us_cash},
+        exchanges=_load_json(args.exchanges)
+    )
+    emulator = KISEmulator(
+        host=args.host,
+        port=args.port,
+        exchange=exchange,
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        rate_limit=args.rate_limit,
+        token_ttl=args.token_ttl,
+        token_issue_interval=args.token_issue_interval,
+        page_size=args.page_size
+    )
+    emulator.serve_forever()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,413 @@
+"""
+KIS 에뮬레이터 시장/계좌 상태 - 시세 생성, 가상 계좌, 주문 매칭
+
+- 시세: 종목별 랜덤 워크 (조회 시점까지 경과 시간만큼 진행, KR은 호가 단위 반올림)
+  set_price()로 직접 지정 가능 (부하 테스트/체결 시나리오용)
+- 계좌: (시장, 계좌번호)별 예수금/보유 종목/미체결 주문/실현손익 (처음 조회 시 자동 생성)
+- 매칭: 시장가 즉시 체결, 지정가는 현재가보다 유리하면 즉시 체결 아니면 미체결 대기 후
+  시세가 지정가를 지나면 현재가로 체결 (매수 대기 주문은 예수금, 매도 대기 주문은 수량을 묶어둠)
+- 비용: 수수료/매도 거래세 (기본값은 backtest.sim_client.market_profile과 동일)
+"""
+import math
+import random
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Optional, Dict, Any, List, Callable, Tuple
+
+import pytz
+
+from backtest.sim_client import market_profile
+
+
+DEFAULT_CASH = {'kr': 10_000_000, 'us': 10_000.0}
+DEFAULT_VOLATILITY = 0.02           # 일간 변동성 (랜덤 워크)
+SESSION_SECONDS = 6.5 * 3600        # 일간 변동성을 나눌 장 시간 (초)
+INITIAL_PRICE_RANGE = {'kr': (5_000, 200_000), 'us': (10.0, 500.0)}
+
+# 주문/잔고 API 거래소 코드 → 시세 API 거래소 코드
+US_EXCHANGE_ALIASES = {'NASD': 'NAS', 'NYSE': 'NYS', 'AMEX': 'AMS'}
+
+
+class EmulatedExchange:
+    """
+    에뮬레이터 시세/계좌/매칭 엔진 (스레드 안전)
+
+    사용 예:
+        exchange = EmulatedExchange(prices={'kr': {'005930': 55000}}, seed=1)
+        exchange.quote('kr', '005930')
+        exchange.submit_order('kr', '12345678', '005930', 'buy', 10)
+    """
+
+    def __init__(self, prices: Optional[Dict[str, Dict[str, float]]] = None,
+                 volatility: float = DEFAULT_VOLATILITY,
+                 seed: Optional[int] = None,
+                 cash: Optional[Dict[str, float]] = None,
+                 exchanges: Optional[Dict[str, str]] = None,
+                 clock: Optional[Callable[[], float]] = None):
+        """
+        Args:
+            prices: 초기 가격 {'kr': {종목: 가격}, 'us': {종목: 가격}} (없는 종목은 종목코드 기반 임의 가격)
+            volatility: 일간 변동성 (0이면 가격 고정)
+            seed: 랜덤 워크 시드
+            cash: 시장별 계좌 초기 예수금 {'kr': 원, 'us': 달러}
+            exchanges: 미국 종목 거래소 {종목: 'NAS'/'NYS'/'AMS'} (없는 종목은 모든 거래소에서 조회됨)
+            clock: 현재 시각 함수 (epoch 초, 기본 time.time)
+        """
+        self.volatility = volatility
+        self.initial_prices = prices or {}
+        self.initial_cash = dict(DEFAULT_CASH, **(cash or {}))
+        self.exchanges = exchanges or {}
+        self._clock = clock or time.time
+        self._rng = random.Random(seed)
+        self._lock = threading.RLock()
+
+        self.profiles = {market: market_profile(market) for market in ('kr', 'us')}
+        self._tz = {market: pytz.timezone(profile['timezone']) for market, profile in self.profiles.items()}
+
+        self.quotes: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self.accounts: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self.open_orders: Dict[Tuple[str, str], List[Dict[str, Any]]] = {}
+        self._order_seq = 0
+
+        self.stats = {
+            'quotes': 0,
+            'orders': 0,
+            'fills': 0,
+            'rejects': 0,
+            'resting': 0
+        }
+
+    # ===== 시세 =====
+
+    def _round(self, market: str, price: float) -> float:
+        return self.profiles[market]['round_to_tick'](price)
+
+    def _new_quote(self, market: str, symbol: str) -> Dict[str, Any]:
+        price = self.initial_prices.get(market, {}).get(symbol)
+        if price is None:
+            low, high = INITIAL_PRICE_RANGE[market]
+            price = random.Random(f"{market}:{symbol}").uniform(low, high)
+        price = self._round(market, float(price))
+        return {
+            'symbol': symbol,
+            'market': market,
+            'prev_close': price,
+            'open': price,
+            'high': price,
+            'low': price,
+            'price': price,
+            'volume': 0,
+            'updated': self._clock()
+        }
+
+    def _get_quote(self, market: str, symbol: str) -> Dict[str, Any]:
+        key = (market, symbol)
+        quote = self.quotes.get(key)
+        if quote is None:
+            quote = self.quotes[key] = self._new_quote(market, symbol)
+        return quote
+
+    def _advance(self, quote: Dict[str, Any]):
+        """마지막 갱신 이후 경과 시간만큼 랜덤 워크 진행"""
+        now = self._clock()
+        elapsed = min(now - quote['updated'], SESSION_SECONDS)
+        if elapsed <= 0 or self.volatility <= 0:
+            return
+        sigma = self.volatility * math.sqrt(elapsed / SESSION_SECONDS)
+        price = self._round(quote['market'], quote['price'] * math.exp(self._rng.gauss(0.0, sigma)))
+        if price > 0:
+            self._update_price(quote, price)
+        quote['volume'] += int(elapsed * self._rng.uniform(1, 20))
+        quote['updated'] = now
+
+    def _update_price(self, quote: Dict[str, Any], price: float):
+        quote['price'] = price
+        quote['high'] = max(quote['high'], price)
+        quote['low'] = min(quote['low'], price)
+        self._match(quote)
+
+    def quote(self, market: str, symbol: str) -> Dict[str, Any]:
+        """
+        현재 시세 (조회 시점까지 랜덤 워크 진행 + 대기 주문 매칭)
+
+        Returns:
+            dict: symbol, price, prev_close, open, high, low, volume
+        """
+        with self._lock:
+            quote = self._get_quote(market, symbol)
+            self._advance(quote)
+            self.stats['quotes'] += 1
+            return dict(quote)
+
+    def set_price(self, market: str, symbol: str, price: float) -> Dict[str, Any]:
+        """가격 직접 지정 (대기 주문 매칭 포함)"""
+        with self._lock:
+            quote = self._get_quote(market, symbol)
+            quote['updated'] = self._clock()
+            self._update_price(quote, self._round(market, float(price)))
+            return dict(quote)
+
+    def listed_on(self, symbol: str, exchange: str) -> bool:
+        """미국 종목이 해당 거래소 코드(NAS/NYS/AMS 또는 NASD/NYSE/AMEX)에 상장되어 있는지"""
+        listed = self.exchanges.get(symbol)
+        return listed is None or US_EXCHANGE_ALIASES.get(exchange, exchange) == listed
+
+    def daily_history(self, market: str, symbol: str, days: int = 100,
+                      end: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        일별 시세 (최근 날짜부터, 첫 행은 오늘 시세, 둘째 행 종가는 전일 종가)
+
+        과거 구간은 종목별 고정 시드 랜덤 워크로 생성하므로 같은 종목은 항상 같은 이력을 반환한다.
+
+        이력은 항상 오늘부터 거꾸로 생성하고 end 이후 행을 버리므로, end를 바꿔 나눠 조회해도 같은 값이 이어진다.
+
+        Args:
+            market: 'kr' 또는 'us'
+            symbol: 종목 코드
+            days: 행 수
+            end: 마지막 날짜 'YYYYMMDD' (없으면 오늘)
+
+        Returns:
+            [{date, open, high, low, close, volume}, ...]
+        """
+        quote = self.quote(market, symbol)
+        today = datetime.fromtimestamp(self._clock(), self._tz[market]).date()
+        last = min(today, datetime.strptime(end, '%Y%m%d').date()) if end else today
+
+        rows = []
+        if today <= last:
+            rows.append({'date': today, 'open': quote['open'], 'high': quote['high'], 'low': quote['low'],
+                         'close': quote['price'], 'volume': quote['volume']})
+        rng = random.Random(f"history:{market}:{symbol}")
+        close = quote['prev_close']
+        day = today
+        while len(rows) < days:
+            day -= timedelta(days=1)
+            if day.weekday() >= 5:
+                continue
+            open_ = self._round(market, close * math.exp(rng.gauss(0.0, self.volatility / 2)))
+            volume = rng.randint(10_000, 1_000_000)
+            if day <= last:
+                rows.append({
+                    'date': day,
+                    'open': open_,
+                    'high': max(open_, close),
+                    'low': min(open_, close),
+                    'close': close,
+                    'volume': volume
+                })
+            close = self._round(market, close * math.exp(rng.gauss(0.0, max(self.volatility, 1e-9))))
+        return rows
+
+    # ===== 계좌 =====
+
+    def account(self, market: str, account_no: str) -> Dict[str, Any]:
+        """계좌 상태 (없으면 초기 예수금으로 생성)"""
+        key = (market, account_no)
+        with self._lock:
+            account = self.accounts.get(key)
+            if account is None:
+                account = self.accounts[key] = {
+                    'cash': float(self.initial_cash[market]),
+                    'reserved_cash': 0.0,
+                    'positions': {},        # {symbol: {quantity, reserved, avg_price, fees}}
+                    'realized': [],         # [{date, symbol, quantity, price, avg_price, fee, pnl}]
+                    'fees': 0.0
+                }
+            return account
+
+    def balance(self, market: str, account_no: str) -> Dict[str, Any]:
+        """
+        잔고 (보유 종목은 종목코드 순, 현재가로 평가)
+
+        Returns:
+            dict: cash, available_cash, positions [{symbol, quantity, sellable_qty, avg_price,
+                  current_price, purchase_amount, eval_amount, profit_loss, profit_rate}]
+        """
+        with self._lock:
+            account = self.account(market, account_no)
+            positions = []
+            for symbol in sorted(account['positions']):
+                pos = account['positions'][symbol]
+                price = self.quote(market, symbol)['price']
+                purchase = pos['avg_price'] * pos['quantity']
+                eval_amount = price * pos['quantity']
+                positions.append({
+                    'symbol': symbol,
+                    'quantity': pos['quantity'],
+                    'sellable_qty': pos['quantity'] - pos['reserved'],
+                    'avg_price': pos['avg_price'],
+                    'current_price': price,
+                    'purchase_amount': purchase,
+                    'eval_amount': eval_amount,
+                    'profit_loss': eval_amount - purchase,
+                    'profit_rate': (eval_amount - purchase) / purchase * 100 if purchase > 0 else 0.0
+                })
+            return {
+                'cash': account['cash'],
+                'available_cash': account['cash'] - account['reserved_cash'],
+                'positions': positions
+            }
+
+    def realized(self, market: str, account_no: str, start: Optional[str] = None,
+                 end: Optional[str] = None) -> List[Dict[str, Any]]:
+        """기간 실현손익 내역 (start/end: 'YYYYMMDD', 시장 타임존 날짜 기준)"""
+        with self._lock:
+            records = self.account(market, account_no)['realized']
+            return [dict(r) for r in records
+                    if (not start or r['date'] >= start) and (not end or r['date'] <= end)]
+
+    # ===== 주문/매칭 =====
+
+    def _fee_rates(self, market: str) -> Tuple[float, float]:
+        profile = self.profiles[market]
+        return profile['commission_rate'], profile['commission_rate'] + profile['sell_tax_rate']
+
+    def submit_order(self, market: str, account_no: str, symbol: str, side: str,
+                     quantity: int, price: Optional[float] = None) -> Dict[str, Any]:
+        """
+        주문 접수 (시장가/유리한 지정가는 즉시 체결, 아니면 대기)
+
+        Args:
+            market: 'kr' 또는 'us'
+            account_no: 계좌번호 앞 8자리
+            symbol: 종목 코드
+            side: 'buy' 또는 'sell'
+            quantity: 수량
+            price: 지정가 (None 또는 0이면 시장가)
+
+        Returns:
+            dict: success, message, order_id, status ('filled'/'open'), filled_price
+        """
+        with self._lock:
+            self.stats['orders'] += 1
+            account = self.account(market, account_no)
+            quote = self._get_quote(market, symbol)
+            self._advance(quote)
+            market_price = quote['price']
+            buy_fee_rate, _ = self._fee_rates(market)
+
+            if quantity <= 0:
+                return self._reject("주문수량 오류")
+            if price:
+                price = float(price)
+                if market == 'kr' and self._round(market, price) != price:
+                    return self._reject(f"호가단위 오류 (주문가 {price})")
+
+            marketable = not price or (side == 'buy' and price >= market_price) \
+                or (side == 'sell' and price <= market_price)
+
+            if side == 'buy':
+                need = (price or market_price) * quantity * (1 + buy_fee_rate)
+                if need > account['cash'] - account['reserved_cash'] + 1e-9:
+                    return self._reject(f"주문가능금액 부족 (필요 {need:,.2f})")
+            elif side == 'sell':
+                pos = account['positions'].get(symbol)
+                sellable = pos['quantity'] - pos['reserved'] if pos else 0
+                if sellable < quantity:
+                    return self._reject(f"매도가능수량 부족 (매도가능 {sellable}주)")
+            else:
+                return self._reject(f"주문구분 오류: {side}")
+
+            self._order_seq += 1
+            order = {
+                'order_id': f"{self._order_seq:010d}",
+                'market': market,
+                'account_no': account_no,
+                'symbol': symbol,
+                'side': side,
+                'quantity': quantity,
+                'price': price,
+                'time': self._clock()
+            }
+
+            if marketable:
+                fill_price = self._fill(order, market_price)
+                return {'success': True, 'message': "주문 전송 완료 (체결)", 'order_id': order['order_id'],
+                        'status': 'filled', 'filled_price': fill_price}
+
+            # 미체결 대기: 매수는 예수금, 매도는 수량을 묶어둠
+            if side == 'buy':
+                order['reserved_cash'] = price * quantity * (1 + buy_fee_rate)
+                account['reserved_cash'] += order['reserved_cash']
+            else:
+                account['positions'][symbol]['reserved'] += quantity
+            self.open_orders.setdefault((market, symbol), []).append(order)
+            self.stats['resting'] += 1
+            return {'success': True, 'message': "주문 전송 완료 (미체결)", 'order_id': order['order_id'],
+                    'status': 'open', 'filled_price': None}
+
+    def _reject(self, message: str) -> Dict[str, Any]:
+        self.stats['rejects'] += 1
+        return {'success': False, 'message': message, 'order_id': None, 'status': 'rejected',
+                'filled_price': None}
+
+    def _match(self, quote: Dict[str, Any]):
+        """시세 변경 시 대기 주문 체결 (현재가가 지정가를 지나면 현재가로 체결)"""
+        key = (quote['market'], quote['symbol'])
+        orders = self.open_orders.get(key)
+        if not orders:
+            return
+        price = quote['price']
+        remaining = []
+        for order in orders:
+            if (order['side'] == 'buy' and price <= order['price']) \
+                    or (order['side'] == 'sell' and price >= order['price']):
+                account = self.account(order['market'], order['account_no'])
+                if order['side'] == 'buy':
+                    account['reserved_cash'] -= order['reserved_cash']
+                else:
+                    account['positions'][order['symbol']]['reserved'] -= order['quantity']
+                self.stats['resting'] -= 1
+                self._fill(order, price)
+            else:
+                remaining.append(order)
+        self.open_orders[key] = remaining
+
+    def _fill(self, order: Dict[str, Any], price: float) -> float:
+        """체결 처리 (예수금/보유 수량/평균단가/실현손익 갱신)"""
+        market = order['market']
+        account = self.account(market, order['account_no'])
+        buy_fee_rate, sell_fee_rate = self._fee_rates(market)
+        symbol = order['symbol']
+        quantity = order['quantity']
+        amount = price * quantity
+
+        if order['side'] == 'buy':
+            fee = amount * buy_fee_rate
+            pos = account['positions'].setdefault(symbol, {'quantity': 0, 'reserved': 0,
+                                                           'avg_price': 0.0, 'fees': 0.0})
+            held = pos['quantity']
+            pos['avg_price'] = (pos['avg_price'] * held + amount) / (held + quantity)
+            pos['quantity'] = held + quantity
+            pos['fees'] += fee
+            account['cash'] -= amount + fee
+        else:
+            pos = account['positions'][symbol]
+            held = pos['quantity']
+            fee = amount * sell_fee_rate
+            buy_fee = pos['fees'] * quantity / held
+            pnl = (price - pos['avg_price']) * quantity - fee - buy_fee
+            account['realized'].append({
+                'date': datetime.fromtimestamp(self._clock(), self._tz[market]).strftime('%Y%m%d'),
+                'symbol': symbol,
+                'quantity': quantity,
+                'price': price,
+                'avg_price': pos['avg_price'],
+                'fee': fee + buy_fee,
+                'pnl': pnl
+            })
+            pos['quantity'] = held - quantity
+            pos['fees'] -= buy_fee
+            if pos['quantity'] == 0 and pos['reserved'] == 0:
+                del account['positions'][symbol]
+            account['cash'] += amount - fee
+
+        account['fees'] += fee
+        self.stats['fills'] += 1
+        return price
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return dict(self.stats, symbols=len(self.quotes), accounts=len(self.accounts))
@@ -0,0 +1,630 @@
+"""
+KIS OpenAPI 로컬 에뮬레이터 서버 (http.server 기반)
+
+프로젝트가 사용하는 엔드포인트만 같은 경로/파라미터/응답 필드로 흉내 낸다.
+
+- 토큰: POST /oauth2/tokenP (유효기간 token_ttl, 앱키별 재발급 간격 token_issue_interval → EGW00133)
+- 인증: 없는/모르는 토큰 EGW00121, 만료 토큰 EGW00123
+- 호출 제한: 앱키별 초당 rate_limit 건 초과 시 EGW00201 (HTTP 500, 실서버와 같은 형식)
+- 지연: 응답마다 latency_ms + 0~jitter_ms 대기 (요청별 스레드라 동시 요청은 병렬 처리)
+- 시세/잔고/주문: EmulatedExchange (랜덤 워크 시세 + 가상 계좌 + 매칭)
+
+관리용 엔드포인트 (부하/장애 시나리오용):
+    GET  /emulator/stats            엔드포인트별 호출 수, 제한/인증 오류 수, 체결 통계
+    POST /emulator/price            {"market": "kr", "symbol": "005930", "price": 55000}
+    POST /emulator/expire-tokens    발급된 토큰 모두 만료 처리
+
+사용 예:
+    emulator = KISEmulator(port=0, latency_ms=20, rate_limit=20)
+    emulator.start()
+    # KRConfig.BASE_URL 등을 emulator.base_url로 지정
+    emulator.stop()
+"""
+import json
+import logging
+import random
+import re
+import secrets
+import threading
+import time
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional, Dict, Any, Tuple
+from urllib.parse import urlsplit, parse_qs
+
+from common.rate_limiter import RateLimiter
+from .exchange import EmulatedExchange
+
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+DEFAULT_RATE_LIMIT = 20             # 앱키별 초당 호출 수 (실전 기준, 0이면 제한 없음)
+DEFAULT_TOKEN_TTL = 86400           # 토큰 유효기간 (초)
+DEFAULT_TOKEN_ISSUE_INTERVAL = 60   # 앱키별 토큰 재발급 최소 간격 (초, 0이면 제한 없음)
+DEFAULT_PAGE_SIZE = 20              # 잔고 조회 페이지당 종목 수
+
+# 해외주식 매도 TR_ID (나머지 해외 주문 TR은 매수로 처리)
+US_SELL_TR_IDS = ('TTTT1006U', 'JTTT1006U', 'VTTT1006U', 'VTTT1001U')
+
+# KIS 공통 오류 (msg_cd, msg1, HTTP 상태)
+ERROR_RATE_LIMIT = ('EGW00201', "초당 거래건수를 초과하였습니다.", 500)
+ERROR_INVALID_TOKEN = ('EGW00121', "유효하지 않은 token 입니다.", 500)
+ERROR_EXPIRED_TOKEN = ('EGW00123', "기간이 만료된 token 입니다.", 500)
+ERROR_TOKEN_ISSUE = ('EGW00133', "접근토큰 발급 잠시 후 다시 시도하세요(1분당 1회)", 403)
+
+
+def _num(value: float, market: str) -> str:
+    """KIS 응답 숫자 문자열 (KR 원화 정수, US 소수 4자리)"""
+    if market == 'kr':
+        return str(int(round(value)))
+    return f"{value:.4f}"
+
+
+def _sign(diff: float) -> str:
+    """전일 대비 부호 (2: 상승, 3: 보합, 5: 하락)"""
+    return '2' if diff > 0 else ('5' if diff < 0 else '3')
+
+
+class _RequestHandler(BaseHTTPRequestHandler):
+    """요청을 KISEmulator.handle로 넘기는 핸들러"""
+
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        self.server.emulator.handle(self, 'GET')
+
+    def do_POST(self):
+        self.server.emulator.handle(self, 'POST')
+
+    def log_message(self, format, *args):
+        self.server.emulator.logger.debug(f"[EMU] {self.address_string()} {format % args}")
+
+
+class KISEmulator:
+    """
+    KIS OpenAPI 에뮬레이터 (백그라운드 스레드 HTTP 서버)
+
+    클라이언트는 base URL 설정만 바꾸면 된다:
+        config.py         KIS_BASE_URL / KIS_PAPER_BASE_URL
+        kr/config.py      KRConfig.BASE_URL / PAPER_BASE_URL
+        us/config.py      USConfig.BASE_URL / PAPER_BASE_URL
+    """
+
+    def __init__(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT,
+                 exchange: Optional[EmulatedExchange] = None,
+                 latency_ms: float = 0.0, jitter_ms: float = 0.0,
+                 rate_limit: float = DEFAULT_RATE_LIMIT,
+                 token_ttl: int = DEFAULT_TOKEN_TTL,
+                 token_issue_interval: float = DEFAULT_TOKEN_ISSUE_INTERVAL,
+                 page_size: int = DEFAULT_PAGE_SIZE):
+        """
+        Args:
+            host: 바인드 주소
+            port: 포트 (0이면 빈 포트 자동 선택)
+            exchange: 시세/계좌 엔진 (없으면 기본 설정으로 생성)
+            latency_ms: 응답 기본 지연 (밀리초)
+            jitter_ms: 추가 무작위 지연 상한 (밀리초)
+            rate_limit: 앱키별 초당 허용 호출 수 (0이면 제한 없음)
+            token_ttl: 토큰 유효기간 (초)
+            token_issue_interval: 앱키별 토큰 재발급 최소 간격 (초, 0이면 제한 없음)
+            page_size: 잔고 조회 페이지당 종목 수
+        """
+        self.host = host
+        self.port = port
+        self.exchange = exchange or EmulatedExchange()
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.rate_limit = rate_limit
+        self.token_ttl = token_ttl
+        self.token_issue_interval = token_issue_interval
+        self.page_size = max(1, page_size)
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+        self._lock = threading.Lock()
+        self._tokens: Dict[str, Dict[str, Any]] = {}        # {token: {appkey, expires_at}}
+        self._last_issued: Dict[str, float] = {}            # {appkey: 발급 시각}
+        self._limiters: Dict[str, RateLimiter] = {}
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+        self.routes = {
+            ('POST', '/oauth2/tokenP'): self._issue_token,
+            ('POST', '/uapi/hashkey'): self._hashkey,
+            ('GET', '/uapi/domestic-stock/v1/quotations/inquire-price'): self._domestic_price,
+            ('GET', '/uapi/domestic-stock/v1/quotations/inquire-daily-itemchartprice'): self._domestic_daily_chart,
+            ('GET', '/uapi/domestic-stock/v1/trading/inquire-balance'): self._domestic_balance,
+            ('POST', '/uapi/domestic-stock/v1/trading/order-cash'): self._domestic_order,
+            ('GET', '/uapi/overseas-price/v1/quotations/price'): self._overseas_price,
+            ('GET', '/uapi/overseas-price/v1/quotations/dailyprice'): self._overseas_daily_price,
+            ('GET', '/uapi/overseas-stock/v1/trading/inquire-balance'): self._overseas_balance,
+            ('GET', '/uapi/overseas-stock/v1/trading/inquire-present-balance'): self._overseas_present_balance,
+            ('POST', '/uapi/overseas-stock/v1/trading/order'): self._overseas_order,
+            ('GET', '/uapi/overseas-stock/v1/trading/inquire-period-profit'): self._overseas_period_profit,
+            ('GET', '/emulator/stats'): self._admin_stats,
+            ('POST', '/emulator/price'): self._admin_price,
+            ('POST', '/emulator/expire-tokens'): self._admin_expire_tokens
+        }
+        # 인증/호출 제한을 적용하지 않는 경로
+        self.public_paths = {'/oauth2/tokenP', '/emulator/stats', '/emulator/price', '/emulator/expire-tokens'}
+
+        self.stats = {
+            'requests': 0,
+            'rate_limited': 0,
+            'auth_errors': 0,
+            'tokens_issued': 0,
+            'token_rejects': 0,
+            'not_found': 0,
+            'by_path': {}
+        }
+
+    # ===== 서버 수명 =====
+
+    @property
+    def base_url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    def start(self):
+        """백그라운드 스레드에서 서버 시작"""
+        if self.is_running():
+            return
+        self._server = ThreadingHTTPServer((self.host, self.port), _RequestHandler)
+        self._server.daemon_threads = True
+        self._server.emulator = self
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever, name="KISEmulator", daemon=True)
+        self._thread.start()
+        self.logger.info(f"[EMU] KIS 에뮬레이터 시작: {self.base_url} "
+                         f"(지연 {self.latency_ms:.0f}+{self.jitter_ms:.0f}ms, 초당 제한 {self.rate_limit or '없음'})")
+
+    def stop(self):
+        """서버 종료"""
+        if self._server is None:
+            return
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread:
+            self._thread.join(timeout=5)
+        self._server = None
+        self._thread = None
+        self.logger.info("[EMU] KIS 에뮬레이터 종료")
+
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def serve_forever(self):
+        """포그라운드 실행 (Ctrl+C로 종료)"""
+        self.start()
+        try:
+            while self.is_running():
+                time.sleep(0.5)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.stop()
+
+    # ===== 요청 처리 =====
+
+    def handle(self, handler: BaseHTTPRequestHandler, method: str):
+        """요청 1건 처리: 지연 → 라우팅 → 인증/호출 제한 → 응답"""
+        parts = urlsplit(handler.path)
+        path = re.sub(r'/+', '/', parts.path)     # mojito2는 '//uapi/...' 형식으로 요청하는 경로가 있음
+        params = {key: values[0] for key, values in parse_qs(parts.query, keep_blank_values=True).items()}
+        headers = {key.lower(): value for key, value in handler.headers.items()}
+
+        body = {}
+        length = int(headers.get('content-length') or 0)
+        if length:
+            raw = handler.rfile.read(length)
+            try:
+                body = json.loads(raw.decode('utf-8')) if raw else {}
+            except (ValueError, UnicodeDecodeError):
+                body = {}
+
+        with self._lock:
+            self.stats['requests'] += 1
+            self.stats['by_path'][path] = self.stats['by_path'].get(path, 0) + 1
+
+        if self.latency_ms or self.jitter_ms:
+            time.sleep((self.latency_ms + random.uniform(0, self.jitter_ms)) / 1000)
+
+        route = self.routes.get((method, path))
+        if route is None:
+            with self._lock:
+                self.stats['not_found'] += 1
+            self._send(handler, 404, {'rt_cd': '1', 'msg_cd': 'EMU00404', 'msg1': f"지원하지 않는 API: {method} {path}"})
+            return
+
+        if path not in self.public_paths:
+            error = self._authorize(headers)
+            if error:
+                self._send_error(handler, error)
+                return
+
+        try:
+            status, payload, extra_headers = route(headers, params, body)
+        except Exception as e:
+            self.logger.exception(f"[EMU] {method} {path} 처리 오류")
+            status, payload, extra_headers = 500, {'rt_cd': '1', 'msg_cd': 'EMU00500', 'msg1': str(e)}, {}
+        self._send(handler, status, payload, dict(extra_headers, tr_id=headers.get('tr_id', '')))
+
+    def _send(self, handler: BaseHTTPRequestHandler, status: int, payload: Dict[str, Any],
+              extra_headers: Optional[Dict[str, str]] = None):
+        data = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        handler.send_response(status)
+        handler.send_header('Content-Type', 'application/json; charset=UTF-8')
+        handler.send_header('Content-Length', str(len(data)))
+        for key, value in (extra_headers or {}).items():
+            handler.send_header(key, value)
+        handler.end_headers()
+        handler.wfile.write(data)
+
+    def _send_error(self, handler: BaseHTTPRequestHandler, error: Tuple[str, str, int]):
+        msg_cd, msg1, status = error
+        self._send(handler, status, {'rt_cd': '1', 'msg_cd': msg_cd, 'msg1': msg1})
+
+    def _authorize(self, headers: Dict[str, str]) -> Optional[Tuple[str, str, int]]:
+        """토큰 확인 + 앱키별 초당 호출 제한 (오류 없으면 None)"""
+        token = headers.get('authorization', '')
+        if token.lower().startswith('bearer '):
+            token = token[7:]
+        now = time.time()
+
+        with self._lock:
+            info = self._tokens.get(token.strip())
+            if info is None:
+                self.stats['auth_errors'] += 1
+                return ERROR_INVALID_TOKEN
+            if info['expires_at'] <= now:
+                self.stats['auth_errors'] += 1
+                return ERROR_EXPIRED_TOKEN
+
+            if self.rate_limit > 0:
+                appkey = headers.get('appkey') or info['appkey']
+                limiter = self._limiters.get(appkey)
+                if limiter is None:
+                    burst = max(1, int(self.rate_limit))
+                    limiter = self._limiters[appkey] = RateLimiter(self.rate_limit * 60, burst=burst)
+                if not limiter.try_acquire():
+                    self.stats['rate_limited'] += 1
+                    return ERROR_RATE_LIMIT
+        return None
+
+    @staticmethod
+    def _ok(payload: Dict[str, Any], msg1: str = "정상처리 되었습니다.") -> Dict[str, Any]:
+        return dict({'rt_cd': '0', 'msg_cd': 'MCA00000', 'msg1': msg1}, **payload)
+
+    @staticmethod
+    def _account_no(values: Dict[str, Any]) -> str:
+        return str(values.get('CANO') or '00000000')
+
+    # ===== 토큰 =====
+
+    def _issue_token(self, headers, params, body):
+        appkey = body.get('appkey')
+        if not appkey or not body.get('appsecret') or body.get('grant_type') != 'client_credentials':
+            return 403, {'error_code': 'EGW00103', 'error_description': "유효하지 않은 AppKey입니다."}, {}
+
+        now = time.time()
+        with self._lock:
+            last = self._last_issued.get(appkey)
+            if self.token_issue_interval > 0 and last is not None and now - last < self.token_issue_interval:
+                self.stats['token_rejects'] += 1
+                msg_cd, msg1, status = ERROR_TOKEN_ISSUE
+                return status, {'error_code': msg_cd, 'error_description': msg1}, {}
+            token = f"emu-{secrets.token_hex(24)}"
+            self._tokens[token] = {'appkey': appkey, 'expires_at': now + self.token_ttl}
+            self._last_issued[appkey] = now
+            self.stats['tokens_issued'] += 1
+
+        expired_at = datetime.fromtimestamp(now + self.token_ttl).strftime('%Y-%m-%d %H:%M:%S')
+        return 200, {
+            'access_token': token,
+            'access_token_token_expired': expired_at,
+            'token_type': 'Bearer',
+            'expires_in': self.token_ttl
+        }, {}
+
+    def _hashkey(self, headers, params, body):
+        digest = secrets.token_hex(32)
+        return 200, {'BODY': body, 'HASH': digest}, {}
+
+    # ===== 국내주식 =====
+
+    def _domestic_price(self, headers, params, body):
+        symbol = params.get('FID_INPUT_ISCD', '')
+        q = self.exchange.quote('kr', symbol)
+        diff = q['price'] - q['prev_close']
+        return 200, self._ok({'output': {
+            'stck_prpr': _num(q['price'], 'kr'),
+            'prdy_vrss': _num(diff, 'kr'),
+            'prdy_vrss_sign': _sign(diff),
+            'prdy_ctrt': f"{diff / q['prev_close'] * 100:.2f}",
+            'acml_vol': str(q['volume']),
+            'acml_tr_pbmn': _num(q['volume'] * q['price'], 'kr'),
+            'stck_oprc': _num(q['open'], 'kr'),
+            'stck_hgpr': _num(q['high'], 'kr'),
+            'stck_lwpr': _num(q['low'], 'kr'),
+            'stck_mxpr': _num(q['prev_close'] * 1.3, 'kr'),
+            'stck_llam': _num(q['prev_close'] * 0.7, 'kr'),
+            'stck_sdpr': _num(q['prev_close'], 'kr')
+        }}), {}
+
+    def _domestic_daily_chart(self, headers, params, body):
+        symbol = params.get('FID_INPUT_ISCD', '')
+        start = params.get('FID_INPUT_DATE_1') or '00000000'
+        rows = self.exchange.daily_history('kr', symbol, end=params.get('FID_INPUT_DATE_2') or None)
+        output2 = [{
+            'stck_bsop_date': row['date'].strftime('%Y%m%d'),
+            'stck_clpr': _num(row['close'], 'kr'),
+            'stck_oprc': _num(row['open'], 'kr'),
+            'stck_hgpr': _num(row['high'], 'kr'),
+            'stck_lwpr': _num(row['low'], 'kr'),
+            'acml_vol': str(row['volume']),
+            'acml_tr_pbmn': _num(row['volume'] * row['close'], 'kr')
+        } for row in rows if row['date'].strftime('%Y%m%d') >= start]
+        q = self.exchange.quote('kr', symbol)
+        return 200, self._ok({'output1': {'stck_prpr': _num(q['price'], 'kr'),
+                                          'stck_prdy_clpr': _num(q['prev_close'], 'kr'),
+                                          'stck_shrn_iscd': symbol},
+                              'output2': output2}), {}
+
+    def _domestic_balance(self, headers, params, body):
+        balance = self.exchange.balance('kr', self._account_no(params))
+        offset = int(params.get('CTX_AREA_NK100') or 0)
+        page = balance['positions'][offset:offset + self.page_size]
+        has_more = offset + self.page_size < len(balance['positions'])
+        next_key = str(offset + self.page_size) if has_more else ''
+
+        eval_total = sum(p['eval_amount'] for p in balance['positions'])
+        purchase_total = sum(p['purchase_amount'] for p in balance['positions'])
+        output1 = [{
+            'pdno': p['symbol'],
+            'prdt_name': p['symbol'],
+            'hldg_qty': str(p['quantity']),
+            'ord_psbl_qty': str(p['sellable_qty']),
+            'pchs_avg_pric': f"{p['avg_price']:.4f}",
+            'pchs_amt': _num(p['purchase_amount'], 'kr'),
+            'prpr': _num(p['current_price'], 'kr'),
+            'evlu_amt': _num(p['eval_amount'], 'kr'),
+            'evlu_pfls_amt': _num(p['profit_loss'], 'kr'),
+            'evlu_pfls_rt': f"{p['profit_rate']:.2f}"
+        } for p in page]
+        output2 = [{
+            'dnca_tot_amt': _num(balance['cash'], 'kr'),
+            'prvs_rcdl_excc_amt': _num(balance['available_cash'], 'kr'),
+            'scts_evlu_amt': _num(eval_total, 'kr'),
+            'tot_evlu_amt': _num(balance['cash'] + eval_total, 'kr'),
+            'pchs_amt_smtl_amt': _num(purchase_total, 'kr'),
+            'evlu_amt_smtl_amt': _num(eval_total, 'kr'),
+            'evlu_pfls_smtl_amt': _num(eval_total - purchase_total, 'kr'),
+            'nass_amt': _num(balance['cash'] + eval_total, 'kr')
+        }]
+        # 연속 조회 여부: 실서버는 응답 헤더 tr_cont, 이 프로젝트 클라이언트는 본문 tr_cont를 읽으므로 둘 다 제공
+        tr_cont = 'M' if has_more else 'D'
+        return 200, self._ok({
+            'tr_cont': tr_cont,
+            'ctx_area_fk100': params.get('CTX_AREA_FK100', ''),
+            'ctx_area_nk100': next_key,
+            'output1': output1,
+            'output2': output2
+        }), {'tr_cont': tr_cont}
+
+    def _domestic_order(self, headers, params, body):
+        tr_id = headers.get('tr_id', '')
+        side = 'sell' if tr_id.endswith(('0011U', '0801U')) else 'buy'
+        ord_dvsn = body.get('ORD_DVSN', '00')
+        price = float(body.get('ORD_UNPR') or 0) if ord_dvsn == '00' else None
+        result = self.exchange.submit_order('kr', self._account_no(body), body.get('PDNO', ''), side,
+                                            int(body.get('ORD_QTY') or 0), price)
+        return self._order_response(result)
+
+    def _order_response(self, result: Dict[str, Any]):
+        if not result['success']:
+            return 200, {'rt_cd': '1', 'msg_cd': 'EMU00001', 'msg1': result['message']}, {}
+        return 200, self._ok({'output': {
+            'KRX_FWDG_ORD_ORGNO': '00950',
+            'ODNO': result['order_id'],
+            'ORD_TMD': datetime.now().strftime('%H%M%S')
+        }}, msg1=result['message']), {}
+
+    # ===== 해외주식 =====
+
+    def _overseas_price(self, headers, params, body):
+        symbol = params.get('SYMB', '')
+        excd = params.get('EXCD', 'NAS')
+        if not self.exchange.listed_on(symbol, excd):
+            # 실서버는 다른 거래소 종목 조회 시 정상 응답 + 빈 시세
+            return 200, self._ok({'output': {'rsym': f"D{excd}{symbol}", 'zdiv': '', 'base': '', 'pvol': '',
+                                             'last': '', 'sign': '', 'diff': '', 'rate': '', 'tvol': '',
+                                             'tamt': '', 'ordy': ''}}), {}
+        q = self.exchange.quote('us', symbol)
+        diff = q['price'] - q['prev_close']
+        return 200, self._ok({'output': {
+            'rsym': f"D{excd}{symbol}",
+            'zdiv': '4',
+            'base': _num(q['prev_close'], 'us'),
+            'pvol': '0',
+            'last': _num(q['price'], 'us'),
+            'sign': _sign(diff),
+            'diff': _num(abs(diff), 'us'),
+            'rate': f"{diff / q['prev_close'] * 100:.2f}",
+            'tvol': str(q['volume']),
+            'tamt': _num(q['volume'] * q['price'], 'us'),
+            'ordy': '매수가능'
+        }}), {}
+
+    def _overseas_daily_price(self, headers, params, body):
+        symbol = params.get('SYMB', '')
+        excd = params.get('EXCD', 'NAS')
+        if not self.exchange.listed_on(symbol, excd):
+            return 200, self._ok({'output1': {'rsym': f"D{excd}{symbol}", 'zdiv': '', 'nrec': '0'},
+                                  'output2': []}), {}
+        rows = self.exchange.daily_history('us', symbol, end=params.get('BYMD') or None)
+        output2 = []
+        for row, prev in zip(rows, rows[1:] + [None]):
+            diff = row['close'] - prev['close'] if prev else 0.0
+            output2.append({
+                'xymd': row['date'].strftime('%Y%m%d'),
+                'clos': _num(row['close'], 'us'),
+                'sign': _sign(diff),
+                'diff': _num(abs(diff), 'us'),
+                'rate': f"{diff / prev['close'] * 100:.2f}" if prev else '0.00',
+                'open': _num(row['open'], 'us'),
+                'high': _num(row['high'], 'us'),
+                'low': _num(row['low'], 'us'),
+                'tvol': str(row['volume']),
+                'tamt': _num(row['volume'] * row['close'], 'us')
+            })
+        return 200, self._ok({'output1': {'rsym': f"D{excd}{symbol}", 'zdiv': '4', 'nrec': str(len(output2))},
+                              'output2': output2}), {}
+
+    def _us_position_item(self, p: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            'ovrs_pdno': p['symbol'],
+            'ovrs_item_name': p['symbol'],
+            'ovrs_cblc_qty': str(p['quantity']),
+            'ord_psbl_qty': str(p['sellable_qty']),
+            'pchs_avg_pric': _num(p['avg_price'], 'us'),
+            'frcr_pchs_amt1': _num(p['purchase_amount'], 'us'),
+            'ovrs_stck_evlu_amt': _num(p['eval_amount'], 'us'),
+            'frcr_evlu_pfls_amt': _num(p['profit_loss'], 'us'),
+            'evlu_pfls_rt': f"{p['profit_rate']:.2f}",
+            'now_pric2': _num(p['current_price'], 'us'),
+            'ovrs_excg_cd': 'NASD',
+            'tr_crcy_cd': 'USD'
+        }
+
+    def _overseas_balance(self, headers, params, body):
+        balance = self.exchange.balance('us', self._account_no(params))
+        positions = balance['positions']
+        excg = params.get('OVRS_EXCG_CD', '')
+        if excg and excg != 'NASD':       # NASD는 미국 전체
+            positions = [p for p in positions if self.exchange.listed_on(p['symbol'], excg)]
+
+        offset = int(params.get('CTX_AREA_NK200') or 0)
+        page = positions[offset:offset + self.page_size]
+        has_more = offset + self.page_size < len(positions)
+        eval_total = sum(p['eval_amount'] for p in positions)
+        purchase_total = sum(p['purchase_amount'] for p in positions)
+        tr_cont = 'M' if has_more else 'D'
+        return 200, self._ok({
+            'tr_cont': tr_cont,
+            'ctx_area_fk200': params.get('CTX_AREA_FK200', ''),
+            'ctx_area_nk200': str(offset + self.page_size) if has_more else '',
+            'output1': [self._us_position_item(p) for p in page],
+            # 이 프로젝트 클라이언트는 output2[0]['frcr_drwg_psbl_amt_1']에서 예수금을 읽음
+            'output2': [{
+                'frcr_pchs_amt1': _num(purchase_total, 'us'),
+                'tot_evlu_pfls_amt': _num(eval_total - purchase_total, 'us'),
+                'tot_pftrt': f"{(eval_total - purchase_total) / purchase_total * 100 if purchase_total else 0:.2f}",
+                'frcr_drwg_psbl_amt_1': _num(balance['available_cash'], 'us')
+            }]
+        }), {'tr_cont': tr_cont}
+
+    def _overseas_present_balance(self, headers, params, body):
+        balance = self.exchange.balance('us', self._account_no(params))
+        eval_total = sum(p['eval_amount'] for p in balance['positions'])
+        purchase_total = sum(p['purchase_amount'] for p in balance['positions'])
+        return 200, self._ok({
+            'output1': [{
+                'ovrs_pdno': p['symbol'],
+                'prdt_name': p['symbol'],
+                'cblc_qty13': str(p['quantity']),
+                'ord_psbl_qty1': str(p['sellable_qty']),
+                'avg_unpr3': _num(p['avg_price'], 'us'),
+                'frcr_pchs_amt': _num(p['purchase_amount'], 'us'),
+                'frcr_evlu_amt2': _num(p['eval_amount'], 'us'),
+                'evlu_pfls_amt2': _num(p['profit_loss'], 'us'),
+                'evlu_pfls_rt1': f"{p['profit_rate']:.2f}",
+                'ovrs_now_pric1': _num(p['current_price'], 'us')
+            } for p in balance['positions']],
+            'output2': [{
+                'crcy_cd': 'USD',
+                'frcr_dncl_amt_2': _num(balance['cash'], 'us'),
+                'frcr_drwg_psbl_amt_1': _num(balance['available_cash'], 'us')
+            }],
+            'output3': {
+                'pchs_amt_smtl': _num(purchase_total, 'us'),
+                'evlu_amt_smtl': _num(eval_total, 'us'),
+                'tot_evlu_pfls_amt': _num(eval_total - purchase_total, 'us'),
+                'tot_frcr_cblc_smtl': _num(balance['cash'], 'us'),
+                'ustl_buy_amt_smtl': _num(balance['cash'] - balance['available_cash'], 'us')
+            }
+        }), {}
+
+    def _overseas_order(self, headers, params, body):
+        symbol = body.get('PDNO', '')
+        excg = body.get('OVRS_EXCG_CD', 'NASD')
+        if not self.exchange.listed_on(symbol, excg):
+            return 200, {'rt_cd': '1', 'msg_cd': 'EMU00002', 'msg1': f"해당 거래소 종목이 아닙니다: {excg} {symbol}"}, {}
+        side = 'sell' if headers.get('tr_id', '') in US_SELL_TR_IDS else 'buy'
+        price = float(body.get('OVRS_ORD_UNPR') or 0) or None
+        result = self.exchange.submit_order('us', self._account_no(body), symbol, side,
+                                            int(body.get('ORD_QTY') or 0), price)
+        return self._order_response(result)
+
+    def _overseas_period_profit(self, headers, params, body):
+        records = self.exchange.realized('us', self._account_no(params),
+                                         params.get('INQR_STRT_DT'), params.get('INQR_END_DT'))
+        # (날짜, 종목)별 합산
+        grouped: Dict[Tuple[str, str], Dict[str, float]] = {}
+        for r in records:
+            g = grouped.setdefault((r['date'], r['symbol']), {'qty': 0, 'buy': 0.0, 'sell': 0.0, 'fee': 0.0,
+                                                             'pnl': 0.0})
+            g['qty'] += r['quantity']
+            g['buy'] += r['avg_price'] * r['quantity']
+            g['sell'] += r['price'] * r['quantity']
+            g['fee'] += r['fee']
+            g['pnl'] += r['pnl']
+
+        output1 = [{
+            'trad_day': day,
+            'ovrs_pdno': symbol,
+            'ovrs_item_name': symbol,
+            'slcl_qty': str(g['qty']),
+            'pchs_avg_pric': _num(g['buy'] / g['qty'], 'us'),
+            'frcr_pchs_amt1': _num(g['buy'], 'us'),
+            'avg_sll_unpr': _num(g['sell'] / g['qty'], 'us'),
+            'frcr_sll_amt_smtl1': _num(g['sell'], 'us'),
+            'stck_sll_tlex': _num(g['fee'], 'us'),
+            'ovrs_rlzt_pfls_amt': _num(g['pnl'], 'us'),
+            'pftrt': f"{g['pnl'] / g['buy'] * 100 if g['buy'] else 0:.4f}",
+            'ovrs_excg_cd': 'NASD'
+        } for (day, symbol), g in sorted(grouped.items())]
+
+        total_pnl = sum(g['pnl'] for g in grouped.values())
+        total_buy = sum(g['buy'] for g in grouped.values())
+        return 200, self._ok({
+            'output1': output1,
+            'output2': {
+                'stck_sll_amt_smtl': _num(sum(g['sell'] for g in grouped.values()), 'us'),
+                'stck_buy_amt_smtl': _num(total_buy, 'us'),
+                'smtl_fee1': _num(sum(g['fee'] for g in grouped.values()), 'us'),
+                'ovrs_rlzt_pfls_tot_amt': _num(total_pnl, 'us'),
+                'ovrs_rlzt_pfls_smtl_amt': _num(total_pnl, 'us'),
+                'tot_pftrt': f"{total_pnl / total_buy * 100 if total_buy else 0:.4f}"
+            }
+        }), {}
+
+    # ===== 관리용 =====
+
+    def _admin_stats(self, headers, params, body):
+        return 200, self.get_stats(), {}
+
+    def _admin_price(self, headers, params, body):
+        quote = self.exchange.set_price(body.get('market', 'kr'), str(body['symbol']), float(body['price']))
+        return 200, self._ok({'output': quote}), {}
+
+    def _admin_expire_tokens(self, headers, params, body):
+        with self._lock:
+            for info in self._tokens.values():
+                info['expires_at'] = 0
+            count = len(self._tokens)
+        self.logger.info(f"[EMU] 토큰 {count}개 만료 처리")
+        return 200, self._ok({'expired': count}), {}
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self.stats, by_path=dict(self.stats['by_path']))
+        stats['exchange'] = self.exchange.get_stats()
+        return stats
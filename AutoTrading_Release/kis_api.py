@@ -5,11 +5,14 @@
 import logging
 import time
 import requests
-from datetime import datetime, time as dt_time
+from datetime import datetime, timedelta, time as dt_time
 import pytz
 from config import USE_PAPER_TRADING, KIS_ACCOUNT_NUMBER, LOG_LEVEL, LOG_FILE, KIS_BASE_URL, KIS_PAPER_BASE_URL, KIS_APP_KEY, KIS_APP_SECRET, TRADING_START_TIME, TRADING_END_TIME
 from token_manager import TokenManager
 from currency_utils import format_usd_krw
+from common.quote_fallback import BulkQuoteFallback
+from common.bar_store import parse_daily_rows
+from common.market_calendar import get_calendar
 
 try:
     import mojito
@@ -37,12 +40,22 @@ class KISAPIClient:
         self.et_tz = pytz.timezone('US/Eastern')
         self.start_time = dt_time.fromisoformat(TRADING_START_TIME)
         self.end_time = dt_time.fromisoformat(TRADING_END_TIME)
+        self.calendar = get_calendar('us', (TRADING_START_TIME, TRADING_END_TIME))
 
         # 캐시 시스템 추가 (거래소 자동 감지 및 성능 최적화)
         self.exchange_cache = {}  # {symbol: "NAS" or "NYS" or "AMS"}
         self.price_cache = {}     # {symbol: (price, timestamp)}
         self.cache_timeout = 60   # 60초
 
+        # 로컬 일봉 저장소 (common.bar_store.BarStore, 지정 시 전일 종가를 네트워크 없이 조회)
+        self.bar_store = None
+
+        # yfinance 일괄 폴백 (KIS 실패 시 조회된 종목 전체를 한 번에 받아 가격 캐시에 채움)
+        self.quote_fallback = BulkQuoteFallback(
+            timezone='US/Eastern',
+            on_quote=lambda symbol, price: self.price_cache.__setitem__(symbol, (price, time.time()))
+        )
+
         # mojito2 클라이언트 초기화
         if MOJITO_AVAILABLE:
             self._init_mojito_client()
@@ -51,17 +64,9 @@ class KISAPIClient:
             self.broker = None
     
     def is_market_open(self):
-        """현재 시장이 열려있는지 확인 (US Eastern Time 기준)"""
+        """현재 시장이 열려있는지 확인 (US Eastern Time 기준, NYSE 휴장일/조기 폐장 반영)"""
         try:
-            et_now = datetime.now(self.et_tz)
-            current_time = et_now.time()
-
-            # 주말 체크 (토요일=5, 일요일=6)
-            if et_now.weekday() >= 5:
-                return False
-
-            # 시장 시간 체크 (09:30-16:00 ET)
-            return self.start_time <= current_time <= self.end_time
+            return self.calendar.is_open()
 
         except Exception as e:
             self.logger.error(f"시장 시간 확인 오류: {e}")
@@ -121,6 +126,10 @@ class KISAPIClient:
                 mock=USE_PAPER_TRADING
             )
 
+            # mojito2는 실전/모의 URL을 고정 사용하므로 설정 URL로 맞춤 (로컬 에뮬레이터 지원)
+            for broker in (self.nasdaq_broker, self.nyse_broker):
+                broker.base_url = KIS_PAPER_BASE_URL if USE_PAPER_TRADING else KIS_BASE_URL
+
             # 기본 브로커는 나스닥 (호환성)
             self.broker = self.nasdaq_broker
 
@@ -265,6 +274,9 @@ class KISAPIClient:
         """
         yfinance로 현재가 직접 조회 (최종 대체 수단)
 
+        조회된 종목 중 폴백 시세가 만료된 종목 전체를 다중 종목 요청 1회로 받아
+        가격 캐시에 함께 채운다 (BulkQuoteFallback).
+
         Args:
             symbol (str): 종목 코드
 
@@ -272,26 +284,16 @@ class KISAPIClient:
             float: 현재가 (실패 시 None)
         """
         try:
-            import yfinance as yf
-
-            ticker = yf.Ticker(symbol)
-            hist = ticker.history(period="1d")
+            quote = self.quote_fallback.get_quote(symbol)
 
-            if not hist.empty:
-                price = hist['Close'].iloc[-1]
-                if price > 0:
-                    self.logger.info(f"[OK] {symbol} 현재가: ${price:.2f} (yfinance)")
-                    return float(price)
-                else:
-                    self.logger.warning(f"[WARN] {symbol} yfinance 가격이 0 이하: {price}")
-                    return None
+            if quote:
+                price = quote['price']
+                self.logger.info(f"[OK] {symbol} 현재가: ${price:.2f} (yfinance)")
+                return price
             else:
-                self.logger.warning(f"[WARN] {symbol} yfinance 히스토리 데이터 없음 (빈 DataFrame)")
+                self.logger.warning(f"[WARN] {symbol} yfinance 시세 없음 (일괄 다운로드 실패 또는 데이터 없음)")
                 return None
 
-        except ImportError:
-            self.logger.error("yfinance 모듈이 설치되지 않았습니다 - pip install yfinance 실행 필요")
-            return None
         except Exception as e:
             self.logger.error(f"[ERROR] {symbol} yfinance 조회 실패: {type(e).__name__}: {str(e)}")
             return None
@@ -384,6 +386,7 @@ class KISAPIClient:
                 exchange="나스닥",
                 mock=USE_PAPER_TRADING
             )
+            self.broker.base_url = KIS_PAPER_BASE_URL if USE_PAPER_TRADING else KIS_BASE_URL
             
             # 수동으로 토큰 설정
             if hasattr(self.broker, '_token'):
@@ -684,6 +687,8 @@ class KISAPIClient:
             symbol (str): 종목 코드
             retry_count (int): 재시도 횟수 (내부용, 최대 1회)
         """
+        self.quote_fallback.track([symbol])
+
         # 시장 시간 체크를 경고로만 변경 (yfinance fallback 허용)
         if not self.is_market_open():
             self.logger.warning(f"{symbol} 현재가 조회: 시장 폐장 중, yfinance로 최신 종가 조회 시도")
@@ -1033,10 +1038,54 @@ class KISAPIClient:
             self.logger.exception("직접 API 호출 실패")
             return None
     
+    def fetch_daily_bars(self, symbol, start, end):
+        """
+        기간 일봉 조회 (BarStore 갱신용, 종료일을 당기며 100건씩 반복)
+
+        Returns:
+            [(YYYYMMDD, open, high, low, close, volume), ...] 날짜 오름차순 (실패 시 None)
+        """
+        broker, _ = self._get_broker_for_symbol(symbol)
+        if not broker:
+            return None
+
+        start_int = int(start.strftime('%Y%m%d'))
+        end_int = int(end.strftime('%Y%m%d'))
+        end_day = end.strftime('%Y%m%d')
+        bars = {}
+        try:
+            while int(end_day) >= start_int:
+                daily_data = broker.fetch_ohlcv_overesea(symbol, end_day=end_day)
+                if not daily_data or daily_data.get('rt_cd') != '0':
+                    return None
+                rows = parse_daily_rows(daily_data.get('output2'))
+                for row in rows:
+                    bars[row[0]] = row
+                oldest = min((row[0] for row in rows), default=None)
+                if oldest is None or oldest <= start_int:
+                    break
+                end_day = (datetime.strptime(str(oldest), '%Y%m%d') - timedelta(days=1)).strftime('%Y%m%d')
+                time.sleep(0.1)  # Rate limiting
+        except Exception as e:
+            self.logger.error(f"{symbol} 일봉 조회 오류: {e}")
+            return None
+
+        return [bars[day] for day in sorted(bars) if start_int <= day <= end_int]
+
     def get_previous_close(self, symbol):
         """
         전일 종가 조회 (자동 거래소 감지)
+
+        bar_store가 지정되어 있으면 당일 갱신된 로컬 일봉을 먼저 읽고,
+        API로 받은 일별 시세는 저장소에 이어 붙인다.
         """
+        today = datetime.now(self.et_tz).date()
+        if self.bar_store is not None:
+            prev_close = self.bar_store.previous_close('us', symbol, today)
+            if prev_close is not None:
+                self.logger.debug(f"{symbol} 전일 종가: ${prev_close:.2f} (로컬 일봉)")
+                return prev_close
+
         # 시장 시간 체크를 경고로만 변경 (장 시작 전에도 전일 종가는 조회 가능)
         if not self.is_market_open():
             self.logger.warning(f"{symbol} 전일 종가 조회: 시장 폐장 중이나 API 조회 시도")
@@ -1057,6 +1106,12 @@ class KISAPIClient:
             
             if daily_data and daily_data.get('rt_cd') == '0':
                 output2 = daily_data.get('output2', [])
+
+                if self.bar_store is not None:
+                    try:
+                        self.bar_store.absorb('us', symbol, parse_daily_rows(output2), today)
+                    except Exception as e:
+                        self.logger.warning(f"{symbol} 일봉 저장 실패: {e}")
                 
                 # output2에서 전일 데이터 찾기
                 if output2 and len(output2) >= 2:
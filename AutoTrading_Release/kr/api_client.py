@@ -4,7 +4,8 @@
 import os
 import sys
 import logging
-import requests
+import time
+from datetime import date, datetime, timedelta
 from typing import Optional, Dict, Any, List
 
 # 프로젝트 루트를 경로에 추가
@@ -13,6 +14,8 @@ if project_root not in sys.path:
     sys.path.insert(0, project_root)
 
 from common.base_api import BaseAPIClient
+from common import http
+from common.bar_store import parse_daily_rows, KIS_DOMESTIC_DAILY_FIELDS
 from kr.config import KRConfig
 from kr.token_manager import KRTokenManager
 
@@ -108,7 +111,7 @@ class KRAPIClient(BaseAPIClient):
                     "CTX_AREA_NK100": ctx_area_nk100
                 }
 
-                response = requests.get(url, headers=headers, params=params, timeout=10)
+                response = http.get(url, headers=headers, params=params, timeout=10)
                 response.raise_for_status()
                 balance = response.json()
 
@@ -220,7 +223,7 @@ class KRAPIClient(BaseAPIClient):
                 "FID_INPUT_ISCD": symbol
             }
 
-            response = requests.get(url, headers=headers, params=params, timeout=10)
+            response = http.get(url, headers=headers, params=params, timeout=10)
             response.raise_for_status()
             result = response.json()
 
@@ -230,6 +233,7 @@ class KRAPIClient(BaseAPIClient):
 
                 if price > 0:
                     self.logger.debug(f"{symbol} 현재가: {price:,.0f}원")
+                    self._notify_price(symbol, price, self._safe_float(output.get('acml_vol')))  # 누적 거래량
                     return price
 
             return None
@@ -263,7 +267,7 @@ class KRAPIClient(BaseAPIClient):
                 "FID_INPUT_ISCD": symbol
             }
 
-            response = requests.get(url, headers=headers, params=params, timeout=10)
+            response = http.get(url, headers=headers, params=params, timeout=10)
             response.raise_for_status()
             result = response.json()
 
@@ -280,6 +284,76 @@ class KRAPIClient(BaseAPIClient):
             self.logger.error(f"{symbol} 전일 종가 조회 오류: {e}")
             return None
 
+    def fetch_daily_bars(self, symbol: str, start: date, end: date) -> Optional[List[tuple]]:
+        """
+        기간 일봉 조회 (BarStore 갱신용)
+
+        한국 주식용 TR: FHKST03010100 (국내주식기간별시세, 호출당 최대 100건 → 종료일을 당기며 반복)
+
+        Args:
+            symbol: 종목 코드
+            start: 시작 날짜 (포함)
+            end: 종료 날짜 (포함)
+
+        Returns:
+            [(YYYYMMDD, open, high, low, close, volume), ...] 날짜 오름차순 (실패 시 None)
+        """
+        try:
+            access_token = self.token_manager.get_valid_token()
+            if not access_token:
+                return None
+
+            app_key, app_secret, _ = KRConfig.get_credentials()
+            base_url = KRConfig.get_api_url()
+            url = f"{base_url}/uapi/domestic-stock/v1/quotations/inquire-daily-itemchartprice"
+
+            headers = {
+                "content-type": "application/json",
+                "authorization": f"Bearer {access_token}",
+                "appkey": app_key,
+                "appsecret": app_secret,
+                "tr_id": "FHKST03010100",
+                "custtype": "P"
+            }
+
+            start_str = start.strftime('%Y%m%d')
+            end_str = end.strftime('%Y%m%d')
+            bars = {}
+            while end_str >= start_str:
+                params = {
+                    "FID_COND_MRKT_DIV_CODE": "J",
+                    "FID_INPUT_ISCD": symbol,
+                    "FID_INPUT_DATE_1": start_str,
+                    "FID_INPUT_DATE_2": end_str,
+                    "FID_PERIOD_DIV_CODE": "D",  # 일봉
+                    "FID_ORG_ADJ_PRC": "0"       # 수정주가
+                }
+
+                response = http.get(url, headers=headers, params=params, timeout=10)
+                response.raise_for_status()
+                result = response.json()
+
+                if not result or result.get('rt_cd') != '0':
+                    self.logger.warning(f"{symbol} 일봉 조회 실패: {result.get('msg1') if result else 'API 응답 없음'}")
+                    return None
+
+                rows = parse_daily_rows(result.get('output2'), KIS_DOMESTIC_DAILY_FIELDS)
+                for row in rows:
+                    bars[row[0]] = row
+
+                oldest = min((row[0] for row in rows), default=None)
+                if oldest is None or oldest <= int(start_str):
+                    break
+                # 가장 오래된 날짜 전날까지 다시 조회
+                end_str = (datetime.strptime(str(oldest), '%Y%m%d') - timedelta(days=1)).strftime('%Y%m%d')
+                time.sleep(0.1)  # Rate limiting
+
+            return [bars[day] for day in sorted(bars) if int(start_str) <= day <= int(end.strftime('%Y%m%d'))]
+
+        except Exception as e:
+            self.logger.error(f"{symbol} 일봉 조회 오류: {e}")
+            return None
+
     def place_order(self, symbol: str, side: str, quantity: int,
                     price: Optional[float] = None) -> Dict[str, Any]:
         """
@@ -347,7 +421,7 @@ class KRAPIClient(BaseAPIClient):
             self.logger.info(f"수량: {quantity}주")
             self.logger.info(f"가격: {'시장가' if price is None else f'{price:,.0f}원'}")
 
-            response = requests.post(url, headers=headers, json=data, timeout=10)
+            response = http.post(url, headers=headers, json=data, timeout=10)
             response.raise_for_status()
             result = response.json()
 
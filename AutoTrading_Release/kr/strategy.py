@@ -13,6 +13,7 @@ if project_root not in sys.path:
     sys.path.insert(0, project_root)
 
 from common.base_strategy import BaseStrategy
+from common.price_trigger import PriceTrigger, BELOW
 from kr.config import KRConfig
 from kr.api_client import KRAPIClient
 from transaction_logger import TransactionLogger
@@ -33,13 +34,18 @@ class KRStrategy(BaseStrategy):
     def __init__(self, api_client: KRAPIClient = None,
                  profit_threshold: float = None,
                  enable_filter_check: bool = True,
-                 check_previous_sell_price: bool = True):
+                 check_previous_sell_price: bool = True,
+                 stocks_config_file: str = None,
+                 state_dir: str = None):
         """
         Args:
             api_client: 한국 주식 API 클라이언트 (없으면 자동 생성)
             profit_threshold: 목표 수익률 (없으면 config에서 로드)
             enable_filter_check: 필터 체크 활성화 여부
             check_previous_sell_price: 이전 매도가 체크 여부
+            stocks_config_file: 종목 설정 파일 (없으면 KRConfig.STOCKS_CONFIG_FILE)
+            state_dir: 상태 파일(거래 기록/손절 블랙리스트/매도가/트레일링 최고가) 디렉토리
+                       (없으면 현재 디렉토리, 백테스트는 결과 디렉토리를 지정해 실거래 상태와 분리)
         """
         if api_client is None:
             api_client = KRAPIClient()
@@ -56,27 +62,34 @@ class KRStrategy(BaseStrategy):
             check_previous_sell_price
         )
 
-        self.transaction_logger = TransactionLogger(prefix="kr")
+        self.state_dir = state_dir
+        self.transaction_logger = TransactionLogger(csv_dir=self._state_path("transaction_logs"), prefix="kr")
         self._filter_stocks = {}
         self._watch_list = []
+        self.stocks_config_file = stocks_config_file or KRConfig.STOCKS_CONFIG_FILE
         self._sectors = None  # 섹터 구조 (있을 경우)
 
         # StopLossTracker 초기화
         from stop_loss_tracker import StopLossTracker
         self.stop_loss_tracker = StopLossTracker(
-            blacklist_file="kr_stop_loss_blacklist.json",
+            blacklist_file=self._state_path("kr_stop_loss_blacklist.json"),
             cooldown_days=KRConfig.STOP_LOSS_COOLDOWN_DAYS,
             timezone=KRConfig.TIMEZONE,
             transaction_logger=self.transaction_logger
         )
 
+        # 마지막 매도가 영구 저장소 (프로세스 내 전략 간 공유)
+        from sell_price_store import get_sell_price_store
+        self.sell_price_store = get_sell_price_store(self._state_path("kr_last_sell_prices.json"), "kr",
+                                                     KRConfig.TIMEZONE)
+
         # 설정 파일 로드
         self._load_stock_config()
 
     def _load_stock_config(self):
         """종목 설정 파일 로드 (섹터 구조 및 기존 구조 모두 지원)"""
         try:
-            config_file = KRConfig.STOCKS_CONFIG_FILE
+            config_file = self.stocks_config_file
 
             if not os.path.exists(config_file):
                 self.logger.warning(f"설정 파일 없음: {config_file}")
@@ -109,6 +122,20 @@ class KRStrategy(BaseStrategy):
 
                 self.logger.info(f"KR 설정 로드 (레거시 모드): filter={len(self._filter_stocks)}종목, watch={len(self._watch_list)}종목")
 
+            # 조건식 (매수 게이트 / 매수 후보 조건)
+            self._load_conditions(config)
+
+            # 재매수 방지 매도가 만료 기간 (일, 없으면 만료 없음)
+            self.sell_price_expiry_days = config.get('sell_price_expiry_days')
+            if self.sell_price_expiry_days is not None and self.sell_price_store is not None:
+                purged = self.sell_price_store.purge_expired(self.sell_price_expiry_days)
+                if purged:
+                    self.logger.info(f"만료된 매도가 기록 {purged}종목 정리 ({self.sell_price_expiry_days}일 경과)")
+
+            # 트레일링 스탑 (시장 기본값 + 섹터별 설정)
+            state_file = self._trailing_state_file("kr_trailing_stop.json", KRConfig.STOCKS_CONFIG_FILE)
+            self._setup_trailing_stop(config, state_file, KRConfig.TIMEZONE)
+
         except Exception as e:
             self.logger.error(f"설정 파일 로드 실패: {e}")
 
@@ -204,8 +231,10 @@ class KRStrategy(BaseStrategy):
                 self.logger.debug(f"종목 {symbol} 하락률 계산 오류: {e}")
                 continue
 
-        # 하락률 내림차순 정렬 후 상위 N개 반환
+        # 매수 조건식 적용 후 하락률 내림차순 정렬, 상위 N개 반환
+        declining_stocks = self.apply_buy_condition(declining_stocks)
         declining_stocks.sort(key=lambda x: x['decline_rate'], reverse=True)
+        self._report_ranking_signals(declining_stocks, count)
         return declining_stocks[:count]
 
     def should_buy(self, symbol: str) -> bool:
@@ -249,6 +278,18 @@ class KRStrategy(BaseStrategy):
 
         return False
 
+    def get_exit_triggers(self, position: Dict[str, Any]) -> List[PriceTrigger]:
+        """
+        청산 가격선 (should_sell과 동일 조건)
+        1. 익절: avg_price * (1 + profit_threshold) 이상
+        2. 손절: avg_price * (1 + KRConfig.STOP_LOSS_THRESHOLD) 이하
+        """
+        triggers = super().get_exit_triggers(position)
+        if triggers:
+            triggers.append(PriceTrigger(position['avg_price'] * (1 + KRConfig.STOP_LOSS_THRESHOLD),
+                                         BELOW, 'stop_loss'))
+        return triggers
+
     def execute_buy_strategy(self) -> Dict[str, Any]:
         """매수 전략 실행"""
         try:
@@ -311,6 +352,7 @@ class KRStrategy(BaseStrategy):
 
                     # 사용 가능 금액 업데이트
                     available_cash -= (quantity * current_price)
+                    self.invalidate_balance_snapshot()
 
                     # 트랜잭션 로그
                     self.transaction_logger.log_buy_order(
@@ -344,14 +386,15 @@ class KRStrategy(BaseStrategy):
             self.logger.info("=== 한국 주식 매도 전략 실행 ===")
             self.stats['sell_attempts'] += 1
 
-            # 잔고 조회
-            balance = self.api_client.get_account_balance()
+            # 잔고 조회 (포지션 감시용 스냅샷 갱신 겸용)
+            balance = self.refresh_balance_snapshot()
             if not balance:
                 return {'executed': False, 'orders': [], 'message': '잔고 조회 실패'}
 
             positions = balance.get('positions', [])
             if not positions:
                 return {'executed': False, 'orders': [], 'message': '보유 종목 없음'}
+            snapshot_time = self.get_balance_snapshot_time()
 
             # 수익률 순으로 정렬 (높은 것부터)
             positions.sort(key=lambda x: x.get('profit_rate', 0), reverse=True)
@@ -362,58 +405,17 @@ class KRStrategy(BaseStrategy):
                 symbol = pos['symbol']
                 profit_rate = pos.get('profit_rate', 0) / 100  # 퍼센트 → 소수
 
-                # 매도 조건 확인
-                if not self.should_sell(symbol, profit_rate):
-                    continue
-
-                quantity = pos.get('sellable_qty', 0)
-                if quantity <= 0:
+                # 매도 조건 확인 (고정 익절/손절 → 트레일링 스탑)
+                if self.should_sell(symbol, profit_rate):
+                    reason = None
+                elif self.check_trailing_stop(pos):
+                    reason = 'trailing_stop'
+                else:
                     continue
 
-                current_price = pos.get('current_price', 0)
-
-                # 주문 실행
-                result = self.api_client.place_order(symbol, 'sell', quantity)
-
-                if result['success']:
-                    self.stats['sell_successes'] += 1
-
-                    # 손절 여부 확인
-                    is_stop_loss = profit_rate <= KRConfig.STOP_LOSS_THRESHOLD
-
-                    if is_stop_loss:
-                        # 손절 블랙리스트 추가
-                        self.stop_loss_tracker.add_stop_loss(
-                            symbol=symbol,
-                            avg_price=pos.get('avg_price', 0),
-                            loss_price=current_price,
-                            loss_rate=profit_rate
-                        )
-                        notes = f"stop_loss_triggered ({profit_rate*100:.2f}%) (주문번호: {result['order_id']})"
-                    else:
-                        # 익절 기록
-                        self.record_sell_price(symbol, current_price)
-                        notes = f"profit_target_reached ({profit_rate*100:.2f}%) (주문번호: {result['order_id']})"
-
-                    executed_orders.append({
-                        'symbol': symbol,
-                        'quantity': quantity,
-                        'price': current_price,
-                        'profit_rate': profit_rate,
-                        'order_id': result['order_id']
-                    })
-
-                    # 트랜잭션 로그 (손절/익절 구분)
-                    self.transaction_logger.log_sell_order(
-                        symbol=symbol,
-                        quantity=quantity,
-                        price=current_price,
-                        profit_loss=pos.get('profit_loss', 0),
-                        profit_rate=profit_rate,
-                        order_type="market",
-                        status="filled",
-                        notes=notes
-                    )
+                order = self.sell_position(pos, profit_rate, reason=reason, as_of=snapshot_time)
+                if order:
+                    executed_orders.append(order)
 
             return {
                 'executed': len(executed_orders) > 0,
@@ -424,3 +426,77 @@ class KRStrategy(BaseStrategy):
         except Exception as e:
             self.logger.error(f"매도 전략 실행 오류: {e}")
             return {'executed': False, 'orders': [], 'message': str(e)}
+
+    def sell_position(self, position: Dict[str, Any], profit_rate: float,
+                      reason: str = None, as_of: float = None) -> Optional[Dict[str, Any]]:
+        """
+        단일 보유 종목 매도 (손절 시 블랙리스트 등록, 익절 시 매도가 기록)
+
+        Args:
+            position: 보유 종목 정보 (symbol, sellable_qty, avg_price, current_price, profit_loss)
+            profit_rate: 수익률 (소수)
+            reason: 매도 사유 (로그용)
+            as_of: position 정보의 조회 시각 (이후 다른 경로에서 매도됐으면 스킵)
+
+        Returns:
+            실행된 주문 정보 (미실행/실패 시 None)
+        """
+        symbol = position['symbol']
+
+        with self.sell_lock:
+            if self.was_sold_since(symbol, as_of):
+                self.logger.info(f"{symbol}: 잔고 조회 이후 이미 매도됨 → 중복 매도 스킵")
+                return None
+
+            quantity = position.get('sellable_qty', 0)
+            if quantity <= 0:
+                return None
+
+            current_price = position.get('current_price', 0)
+
+            # 주문 실행
+            result = self.api_client.place_order(symbol, 'sell', quantity)
+
+            if not result['success']:
+                return None
+
+            self.stats['sell_successes'] += 1
+            self.mark_sold(symbol)
+
+            # 손절 여부 확인
+            is_stop_loss = profit_rate <= KRConfig.STOP_LOSS_THRESHOLD
+            source = f" [{reason}]" if reason else ""
+
+            if is_stop_loss:
+                # 손절 블랙리스트 추가
+                self.stop_loss_tracker.add_stop_loss(
+                    symbol=symbol,
+                    avg_price=position.get('avg_price', 0),
+                    loss_price=current_price,
+                    loss_rate=profit_rate
+                )
+                notes = f"stop_loss_triggered ({profit_rate*100:.2f}%){source} (주문번호: {result['order_id']})"
+            else:
+                # 익절 기록
+                self.record_sell_price(symbol, current_price)
+                notes = f"profit_target_reached ({profit_rate*100:.2f}%){source} (주문번호: {result['order_id']})"
+
+            # 트랜잭션 로그 (손절/익절 구분)
+            self.transaction_logger.log_sell_order(
+                symbol=symbol,
+                quantity=quantity,
+                price=current_price,
+                profit_loss=position.get('profit_loss', 0),
+                profit_rate=profit_rate,
+                order_type="market",
+                status="filled",
+                notes=notes
+            )
+
+            return {
+                'symbol': symbol,
+                'quantity': quantity,
+                'price': current_price,
+                'profit_rate': profit_rate,
+                'order_id': result['order_id']
+            }
@@ -11,10 +11,9 @@
 - 미국 주식: python main.py (기본)
 - 한국 주식: python main.py --market kr (Phase 2에서 지원)
 """
-import schedule
 import time
 import logging
-from datetime import datetime, time as dt_time
+from datetime import date, datetime, timedelta, time as dt_time
 import pytz
 import argparse
 
@@ -29,6 +28,8 @@ except ImportError:
 
 from order_manager import OrderManager
 from transaction_logger import TransactionLogger
+from common.event_scheduler import EventScheduler
+from common.market_calendar import get_calendar
 from config import *
 
 class TradingScheduler:
@@ -46,6 +47,12 @@ class TradingScheduler:
         self.market_open_et = dt_time(9, 30)   # 09:30 ET
         self.market_close_et = dt_time(16, 0)  # 16:00 ET
 
+        # NYSE 캘린더 (휴장일/조기 폐장 반영)
+        self.calendar = get_calendar('us', ('09:30', '16:00'))
+
+        # 주기 작업 (ET 벽시계 경계, 운영 시간 창 안에서만 실행)
+        self.events = EventScheduler('us')
+
         self.is_running = False
     
     def is_trading_hours(self):
@@ -62,16 +69,8 @@ class TradingScheduler:
             bool: 운영 시간이면 True, 아니면 False
         """
         try:
-            # 현재 동부시간 (pytz가 자동으로 서머타임 처리)
-            et_now = datetime.now(self.et_tz)
-            current_time_et = et_now.time()
-
-            # 주말 체크
-            if et_now.weekday() >= 5:  # 토요일(5), 일요일(6)
-                return False
-
-            # ET 기준으로 운영 시간 체크 (서머타임 자동 반영)
-            return self.market_open_et <= current_time_et <= self.market_close_et
+            # 휴장일/조기 폐장까지 반영한 세션 표 조회 (서머타임 자동 반영)
+            return self.calendar.is_open()
 
         except Exception as e:
             self.logger.error(f"운영 시간 확인 오류: {e}")
@@ -235,28 +234,46 @@ class TradingScheduler:
             self.logger.error(f"상태 출력 오류: {e}")
     
     def setup_schedule(self):
-        """스케줄 설정"""
-        # 매도 전략 (30분 주기)
-        schedule.every(SELL_INTERVAL_MINUTES).minutes.do(self.execute_sell_strategy)
+        """스케줄 설정 (ET 벽시계 경계, 예: 30분 주기 → 매시 :00/:30)"""
+        calendar = self.calendar
+        pre_open = (datetime.combine(date.today(), self.market_open_et) - timedelta(minutes=30)).time()
+
+        # 토큰 상태 체크 (30분 주기, 거래일 개장 30분 전부터) - 만료 감지 및 브로커 재초기화
+        self.events.every(30, self.check_and_refresh_token, self.et_tz,
+                          window=(pre_open, self.market_close_et), name='token', calendar=calendar)
+
+        # 매도 전략 (30분 주기, 거래일 세션 안에서만 - 조기 폐장 반영)
+        self.events.every(SELL_INTERVAL_MINUTES, self.execute_sell_strategy, self.et_tz, name='sell', calendar=calendar)
 
         # 매수 전략 (1시간 주기)
-        schedule.every(BUY_INTERVAL_MINUTES).minutes.do(self.execute_buy_strategy)
+        self.events.every(BUY_INTERVAL_MINUTES, self.execute_buy_strategy, self.et_tz, name='buy', calendar=calendar)
 
         # 주문 정리 (10분 주기)
-        schedule.every(10).minutes.do(self.cleanup_orders)
+        self.events.every(10, self.cleanup_orders, self.et_tz, name='cleanup', calendar=calendar)
 
         # 상태 출력 (5분 주기)
-        schedule.every(5).minutes.do(self.print_status)
+        self.events.every(5, self.print_status, self.et_tz, name='status', calendar=calendar)
 
-        # 토큰 상태 체크 (30분 주기) - 만료 감지 및 브로커 재초기화
-        schedule.every(30).minutes.do(self.check_and_refresh_token)
+        # 폐장 중 대기 로그 (1시간 주기)
+        self.events.every(60, self.log_closed_status, self.et_tz, weekdays_only=False, name='closed_status')
 
         self.logger.info("스케줄 설정 완료")
         self.logger.info(f"- 매도 전략: {SELL_INTERVAL_MINUTES}분 주기")
         self.logger.info(f"- 매수 전략: {BUY_INTERVAL_MINUTES}분 주기")
         self.logger.info(f"- 토큰 체크: 30분 주기 (자동 재발급 및 브로커 재초기화)")
         self.logger.info(f"- 운영 시간: {TRADING_START_TIME} ~ {TRADING_END_TIME} (ET)")
-    
+        for name, fire_at in self.events.next_fire_times().items():
+            self.logger.info(f"- 다음 {name}: {fire_at.strftime('%Y-%m-%d %H:%M ET')}")
+
+    def log_closed_status(self):
+        """폐장 중 대기 로그 (스케줄러 지연 통계 포함)"""
+        if self.is_trading_hours():
+            return
+        et_now = datetime.now(self.et_tz)
+        stats = self.events.get_stats()
+        self.logger.info(f"[폐장 중] 대기 중... ({et_now.strftime('%Y-%m-%d %H:%M:%S ET')}) - "
+                         f"실행 {stats['dispatches']}회, 평균 지연 {stats['avg_lag_ms']}ms")
+
     def start(self):
         """스케줄러 시작"""
         self.logger.info("=== 자동매매 시스템 시작 ===")
@@ -269,7 +286,12 @@ class TradingScheduler:
         if not self.is_trading_hours():
             et_now = datetime.now(self.et_tz)
             self.logger.warning(f"[폐장 중] 현재 {et_now.strftime('%Y-%m-%d %H:%M:%S ET')} - 대기 모드")
-            self.logger.info(f"[폐장 중] 다음 개장: 월-금 {TRADING_START_TIME} ET (한국시간 22:30 또는 23:30)")
+            next_open = self.calendar.next_open()
+            if next_open:
+                next_open_et = datetime.fromtimestamp(next_open, self.et_tz)
+                next_open_kst = datetime.fromtimestamp(next_open, pytz.timezone('Asia/Seoul'))
+                self.logger.info(f"[폐장 중] 다음 개장: {next_open_et.strftime('%Y-%m-%d %H:%M ET')} "
+                                 f"(한국시간 {next_open_kst.strftime('%m-%d %H:%M')})")
 
         self.setup_schedule()
         self.is_running = True
@@ -277,24 +299,9 @@ class TradingScheduler:
         # 초기 상태 출력
         self.print_status()
 
-        # 폐장 중 로그 출력 주기 (1시간마다)
-        last_closed_log_time = time.time()
-
         try:
-            while self.is_running:
-                schedule.run_pending()
-
-                # 폐장 중에는 로그를 1시간마다만 출력
-                if not self.is_trading_hours():
-                    current_time = time.time()
-                    if current_time - last_closed_log_time >= 3600:  # 1시간 = 3600초
-                        et_now = datetime.now(self.et_tz)
-                        self.logger.info(f"[폐장 중] 대기 중... ({et_now.strftime('%Y-%m-%d %H:%M:%S ET')})")
-                        last_closed_log_time = current_time
-
-                    time.sleep(300)  # 폐장 시 5분마다 체크 (절전)
-                else:
-                    time.sleep(30)   # 개장 시 30초마다 체크 (적극)
+            # 다음 예정 작업 시각까지 대기 후 실행 (폐장 중에는 다음 개장 직전까지 잠듦)
+            self.events.run()
 
         except KeyboardInterrupt:
             self.logger.info("사용자에 의한 중단 요청")
@@ -307,6 +314,7 @@ class TradingScheduler:
         """스케줄러 중지"""
         self.logger.info("=== 자동매매 시스템 중지 ===")
         self.is_running = False
+        self.events.stop()
         
         # 미체결 주문 현황 출력
         order_summary = self.order_manager.get_order_summary()
@@ -0,0 +1,303 @@
+"""
+보유 종목 고빈도 감시 (매도 주기 사이 익절/손절 즉시 대응)
+
+정기 매도 전략은 SELL_INTERVAL_MINUTES(30분)마다 실행되므로 손절선 돌파를
+최대 30분 늦게 발견할 수 있음. PositionWatcher는 매수/매도 스케줄과 별개의
+백그라운드 스레드에서 보유 종목 시세만 짧은 주기로 조회하고, 익절/손절 조건이
+충족되면 전략의 기존 매도 경로(strategy.sell_position)를 즉시 호출한다.
+
+- 감시 대상: 마지막 잔고 스냅샷의 보유 종목만 (매도 가능 수량 > 0)
+- 조건 판단: 포지션 변경 시에만 청산 가격선을 PriceTriggerIndex로 재구성하고,
+  시세마다 이진 탐색으로 발동 여부만 확인 (손익 재계산 없음)
+- API 비용: RateLimiter로 분당 호출 수 상한 고정 (잔고 재조회 포함)
+- 지연 측정: 조건 감지 → 주문 완료까지 소요 시간 통계
+"""
+import logging
+import threading
+import time
+from typing import Optional, Dict, Any, List
+
+from common.rate_limiter import RateLimiter
+from common.price_trigger import PriceTriggerIndex, BELOW
+
+
+# 기본 감시 설정
+WATCH_INTERVAL_SECONDS = 5            # 감시 주기 (초)
+WATCH_MAX_REQUESTS_PER_MINUTE = 60    # 분당 최대 API 호출 수 (시세 + 잔고)
+WATCH_SNAPSHOT_MAX_AGE_SECONDS = 300  # 잔고 스냅샷 최대 사용 시간 (초)
+WATCH_RETRIGGER_COOLDOWN_SECONDS = 60  # 매도 시도 후 같은 종목 재시도 금지 시간 (초)
+
+
+class PositionWatcher:
+    """
+    보유 종목 고빈도 감시기
+
+    사용 예:
+        watcher = PositionWatcher(strategy)
+        watcher.start()
+        ...
+        watcher.stop()
+    """
+
+    def __init__(self, strategy,
+                 interval_seconds: float = WATCH_INTERVAL_SECONDS,
+                 max_requests_per_minute: int = WATCH_MAX_REQUESTS_PER_MINUTE,
+                 snapshot_max_age: float = WATCH_SNAPSHOT_MAX_AGE_SECONDS,
+                 name: str = None):
+        """
+        Args:
+            strategy: BaseStrategy 서브클래스 인스턴스 (sell_position 구현 필요)
+            interval_seconds: 감시 주기 (초)
+            max_requests_per_minute: 분당 API 호출 상한 (시세 + 잔고 조회)
+            snapshot_max_age: 잔고 스냅샷이 이보다 오래되면 재조회 (초)
+            name: 로그 식별용 이름 (예: 'KR')
+        """
+        self.strategy = strategy
+        self.api_client = strategy.api_client
+        self.interval_seconds = interval_seconds
+        self.snapshot_max_age = snapshot_max_age
+        self.name = name or strategy.__class__.__name__
+        self.limiter = RateLimiter(max_requests_per_minute)
+        self.logger = logging.getLogger(f"{self.__class__.__name__}.{self.name}")
+
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        # 감시 대상 {symbol: position}, 라운드로빈 커서
+        self._held: Dict[str, Dict[str, Any]] = {}
+        self._held_as_of: float = 0.0
+        self._cursor = 0
+        self._last_trigger: Dict[str, float] = {}  # {symbol: 마지막 매도 시도 시각}
+
+        # 청산 가격 인덱스 (포지션 변경 시에만 재구성)
+        self.trigger_index = PriceTriggerIndex()
+
+        # 감시 통계
+        self.stats = {
+            'polls': 0,
+            'quote_requests': 0,
+            'balance_requests': 0,
+            'budget_skips': 0,
+            'triggers': 0,
+            'orders': 0,
+            'last_latency_ms': None,
+            'max_latency_ms': None,
+            'total_latency_ms': 0.0
+        }
+
+    # ------------------------------------------------------------------
+    # 스레드 제어
+    # ------------------------------------------------------------------
+    def start(self):
+        """감시 스레드 시작"""
+        if self.is_running():
+            return
+
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name=f"PositionWatcher-{self.name}")
+        self._thread.daemon = True
+        self._thread.start()
+        self.logger.info(f"[WATCH] 포지션 감시 시작 (주기: {self.interval_seconds}초, "
+                         f"예산: 분당 {self.limiter.rate_per_minute:.0f}회)")
+
+    def stop(self, timeout: float = 5.0):
+        """감시 스레드 중지"""
+        self._stop_event.set()
+        if self._thread and self._thread.is_alive():
+            self._thread.join(timeout)
+        self._thread = None
+
+        if self.strategy.trailing_stop is not None:
+            self.strategy.trailing_stop.flush()
+        self.logger.info("[WATCH] 포지션 감시 중지")
+
+    def is_running(self) -> bool:
+        """감시 스레드 실행 여부"""
+        return self._thread is not None and self._thread.is_alive()
+
+    def _run(self):
+        """감시 루프"""
+        while not self._stop_event.is_set():
+            try:
+                self.poll_once()
+            except Exception as e:
+                self.logger.error(f"[WATCH] 감시 루프 오류: {e}")
+
+            self._stop_event.wait(self.interval_seconds)
+
+    # ------------------------------------------------------------------
+    # 감시 로직
+    # ------------------------------------------------------------------
+    def _sync_positions(self):
+        """
+        잔고 스냅샷 → 감시 대상 동기화
+
+        스냅샷이 오래됐거나 매매로 만료된 경우에만 잔고를 재조회 (예산 차감)
+        """
+        balance, age = self.strategy.get_balance_snapshot()
+
+        if age > self.snapshot_max_age:
+            if not self.limiter.try_acquire():
+                self.stats['budget_skips'] += 1
+                return
+            self.stats['balance_requests'] += 1
+            refreshed = self.strategy.refresh_balance_snapshot()
+            if refreshed:
+                balance = refreshed
+
+        if not balance:
+            return
+
+        as_of = self.strategy.get_balance_snapshot_time()
+        if as_of == self._held_as_of:
+            return
+
+        now = time.time()
+        self._held = {
+            pos['symbol']: pos
+            for pos in balance.get('positions', [])
+            if pos.get('sellable_qty', 0) > 0 and pos.get('avg_price', 0) > 0
+            and now - self._last_trigger.get(pos['symbol'], 0) >= WATCH_RETRIGGER_COOLDOWN_SECONDS
+        }
+        self._held_as_of = as_of
+        if self.trigger_index.rebuild(list(self._held.values()), self.strategy.get_exit_triggers):
+            self.logger.debug(f"[WATCH] 감시 대상 갱신: {list(self._held.keys())}")
+
+    def refresh_triggers(self):
+        """청산 규칙 변경 시 (트레일링 스탑 등) 현재 감시 대상으로 인덱스 강제 재구성"""
+        self.trigger_index.rebuild(list(self._held.values()), self.strategy.get_exit_triggers,
+                                   force=True)
+
+    def _next_symbols(self) -> List[str]:
+        """이번 주기에 조회할 종목 (라운드로빈, 예산 내)"""
+        symbols = [symbol for symbol in self._held if symbol in self.trigger_index]
+        if not symbols:
+            return []
+
+        start = self._cursor % len(symbols)
+        ordered = symbols[start:] + symbols[:start]
+        self._cursor = start + 1
+        return ordered
+
+    def poll_once(self) -> List[Dict[str, Any]]:
+        """
+        감시 1회 실행
+
+        Returns:
+            이번 주기에 실행된 매도 주문 리스트
+        """
+        if not self.api_client.is_market_open():
+            return []
+
+        self.stats['polls'] += 1
+        self._sync_positions()
+
+        executed = []
+        for symbol in self._next_symbols():
+            if not self.limiter.try_acquire():
+                self.stats['budget_skips'] += 1
+                break
+
+            self.stats['quote_requests'] += 1
+            price = self.api_client.get_current_price(symbol)
+            if price is None or price <= 0:
+                continue
+
+            order = self.on_price(symbol, price)
+            if order:
+                executed.append(order)
+
+        return executed
+
+    def on_price(self, symbol: str, price: float) -> Optional[Dict[str, Any]]:
+        """
+        시세 1건 처리 (폴링/외부 시세 피드 공용)
+
+        Args:
+            symbol: 종목 코드
+            price: 현재가
+
+        Returns:
+            실행된 주문 정보 (미발동/실패 시 None)
+        """
+        position = self._held.get(symbol) or self.trigger_index.get_position(symbol)
+        if position is None:
+            return None
+
+        # 트레일링 스탑: 최고가 갱신 시에만 해당 종목 가격선 재계산
+        trailing = self.strategy.trailing_stop
+        if trailing is not None and trailing.update(symbol, price):
+            self.trigger_index.set_triggers(symbol, self.strategy.get_exit_triggers(position), position)
+
+        return self.check_position(position, price)
+
+    def check_position(self, position: Dict[str, Any], price: float) -> Optional[Dict[str, Any]]:
+        """
+        시세 1건에 대한 매도 조건 확인 및 매도 실행
+
+        Args:
+            position: 보유 종목 정보 (잔고 스냅샷 항목)
+            price: 방금 조회한 현재가
+
+        Returns:
+            실행된 주문 정보 (조건 미충족/실패 시 None)
+        """
+        symbol = position['symbol']
+        detected_at = time.monotonic()
+
+        fired = self.trigger_index.check(symbol, price)
+        if not fired:
+            return None
+
+        # 발동 후에만 수익률 계산 (주문/로그용)
+        avg_price = position['avg_price']
+        profit_rate = (price - avg_price) / avg_price
+        trigger = fired[0]
+
+        self.stats['triggers'] += 1
+        self.logger.warning(f"[WATCH] {symbol} 매도 조건 감지 ({trigger.reason}): 현재가 {price}, "
+                            f"{'하한' if trigger.direction == BELOW else '상한'} {trigger.price:.2f}, "
+                            f"수익률 {profit_rate*100:.2f}%")
+
+        live_position = dict(position)
+        live_position['current_price'] = price
+        live_position['profit_loss'] = (price - avg_price) * position.get('quantity', 0)
+
+        order = self.strategy.sell_position(live_position, profit_rate,
+                                            reason=f'watcher:{trigger.reason}',
+                                            as_of=self._held_as_of)
+        latency_ms = (time.monotonic() - detected_at) * 1000
+
+        # 성공/실패 관계없이 감시 대상에서 제외 (쿨다운 후 다음 잔고 스냅샷에서 재확인)
+        self._held.pop(symbol, None)
+        self.trigger_index.remove(symbol)
+        self._last_trigger[symbol] = time.time()
+
+        if order:
+            self._record_latency(latency_ms)
+            self.logger.warning(f"[WATCH] {symbol} 매도 주문 완료 (감지→주문 {latency_ms:.0f}ms)")
+        else:
+            self.logger.error(f"[WATCH] {symbol} 매도 주문 실패/스킵 (감지→응답 {latency_ms:.0f}ms)")
+            self.strategy.invalidate_balance_snapshot()
+
+        return order
+
+    def _record_latency(self, latency_ms: float):
+        """감지 → 주문 지연 통계 기록"""
+        self.stats['orders'] += 1
+        self.stats['last_latency_ms'] = round(latency_ms, 1)
+        self.stats['total_latency_ms'] += latency_ms
+        if self.stats['max_latency_ms'] is None or latency_ms > self.stats['max_latency_ms']:
+            self.stats['max_latency_ms'] = round(latency_ms, 1)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """감시 통계 반환"""
+        orders = self.stats['orders']
+        return {
+            **self.stats,
+            'avg_latency_ms': round(self.stats['total_latency_ms'] / orders, 1) if orders else None,
+            'watched_symbols': list(self._held.keys()),
+            'budget': self.limiter.get_stats(),
+            'trigger_index': self.trigger_index.get_stats(),
+            'running': self.is_running()
+        }
@@ -0,0 +1,163 @@
+"""
+마지막 매도가 저장소 - 재매수 방지 체크용 (재시작 후에도 유지)
+
+- 시작 시 JSON 파일을 한 번만 메모리로 로드
+- record 시 즉시 파일에 반영 (원자적 쓰기 + .bak 백업)
+- 조회는 메모리 딕셔너리 O(1), 만료 기간은 조회 시점에 판정
+- 같은 파일은 프로세스 내 모든 전략이 하나의 인스턴스를 공유 (get_sell_price_store)
+
+파일 형식:
+    {"005930": {"price": 71000, "sold_at": "2026-01-26T10:30:00+09:00", "ts": 1769391000.0, "market": "kr"}}
+"""
+import json
+import os
+import logging
+import threading
+import time
+from datetime import datetime
+from typing import Optional, Dict, Any
+
+import pytz
+
+
+class SellPriceStore:
+    """
+    종목별 마지막 매도가 영구 저장소 (스레드 안전)
+
+    사용 예:
+        store = get_sell_price_store("kr_last_sell_prices.json", "kr", "Asia/Seoul")
+        store.record("005930", 71000)
+        store.get("005930", expiry_days=30)
+    """
+
+    def __init__(self, state_file: str, market: str, timezone: str):
+        """
+        Args:
+            state_file: JSON 저장 파일 경로
+            market: 시장 구분 ('kr' / 'us')
+            timezone: 기록 시각 타임존
+        """
+        self.state_file = state_file
+        self.backup_file = f"{state_file}.bak"
+        self.market = market
+        self.timezone = pytz.timezone(timezone)
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+        self._lock = threading.Lock()
+        self.records: Dict[str, Dict[str, Any]] = self._load()
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        """저장 파일 로드 (실패 시 .bak 복구)"""
+        for path, label in ((self.state_file, "로드"), (self.backup_file, "백업 복구")):
+            if not os.path.exists(path):
+                continue
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    records = json.load(f)
+                self.logger.info(f"[SELL_PRICE] 매도가 기록 {label} 완료: {len(records)}개 종목")
+                return records
+            except Exception as e:
+                self.logger.error(f"[SELL_PRICE] 매도가 기록 {label} 실패: {e}")
+        return {}
+
+    def _save(self):
+        """저장 파일 기록 (원자적 쓰기, 락 보유 상태에서 호출)"""
+        temp_file = f"{self.state_file}.tmp"
+        try:
+            with open(temp_file, 'w', encoding='utf-8') as f:
+                json.dump(self.records, f, ensure_ascii=False, indent=2)
+
+            if os.path.exists(self.state_file):
+                try:
+                    with open(self.state_file, 'r', encoding='utf-8') as src:
+                        with open(self.backup_file, 'w', encoding='utf-8') as dst:
+                            dst.write(src.read())
+                except Exception as e:
+                    self.logger.warning(f"[SELL_PRICE] 백업 파일 생성 실패: {e}")
+
+            os.replace(temp_file, self.state_file)
+        except Exception as e:
+            self.logger.error(f"[SELL_PRICE] 매도가 기록 저장 실패: {e}")
+            if os.path.exists(temp_file):
+                try:
+                    os.remove(temp_file)
+                except OSError:
+                    pass
+
+    def record(self, symbol: str, price: float):
+        """매도가 기록 (즉시 파일 반영)"""
+        with self._lock:
+            self.records[symbol] = {
+                'price': price,
+                'sold_at': datetime.now(self.timezone).isoformat(),
+                'ts': time.time(),
+                'market': self.market
+            }
+            self._save()
+
+    def get(self, symbol: str, expiry_days: Optional[float] = None) -> Optional[float]:
+        """
+        마지막 매도가 조회 (메모리 조회, 파일 접근 없음)
+
+        Args:
+            symbol: 종목 코드
+            expiry_days: 이 기간(일)보다 오래된 기록은 없는 것으로 처리 (None이면 만료 없음)
+
+        Returns:
+            매도가 또는 None
+        """
+        record = self.records.get(symbol)
+        if record is None:
+            return None
+        if expiry_days is not None and time.time() - record.get('ts', 0) > expiry_days * 86400:
+            return None
+        return record['price']
+
+    def get_record(self, symbol: str) -> Optional[Dict[str, Any]]:
+        """매도가 기록 전체 (가격, 시각, 시장)"""
+        record = self.records.get(symbol)
+        return dict(record) if record else None
+
+    def remove(self, symbol: str):
+        """매도가 기록 삭제"""
+        with self._lock:
+            if self.records.pop(symbol, None) is not None:
+                self._save()
+
+    def purge_expired(self, expiry_days: float) -> int:
+        """
+        만료 기록 정리
+
+        Returns:
+            삭제한 종목 수
+        """
+        cutoff = time.time() - expiry_days * 86400
+        with self._lock:
+            expired = [symbol for symbol, record in self.records.items() if record.get('ts', 0) < cutoff]
+            for symbol in expired:
+                del self.records[symbol]
+            if expired:
+                self._save()
+        return len(expired)
+
+
+# 저장 파일별 공유 인스턴스 (프로세스 내 전략 간 공유)
+_stores: Dict[str, SellPriceStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_sell_price_store(state_file: str, market: str, timezone: str) -> SellPriceStore:
+    """
+    저장 파일 기준 공유 저장소 반환 (없으면 생성)
+
+    Args:
+        state_file: JSON 저장 파일 경로
+        market: 시장 구분 ('kr' / 'us')
+        timezone: 기록 시각 타임존
+    """
+    key = os.path.abspath(state_file)
+    with _stores_lock:
+        store = _stores.get(key)
+        if store is None:
+            store = _stores[key] = SellPriceStore(state_file, market, timezone)
+        return store
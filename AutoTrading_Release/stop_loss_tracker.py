@@ -9,7 +9,7 @@ import json
 import os
 import logging
 from datetime import datetime, timedelta
-from typing import Optional, Dict, List, Any
+from typing import Optional, Dict, List, Any, Callable
 import pytz
 
 
@@ -29,24 +29,33 @@ class StopLossTracker:
                  blacklist_file: str,
                  cooldown_days: int,
                  timezone: str,
-                 transaction_logger=None):
+                 transaction_logger=None,
+                 clock: Optional[Callable] = None):
         """
         Args:
             blacklist_file: JSON 블랙리스트 파일 경로
             cooldown_days: 재매수 금지 기간 (일)
             timezone: 타임존 (예: "Asia/Seoul", "US/Eastern")
             transaction_logger: TransactionLogger 인스턴스 (선택)
+            clock: 현재 시각 함수 clock(tz) -> datetime (백테스트용, 없으면 실제 시각)
         """
         self.blacklist_file = blacklist_file
         self.backup_file = f"{blacklist_file}.bak"
         self.cooldown_days = cooldown_days
         self.timezone = pytz.timezone(timezone)
         self.transaction_logger = transaction_logger
+        self.clock = clock
         self.logger = logging.getLogger(self.__class__.__name__)
 
         # JSON 파일 로드 (캐싱)
         self.blacklist = self._load_blacklist()
 
+    def _now(self) -> datetime:
+        """현재 시각 (clock 지정 시 해당 시각)"""
+        if self.clock is not None:
+            return self.clock(self.timezone)
+        return datetime.now(self.timezone)
+
     def _load_blacklist(self) -> Dict[str, Dict]:
         """
         블랙리스트 JSON 파일 로드
@@ -146,7 +155,7 @@ class StopLossTracker:
             loss_price: 손절 매도가
             loss_rate: 손실률 (소수, 예: -0.15 = -15%)
         """
-        now = datetime.now(self.timezone)
+        now = self._now()
         cooldown_until = now + timedelta(days=self.cooldown_days)
 
         # JSON 블랙리스트 업데이트
@@ -197,7 +206,7 @@ class StopLossTracker:
             if cooldown_until.tzinfo is None:
                 cooldown_until = self.timezone.localize(cooldown_until)
 
-            now = datetime.now(self.timezone)
+            now = self._now()
 
             if now > cooldown_until:
                 # 만료됨 → 블랙리스트에서 제거
@@ -213,6 +222,33 @@ class StopLossTracker:
             # 오류 발생 시 안전하게 차단
             return True
 
+    def reload(self) -> int:
+        """
+        블랙리스트 파일 다시 로드 후 만료 종목 일괄 정리 (개장 전 워밍업용 - 주기 중 파일 쓰기 방지)
+
+        Returns:
+            재매수 금지 중인 종목 수
+        """
+        self.blacklist = self._load_blacklist()
+        now = self._now()
+        expired = []
+        for symbol, info in self.blacklist.items():
+            try:
+                cooldown_until = datetime.fromisoformat(info['cooldown_until'])
+                if cooldown_until.tzinfo is None:
+                    cooldown_until = self.timezone.localize(cooldown_until)
+                if now > cooldown_until:
+                    expired.append(symbol)
+            except Exception as e:
+                self.logger.error(f"{symbol} 블랙리스트 만료 확인 오류: {e}")
+
+        if expired:
+            for symbol in expired:
+                del self.blacklist[symbol]
+            self._save_blacklist()
+            self.logger.info(f"손절 쿨다운 만료 {len(expired)}개 종목 정리: {expired}")
+        return len(self.blacklist)
+
     def get_remaining_days(self, symbol: str) -> Optional[int]:
         """
         남은 쿨다운 일수 반환
@@ -234,7 +270,7 @@ class StopLossTracker:
             if cooldown_until.tzinfo is None:
                 cooldown_until = self.timezone.localize(cooldown_until)
 
-            now = datetime.now(self.timezone)
+            now = self._now()
             remaining = (cooldown_until - now).days
 
             return max(0, remaining)
@@ -251,7 +287,7 @@ class StopLossTracker:
             [{'symbol': str, 'remaining_days': int, ...}, ...]
         """
         active_blocks = []
-        now = datetime.now(self.timezone)
+        now = self._now()
 
         for symbol, info in list(self.blacklist.items()):
             try:
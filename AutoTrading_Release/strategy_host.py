@@ -0,0 +1,601 @@
+"""
+멀티 전략 호스트 - 한 시장에서 여러 전략을 공유 데이터 계층 위에서 실행
+
+시장마다 API 클라이언트/토큰 매니저/브로커 객체는 1개만 두고
+(MarketDataHub), 전략은 파라미터/섹터 설정만 다른 인스턴스로 여러 개 실행한다.
+주문은 OrderDispatcher 한 곳을 거쳐 전략별 예산이 적용된다.
+
+전략 구성은 시장 종목 설정 파일의 "strategies" 리스트로 지정 (없으면 기본 전략 1개):
+
+    "strategies": [
+        {"name": "default"},
+        {"name": "aggressive", "profit_threshold": 0.08,
+         "stocks_config_file": "kr_stocks_config_aggressive.json",
+         "max_buy_amount": 1000000, "max_orders": 10}
+    ]
+
+전략은 자기가 체결한 보유분만 잔고에서 보고 매도한다 (디스패처 소유 기록, {market}_position_owners.json).
+기록 없는 보유분(기존 잔고, 수동 매수)은 첫 번째 전략 소유이며, 포지션 감시도 첫 번째 전략 보유분만 감시한다.
+
+같은 파일의 "risk" 블록이 있으면 전략 공통 리스크 엔진(RiskEngine)이
+디스패처 주문 경로에서 노출/손실 한도를 검사하고, "adaptive_refresh" 블록이
+있으면 전략들이 보고한 경계 근접도로 종목별 시세 갱신 주기를 조절한다:
+
+    "adaptive_refresh": {"enabled": true, "max_requests_per_minute": 60}
+
+정기 주기 직전에는 QuotePrefetcher가 주기 대상 종목 시세를 미리 채우고
+(끄려면 "prefetch": {"enabled": false}), 주기별 예정 시각 대비 판단 시작/완료
+시각을 cycle_timings에 기록한다.
+
+"paper_broker" 블록이 켜져 있으면 시세만 실제 클라이언트로 조회하고 주문/잔고는
+인프로세스 모의 브로커(PaperBroker)가 처리한다 (KIS 주문 호출 없음):
+
+    "paper_broker": {"enabled": true, "initial_cash": 10000000, "state_file": "kr_paper_account.json"}
+
+"bar_store" 블록이 켜져 있으면 주기마다 대상 종목의 지난 일봉을 로컬 저장소(BarStore)에
+이어 붙이고 (종목당 하루 1회), 전일 종가는 저장소에서 읽는다:
+
+    "bar_store": {"enabled": true, "root": "bar_store", "lookback_days": 400}
+
+"minute_bars" 블록이 켜져 있으면 조회한 모든 시세를 종목별 1분봉(MinuteBarAggregator)으로
+모으고 장 마감(stop/flush_minute_bars) 시 같은 저장소의 분봉으로 저장한다:
+
+    "minute_bars": {"enabled": true, "capacity": 480}
+
+개장 lead_minutes분 전(거래소 캘린더 기준)에는 워밍업(warmup)이 토큰 갱신, 커넥션 풀 선연결, 잔고 스냅샷,
+블랙리스트 로드, 거래소 코드 확인, 전일 종가 일괄 로드를 마치고 준비 상태(readiness)를 남긴다
+(끄려면 "warmup": {"enabled": false}):
+
+    "warmup": {"enabled": true, "lead_minutes": 10}
+"""
+import os
+import json
+import time
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from collections import deque
+from datetime import datetime
+from typing import Optional, Dict, Any, List
+
+import pytz
+
+from common.market_data import MarketDataHub
+from common.order_dispatcher import OrderDispatcher
+from common.risk_engine import RiskEngine
+from common.refresh_scheduler import RefreshScheduler
+from common.prefetcher import QuotePrefetcher
+from common.paper_broker import PaperBroker
+from common.bar_store import BarStore, DEFAULT_STORE_DIR, DEFAULT_LOOKBACK_DAYS
+from common.minute_bars import MinuteBarAggregator
+from common import http
+
+
+# 전략 생성자에 전달하는 설정 키
+STRATEGY_KWARGS = ('profit_threshold', 'stocks_config_file',
+                   'enable_filter_check', 'check_previous_sell_price')
+
+# PaperBroker 생성자에 전달하는 설정 키
+PAPER_BROKER_KWARGS = ('initial_cash', 'commission_rate', 'sell_tax_rate',
+                       'settlement_days', 'state_file')
+
+REALIZED_SYNC_SECONDS = 300  # 브로커 당일 실현손익 보정 주기 (초, 사이클 시작 시에만 조회)
+CYCLE_TIMING_HISTORY = 50    # 보관할 주기 실행 시각 기록 수
+WARMUP_LEAD_MINUTES = 10     # 개장 몇 분 전에 워밍업 (거래소 캘린더 실제 개장 시각 기준)
+WARMUP_WORKERS = 4           # 전일 종가 일괄 로드 동시 조회 수 (공용 HTTP 예산 안에서)
+WARMUP_REQUIRED_STEPS = ('token', 'balance')   # 실패하면 준비 미완료로 보는 단계
+HOST_SETTING_KEYS = ('strategies', 'risk', 'adaptive_refresh', 'prefetch', 'paper_broker', 'bar_store',
+                     'minute_bars', 'warmup')
+
+
+def load_market_settings(config_file: str) -> Dict[str, Any]:
+    """
+    종목 설정 파일의 호스트 설정 블록 (파일이 없으면 빈 딕셔너리, 읽기/파싱 실패는 예외)
+
+    Args:
+        config_file: 시장 종목 설정 파일 경로
+    """
+    if not os.path.exists(config_file):
+        return {}
+    with open(config_file, 'r', encoding='utf-8') as f:
+        config = json.load(f)
+    return {key: config.get(key) for key in HOST_SETTING_KEYS}
+
+
+def warmup_lead_minutes(market_settings: Dict[str, Any]) -> Optional[float]:
+    """호스트 설정의 "warmup" 블록 → 개장 몇 분 전에 워밍업할지 (꺼져 있으면 None)"""
+    warmup_config = market_settings.get('warmup') or {}
+    if not warmup_config.get('enabled', True):
+        return None
+    return warmup_config.get('lead_minutes', WARMUP_LEAD_MINUTES)
+
+
+class StrategyAPIView:
+    """
+    전략별 API 뷰
+
+    시세/잔고 조회는 공유 허브에 위임하고, 주문은 디스패처를 거쳐
+    전략 예산을 적용한다. 잔고의 available_cash는 전략의 남은 매수 예산으로
+    제한되어 전략의 수량 계산이 예산 안에서 이뤄지고, positions는 디스패처가
+    기록한 전략 소유분만 남겨 다른 전략이 연 포지션을 매도하지 않는다.
+    """
+
+    def __init__(self, hub: MarketDataHub, dispatcher: OrderDispatcher, name: str):
+        self.hub = hub
+        self.dispatcher = dispatcher
+        self.name = name
+
+    def __getattr__(self, name):
+        if name == 'hub':
+            raise AttributeError(name)
+        return getattr(self.hub, name)
+
+    def get_account_balance(self) -> Optional[Dict[str, Any]]:
+        """공유 잔고 (available_cash는 전략 남은 예산 이하, positions는 전략 소유분만)"""
+        balance = self.hub.get_account_balance()
+        if not balance:
+            return balance
+
+        balance['positions'] = self.dispatcher.scope_positions(self.name, balance.get('positions', []))
+        remaining = self.dispatcher.get_remaining_buy_amount(self.name)
+        if remaining is not None:
+            balance['available_cash'] = min(balance.get('available_cash', 0), remaining)
+        return balance
+
+    def place_order(self, symbol: str, side: str, quantity: int,
+                    price: Optional[float] = None) -> Dict[str, Any]:
+        """디스패처를 통한 주문"""
+        return self.dispatcher.submit(self.name, symbol, side, quantity, price)
+
+
+class StrategyHost:
+    """
+    시장 1개의 멀티 전략 실행기
+
+    사용 예:
+        host = StrategyHost('kr')
+        host.execute_sell_strategy()
+        host.execute_buy_strategy()
+    """
+
+    def __init__(self, market: str, strategies: List[Dict[str, Any]] = None, api_client=None):
+        """
+        Args:
+            market: 'us' 또는 'kr'
+            strategies: 전략 설정 리스트 (없으면 종목 설정 파일의 "strategies" 또는 기본 전략 1개)
+            api_client: 실제 API 클라이언트 (없으면 시장별 자동 생성)
+        """
+        self.market = market.lower()
+        self.logger = logging.getLogger(f"{self.__class__.__name__}.{self.market.upper()}")
+
+        if self.market == 'us':
+            from us.strategy import USStrategy as strategy_class
+            from us.api_client import USAPIClient as client_class
+            from us.config import USConfig as market_config
+        else:
+            from kr.strategy import KRStrategy as strategy_class
+            from kr.api_client import KRAPIClient as client_class
+            from kr.config import KRConfig as market_config
+
+        self.strategy_class = strategy_class
+        self.market_config = market_config
+
+        market_settings = self._load_market_settings()
+
+        if api_client is None:
+            api_client = client_class()
+            paper_config = market_settings.get('paper_broker') or {}
+            if paper_config.get('enabled'):
+                options = {key: paper_config[key] for key in PAPER_BROKER_KWARGS if key in paper_config}
+                api_client = PaperBroker(self.market, quote_client=api_client, **options)
+        self.hub = MarketDataHub(api_client)
+        self.risk_engine = None
+        if market_settings.get('risk'):
+            self.risk_engine = RiskEngine(market_settings['risk'], timezone=market_config.TIMEZONE)
+            self.hub.add_balance_listener(self.risk_engine.sync_balance)
+        self._realized_synced_at = None
+
+        self.bar_store = None
+        bar_config = market_settings.get('bar_store') or {}
+        if bar_config.get('enabled'):
+            self.bar_store = BarStore(bar_config.get('root', DEFAULT_STORE_DIR))
+            self.bar_lookback_days = bar_config.get('lookback_days', DEFAULT_LOOKBACK_DAYS)
+            self.hub.attach_bar_store(self.bar_store, self.market)
+
+        self.minute_bars = None
+        minute_config = market_settings.get('minute_bars') or {}
+        if minute_config.get('enabled'):
+            store = self.bar_store or BarStore(minute_config.get('root', DEFAULT_STORE_DIR))
+            options = {key: minute_config[key] for key in ('capacity',) if key in minute_config}
+            self.minute_bars = MinuteBarAggregator(
+                market_config.TIMEZONE,
+                (market_config.TRADING_START_TIME, market_config.TRADING_END_TIME),
+                store=store, market=self.market, **options
+            )
+            if hasattr(self.hub.client, 'add_price_listener'):
+                self.hub.client.add_price_listener(self.minute_bars.update)
+
+        self.refresh_scheduler = None
+        refresh_config = market_settings.get('adaptive_refresh') or {}
+        if refresh_config.get('enabled'):
+            options = {key: refresh_config[key] for key in
+                       ('max_requests_per_minute', 'min_interval', 'max_interval') if key in refresh_config}
+            self.refresh_scheduler = RefreshScheduler(
+                self.hub.refresh_price,
+                indicators=self.hub.indicators,
+                ttl_sink=self.hub.set_price_ttl,
+                is_active=self.hub.is_market_open,
+                name=self.market.upper(),
+                **options
+            )
+
+        self.prefetcher = None
+        prefetch_config = market_settings.get('prefetch') or {}
+        if prefetch_config.get('enabled', True):
+            options = {key: prefetch_config[key] for key in
+                       ('lead_seconds', 'max_requests_per_minute') if key in prefetch_config}
+            self.prefetcher = QuotePrefetcher(self.hub, self.get_cycle_symbols,
+                                              name=self.market.upper(), **options)
+        self.cycle_timings = deque(maxlen=CYCLE_TIMING_HISTORY)
+
+        self.warmup_lead_minutes = warmup_lead_minutes(market_settings)
+        self.readiness: Optional[Dict[str, Any]] = None
+        if self.warmup_lead_minutes:
+            self.logger.info(f"[HOST] 개장 전 워밍업: 개장 {self.warmup_lead_minutes:g}분 전")
+        else:
+            self.logger.info("[HOST] 개장 전 워밍업: 사용 안 함")
+
+        self.dispatcher = OrderDispatcher(self.hub, timezone=market_config.TIMEZONE,
+                                          risk_engine=self.risk_engine,
+                                          state_file=f"{self.market}_position_owners.json")
+
+        if strategies is None:
+            strategies = market_settings.get('strategies') or [{'name': 'default'}]
+
+        self.strategies: Dict[str, Any] = {}
+        self._config_mtimes: Dict[str, Optional[float]] = {}   # {전략 이름: 종목 설정 파일 수정 시각}
+        for spec in strategies:
+            self.add_strategy(spec)
+
+        if self.risk_engine is not None:
+            self.risk_engine.set_symbol_sectors(self._build_symbol_sectors())
+
+        self.logger.info(f"[HOST] {len(self.strategies)}개 전략 구성: {list(self.strategies.keys())}")
+
+    def _load_market_settings(self) -> Dict[str, Any]:
+        """종목 설정 파일의 호스트 설정 블록 로드 (없으면 빈 딕셔너리)"""
+        try:
+            return load_market_settings(self.market_config.STOCKS_CONFIG_FILE)
+        except Exception as e:
+            self.logger.error(f"[HOST] 전략 구성 로드 실패: {e}")
+
+        return {}
+
+    def _build_symbol_sectors(self) -> Dict[str, str]:
+        """전략 섹터 설정에서 종목 → 섹터 매핑 생성 (먼저 등록된 전략 우선)"""
+        symbol_sectors = {}
+        for strategy in self.strategies.values():
+            for sector_key, sector_info in (strategy.get_sectors() or {}).items():
+                symbols = list(sector_info.get('filter_stocks', {})) + list(sector_info.get('watch_list', []))
+                for symbol in symbols:
+                    symbol_sectors.setdefault(symbol, sector_key)
+        return symbol_sectors
+
+    def _sync_realized_profit(self):
+        """브로커 당일 실현손익으로 리스크 엔진 보정 (지원 클라이언트만, 주기 제한)"""
+        if self.risk_engine is None or not hasattr(self.api_client, 'get_realized_profit_today'):
+            return
+        now = time.monotonic()
+        if self._realized_synced_at is not None and now - self._realized_synced_at < REALIZED_SYNC_SECONDS:
+            return
+        self._realized_synced_at = now
+
+        try:
+            result = self.api_client.get_realized_profit_today()
+            if result:
+                self.risk_engine.sync_realized_profit(result.get('total_realized_profit', 0))
+        except Exception as e:
+            self.logger.error(f"[HOST] 실현손익 조회 실패: {e}")
+
+    def _update_bar_store(self, kind: str):
+        """주기 대상 종목 일봉 갱신 (당일 갱신을 마친 종목은 메타만 확인)"""
+        if self.bar_store is None or not hasattr(self.api_client, 'fetch_daily_bars'):
+            return
+        try:
+            today = datetime.now(pytz.timezone(self.market_config.TIMEZONE)).date()
+            self.bar_store.update(self.market, self.api_client, self.get_cycle_symbols(kind),
+                                  today=today, lookback_days=self.bar_lookback_days)
+        except Exception as e:
+            self.logger.error(f"[HOST] 일봉 저장소 갱신 실패: {e}")
+
+    def add_strategy(self, spec: Dict[str, Any]):
+        """
+        전략 추가
+
+        Args:
+            spec: {'name': str, 전략 생성자 인자..., 'max_buy_amount': float, 'max_orders': int}
+        """
+        name = spec.get('name') or f"strategy{len(self.strategies) + 1}"
+        if name in self.strategies:
+            raise ValueError(f"duplicate strategy name: {name}")
+
+        self.dispatcher.set_budget(name, spec.get('max_buy_amount'), spec.get('max_orders'))
+        view = StrategyAPIView(self.hub, self.dispatcher, name)
+
+        kwargs = {key: spec[key] for key in STRATEGY_KWARGS if key in spec}
+        strategy = self.strategy_class(api_client=view, **kwargs)
+        strategy.logger = logging.getLogger(f"{strategy.__class__.__name__}.{name}")
+
+        strategy.refresh_scheduler = self.refresh_scheduler
+        self._config_mtimes[name] = self._config_mtime(strategy)
+
+        # 계좌 단위 정보는 전략 간 공유 (손절 블랙리스트 파일을 서로 덮어쓰지 않도록)
+        primary = self.primary
+        if primary is not None and primary.stop_loss_tracker is not None:
+            strategy.stop_loss_tracker = primary.stop_loss_tracker
+
+        self.strategies[name] = strategy
+
+    @property
+    def primary(self):
+        """첫 번째 전략 (포지션 감시 등 단일 전략 대상 기능에서 사용)"""
+        return next(iter(self.strategies.values()), None)
+
+    @property
+    def api_client(self):
+        """실제 API 클라이언트 (토큰 관리 등)"""
+        return self.hub.client
+
+    def start(self):
+        """백그라운드 작업 시작 (적응형 시세 갱신)"""
+        if self.refresh_scheduler is not None:
+            self.refresh_scheduler.start()
+
+    def stop(self):
+        """백그라운드 작업 중지 (모은 1분봉 저장)"""
+        if self.refresh_scheduler is not None and self.refresh_scheduler.is_running():
+            self.refresh_scheduler.stop()
+        self.flush_minute_bars()
+
+    @staticmethod
+    def _config_mtime(strategy) -> Optional[float]:
+        path = getattr(strategy, 'stocks_config_file', None)
+        try:
+            return os.path.getmtime(path) if path else None
+        except OSError:
+            return None
+
+    def reload_stock_configs(self) -> List[str]:
+        """
+        수정 시각이 바뀐 종목 설정 파일만 다시 로드 (세션 사이 설정 편집 반영)
+
+        Returns:
+            다시 로드한 전략 이름 리스트
+        """
+        reloaded = []
+        for name, strategy in self.strategies.items():
+            mtime = self._config_mtime(strategy)
+            if mtime is None or mtime == self._config_mtimes.get(name) or not hasattr(strategy, '_load_stock_config'):
+                continue
+            strategy._load_stock_config()
+            self._config_mtimes[name] = mtime
+            reloaded.append(name)
+
+        if reloaded:
+            self.logger.info(f"[HOST] 종목 설정 다시 로드: {reloaded}")
+            if self.risk_engine is not None:
+                self.risk_engine.set_symbol_sectors(self._build_symbol_sectors())
+        return reloaded
+
+    def warmup(self, token_step=None) -> Dict[str, Any]:
+        """
+        개장 전 워밍업 - 첫 주기가 데워진 상태(토큰/연결/캐시)에서 돌도록 미리 준비
+
+        단계: 토큰 갱신 → 커넥션 풀 선연결 → 잔고 스냅샷 → 블랙리스트 로드 → 거래소 코드 확인
+        → 전일 종가 일괄 로드 (단계가 실패해도 나머지는 계속 진행)
+
+        Args:
+            token_step: 토큰 확인/재발급 함수 (MarketScheduler.check_and_refresh_token)
+
+        Returns:
+            준비 상태 {'ready', 'finished_at', 'elapsed', 'symbols', 'steps': {단계: {'ok', 'seconds', 'detail'}}}
+        """
+        started = time.perf_counter()
+        steps: Dict[str, Dict[str, Any]] = {}
+
+        def run_step(name: str, fn):
+            step_started = time.perf_counter()
+            try:
+                detail = fn()
+                ok = detail is not False
+            except Exception as e:
+                detail, ok = str(e), False
+                self.logger.error(f"[WARMUP] {name} 단계 실패: {e}")
+            steps[name] = {'ok': ok, 'seconds': round(time.perf_counter() - step_started, 3), 'detail': detail}
+
+        if token_step is not None:
+            run_step('token', lambda: bool(token_step()))
+        run_step('connections', self._warm_connections)
+        run_step('balance', self._warm_balance)
+        symbols = list(dict.fromkeys(self.get_cycle_symbols('sell') + self.get_cycle_symbols('buy')))
+        run_step('blacklist', self._warm_blacklist)
+        run_step('exchanges', lambda: self._warm_exchanges(symbols))
+        run_step('prev_closes', lambda: self._warm_prev_closes(symbols))
+
+        self.readiness = {
+            'ready': all(steps[name]['ok'] for name in WARMUP_REQUIRED_STEPS if name in steps),
+            'finished_at': datetime.now(pytz.timezone(self.market_config.TIMEZONE)).isoformat(timespec='seconds'),
+            'elapsed': round(time.perf_counter() - started, 3),
+            'symbols': len(symbols),
+            'steps': steps
+        }
+        return self.readiness
+
+    def _warm_connections(self):
+        """KIS 호스트 TCP/TLS 선연결 (공용 HTTP 커넥션 풀)"""
+        token_manager = getattr(self.api_client, 'token_manager', None)
+        if token_manager is None:
+            return None
+        result = http.warm_up([token_manager.get_api_url()])
+        return result if not result['failed'] else False
+
+    def _warm_balance(self):
+        """잔고 스냅샷 (캐시 만료 후 새로 조회 - 리스크 엔진/감시 리스너에도 전달)"""
+        self.hub.invalidate_balance()
+        balance = self.hub.get_account_balance()
+        if not balance:
+            return False
+        return {'positions': len(balance.get('positions', [])), 'available_cash': balance.get('available_cash')}
+
+    def _warm_blacklist(self):
+        """손절 블랙리스트 로드 및 만료 정리 (전략 간 공유 트래커는 1번만)"""
+        trackers = {id(s.stop_loss_tracker): s.stop_loss_tracker
+                    for s in self.strategies.values() if getattr(s, 'stop_loss_tracker', None) is not None}
+        if not trackers:
+            return None
+        return sum(tracker.reload() for tracker in trackers.values())
+
+    def _warm_exchanges(self, symbols: List[str]):
+        """거래소 코드 확인 (지원하는 클라이언트만 - 미국 NAS/NYS)"""
+        resolve = getattr(self.api_client, 'resolve_exchanges', None)
+        if resolve is None:
+            return None
+        return f"{resolve(symbols)}/{len(symbols)}"
+
+    def _warm_prev_closes(self, symbols: List[str]):
+        """전일 종가 일괄 로드 (일봉 저장소 갱신 후 로컬 우선, 나머지는 병렬 조회 - 장 날짜 단위 캐시)"""
+        if self.bar_store is not None:
+            self._update_bar_store('sell')
+            self._update_bar_store('buy')
+        if not symbols:
+            return "0/0"
+        with ThreadPoolExecutor(max_workers=WARMUP_WORKERS, thread_name_prefix=f"Warmup-{self.market.upper()}") as pool:
+            closes = list(pool.map(self.hub.get_previous_close, symbols))
+        loaded = sum(1 for close in closes if close)
+        return f"{loaded}/{len(symbols)}"
+
+    def flush_minute_bars(self) -> int:
+        """모은 1분봉을 저장소에 저장 (장 마감 시 호출)"""
+        if self.minute_bars is None:
+            return 0
+        return self.minute_bars.flush(complete_only=True)
+
+    def get_cycle_symbols(self, kind: str) -> List[str]:
+        """
+        주기 조회 대상 종목 (선조회용)
+
+        Args:
+            kind: 'buy' (필터 + 감시 종목) 또는 'sell' (보유 종목)
+        """
+        symbols = []
+        if kind == 'sell':
+            balance = self.hub.get_account_balance()
+            if balance:
+                symbols = [pos['symbol'] for pos in balance.get('positions', []) if pos.get('quantity', 0) > 0]
+            return symbols
+
+        for strategy in self.strategies.values():
+            symbols.extend(strategy.get_filter_stocks())
+            symbols.extend(strategy.get_watch_list())
+            for sector_info in (strategy.get_sectors() or {}).values():
+                symbols.extend(sector_info.get('filter_stocks', {}))
+                symbols.extend(sector_info.get('watch_list', []))
+        return list(dict.fromkeys(symbols))
+
+    def prefetch(self, kind: str, cycle_at: float) -> bool:
+        """
+        다음 주기 선조회 예약
+
+        Args:
+            kind: 'buy' 또는 'sell'
+            cycle_at: 주기 예정 시각 (epoch 초)
+        """
+        if self.prefetcher is None:
+            return False
+        return self.prefetcher.schedule(kind, cycle_at)
+
+    def _run_timed(self, kind: str, method: str, scheduled_at: Optional[float]) -> Dict[str, Any]:
+        """주기 실행 + 예정 시각 대비 판단 시작/완료 시각 기록"""
+        self._update_bar_store(kind)
+        hits_before = self.hub.stats['price_hits']
+        requests_before = self.hub.stats['price_requests']
+        started_at = time.time()
+
+        result = self._run_all(method)
+
+        finished_at = time.time()
+        job = self.prefetcher.get_job(kind) if self.prefetcher is not None else None
+        prefetched = job is not None and scheduled_at is not None and abs(job['cycle_at'] - scheduled_at) < 1
+
+        timing = {
+            'kind': kind,
+            'scheduled_at': datetime.fromtimestamp(scheduled_at).isoformat() if scheduled_at else None,
+            'start_delay': round(started_at - scheduled_at, 3) if scheduled_at else None,
+            'decision_seconds': round(finished_at - started_at, 3),
+            'finish_delay': round(finished_at - scheduled_at, 3) if scheduled_at else None,
+            'prefetched': job['fetched'] if prefetched else 0,
+            'price_hits': self.hub.stats['price_hits'] - hits_before,
+            'price_requests': self.hub.stats['price_requests'] - requests_before
+        }
+        self.cycle_timings.append(timing)
+        result['timing'] = timing
+        return result
+
+    def _run_all(self, method: str) -> Dict[str, Any]:
+        """모든 전략의 매수/매도 전략 실행 후 결과 병합"""
+        orders = []
+        messages = []
+        self._sync_realized_profit()
+
+        for name, strategy in self.strategies.items():
+            try:
+                result = getattr(strategy, method)()
+            except Exception as e:
+                self.logger.error(f"[HOST] {name} {method} 오류: {e}")
+                result = {'executed': False, 'orders': [], 'message': str(e)}
+
+            for order in result.get('orders', []):
+                orders.append({**order, 'strategy': name})
+            messages.append(f"{name}: {result.get('message', '')}")
+
+        return {
+            'executed': len(orders) > 0,
+            'orders': orders,
+            'message': ', '.join(messages)
+        }
+
+    def execute_buy_strategy(self, scheduled_at: Optional[float] = None) -> Dict[str, Any]:
+        """
+        전체 전략 매수 실행
+
+        Args:
+            scheduled_at: 주기 예정 시각 (epoch 초, 시각 기록용)
+        """
+        return self._run_timed('buy', 'execute_buy_strategy', scheduled_at)
+
+    def execute_sell_strategy(self, scheduled_at: Optional[float] = None) -> Dict[str, Any]:
+        """
+        전체 전략 매도 실행
+
+        Args:
+            scheduled_at: 주기 예정 시각 (epoch 초, 시각 기록용)
+        """
+        return self._run_timed('sell', 'execute_sell_strategy', scheduled_at)
+
+    def get_status(self) -> Dict[str, Any]:
+        """공유 데이터/주문 디스패처 상태 반환"""
+        status = {
+            'strategies': list(self.strategies.keys()),
+            'data': self.hub.get_stats(),
+            'dispatcher': self.dispatcher.get_status()
+        }
+        if self.refresh_scheduler is not None:
+            status['refresh'] = self.refresh_scheduler.get_stats()
+        if self.prefetcher is not None:
+            status['prefetch'] = self.prefetcher.get_stats()
+        if self.bar_store is not None:
+            status['bar_store'] = self.bar_store.get_stats()
+        if self.minute_bars is not None:
+            status['minute_bars'] = self.minute_bars.get_stats()
+        status['cycle_timings'] = list(self.cycle_timings)
+        status['readiness'] = self.readiness
+        return status
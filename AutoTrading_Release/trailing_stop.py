@@ -0,0 +1,327 @@
+"""
+트레일링 스탑 추적 시스템
+
+보유 종목별 최고가(high-water mark)를 기록하고, 최고가 대비 일정 비율 이상
+하락하면 매도 신호를 낸다. 고정 익절/손절과 별개로 동작하며 설정은 종목 설정
+파일(kr_stocks_config.json / us_stocks_config.json)의 "trailing_stop" 블록에서
+시장 단위로, 섹터 구조 사용 시 섹터별 "trailing_stop" 블록으로 덮어쓴다.
+
+    "trailing_stop": {
+        "enabled": true,
+        "trail_rate": 0.05,       # 최고가 대비 5% 하락 시 매도
+        "activation_rate": 0.03   # 평균단가 대비 +3% 도달 후부터 추적 (0이면 즉시)
+    }
+
+- 시세 1건당 O(1) 갱신 (최고가 비교만, 잔고 조회 없음)
+- JSON 파일 영구 저장 (재시작 시 최고가 유지), 원자적 쓰기 + .bak 백업
+- 잦은 시세 갱신으로 인한 디스크 쓰기는 save_interval 단위로 묶어서 저장
+"""
+import json
+import os
+import threading
+import time
+import logging
+from datetime import datetime
+from typing import Optional, Dict, List, Any
+import pytz
+
+from common.price_trigger import PriceTrigger, BELOW
+
+
+# 기본 트레일링 스탑 설정 (설정 파일에 블록이 없으면 비활성)
+DEFAULT_TRAILING_CONFIG = {
+    'enabled': False,
+    'trail_rate': 0.05,
+    'activation_rate': 0.0
+}
+TRAILING_SAVE_INTERVAL_SECONDS = 30  # 최고가 변경분 저장 주기 (초)
+
+
+class TrailingStopTracker:
+    """
+    트레일링 스탑 관리 클래스
+
+    주요 기능:
+    1. 종목별 최고가 O(1) 갱신 (update)
+    2. 시장/섹터별 설정 (trail_rate, activation_rate)
+    3. JSON 파일 영구 저장 (원자적 쓰기, .bak 백업)
+    4. PriceTriggerIndex용 손절 가격선 제공 (get_trigger)
+    """
+
+    def __init__(self,
+                 state_file: str,
+                 timezone: str,
+                 config: Dict[str, Any] = None,
+                 sector_configs: Dict[str, Dict[str, Any]] = None,
+                 symbol_sectors: Dict[str, str] = None,
+                 save_interval: float = TRAILING_SAVE_INTERVAL_SECONDS):
+        """
+        Args:
+            state_file: 최고가 저장 JSON 파일 경로
+            timezone: 타임존 (예: "Asia/Seoul", "US/Eastern")
+            config: 시장 기본 설정 (DEFAULT_TRAILING_CONFIG 키)
+            sector_configs: {sector_key: 설정} 섹터별 덮어쓰기
+            symbol_sectors: {symbol: sector_key} 종목 → 섹터 매핑
+            save_interval: 최고가 변경분 저장 주기 (초, 0이면 매번 저장)
+        """
+        self.state_file = state_file
+        self.backup_file = f"{state_file}.bak"
+        self.timezone = pytz.timezone(timezone)
+        self.save_interval = save_interval
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+        self.config = {**DEFAULT_TRAILING_CONFIG, **(config or {})}
+        self.sector_configs = {
+            key: {**self.config, **cfg} for key, cfg in (sector_configs or {}).items()
+        }
+        self.symbol_sectors = symbol_sectors or {}
+
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._last_save = 0.0
+
+        # {symbol: {'avg_price': float, 'high': float, 'updated': str}}
+        self.marks = self._load_marks()
+
+    @classmethod
+    def from_stocks_config(cls, stocks_config: Dict[str, Any], state_file: str,
+                           timezone: str, **kwargs) -> Optional['TrailingStopTracker']:
+        """
+        종목 설정 파일 내용으로 생성 (시장/섹터 어디에서도 활성화되지 않으면 None)
+
+        Args:
+            stocks_config: 종목 설정 JSON 딕셔너리
+            state_file: 최고가 저장 파일
+            timezone: 타임존
+        """
+        config = stocks_config.get('trailing_stop') or {}
+        sector_configs = {}
+        symbol_sectors = {}
+
+        for sector_key, sector_info in (stocks_config.get('sectors') or {}).items():
+            if 'trailing_stop' in sector_info:
+                sector_configs[sector_key] = sector_info['trailing_stop'] or {}
+            for symbol in sector_info.get('watch_list', []):
+                symbol_sectors.setdefault(symbol, sector_key)
+
+        enabled = config.get('enabled', False) or any(
+            cfg.get('enabled', config.get('enabled', False)) for cfg in sector_configs.values()
+        )
+        if not enabled:
+            return None
+
+        return cls(state_file, timezone, config=config, sector_configs=sector_configs,
+                   symbol_sectors=symbol_sectors, **kwargs)
+
+    def _load_marks(self) -> Dict[str, Dict[str, Any]]:
+        """
+        최고가 JSON 파일 로드
+
+        실패 시 .bak 파일에서 복구 시도
+        """
+        for path, label in ((self.state_file, "로드"), (self.backup_file, "백업 파일에서 복구")):
+            if not os.path.exists(path):
+                continue
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    marks = json.load(f)
+                self.logger.info(f"트레일링 스탑 최고가 {label} 완료: {len(marks)}개 종목")
+                return marks
+            except Exception as e:
+                self.logger.error(f"트레일링 스탑 파일 {label} 실패: {e}")
+
+        return {}
+
+    def _save_marks(self):
+        """
+        최고가를 JSON 파일에 저장 (원자적 쓰기)
+
+        1. 임시 파일에 기록
+        2. 백업 파일 생성
+        3. os.replace()로 원자적 교체
+        """
+        temp_file = f"{self.state_file}.tmp"
+
+        try:
+            with self._lock:
+                snapshot = {symbol: dict(mark) for symbol, mark in self.marks.items()}
+                self._dirty = False
+                self._last_save = time.monotonic()
+
+            with open(temp_file, 'w', encoding='utf-8') as f:
+                json.dump(snapshot, f, ensure_ascii=False, indent=2)
+
+            if os.path.exists(self.state_file):
+                try:
+                    with open(self.state_file, 'r', encoding='utf-8') as src:
+                        with open(self.backup_file, 'w', encoding='utf-8') as dst:
+                            dst.write(src.read())
+                except Exception as e:
+                    self.logger.warning(f"백업 파일 생성 실패: {e}")
+
+            os.replace(temp_file, self.state_file)
+
+        except Exception as e:
+            self.logger.error(f"트레일링 스탑 저장 실패: {e}")
+            self._dirty = True
+            if os.path.exists(temp_file):
+                try:
+                    os.remove(temp_file)
+                except OSError:
+                    pass
+
+    def _maybe_save(self):
+        """변경분이 있고 저장 주기가 지났으면 저장"""
+        if self._dirty and time.monotonic() - self._last_save >= self.save_interval:
+            self._save_marks()
+
+    def flush(self):
+        """미저장 변경분 즉시 저장 (종료 시 호출)"""
+        if self._dirty:
+            self._save_marks()
+
+    def get_config(self, symbol: str) -> Dict[str, Any]:
+        """종목에 적용되는 설정 (섹터 설정 우선)"""
+        sector = self.symbol_sectors.get(symbol)
+        if sector and sector in self.sector_configs:
+            return self.sector_configs[sector]
+        return self.config
+
+    def is_enabled(self, symbol: str) -> bool:
+        """종목에 트레일링 스탑이 적용되는지 여부"""
+        return bool(self.get_config(symbol).get('enabled'))
+
+    def sync_positions(self, positions: List[Dict[str, Any]]):
+        """
+        잔고 스냅샷으로 추적 대상 동기화
+
+        - 새 보유 종목: 평균단가/현재가 중 높은 값으로 최고가 초기화
+        - 추가 매수로 평균단가가 바뀐 종목: 평균단가만 갱신 (최고가 유지)
+        - 더 이상 보유하지 않는 종목: 삭제
+
+        Args:
+            positions: get_account_balance()의 positions 항목 리스트
+        """
+        changed = False
+        held = set()
+
+        with self._lock:
+            for pos in positions:
+                symbol = pos['symbol']
+                avg_price = pos.get('avg_price', 0)
+                if avg_price <= 0 or not self.is_enabled(symbol):
+                    continue
+                held.add(symbol)
+
+                current_price = pos.get('current_price', 0) or 0
+                mark = self.marks.get(symbol)
+                if mark is None:
+                    self.marks[symbol] = {
+                        'avg_price': avg_price,
+                        'high': max(avg_price, current_price),
+                        'updated': datetime.now(self.timezone).isoformat()
+                    }
+                    changed = True
+                else:
+                    if mark['avg_price'] != avg_price:
+                        mark['avg_price'] = avg_price
+                        changed = True
+                    if current_price > mark['high']:
+                        mark['high'] = current_price
+                        mark['updated'] = datetime.now(self.timezone).isoformat()
+                        changed = True
+
+            for symbol in [s for s in self.marks if s not in held]:
+                del self.marks[symbol]
+                changed = True
+
+            if changed:
+                self._dirty = True
+
+        self._maybe_save()
+
+    def update(self, symbol: str, price: float) -> bool:
+        """
+        시세 1건으로 최고가 갱신 (O(1))
+
+        Args:
+            symbol: 종목 코드
+            price: 현재가
+
+        Returns:
+            True: 최고가 갱신됨 (손절 가격선 상승), False: 변경 없음
+        """
+        mark = self.marks.get(symbol)
+        if mark is None or price <= mark['high']:
+            return False
+
+        # 락 밖 비교는 빠른 거절용 - 감시 스레드와 매도 주기가 동시에 통과할 수 있어 락 안에서 다시 비교
+        with self._lock:
+            mark = self.marks.get(symbol)
+            if mark is None or price <= mark['high']:
+                return False
+            mark['high'] = price
+            mark['updated'] = datetime.now(self.timezone).isoformat()
+            self._dirty = True
+
+        self._maybe_save()
+        return True
+
+    def get_stop_price(self, symbol: str) -> Optional[float]:
+        """
+        현재 트레일링 손절 가격 (미추적/미활성 시 None)
+
+        최고가가 평균단가 * (1 + activation_rate)에 도달해야 활성화
+        """
+        mark = self.marks.get(symbol)
+        if mark is None:
+            return None
+
+        config = self.get_config(symbol)
+        if mark['high'] < mark['avg_price'] * (1 + config.get('activation_rate', 0)):
+            return None
+        return mark['high'] * (1 - config['trail_rate'])
+
+    def is_triggered(self, symbol: str, price: float) -> bool:
+        """최고가 갱신 후 트레일링 손절 발동 여부 확인"""
+        self.update(symbol, price)
+        stop_price = self.get_stop_price(symbol)
+        return stop_price is not None and price <= stop_price
+
+    def get_trigger(self, symbol: str) -> Optional[PriceTrigger]:
+        """PriceTriggerIndex용 트레일링 손절 가격선"""
+        stop_price = self.get_stop_price(symbol)
+        if stop_price is None:
+            return None
+        return PriceTrigger(stop_price, BELOW, 'trailing_stop')
+
+    def remove(self, symbol: str):
+        """매도 완료 종목 삭제"""
+        with self._lock:
+            if self.marks.pop(symbol, None) is None:
+                return
+            self._dirty = True
+        self._maybe_save()
+
+    def get_status(self) -> Dict[str, Any]:
+        """
+        트레일링 스탑 전체 상태 반환 (모니터링용)
+
+        Returns:
+            {'config': dict, 'sectors': dict, 'positions': list}
+        """
+        positions = []
+        for symbol, mark in list(self.marks.items()):
+            positions.append({
+                'symbol': symbol,
+                'avg_price': mark['avg_price'],
+                'high': mark['high'],
+                'stop_price': self.get_stop_price(symbol),
+                'updated': mark.get('updated')
+            })
+
+        return {
+            'config': self.config,
+            'sectors': self.sector_configs,
+            'positions': positions
+        }
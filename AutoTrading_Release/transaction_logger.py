@@ -5,19 +5,23 @@ import csv
 import os
 from datetime import datetime
 import pytz
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Callable
 
 class TransactionLogger:
-    def __init__(self, csv_dir: str = "transaction_logs", prefix: str = ""):
+    def __init__(self, csv_dir: str = "transaction_logs", prefix: str = "",
+                 clock: Optional[Callable] = None):
         """
         거래기록 CSV 저장기 초기화
 
         Args:
             csv_dir: CSV 파일 저장 디렉토리
             prefix: 파일명 접두사 (예: "kr" -> "kr_trading_log_...")
+            clock: 현재 시각 함수 clock(tz) -> datetime (백테스트용, 없으면 실제 시각)
+                   지정하면 기록 시각의 날짜가 바뀔 때 날짜별 파일도 전환
         """
         self.csv_dir = csv_dir
         self.prefix = prefix
+        self.clock = clock
 
         # 한국 시장용은 Asia/Seoul, 미국은 US/Eastern
         if prefix == "kr":
@@ -28,11 +32,7 @@ class TransactionLogger:
         # 하위 호환성을 위해 et_tz도 유지
         self.et_tz = self.tz
         
-        # 디렉토리 생성
-        if not os.path.exists(csv_dir):
-            os.makedirs(csv_dir)
-        
-        # CSV 파일명 (날짜별)
+        # CSV 파일명 (날짜별, 디렉토리/헤더는 첫 기록 시 생성 - 기록 없는 실행은 파일을 남기지 않음)
         self.csv_filename = self._get_csv_filename()
         self.csv_path = os.path.join(csv_dir, self.csv_filename)
         
@@ -54,19 +54,23 @@ class TransactionLogger:
             'balance_total',
             'notes'
         ]
-        
-        # CSV 파일 초기화
-        self._init_csv_file()
     
+    def _now(self) -> datetime:
+        """현재 시각 (clock 지정 시 해당 시각)"""
+        if self.clock is not None:
+            return self.clock(self.tz)
+        return datetime.now(self.tz)
+
     def _get_csv_filename(self) -> str:
         """현재 날짜로 CSV 파일명 생성"""
-        now = datetime.now(self.tz)
+        now = self._now()
         if self.prefix:
             return f"{self.prefix}_trading_log_{now.strftime('%Y%m%d')}.csv"
         return f"trading_log_{now.strftime('%Y%m%d')}.csv"
     
     def _init_csv_file(self):
-        """CSV 파일 초기화 (헤더 작성)"""
+        """CSV 파일 초기화 (디렉토리 생성, 헤더 작성)"""
+        os.makedirs(self.csv_dir, exist_ok=True)
         # 파일이 없거나 비어있으면 헤더 작성 (BOM 포함 UTF-8로 Excel 호환성 확보)
         if not os.path.exists(self.csv_path) or os.path.getsize(self.csv_path) == 0:
             with open(self.csv_path, 'w', newline='', encoding='utf-8-sig') as csvfile:
@@ -102,7 +106,16 @@ class TransactionLogger:
             notes: 추가 메모
         """
         try:
-            now = datetime.now(self.tz)
+            now = self._now()
+
+            # 시뮬레이션 시각은 날짜가 계속 바뀌므로 날짜별 파일 전환
+            if self.clock is not None:
+                filename = self._get_csv_filename()
+                if filename != self.csv_filename:
+                    self.csv_filename = filename
+                    self.csv_path = os.path.join(self.csv_dir, filename)
+            if not os.path.exists(self.csv_path):
+                self._init_csv_file()
 
             # 총 거래금액 계산
             total_amount = quantity * price if quantity and price else 0
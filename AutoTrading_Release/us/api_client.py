@@ -5,9 +5,8 @@ import os
 import sys
 import logging
 import time
-import requests
 import pickle
-from datetime import datetime
+from datetime import date, datetime, timedelta
 from typing import Optional, Dict, Any, List
 
 # 프로젝트 루트를 경로에 추가
@@ -16,6 +15,9 @@ if project_root not in sys.path:
     sys.path.insert(0, project_root)
 
 from common.base_api import BaseAPIClient
+from common import http
+from common.bar_store import parse_daily_rows
+from common.quote_fallback import BulkQuoteFallback
 from us.config import USConfig
 from us.token_manager import USTokenManager
 from currency_utils import format_usd_krw
@@ -33,7 +35,7 @@ class USAPIClient(BaseAPIClient):
 
     BaseAPIClient를 상속하여 미국 주식 거래에 맞게 구현
     - 이중 거래소 지원 (NASDAQ/NYSE)
-    - mojito2 라이브러리 연동
+    - 시세/일봉은 공용 HTTP 계층으로 직접 호출, 주문은 mojito2 (공용 호출 예산 차감)
     - yfinance 폴백 지원
     """
 
@@ -46,6 +48,9 @@ class USAPIClient(BaseAPIClient):
         # 거래소 캐시
         self.exchange_cache: Dict[str, str] = {}  # {symbol: "NAS" or "NYS"}
 
+        # yfinance 일괄 폴백 (KIS 실패 시 조회된 종목 전체를 한 번에 받아 현재가 캐시에 채움)
+        self.quote_fallback = BulkQuoteFallback(timezone=USConfig.TIMEZONE, on_quote=self.set_cached_price)
+
         # mojito2 클라이언트 초기화
         self.nasdaq_broker = None
         self.nyse_broker = None
@@ -108,6 +113,10 @@ class USAPIClient(BaseAPIClient):
                 mock=USConfig.is_paper_trading()
             )
 
+            # mojito2는 실전/모의 URL을 고정 사용하므로 설정 URL로 맞춤 (로컬 에뮬레이터 지원)
+            for broker in (self.nasdaq_broker, self.nyse_broker):
+                broker.base_url = USConfig.get_api_url()
+
             self.broker = self.nasdaq_broker
             self.logger.info(f"이중 거래소 브로커 초기화 완료 (나스닥 + 뉴욕)")
             self.logger.info(f"모의투자 모드: {USConfig.is_paper_trading()}")
@@ -145,6 +154,37 @@ class USAPIClient(BaseAPIClient):
         except (ValueError, TypeError):
             return default
 
+    def _overseas_quote(self, path: str, tr_id: str, params: Dict[str, str]) -> Optional[Dict[str, Any]]:
+        """해외주식 시세 API 직접 호출 (공용 HTTP 세션/호출 예산 사용, 응답 JSON 반환)"""
+        access_token = self.token_manager.get_valid_token()
+        if not access_token:
+            return None
+
+        app_key, app_secret, _ = USConfig.get_credentials()
+        headers = {
+            "content-type": "application/json",
+            "authorization": f"Bearer {access_token}",
+            "appkey": app_key,
+            "appsecret": app_secret,
+            "tr_id": tr_id,
+            "custtype": "P"
+        }
+
+        response = http.get(f"{USConfig.get_api_url()}{path}", headers=headers, params=params, timeout=10)
+        response.raise_for_status()
+        return response.json()
+
+    def _fetch_price_data(self, symbol: str, excd: str) -> Optional[Dict[str, Any]]:
+        """해외주식 현재체결가 (HHDFS00000300, mojito2 fetch_price와 같은 응답)"""
+        return self._overseas_quote('/uapi/overseas-price/v1/quotations/price', 'HHDFS00000300',
+                                    {"AUTH": "", "EXCD": excd, "SYMB": symbol})
+
+    def _fetch_daily_data(self, symbol: str, excd: str, end_day: str = "") -> Optional[Dict[str, Any]]:
+        """해외주식 기간별시세 일봉 (HHDFS76240000, 수정주가, mojito2 fetch_ohlcv_overesea와 같은 응답)"""
+        return self._overseas_quote('/uapi/overseas-price/v1/quotations/dailyprice', 'HHDFS76240000',
+                                    {"AUTH": "", "EXCD": excd, "SYMB": symbol,
+                                     "GUBN": "0", "BYMD": end_day, "MODP": "1"})
+
     def _get_broker_for_symbol(self, symbol: str) -> tuple:
         """종목에 맞는 브로커 자동 선택"""
         # 캐시 확인
@@ -173,7 +213,7 @@ class USAPIClient(BaseAPIClient):
 
         # 순차 시도 (나스닥 → NYSE)
         try:
-            price_data = self.nasdaq_broker.fetch_price(symbol)
+            price_data = self._fetch_price_data(symbol, "NAS")
             if price_data and price_data.get('rt_cd') == '0':
                 output = price_data.get('output', {})
                 if output.get('last', '').strip():
@@ -183,7 +223,7 @@ class USAPIClient(BaseAPIClient):
             pass
 
         try:
-            price_data = self.nyse_broker.fetch_price(symbol)
+            price_data = self._fetch_price_data(symbol, "NYS")
             if price_data and price_data.get('rt_cd') == '0':
                 output = price_data.get('output', {})
                 if output.get('last', '').strip():
@@ -194,6 +234,20 @@ class USAPIClient(BaseAPIClient):
 
         return None, None
 
+    def resolve_exchanges(self, symbols: List[str]) -> int:
+        """
+        거래소 코드 미리 확인 (개장 전 워밍업용, 확인된 종목은 exchange_cache에 저장)
+
+        Returns:
+            거래소가 확인된 종목 수
+        """
+        resolved = 0
+        for symbol in symbols:
+            broker, _ = self._get_broker_for_symbol(symbol)
+            if broker is not None:
+                resolved += 1
+        return resolved
+
     def _detect_exchange_yfinance(self, symbol: str) -> Optional[str]:
         """yfinance로 거래소 감지"""
         try:
@@ -255,7 +309,7 @@ class USAPIClient(BaseAPIClient):
                 "CTX_AREA_NK200": ""
             }
 
-            response = requests.get(url, headers=headers, params=params, timeout=10)
+            response = http.get(url, headers=headers, params=params, timeout=10)
             response.raise_for_status()
             balance = response.json()
 
@@ -344,16 +398,18 @@ class USAPIClient(BaseAPIClient):
 
     def get_current_price(self, symbol: str) -> Optional[float]:
         """현재가 조회"""
+        self.quote_fallback.track([symbol])
         try:
             broker, exchange_name = self._get_broker_for_symbol(symbol)
 
             if broker:
-                price_data = broker.fetch_price(symbol)
+                price_data = self._fetch_price_data(symbol, self.exchange_cache[symbol])
                 if price_data and price_data.get('rt_cd') == '0':
                     output = price_data.get('output', {})
                     price = self._safe_float(output.get('last'))
                     if price > 0:
                         self.logger.debug(f"{symbol} 현재가: ${price:.2f} ({exchange_name})")
+                        self._notify_price(symbol, price, self._safe_float(output.get('tvol')))  # 당일 거래량
                         return price
 
             # yfinance 폴백
@@ -364,18 +420,14 @@ class USAPIClient(BaseAPIClient):
             return None
 
     def _fetch_price_from_yfinance(self, symbol: str) -> Optional[float]:
-        """yfinance로 현재가 조회"""
+        """yfinance로 현재가 조회 (만료된 조회 종목 전체를 일괄 다운로드)"""
         try:
-            import yfinance as yf
-
-            ticker = yf.Ticker(symbol)
-            hist = ticker.history(period="1d")
-
-            if not hist.empty:
-                price = hist['Close'].iloc[-1]
-                if price > 0:
-                    self.logger.info(f"{symbol} 현재가: ${price:.2f} (yfinance)")
-                    return float(price)
+            quote = self.quote_fallback.get_quote(symbol)
+            if quote:
+                price = quote['price']
+                self.logger.info(f"{symbol} 현재가: ${price:.2f} (yfinance)")
+                self._notify_price(symbol, price, quote['volume'])
+                return price
 
             return None
 
@@ -389,7 +441,7 @@ class USAPIClient(BaseAPIClient):
             broker, _ = self._get_broker_for_symbol(symbol)
 
             if broker:
-                price_data = broker.fetch_price(symbol)
+                price_data = self._fetch_price_data(symbol, self.exchange_cache[symbol])
                 if price_data and price_data.get('rt_cd') == '0':
                     output = price_data.get('output', {})
 
@@ -399,19 +451,57 @@ class USAPIClient(BaseAPIClient):
                         if val > 0:
                             return val
 
-            # yfinance 폴백
-            try:
-                import yfinance as yf
-                ticker = yf.Ticker(symbol)
-                info = ticker.info
-                return info.get('previousClose')
-            except Exception:
-                pass
+            # yfinance 폴백 (현재가와 같은 일괄 다운로드 결과 사용)
+            quote = self.quote_fallback.get_quote(symbol)
+            return quote['prev_close'] if quote else None
 
+        except Exception as e:
+            self.logger.error(f"{symbol} 전일 종가 조회 오류: {e}")
             return None
 
+    def fetch_daily_bars(self, symbol: str, start: date, end: date) -> Optional[List[tuple]]:
+        """
+        기간 일봉 조회 (BarStore 갱신용)
+
+        해외주식 기간별시세(HHDFS76240000)는 종료일(BYMD)부터 최대 100건을 반환하므로 종료일을 당기며 반복
+
+        Args:
+            symbol: 종목 코드
+            start: 시작 날짜 (포함)
+            end: 종료 날짜 (포함)
+
+        Returns:
+            [(YYYYMMDD, open, high, low, close, volume), ...] 날짜 오름차순 (실패 시 None)
+        """
+        try:
+            broker, _ = self._get_broker_for_symbol(symbol)
+            if not broker:
+                return None
+
+            start_str = start.strftime('%Y%m%d')
+            end_str = end.strftime('%Y%m%d')
+            bars = {}
+            while end_str >= start_str:
+                daily_data = self._fetch_daily_data(symbol, self.exchange_cache[symbol], end_day=end_str)
+                if not daily_data or daily_data.get('rt_cd') != '0':
+                    self.logger.warning(f"{symbol} 일봉 조회 실패: "
+                                        f"{daily_data.get('msg1') if daily_data else 'API 응답 없음'}")
+                    return None
+
+                rows = parse_daily_rows(daily_data.get('output2'))
+                for row in rows:
+                    bars[row[0]] = row
+
+                oldest = min((row[0] for row in rows), default=None)
+                if oldest is None or oldest <= int(start_str):
+                    break
+                end_str = (datetime.strptime(str(oldest), '%Y%m%d') - timedelta(days=1)).strftime('%Y%m%d')
+                time.sleep(0.1)  # Rate limiting
+
+            return [bars[day] for day in sorted(bars) if int(start_str) <= day <= int(end.strftime('%Y%m%d'))]
+
         except Exception as e:
-            self.logger.error(f"{symbol} 전일 종가 조회 오류: {e}")
+            self.logger.error(f"{symbol} 일봉 조회 오류: {e}")
             return None
 
     def place_order(self, symbol: str, side: str, quantity: int,
@@ -428,6 +518,8 @@ class USAPIClient(BaseAPIClient):
             self.logger.info(f"수량: {quantity}주")
             self.logger.info(f"가격: {'시장가' if price is None else f'${price:.2f}'}")
 
+            # mojito2 주문은 자체 requests 호출 → 공용 호출 예산만 차감
+            http.acquire(f"US {side} order {symbol}")
             if side.lower() == 'buy':
                 if price:
                     result = broker.create_limit_buy_order(symbol, price, quantity)
@@ -32,13 +32,18 @@ class USStrategy(BaseStrategy):
     def __init__(self, api_client: USAPIClient = None,
                  profit_threshold: float = None,
                  enable_filter_check: bool = True,
-                 check_previous_sell_price: bool = True):
+                 check_previous_sell_price: bool = True,
+                 stocks_config_file: str = None,
+                 state_dir: str = None):
         """
         Args:
             api_client: 미국 주식 API 클라이언트 (없으면 자동 생성)
             profit_threshold: 목표 수익률 (없으면 config에서 로드)
             enable_filter_check: 필터 체크 활성화 여부
             check_previous_sell_price: 이전 매도가 체크 여부
+            stocks_config_file: 종목 설정 파일 (없으면 USConfig.STOCKS_CONFIG_FILE)
+            state_dir: 상태 파일(거래 기록/손절 블랙리스트/매도가/트레일링 최고가) 디렉토리
+                       (없으면 현재 디렉토리, 백테스트는 결과 디렉토리를 지정해 실거래 상태와 분리)
         """
         if api_client is None:
             api_client = USAPIClient()
@@ -53,9 +58,16 @@ class USStrategy(BaseStrategy):
             check_previous_sell_price
         )
 
-        self.transaction_logger = TransactionLogger()
+        self.state_dir = state_dir
+        self.transaction_logger = TransactionLogger(csv_dir=self._state_path("transaction_logs"))
         self._filter_stocks = {}
         self._watch_list = []
+        self.stocks_config_file = stocks_config_file or USConfig.STOCKS_CONFIG_FILE
+
+        # 마지막 매도가 영구 저장소 (프로세스 내 전략 간 공유)
+        from sell_price_store import get_sell_price_store
+        self.sell_price_store = get_sell_price_store(self._state_path("us_last_sell_prices.json"), "us",
+                                                     USConfig.TIMEZONE)
 
         # 설정 파일 로드
         self._load_stock_config()
@@ -63,10 +75,10 @@ class USStrategy(BaseStrategy):
     def _load_stock_config(self):
         """종목 설정 파일 로드"""
         try:
-            config_file = USConfig.STOCKS_CONFIG_FILE
+            config_file = self.stocks_config_file
 
             # us_stocks_config.json이 없으면 기존 stocks_config.json 사용
-            if not os.path.exists(config_file):
+            if not os.path.exists(config_file) and config_file == USConfig.STOCKS_CONFIG_FILE:
                 config_file = "stocks_config.json"
 
             if not os.path.exists(config_file):
@@ -86,6 +98,20 @@ class USStrategy(BaseStrategy):
 
             self.logger.info(f"US 설정 로드: filter={len(self._filter_stocks)}종목, watch={len(self._watch_list)}종목")
 
+            # 조건식 (매수 게이트 / 매수 후보 조건)
+            self._load_conditions(config)
+
+            # 재매수 방지 매도가 만료 기간 (일, 없으면 만료 없음)
+            self.sell_price_expiry_days = config.get('sell_price_expiry_days')
+            if self.sell_price_expiry_days is not None and self.sell_price_store is not None:
+                purged = self.sell_price_store.purge_expired(self.sell_price_expiry_days)
+                if purged:
+                    self.logger.info(f"만료된 매도가 기록 {purged}종목 정리 ({self.sell_price_expiry_days}일 경과)")
+
+            # 트레일링 스탑 (US는 고정 손절이 없으므로 하락 방어 수단)
+            state_file = self._trailing_state_file("us_trailing_stop.json", USConfig.STOCKS_CONFIG_FILE)
+            self._setup_trailing_stop(config, state_file, USConfig.TIMEZONE)
+
         except Exception as e:
             self.logger.error(f"설정 파일 로드 실패: {e}")
 
@@ -183,6 +209,7 @@ class USStrategy(BaseStrategy):
 
                     # 사용 가능 금액 업데이트
                     available_cash -= (quantity * current_price)
+                    self.invalidate_balance_snapshot()
 
                     # 트랜잭션 로그
                     self.transaction_logger.log_buy_order(
@@ -211,14 +238,15 @@ class USStrategy(BaseStrategy):
             self.logger.info("=== 미국 주식 매도 전략 실행 ===")
             self.stats['sell_attempts'] += 1
 
-            # 잔고 조회
-            balance = self.api_client.get_account_balance()
+            # 잔고 조회 (포지션 감시용 스냅샷 갱신 겸용)
+            balance = self.refresh_balance_snapshot()
             if not balance:
                 return {'executed': False, 'orders': [], 'message': '잔고 조회 실패'}
 
             positions = balance.get('positions', [])
             if not positions:
                 return {'executed': False, 'orders': [], 'message': '보유 종목 없음'}
+            snapshot_time = self.get_balance_snapshot_time()
 
             # 수익률 순으로 정렬 (높은 것부터)
             positions.sort(key=lambda x: x.get('profit_rate', 0), reverse=True)
@@ -229,40 +257,17 @@ class USStrategy(BaseStrategy):
                 symbol = pos['symbol']
                 profit_rate = pos.get('profit_rate', 0) / 100  # 퍼센트 → 소수
 
-                # 매도 조건 확인
-                if not self.should_sell(symbol, profit_rate):
+                # 매도 조건 확인 (고정 익절/손절 → 트레일링 스탑)
+                if self.should_sell(symbol, profit_rate):
+                    reason = None
+                elif self.check_trailing_stop(pos):
+                    reason = 'trailing_stop'
+                else:
                     continue
 
-                quantity = pos.get('sellable_qty', 0)
-                if quantity <= 0:
-                    continue
-
-                current_price = pos.get('current_price', 0)
-
-                # 주문 실행
-                result = self.api_client.place_order(symbol, 'sell', quantity)
-
-                if result['success']:
-                    self.stats['sell_successes'] += 1
-
-                    # 매도 가격 기록
-                    self.record_sell_price(symbol, current_price)
-
-                    executed_orders.append({
-                        'symbol': symbol,
-                        'quantity': quantity,
-                        'price': current_price,
-                        'profit_rate': profit_rate,
-                        'order_id': result['order_id']
-                    })
-
-                    # 트랜잭션 로그
-                    self.transaction_logger.log_sell_order(
-                        symbol, quantity, current_price,
-                        pos.get('profit_loss', 0),
-                        result['order_id'],
-                        f"목표 수익률 달성 ({profit_rate*100:.2f}%)"
-                    )
+                order = self.sell_position(pos, profit_rate, reason=reason, as_of=snapshot_time)
+                if order:
+                    executed_orders.append(order)
 
             return {
                 'executed': len(executed_orders) > 0,
@@ -274,6 +279,63 @@ class USStrategy(BaseStrategy):
             self.logger.error(f"매도 전략 실행 오류: {e}")
             return {'executed': False, 'orders': [], 'message': str(e)}
 
+    def sell_position(self, position: Dict[str, Any], profit_rate: float,
+                      reason: str = None, as_of: float = None) -> Optional[Dict[str, Any]]:
+        """
+        단일 보유 종목 매도 (매도가 기록 포함)
+
+        Args:
+            position: 보유 종목 정보 (symbol, sellable_qty, current_price, profit_loss)
+            profit_rate: 수익률 (소수)
+            reason: 매도 사유 (로그용)
+            as_of: position 정보의 조회 시각 (이후 다른 경로에서 매도됐으면 스킵)
+
+        Returns:
+            실행된 주문 정보 (미실행/실패 시 None)
+        """
+        symbol = position['symbol']
+
+        with self.sell_lock:
+            if self.was_sold_since(symbol, as_of):
+                self.logger.info(f"{symbol}: 잔고 조회 이후 이미 매도됨 → 중복 매도 스킵")
+                return None
+
+            quantity = position.get('sellable_qty', 0)
+            if quantity <= 0:
+                return None
+
+            current_price = position.get('current_price', 0)
+
+            # 주문 실행
+            result = self.api_client.place_order(symbol, 'sell', quantity)
+
+            if not result['success']:
+                return None
+
+            self.stats['sell_successes'] += 1
+            self.mark_sold(symbol)
+
+            # 매도 가격 기록
+            self.record_sell_price(symbol, current_price)
+
+            source = f" [{reason}]" if reason else ""
+
+            # 트랜잭션 로그
+            self.transaction_logger.log_sell_order(
+                symbol, quantity, current_price,
+                position.get('profit_loss', 0),
+                result['order_id'],
+                f"목표 수익률 달성 ({profit_rate*100:.2f}%){source}"
+            )
+
+            return {
+                'symbol': symbol,
+                'quantity': quantity,
+                'price': current_price,
+                'profit_rate': profit_rate,
+                'order_id': result['order_id']
+            }
+
 
 # 하위 호환성을 위한 TradingStrategy 별칭
 TradingStrategy = USStrategy